@@ -1,20 +1,64 @@
 """Base client for GoHighLevel API v2 with shared functionality"""
 
-from typing import Any, Dict, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Pattern, Tuple
+import asyncio
+import re
 import httpx
 
 from ..services.oauth import OAuthService
-from ..utils.exceptions import handle_api_error
+from ..utils.exceptions import ResourceNotFoundError, UnsupportedRouteError, handle_api_error
+from ..utils.negative_cache import NegativeCache, not_found_key
+
+# Routes the API is known not to support: (method, path pattern, reason).
+# Requests to them fail locally instead of reaching the network.
+UNSUPPORTED_ROUTES: List[Tuple[str, Pattern[str], str]] = [
+    (
+        "GET",
+        re.compile(r"^/forms/(?!submissions/?$)[^/]+/?$"),
+        "GET /forms/{id} is not supported by the API (401: route not yet supported by the "
+        "IAM Service); use get_forms to list forms instead",
+    ),
+    (
+        "GET",
+        re.compile(r"^/forms/[^/]+/submissions/?$"),
+        "GET /forms/{id}/submissions is not supported by the API (404); "
+        "use /forms/submissions with a formId filter instead",
+    ),
+    (
+        "POST",
+        re.compile(r"^/forms/submit/?$"),
+        "POST /forms/submit is not supported (the API returns 401); forms cannot be "
+        "submitted through this server",
+    ),
+    (
+        "GET",
+        re.compile(r"^/opportunities/pipelines/[^/]+/?$"),
+        "Individual pipeline and stage endpoints do not exist; "
+        "use /opportunities/pipelines to list pipelines instead",
+    ),
+]
+
+
+def unsupported_route_reason(method: str, endpoint: str) -> Optional[str]:
+    """Why a route is known not to work, or None"""
+    path = endpoint.split("?", 1)[0]
+    for route_method, pattern, reason in UNSUPPORTED_ROUTES:
+        if method.upper() == route_method and pattern.match(path):
+            return reason
+    return None
 
 
 class BaseGoHighLevelClient:
     """Base client with shared functionality for GoHighLevel API v2"""
 
     API_BASE_URL = "https://services.leadconnectorhq.com"
+    NOT_FOUND_TTL = 30.0
 
     def __init__(self, oauth_service: OAuthService):
         self.oauth_service = oauth_service
         self.client = httpx.AsyncClient(base_url=self.API_BASE_URL)
+        # Repeated lookups of a missing resource fail locally for a short while
+        self.not_found_cache = NegativeCache(self.NOT_FOUND_TTL)
 
     async def __aenter__(self):
         return self
@@ -51,7 +95,23 @@ class BaseGoHighLevelClient:
         location_id: Optional[str] = None,
         **kwargs,
     ) -> httpx.Response:
-        """Make an authenticated request to the API"""
+        """Make an authenticated request to the API
+
+        Known-unsupported routes raise UnsupportedRouteError without a
+        request, and a GET that returned 404 recently raises
+        ResourceNotFoundError again from the negative cache.
+        """
+        reason = unsupported_route_reason(method, endpoint)
+        if reason is not None:
+            raise UnsupportedRouteError(reason)
+
+        is_lookup = method.upper() == "GET"
+        key = not_found_key(endpoint, location_id, params)
+        if is_lookup:
+            cached = self.not_found_cache.get(key)
+            if cached is not None:
+                raise ResourceNotFoundError(cached[0], 404, cached[1])
+
         headers = await self._get_headers(location_id)
 
         response = await self.client.request(
@@ -64,6 +124,57 @@ class BaseGoHighLevelClient:
         )
 
         if response.status_code >= 400:
-            handle_api_error(response)
+            try:
+                handle_api_error(response)
+            except ResourceNotFoundError as e:
+                if is_lookup:
+                    self.not_found_cache.record(key, str(e), e.response_data)
+                raise
+        elif not is_lookup:
+            # A write may have (re)created what an earlier lookup missed
+            self.not_found_cache.forget(endpoint)
 
         return response
+
+    async def _iter_raw_pages(
+        self,
+        endpoint: str,
+        items_key: str,
+        params: Optional[Dict[str, Any]] = None,
+        location_id: Optional[str] = None,
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield the raw item dicts of a skip-paginated list endpoint, page by page
+
+        No models are built, which keeps aggregations over many pages cheap. The
+        next page is requested while the current one is consumed; paging stops
+        at the first short page or after ``max_pages``.
+        """
+
+        def fetch(skip: int) -> "asyncio.Future[httpx.Response]":
+            page_params = dict(params or {}, limit=page_size)
+            if skip > 0:
+                page_params["skip"] = skip
+            return asyncio.ensure_future(
+                self._request("GET", endpoint, params=page_params, location_id=location_id)
+            )
+
+        skip = 0
+        pages = 0
+        pending: Optional["asyncio.Future[httpx.Response]"] = fetch(skip)
+        try:
+            while pending is not None:
+                response = await pending
+                pending = None
+                pages += 1
+                items = response.json().get(items_key) or []
+
+                if len(items) >= page_size and (max_pages is None or pages < max_pages):
+                    skip += page_size
+                    pending = fetch(skip)
+
+                yield items
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
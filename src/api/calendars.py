@@ -1,6 +1,6 @@
 """Calendar and appointment management client for GoHighLevel API v2"""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime, date, timedelta
 import pytz
 
@@ -157,6 +157,58 @@ class CalendarsClient(BaseGoHighLevelClient):
         )
         return response.status_code == 200
 
+    async def get_calendar_events(
+        self,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        calendar_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        group_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get raw appointments in a time range for a calendar, user or group
+
+        One of ``calendar_id``, ``user_id`` or ``group_id`` is required.
+        """
+        return await self._events(
+            "/calendars/events", location_id, start_time, end_time, calendar_id, user_id, group_id
+        )
+
+    async def get_blocked_slots(
+        self,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        calendar_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        group_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get raw block slots in a time range for a calendar, user or group"""
+        return await self._events(
+            "/calendars/blocked-slots", location_id, start_time, end_time, calendar_id, user_id, group_id
+        )
+
+    async def _events(
+        self,
+        path: str,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        calendar_id: Optional[str],
+        user_id: Optional[str],
+        group_id: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        params: Dict[str, Any] = {
+            "locationId": location_id,
+            "startTime": int(start_time.timestamp() * 1000),
+            "endTime": int(end_time.timestamp() * 1000),
+        }
+        for key, value in (("calendarId", calendar_id), ("userId", user_id), ("groupId", group_id)):
+            if value:
+                params[key] = value
+        response = await self._request("GET", path, params=params, location_id=location_id)
+        return response.json().get("events", [])
+
     # Calendar Methods
 
     async def get_calendars(self, location_id: str) -> CalendarList:
@@ -182,15 +234,18 @@ class CalendarsClient(BaseGoHighLevelClient):
         data = response.json()
         return Calendar(**data.get("calendar", data))
 
-    async def get_free_slots(
+    async def get_free_slot_days(
         self,
         calendar_id: str,
         location_id: str,
         start_date: date,
         end_date: Optional[date] = None,
         timezone: Optional[str] = None,
-    ) -> FreeSlotsResult:
-        """Get available time slots for a calendar"""
+    ) -> Dict[str, List[str]]:
+        """Get a calendar's free slot start times per day, as the API returns them
+
+        Example: ``{"2025-06-10": ["2025-06-10T11:00:00-05:00", ...]}``
+        """
         # Convert dates to millisecond timestamps
         start_timestamp = int(
             datetime.combine(start_date, datetime.min.time()).timestamp() * 1000
@@ -217,27 +272,37 @@ class CalendarsClient(BaseGoHighLevelClient):
         )
         data = response.json()
 
-        # The response format is different - it's organized by date
-        # Example: {"2025-06-10": {"slots": [...]}}
+        # The response is organized by date, next to a traceId
+        return {
+            date_key: list(date_data.get("slots", []))
+            for date_key, date_data in data.items()
+            if date_key != "traceId" and isinstance(date_data, dict) and "slots" in date_data
+        }
+
+    async def get_free_slots(
+        self,
+        calendar_id: str,
+        location_id: str,
+        start_date: date,
+        end_date: Optional[date] = None,
+        timezone: Optional[str] = None,
+        slot_length: timedelta = timedelta(minutes=30),
+    ) -> FreeSlotsResult:
+        """Get available time slots for a calendar
+
+        The API only returns start times; each slot ends ``slot_length``
+        later, which should be the calendar's configured slot duration.
+        """
+        days = await self.get_free_slot_days(
+            calendar_id, location_id, start_date, end_date, timezone
+        )
         all_slots = []
-        for date_key, date_data in data.items():
-            if (
-                date_key != "traceId"
-                and isinstance(date_data, dict)
-                and "slots" in date_data
-            ):
-                for slot_time in date_data.get("slots", []):
-                    # Each slot is just a timestamp string like "2025-06-10T11:00:00-05:00"
-                    # We need to create start and end times (assuming 30-minute slots)
-                    slot_dt = datetime.fromisoformat(slot_time.replace("Z", "+00:00"))
-                    end_dt = slot_dt + timedelta(minutes=30)
-                    all_slots.append(
-                        FreeSlot(
-                            startTime=slot_time,
-                            endTime=end_dt.isoformat(),
-                            available=True,
-                        )
-                    )
+        for slot_times in days.values():
+            for slot_time in slot_times:
+                slot_dt = datetime.fromisoformat(slot_time.replace("Z", "+00:00"))
+                all_slots.append(
+                    FreeSlot(startTime=slot_dt, endTime=slot_dt + slot_length, available=True)
+                )
 
         return FreeSlotsResult(
             slots=all_slots,
@@ -1,9 +1,57 @@
 """Main GoHighLevel API v2 client with composition pattern"""
 
-from typing import Any, Dict, Optional, List
-from datetime import date
-
+import asyncio
+import heapq
+import logging
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from datetime import date, datetime, timedelta, timezone
+
+from ..cache import (
+    CacheStore,
+    CalendarCache,
+    CatalogCache,
+    CatalogIndex,
+    CustomFieldCache,
+    FreeSlotCache,
+    HotKeyTracker,
+    InvalidationBus,
+    MetadataCache,
+    PipelineCache,
+    UserDirectoryCache,
+    invalidates,
+    invalidation,
+)
 from ..services.oauth import OAuthService
+from ..utils.exceptions import (
+    DuplicateResourceError,
+    LocalStoreDisabledError,
+    ScheduleConflictError,
+    ValidationError,
+)
+from ..store import (
+    ContactMirror,
+    ConversationArchive,
+    DuplicateIndex,
+    LocalDatabase,
+    OpportunityStore,
+    PaymentLedger,
+    ScheduleIndex,
+    SubmissionStore,
+    SyncedStore,
+    TaskIndex,
+)
+from ..store.schedule import APPOINTMENT, BLOCK, SHARED_SLOT_CALENDAR_TYPES, Booking
 from ..models.contact import Contact, ContactCreate, ContactUpdate, ContactList
 from ..models.task import Task, TaskCreate, TaskUpdate, TaskList
 from ..models.note import Note, NoteCreate, NoteUpdate, NoteList
@@ -50,6 +98,7 @@ from ..models.calendar import (
 )
 from ..models.form import (
     FormList,
+    FormSubmission,
     FormSubmissionList,
     FormFileUploadRequest,
 )
@@ -85,6 +134,10 @@ from .links import LinksClient
 from .surveys import SurveysClient
 from .oauth_management import OAuthManagementClient
 
+S = TypeVar("S", bound=SyncedStore)
+
+logger = logging.getLogger(__name__)
+
 
 class GoHighLevelClient:
     """Main client for interacting with GoHighLevel API v2
@@ -93,8 +146,20 @@ class GoHighLevelClient:
     while maintaining the same public interface for backward compatibility.
     """
 
-    def __init__(self, oauth_service: OAuthService):
+    def __init__(
+        self,
+        oauth_service: OAuthService,
+        cache_store: Optional[CacheStore] = None,
+        invalidation_bus: Optional[InvalidationBus] = None,
+        hot_keys: Optional[HotKeyTracker] = None,
+        local_db: Optional[LocalDatabase] = None,
+        duplicate_index: bool = False,
+        schedule_index: bool = False,
+    ):
         self.oauth_service = oauth_service
+        self.cache_store = cache_store
+        self.hot_keys = hot_keys
+        self.local_db = local_db
 
         # Initialize specialized clients
         self._contacts = ContactsClient(oauth_service)
@@ -115,6 +180,146 @@ class GoHighLevelClient:
         self._surveys = SurveysClient(oauth_service)
         self._oauth_management = OAuthManagementClient(oauth_service)
 
+        # Location metadata caches, optionally persisted across restarts
+        self.pipeline_cache = PipelineCache(self._opportunities, store=cache_store)
+        self.custom_field_cache = CustomFieldCache(self._locations_extended, store=cache_store)
+        self.calendar_cache = CalendarCache(
+            self._calendars, self._calendar_admin, store=cache_store
+        )
+        self.user_cache = UserDirectoryCache(self._users, store=cache_store)
+        self.catalog_cache = CatalogCache(self._products, store=cache_store)
+        for cache in self._metadata_caches():
+            cache.hot_keys = hot_keys
+        # Free slots per calendar and day, dropped on appointment and calendar writes
+        self.slot_cache = FreeSlotCache(self._calendars)
+
+        # Optional local mirrors answering reads without the API
+        self.contact_mirror: Optional[ContactMirror] = (
+            ContactMirror(self._contacts, local_db) if local_db is not None else None
+        )
+        self.opportunity_store: Optional[OpportunityStore] = (
+            OpportunityStore(self._opportunities, local_db) if local_db is not None else None
+        )
+        self.conversation_archive: Optional[ConversationArchive] = (
+            ConversationArchive(self._conversations, local_db) if local_db is not None else None
+        )
+        self.payment_ledger: Optional[PaymentLedger] = (
+            PaymentLedger(self._payments, local_db) if local_db is not None else None
+        )
+        self.task_index: Optional[TaskIndex] = (
+            TaskIndex(self._locations_extended, local_db) if local_db is not None else None
+        )
+        self.submission_store: Optional[SubmissionStore] = (
+            SubmissionStore(self._forms, self._surveys, local_db) if local_db is not None else None
+        )
+        # Email/phone index checked before creating contacts; built from the
+        # mirror when there is one, otherwise only when asked for since it
+        # pages through every contact of a location
+        self.duplicate_index: Optional[DuplicateIndex] = (
+            DuplicateIndex(self._contacts, mirror=self.contact_mirror)
+            if local_db is not None or duplicate_index
+            else None
+        )
+        # Interval index of appointments and block slots checked before booking
+        self.schedule_index: Optional[ScheduleIndex] = (
+            ScheduleIndex(self._calendars) if schedule_index else None
+        )
+
+        # Writes publish the entities they touch; a client sharing another
+        # client's bus (token overrides) only publishes to it, since its own
+        # caches do not outlive the call
+        if invalidation_bus is None:
+            invalidation_bus = InvalidationBus()
+            self._subscribe_caches(invalidation_bus)
+        self.invalidation_bus = invalidation_bus
+
+    def with_oauth(self, oauth_service: OAuthService) -> "GoHighLevelClient":
+        """A client for another token sharing this client's mirrors, indexes and bus
+
+        The mirrors and indexes are this client's own instances, so local
+        tools and pre-write checks behave the same with a token override, a
+        location is never synced by two clients at once, and stopping this
+        client's mirrors stops every sync. They keep syncing with this
+        client's token.
+        """
+        client = GoHighLevelClient(
+            oauth_service,
+            cache_store=self.cache_store,
+            invalidation_bus=self.invalidation_bus,
+            hot_keys=self.hot_keys,
+        )
+        client.local_db = self.local_db
+        client.contact_mirror = self.contact_mirror
+        client.opportunity_store = self.opportunity_store
+        client.conversation_archive = self.conversation_archive
+        client.payment_ledger = self.payment_ledger
+        client.task_index = self.task_index
+        client.submission_store = self.submission_store
+        client.duplicate_index = self.duplicate_index
+        client.schedule_index = self.schedule_index
+        return client
+
+    def _metadata_caches(self) -> List[MetadataCache]:
+        return [
+            self.pipeline_cache,
+            self.custom_field_cache,
+            self.calendar_cache,
+            self.user_cache,
+            self.catalog_cache,
+        ]
+
+    def mirrors(self) -> List[SyncedStore]:
+        """The local mirrors that are enabled"""
+        stores = (
+            self.contact_mirror,
+            self.opportunity_store,
+            self.conversation_archive,
+            self.payment_ledger,
+            self.task_index,
+            self.submission_store,
+        )
+        return [mirror for mirror in stores if mirror is not None]
+
+    async def _synced(self, store: Optional[S], location_id: str, feature: str) -> S:
+        """A local store for a query that never calls the API
+
+        The first query of a location waits for its initial load; later ones
+        answer at once while background syncs keep the store current.
+        """
+        if store is None:
+            raise LocalStoreDisabledError(f"{feature} needs the local mirror (STORE_ENABLED=true)")
+        if not await store.ready(location_id):
+            if (await store.state(location_id)).last_sync is None:
+                await store.sync(location_id)
+        return store
+
+    def warmers(self) -> Dict[str, Callable[[Any], Awaitable[Any]]]:
+        """Warm-start loaders for the metadata caches, keyed by cache namespace"""
+        return {cache.namespace: cache.warm for cache in self._metadata_caches()}
+
+    def _subscribe_caches(self, bus: InvalidationBus) -> None:
+        # Caches are looked up when a write is published, so replacing one keeps it subscribed
+        def invalidate(cache_name: str, all_locations: bool = False) -> Callable[[Optional[str]], None]:
+            return lambda location_id: getattr(self, cache_name).invalidate(
+                None if all_locations else location_id
+            )
+
+        bus.subscribe(invalidation.PIPELINES, invalidate("pipeline_cache"))
+        bus.subscribe(invalidation.CUSTOM_FIELDS, invalidate("custom_field_cache"))
+        bus.subscribe(invalidation.CALENDARS, invalidate("calendar_cache"))
+        bus.subscribe(invalidation.CALENDARS, invalidate("slot_cache"))
+        bus.subscribe(invalidation.APPOINTMENTS, invalidate("slot_cache"))
+        # Users can belong to several locations, so a user write drops every directory
+        bus.subscribe(invalidation.USERS, invalidate("user_cache", all_locations=True))
+        for cache_name in (
+            "pipeline_cache",
+            "custom_field_cache",
+            "calendar_cache",
+            "user_cache",
+            "catalog_cache",
+        ):
+            bus.subscribe(invalidation.LOCATIONS, invalidate(cache_name))
+
     async def __aenter__(self):
         # Enter all specialized clients
         await self._contacts.__aenter__()
@@ -158,8 +363,16 @@ class GoHighLevelClient:
         email: Optional[str] = None,
         phone: Optional[str] = None,
         tags: Optional[List[str]] = None,
+        live: bool = False,
     ) -> ContactList:
-        """Get contacts for a location"""
+        """Get contacts for a location, from the contact mirror when it is fresh"""
+        if not live and self.contact_mirror is not None and await self.contact_mirror.ready(location_id):
+            rows, total = await self.contact_mirror.search(
+                location_id, query, email, phone, tags, limit, skip
+            )
+            return ContactList(
+                contacts=[Contact(**row) for row in rows], count=len(rows), total=total
+            )
         return await self._contacts.get_contacts(
             location_id=location_id,
             limit=limit,
@@ -170,35 +383,156 @@ class GoHighLevelClient:
             tags=tags,
         )
 
-    async def get_contact(self, contact_id: str, location_id: str) -> Contact:
-        """Get a specific contact"""
-        return await self._contacts.get_contact(contact_id, location_id)
+    def iter_contact_pages(
+        self,
+        location_id: str,
+        query: Optional[str] = None,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Iterate over raw contact pages for a location"""
+        return self._contacts.iter_contact_pages(
+            location_id, query, email, phone, tags, page_size, max_pages
+        )
 
+    async def search_contacts_local(
+        self,
+        location_id: str,
+        text: Optional[str] = None,
+        company: Optional[str] = None,
+        city: Optional[str] = None,
+        state: Optional[str] = None,
+        source: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        assigned_to: Optional[str] = None,
+        added_after: Optional[str] = None,
+        added_before: Optional[str] = None,
+        limit: int = 20,
+        skip: int = 0,
+    ) -> Tuple[List[Tuple[Contact, Optional[float]]], int]:
+        """Ranked full-text contact search over the contact mirror, without calling the API"""
+        mirror = await self._synced(self.contact_mirror, location_id, "Local contact search")
+        rows, total = await mirror.search_text(
+            location_id, text, company, city, state, source, tags,
+            assigned_to, added_after, added_before, limit, skip,
+        )
+        return [(Contact(**row), score) for row, score in rows], total
+
+    async def get_contact(self, contact_id: str, location_id: str, live: bool = False) -> Contact:
+        """Get a specific contact, from the contact mirror when it is fresh"""
+        if not live and self.contact_mirror is not None and await self.contact_mirror.ready(location_id):
+            data = await self.contact_mirror.get(location_id, contact_id)
+            if data is not None:
+                return Contact(**data)
+        return await self._mirror_contact(
+            location_id, await self._contacts.get_contact(contact_id, location_id)
+        )
+
+    async def _mirror_contact(self, location_id: str, contact: Contact) -> Contact:
+        """Write a contact returned by the API through to the contact mirror"""
+        if contact.id:
+            data = contact.model_dump(mode="json")
+            if self.contact_mirror is not None:
+                await self.contact_mirror.put(location_id, data)
+            if self.duplicate_index is not None:
+                self.duplicate_index.put(location_id, [data])
+        return contact
+
+    async def find_duplicate_contact(
+        self, location_id: str, email: Optional[str] = None, phone: Optional[str] = None
+    ) -> Optional[str]:
+        """ID of a contact with the same normalized email or phone, without calling the API
+
+        Returns None when the duplicate index is disabled.
+        """
+        if self.duplicate_index is None:
+            return None
+        return await self.duplicate_index.find(location_id, email, phone)
+
+    async def upsert_contact(
+        self, contact: ContactCreate, update_duplicate: bool = True
+    ) -> Tuple[Contact, Optional[str]]:
+        """Create a contact unless one already shares its email or phone
+
+        Returns the contact and the ID of the duplicate found, if any.
+        Duplicates are found in the local index first; one the API still
+        rejects as a duplicate is identified by the ID in its error. A
+        duplicate is updated with the new fields and tags, keeping its email
+        when matched by phone alone; without ``update_duplicate`` it is
+        returned unchanged.
+        """
+        location_id = contact.locationId
+        match: Optional[Tuple[str, Optional[str]]] = (
+            await self.duplicate_index.match(location_id, contact.email, contact.phone)
+            if self.duplicate_index is not None
+            else None
+        )
+        if match is None:
+            try:
+                return await self.create_contact(contact), None
+            except DuplicateResourceError as e:
+                meta = e.response_data.get("meta") or {}
+                if not meta.get("contactId"):
+                    raise
+                match = meta["contactId"], meta.get("matchingField")
+        duplicate_id, matched_by = match
+        if not update_duplicate:
+            return await self.get_contact(duplicate_id, location_id), duplicate_id
+
+        # Tags are added rather than replacing the existing contact's tags
+        exclude = {"locationId", "tags"} if matched_by == "email" else {"locationId", "tags", "email"}
+        fields = contact.model_dump(exclude=exclude, exclude_unset=True, exclude_none=True)
+        updated: Optional[Contact] = None
+        if fields:
+            updated = await self.update_contact(duplicate_id, ContactUpdate(**fields), location_id)
+        if contact.tags:
+            updated = await self.add_contact_tags(duplicate_id, contact.tags, location_id)
+        if updated is None:
+            updated = await self.get_contact(duplicate_id, location_id)
+        return updated, duplicate_id
+
+    @invalidates(invalidation.CONTACTS)
     async def create_contact(self, contact: ContactCreate) -> Contact:
         """Create a new contact"""
-        return await self._contacts.create_contact(contact)
+        created = await self._contacts.create_contact(contact)
+        return await self._mirror_contact(contact.locationId, created)
 
+    @invalidates(invalidation.CONTACTS)
     async def update_contact(
         self, contact_id: str, updates: ContactUpdate, location_id: str
     ) -> Contact:
         """Update an existing contact"""
-        return await self._contacts.update_contact(contact_id, updates, location_id)
+        updated = await self._contacts.update_contact(contact_id, updates, location_id)
+        return await self._mirror_contact(location_id, updated)
 
+    @invalidates(invalidation.CONTACTS)
     async def delete_contact(self, contact_id: str, location_id: str) -> bool:
         """Delete a contact"""
-        return await self._contacts.delete_contact(contact_id, location_id)
-
+        deleted = await self._contacts.delete_contact(contact_id, location_id)
+        if self.contact_mirror is not None:
+            await self.contact_mirror.remove(location_id, contact_id)
+        if self.duplicate_index is not None:
+            self.duplicate_index.remove(location_id, contact_id)
+        return deleted
+
+    @invalidates(invalidation.CONTACTS)
     async def add_contact_tags(
         self, contact_id: str, tags: List[str], location_id: str
     ) -> Contact:
         """Add tags to a contact"""
-        return await self._contacts.add_contact_tags(contact_id, tags, location_id)
+        contact = await self._contacts.add_contact_tags(contact_id, tags, location_id)
+        return await self._mirror_contact(location_id, contact)
 
+    @invalidates(invalidation.CONTACTS)
     async def remove_contact_tags(
         self, contact_id: str, tags: List[str], location_id: str
     ) -> Contact:
         """Remove tags from a contact"""
-        return await self._contacts.remove_contact_tags(contact_id, tags, location_id)
+        contact = await self._contacts.remove_contact_tags(contact_id, tags, location_id)
+        return await self._mirror_contact(location_id, contact)
 
     # Contact Tasks Methods - Delegate to ContactsClient
 
@@ -212,33 +546,50 @@ class GoHighLevelClient:
         """Get a specific task for a contact"""
         return await self._contacts.get_contact_task(contact_id, task_id, location_id)
 
+    async def _index_task(self, location_id: str, contact_id: str, task: Task) -> Task:
+        """Write a task returned by the API through to the task index"""
+        if self.task_index is not None and task.id:
+            data = task.model_dump(mode="json", exclude_none=True)
+            await self.task_index.put(location_id, {"contactId": contact_id, **data})
+        return task
+
+    @invalidates(invalidation.TASKS)
     async def create_contact_task(
         self, contact_id: str, task: TaskCreate, location_id: str
     ) -> Task:
         """Create a new task for a contact"""
-        return await self._contacts.create_contact_task(contact_id, task, location_id)
+        created = await self._contacts.create_contact_task(contact_id, task, location_id)
+        return await self._index_task(location_id, contact_id, created)
 
+    @invalidates(invalidation.TASKS)
     async def update_contact_task(
         self, contact_id: str, task_id: str, updates: TaskUpdate, location_id: str
     ) -> Task:
         """Update an existing task for a contact"""
-        return await self._contacts.update_contact_task(
+        updated = await self._contacts.update_contact_task(
             contact_id, task_id, updates, location_id
         )
+        return await self._index_task(location_id, contact_id, updated)
 
+    @invalidates(invalidation.TASKS)
     async def delete_contact_task(
         self, contact_id: str, task_id: str, location_id: str
     ) -> bool:
         """Delete a task for a contact"""
-        return await self._contacts.delete_contact_task(contact_id, task_id, location_id)
+        deleted = await self._contacts.delete_contact_task(contact_id, task_id, location_id)
+        if self.task_index is not None:
+            await self.task_index.remove(location_id, task_id)
+        return deleted
 
+    @invalidates(invalidation.TASKS)
     async def complete_contact_task(
         self, contact_id: str, task_id: str, completed: bool, location_id: str
     ) -> Task:
         """Mark a contact task as completed or incomplete"""
-        return await self._contacts.complete_contact_task(
+        task = await self._contacts.complete_contact_task(
             contact_id, task_id, completed, location_id
         )
+        return await self._index_task(location_id, contact_id, task)
 
     # Contact Notes Methods - Delegate to ContactsClient
 
@@ -252,12 +603,14 @@ class GoHighLevelClient:
         """Get a specific note for a contact"""
         return await self._contacts.get_contact_note(contact_id, note_id, location_id)
 
+    @invalidates(invalidation.NOTES)
     async def create_contact_note(
         self, contact_id: str, note: NoteCreate, location_id: str
     ) -> Note:
         """Create a new note for a contact"""
         return await self._contacts.create_contact_note(contact_id, note, location_id)
 
+    @invalidates(invalidation.NOTES)
     async def update_contact_note(
         self, contact_id: str, note_id: str, updates: NoteUpdate, location_id: str
     ) -> Note:
@@ -266,6 +619,7 @@ class GoHighLevelClient:
             contact_id, note_id, updates, location_id
         )
 
+    @invalidates(invalidation.NOTES)
     async def delete_contact_note(
         self, contact_id: str, note_id: str, location_id: str
     ) -> bool:
@@ -274,30 +628,35 @@ class GoHighLevelClient:
 
     # Contact Campaign/Workflow Assignment Methods - Delegate to ContactsClient
 
+    @invalidates(invalidation.CONTACTS)
     async def add_contact_to_campaign(
         self, contact_id: str, campaign_id: str, location_id: str
     ) -> bool:
         """Add a contact to a campaign"""
         return await self._contacts.add_contact_to_campaign(contact_id, campaign_id, location_id)
 
+    @invalidates(invalidation.CONTACTS)
     async def remove_contact_from_campaign(
         self, contact_id: str, campaign_id: str, location_id: str
     ) -> bool:
         """Remove a contact from a specific campaign"""
         return await self._contacts.remove_contact_from_campaign(contact_id, campaign_id, location_id)
 
+    @invalidates(invalidation.CONTACTS)
     async def remove_contact_from_all_campaigns(
         self, contact_id: str, location_id: str
     ) -> bool:
         """Remove a contact from all campaigns"""
         return await self._contacts.remove_contact_from_all_campaigns(contact_id, location_id)
 
+    @invalidates(invalidation.CONTACTS)
     async def add_contact_to_workflow(
         self, contact_id: str, workflow_id: str, location_id: str
     ) -> bool:
         """Add a contact to a workflow"""
         return await self._contacts.add_contact_to_workflow(contact_id, workflow_id, location_id)
 
+    @invalidates(invalidation.CONTACTS)
     async def remove_contact_from_workflow(
         self, contact_id: str, workflow_id: str, location_id: str
     ) -> bool:
@@ -331,6 +690,7 @@ class GoHighLevelClient:
         """Get a specific conversation"""
         return await self._conversations.get_conversation(conversation_id, location_id)
 
+    @invalidates(invalidation.CONVERSATIONS)
     async def create_conversation(
         self, conversation: ConversationCreate
     ) -> Conversation:
@@ -338,13 +698,51 @@ class GoHighLevelClient:
         return await self._conversations.create_conversation(conversation)
 
     async def get_messages(
-        self, conversation_id: str, location_id: str, limit: int = 100, skip: int = 0
+        self,
+        conversation_id: str,
+        location_id: str,
+        limit: int = 100,
+        skip: int = 0,
+        last_message_id: Optional[str] = None,
     ) -> MessageList:
         """Get messages for a conversation"""
         return await self._conversations.get_messages(
-            conversation_id, location_id, limit, skip
+            conversation_id, location_id, limit, skip, last_message_id
         )
 
+    def iter_messages(
+        self,
+        conversation_id: str,
+        location_id: str,
+        page_size: int = 100,
+        since_message_id: Optional[str] = None,
+        prefetch: bool = True,
+        on_page: Optional[Callable[[MessageList], Awaitable[None]]] = None,
+    ) -> AsyncGenerator[Message, None]:
+        """Iterate over every message in a conversation, newest first"""
+        return self._conversations.iter_messages(
+            conversation_id, location_id, page_size, since_message_id, prefetch, on_page
+        )
+
+    async def search_messages_local(
+        self,
+        location_id: str,
+        text: str,
+        contact_id: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        direction: Optional[str] = None,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        limit: int = 20,
+        skip: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Full-text message search over the conversation archive, without calling the API"""
+        archive = await self._synced(self.conversation_archive, location_id, "Message search")
+        return await archive.search(
+            location_id, text, contact_id, conversation_id, direction, after, before, limit, skip
+        )
+
+    @invalidates(invalidation.CONVERSATIONS)
     async def send_message(
         self, conversation_id: str, message: MessageCreate, location_id: str
     ) -> Message:
@@ -353,6 +751,7 @@ class GoHighLevelClient:
             conversation_id, message, location_id
         )
 
+    @invalidates(invalidation.CONVERSATIONS)
     async def update_message_status(
         self, message_id: str, status: str, location_id: str
     ) -> Message:
@@ -375,43 +774,128 @@ class GoHighLevelClient:
             location_id=location_id, limit=limit, skip=skip, filters=filters
         )
 
+    def iter_opportunity_pages(
+        self,
+        location_id: str,
+        filters: Optional[OpportunitySearchFilters] = None,
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Iterate over raw opportunity pages for a location"""
+        return self._opportunities.iter_opportunity_pages(
+            location_id, filters, page_size, max_pages
+        )
+
     async def get_opportunity(
         self, opportunity_id: str, location_id: str
     ) -> Opportunity:
         """Get a specific opportunity"""
         return await self._opportunities.get_opportunity(opportunity_id, location_id)
 
+    async def _store_opportunity(self, location_id: str, opportunity: Opportunity) -> Opportunity:
+        """Write an opportunity returned by the API through to the opportunity store"""
+        if self.opportunity_store is not None:
+            await self.opportunity_store.put(location_id, opportunity.model_dump(mode="json"))
+        return opportunity
+
+    @invalidates(invalidation.OPPORTUNITIES)
     async def create_opportunity(self, opportunity: OpportunityCreate) -> Opportunity:
         """Create a new opportunity"""
-        return await self._opportunities.create_opportunity(opportunity)
+        created = await self._opportunities.create_opportunity(opportunity)
+        return await self._store_opportunity(opportunity.locationId, created)
 
+    @invalidates(invalidation.OPPORTUNITIES)
     async def update_opportunity(
         self, opportunity_id: str, updates: OpportunityUpdate, location_id: str
     ) -> Opportunity:
         """Update an existing opportunity"""
-        return await self._opportunities.update_opportunity(
+        updated = await self._opportunities.update_opportunity(
             opportunity_id, updates, location_id
         )
+        return await self._store_opportunity(location_id, updated)
 
+    @invalidates(invalidation.OPPORTUNITIES)
     async def delete_opportunity(self, opportunity_id: str, location_id: str) -> bool:
         """Delete an opportunity"""
-        return await self._opportunities.delete_opportunity(opportunity_id, location_id)
+        deleted = await self._opportunities.delete_opportunity(opportunity_id, location_id)
+        if self.opportunity_store is not None:
+            await self.opportunity_store.remove(location_id, opportunity_id)
+        return deleted
 
+    @invalidates(invalidation.OPPORTUNITIES)
     async def update_opportunity_status(
         self, opportunity_id: str, status: str, location_id: str
     ) -> Opportunity:
         """Update opportunity status"""
-        return await self._opportunities.update_opportunity_status(
+        updated = await self._opportunities.update_opportunity_status(
             opportunity_id, status, location_id
         )
+        return await self._store_opportunity(location_id, updated)
 
-    async def get_pipelines(self, location_id: str) -> List[Pipeline]:
-        """Get all pipelines for a location
+    async def analyze_opportunities(
+        self,
+        location_id: str,
+        report: str = "summary",
+        group_by: Optional[List[str]] = None,
+        pipeline_id: Optional[str] = None,
+        stage_id: Optional[str] = None,
+        **filters: Any,
+    ) -> List[Dict[str, Any]]:
+        """Pipeline analytics over the local opportunity store, without calling the API
+
+        ``report`` is ``summary`` (counts, value sums and win rates per
+        ``group_by`` group), ``stage_conversion`` (needs ``pipeline_id``) or
+        ``time_in_stage``. Pipelines, stages and users are labelled by name.
+        """
+        store = await self._synced(self.opportunity_store, location_id, "Opportunity analytics")
+        filters.update(pipeline_id=pipeline_id, stage_id=stage_id)
+        index = await self.pipeline_cache.get(location_id)
+        if report == "summary":
+            rows = await store.summary(location_id, group_by, **filters)
+        elif report == "stage_conversion":
+            pipeline = index.by_id.get(pipeline_id or "")
+            if pipeline is None:
+                raise ValidationError("Stage conversion needs a pipeline")
+            stages = sorted(pipeline.stages or [], key=lambda stage: stage.position)
+            rows = await store.stage_conversion(location_id, [stage.id for stage in stages], **filters)
+        elif report == "time_in_stage":
+            rows = await store.time_in_stage(location_id, **filters)
+        else:
+            raise ValidationError(f"Unknown report '{report}'")
+
+        users = None
+        for row in rows:
+            if row.get("pipeline"):
+                pipeline = index.by_id.get(row["pipeline"])
+                row["pipeline_name"] = pipeline.name if pipeline else None
+            if row.get("stage"):
+                row["stage_name"] = index.stage_name(row["stage"])
+            if row.get("assigned_to"):
+                users = users or await self.user_cache.get(location_id)
+                row["assigned_to_name"] = users.name_of(row["assigned_to"])
+        return rows
+
+    async def get_pipelines(self, location_id: str, refresh: bool = False) -> List[Pipeline]:
+        """Get all pipelines for a location, served from the pipeline cache
 
         NOTE: This is the only pipeline endpoint that exists in the API.
         Individual pipeline and stage endpoints do not exist.
         """
-        return await self._opportunities.get_pipelines(location_id)
+        index = await self.pipeline_cache.get(location_id, refresh=refresh)
+        return index.pipelines
+
+    async def resolve_pipeline_stage(
+        self,
+        location_id: str,
+        pipeline: Optional[str] = None,
+        stage: Optional[str] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Resolve pipeline and stage IDs or names to ``(pipeline_id, stage_id)``"""
+        return await self.pipeline_cache.resolve(location_id, pipeline, stage)
+
+    def invalidate_pipelines(self, location_id: Optional[str] = None) -> None:
+        """Drop cached pipelines for a location, or for all locations"""
+        self.invalidation_bus.publish([invalidation.PIPELINES], location_id)
 
     # Calendar Methods - Delegate to CalendarsClient
 
@@ -432,30 +916,158 @@ class GoHighLevelClient:
         """Get a specific appointment"""
         return await self._calendars.get_appointment(appointment_id, location_id)
 
-    async def create_appointment(self, appointment: AppointmentCreate) -> Appointment:
-        """Create a new appointment"""
-        return await self._calendars.create_appointment(appointment)
+    async def check_schedule(
+        self,
+        location_id: str,
+        calendar_id: Optional[str],
+        start: datetime,
+        end: datetime,
+        user_id: Optional[str] = None,
+        exclude_id: Optional[str] = None,
+    ) -> None:
+        """Raise ScheduleConflictError if ``[start, end)`` overlaps a known booking
+
+        The error carries the overlapping bookings and the next free spans of
+        the same length. Does nothing when the schedule index is disabled or
+        the calendar takes several bookings per slot; when the known bookings
+        cannot be loaded, the booking goes ahead unchecked.
+        """
+        if self.schedule_index is None:
+            return
+        try:
+            if calendar_id and await self._shares_slots(location_id, calendar_id):
+                return
+            conflicts = await self.schedule_index.conflicts(
+                location_id, calendar_id, start, end, user_id, exclude_id
+            )
+            if not conflicts:
+                return
+            suggestions = await self.schedule_index.suggest(
+                location_id, calendar_id, start, end, user_id, exclude_id
+            )
+        except Exception as e:
+            logger.warning(
+                "Schedule check skipped for calendar %s in %s: %s", calendar_id, location_id, e
+            )
+            return
+        raise ScheduleConflictError(
+            f"{start.isoformat()} to {end.isoformat()} overlaps {len(conflicts)} existing booking(s)",
+            response_data={
+                "conflicts": [booking.to_dict() for booking in conflicts],
+                "suggestions": [
+                    {"start_time": s.isoformat(), "end_time": e.isoformat()} for s, e in suggestions
+                ],
+            },
+        )
 
+    async def _shares_slots(self, location_id: str, calendar_id: str) -> bool:
+        """Whether a calendar takes more than one booking per slot"""
+        calendar = await self.get_calendar(calendar_id, location_id)
+        return (
+            (calendar.appointmentPerSlot or 1) > 1
+            or calendar.calendarType in SHARED_SLOT_CALENDAR_TYPES
+        )
+
+    def _schedule(self, location_id: str, event: Dict[str, Any], kind: str = APPOINTMENT) -> None:
+        if self.schedule_index is not None:
+            self.schedule_index.put(location_id, event, kind)
+
+    @invalidates(invalidation.APPOINTMENTS)
+    async def create_appointment(
+        self, appointment: AppointmentCreate, allow_overlap: bool = False
+    ) -> Appointment:
+        """Create a new appointment
+
+        Unless ``allow_overlap``, a time overlapping a known appointment or
+        block slot on the calendar or the assigned user's schedule raises
+        ScheduleConflictError before anything is sent.
+        """
+        start, end = appointment.startTime, appointment.endTime
+        if not allow_overlap and isinstance(start, datetime) and isinstance(end, datetime):
+            await self.check_schedule(
+                appointment.locationId, appointment.calendarId, start, end, appointment.assignedUserId
+            )
+        created = await self._calendars.create_appointment(appointment)
+        self._schedule(appointment.locationId, created.model_dump(mode="json"))
+        return created
+
+    @invalidates(invalidation.APPOINTMENTS)
     async def update_appointment(
-        self, appointment_id: str, updates: AppointmentUpdate, location_id: str
+        self,
+        appointment_id: str,
+        updates: AppointmentUpdate,
+        location_id: str,
+        allow_overlap: bool = False,
     ) -> Appointment:
-        """Update an existing appointment"""
-        return await self._calendars.update_appointment(
+        """Update an existing appointment
+
+        A move or reassignment is checked for overlaps like a new booking;
+        moving only the start keeps the appointment's length.
+        """
+        if not allow_overlap and self.schedule_index is not None and (
+            updates.startTime or updates.endTime or updates.assignedUserId
+        ):
+            known = self.schedule_index.booking(location_id, appointment_id)
+            if known is None:
+                try:
+                    current = await self._calendars.get_appointment(appointment_id, location_id)
+                    known = Booking.from_event(current.model_dump(mode="json"))
+                except Exception as e:
+                    logger.warning("Schedule check skipped for appointment %s: %s", appointment_id, e)
+            if known is not None:
+                start = updates.startTime if isinstance(updates.startTime, datetime) else None
+                end = updates.endTime if isinstance(updates.endTime, datetime) else None
+                if start is None:
+                    start = datetime.fromtimestamp(known.start, tz=timezone.utc)
+                if end is None:
+                    end = start + timedelta(seconds=known.end - known.start)
+                await self.check_schedule(
+                    location_id,
+                    known.calendar_id,
+                    start,
+                    end,
+                    updates.assignedUserId or known.user_id,
+                    exclude_id=appointment_id,
+                )
+        updated = await self._calendars.update_appointment(
             appointment_id, updates, location_id
         )
+        self._schedule(location_id, {"id": appointment_id, **updated.model_dump(mode="json")})
+        return updated
 
+    @invalidates(invalidation.APPOINTMENTS)
     async def delete_appointment(self, appointment_id: str, location_id: str) -> bool:
         """Delete an appointment"""
-        return await self._calendars.delete_appointment(appointment_id, location_id)
-
-    async def get_calendars(self, location_id: str) -> CalendarList:
-        """Get all calendars for a location"""
-        return await self._calendars.get_calendars(location_id)
+        deleted = await self._calendars.delete_appointment(appointment_id, location_id)
+        if self.schedule_index is not None:
+            self.schedule_index.remove(location_id, appointment_id)
+        return deleted
+
+    async def get_calendars(self, location_id: str, refresh: bool = False) -> CalendarList:
+        """Get all calendars for a location, served from the calendar cache"""
+        index = await self.calendar_cache.get(location_id, refresh=refresh)
+        return CalendarList(
+            calendars=index.calendars,
+            count=len(index.calendars),
+            total=len(index.calendars),
+        )
 
     async def get_calendar(self, calendar_id: str, location_id: str) -> Calendar:
-        """Get a specific calendar"""
+        """Get a specific calendar, from the calendar cache when it is there"""
+        index = await self.calendar_cache.get(location_id)
+        calendar = index.by_id.get(calendar_id)
+        if calendar is not None:
+            return calendar
         return await self._calendars.get_calendar(calendar_id, location_id)
 
+    async def resolve_calendar(self, location_id: str, calendar: str) -> Calendar:
+        """Resolve a calendar ID, name or widget slug to a calendar"""
+        return await self.calendar_cache.resolve(location_id, calendar)
+
+    def invalidate_calendars(self, location_id: Optional[str] = None) -> None:
+        """Drop cached calendars for a location, or for all locations"""
+        self.invalidation_bus.publish([invalidation.CALENDARS], location_id)
+
     async def get_free_slots(
         self,
         calendar_id: str,
@@ -464,11 +1076,74 @@ class GoHighLevelClient:
         end_date: Optional[date] = None,
         timezone: Optional[str] = None,
     ) -> FreeSlotsResult:
-        """Get available time slots for a calendar"""
+        """Get available time slots for a calendar, as long as its configured slot duration"""
+        calendar = await self.get_calendar(calendar_id, location_id)
         return await self._calendars.get_free_slots(
-            calendar_id, location_id, start_date, end_date, timezone
+            calendar_id, location_id, start_date, end_date, timezone, calendar.slot_length()
         )
 
+    async def find_free_slots(
+        self,
+        location_id: str,
+        calendar_ids: List[str],
+        start_date: date,
+        end_date: Optional[date] = None,
+        timezone: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Free slots across several calendars, earliest first
+
+        Calendars are queried concurrently through the slot cache and their
+        sorted slots merged with a heap. Slots with the same start and end
+        are reported once, listing every calendar that offers them; each
+        calendar's slots last its configured slot duration.
+        """
+        index = await self.calendar_cache.get(location_id)
+        calendar_ids = list(dict.fromkeys(calendar_ids))
+        lengths = {
+            calendar_id: (
+                index.by_id[calendar_id].slot_length()
+                if calendar_id in index.by_id
+                else timedelta(minutes=30)
+            ).total_seconds()
+            for calendar_id in calendar_ids
+        }
+        per_calendar = await asyncio.gather(
+            *(
+                self.slot_cache.get(location_id, calendar_id, start_date, end_date or start_date, timezone)
+                for calendar_id in calendar_ids
+            )
+        )
+
+        def stream(calendar_id: str, slots: List[Tuple[float, str]]) -> Iterator[Tuple[float, float, str, str]]:
+            length = lengths[calendar_id]
+            return ((start, start + length, text, calendar_id) for start, text in slots)
+
+        streams = [stream(calendar_id, slots) for calendar_id, slots in zip(calendar_ids, per_calendar)]
+
+        merged: List[Dict[str, Any]] = []
+        last: Optional[Tuple[float, float]] = None
+        for start, end, text, calendar_id in heapq.merge(*streams):
+            if (start, end) == last:
+                merged[-1]["calendar_ids"].append(calendar_id)
+                continue
+            if limit is not None and len(merged) >= limit:
+                break
+            begins = datetime.fromisoformat(text.replace("Z", "+00:00"))
+            merged.append(
+                {
+                    "start_time": text,
+                    "end_time": (begins + timedelta(seconds=end - start)).isoformat(),
+                    "calendar_ids": [calendar_id],
+                }
+            )
+            last = (start, end)
+        return merged
+
+    async def resolve_calendar_group(self, location_id: str, group: str) -> List[Calendar]:
+        """Resolve a calendar group ID or name to the calendars in it"""
+        return await self.calendar_cache.resolve_group(location_id, group)
+
     # Form Methods - Delegate to FormsClient
 
     async def get_forms(
@@ -492,6 +1167,58 @@ class GoHighLevelClient:
             location_id, form_id, contact_id, start_date, end_date, limit, skip
         )
 
+    def iter_submissions_by_window(
+        self,
+        location_id: str,
+        start_date: date,
+        end_date: date,
+        form_id: Optional[str] = None,
+        window_days: int = 7,
+        max_window_size: int = 2000,
+        page_size: int = 100,
+        concurrency: int = 4,
+        after: Optional[datetime] = None,
+        after_id: Optional[str] = None,
+        on_page: Optional[Callable[[FormSubmissionList], Awaitable[None]]] = None,
+        on_window_total: Optional[Callable[[int], None]] = None,
+    ) -> AsyncGenerator[FormSubmission, None]:
+        """Iterate over every form submission in a date range, oldest first"""
+        return self._forms.iter_submissions_by_window(
+            location_id,
+            start_date,
+            end_date,
+            form_id=form_id,
+            window_days=window_days,
+            max_window_size=max_window_size,
+            page_size=page_size,
+            concurrency=concurrency,
+            after=after,
+            after_id=after_id,
+            on_page=on_page,
+            on_window_total=on_window_total,
+        )
+
+    async def analyze_submissions(
+        self,
+        location_id: str,
+        report: str = "fields",
+        source_id: Optional[str] = None,
+        field: Optional[str] = None,
+        by: Optional[str] = None,
+        period: str = "month",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        top: int = 20,
+    ) -> Dict[str, Any]:
+        """Answer distributions, cross-tabs and date histograms over form and survey submissions
+
+        Runs over the local submission store, without calling the API;
+        ``source_id`` is a form or survey ID.
+        """
+        store = await self._synced(self.submission_store, location_id, "Submission analytics")
+        return await store.analyze(location_id, report, source_id, field, by, period, start, end, top)
+
+    @invalidates(invalidation.FORMS)
     async def upload_form_file(
         self, file_upload: FormFileUploadRequest
     ) -> Dict[str, Any]:
@@ -510,16 +1237,19 @@ class GoHighLevelClient:
         """Get a specific business"""
         return await self._businesses.get_business(business_id, location_id)
 
+    @invalidates(invalidation.BUSINESSES)
     async def create_business(self, business: BusinessCreate) -> Business:
         """Create a new business"""
         return await self._businesses.create_business(business)
 
+    @invalidates(invalidation.BUSINESSES)
     async def update_business(
         self, business_id: str, updates: BusinessUpdate, location_id: str
     ) -> Business:
         """Update an existing business"""
         return await self._businesses.update_business(business_id, updates, location_id)
 
+    @invalidates(invalidation.BUSINESSES)
     async def delete_business(self, business_id: str, location_id: str) -> bool:
         """Delete a business"""
         return await self._businesses.delete_business(business_id, location_id)
@@ -536,14 +1266,26 @@ class GoHighLevelClient:
         """Get a specific user"""
         return await self._users.get_user(user_id)
 
+    async def resolve_user_id(self, location_id: str, user: Optional[str]) -> Optional[str]:
+        """Resolve a user ID, email or name to a user ID"""
+        return await self.user_cache.resolve(location_id, user)
+
+    async def enrich_user_names(self, location_id: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add display names next to assignedTo/assignedUserId in dumped records"""
+        await self.user_cache.enrich(location_id, rows)
+        return rows
+
+    @invalidates(invalidation.USERS)
     async def create_user(self, user: UserCreate) -> User:
         """Create a new user"""
         return await self._users.create_user(user)
 
+    @invalidates(invalidation.USERS)
     async def update_user(self, user_id: str, updates: UserUpdate) -> User:
         """Update an existing user"""
         return await self._users.update_user(user_id, updates)
 
+    @invalidates(invalidation.USERS)
     async def delete_user(self, user_id: str) -> bool:
         """Delete a user"""
         return await self._users.delete_user(user_id)
@@ -580,51 +1322,73 @@ class GoHighLevelClient:
         """Search locations with filters"""
         return await self._locations.search_locations(company_id, limit, skip, search_query)
 
+    @invalidates(invalidation.LOCATIONS)
     async def create_location(self, location: LocationCreate) -> Location:
         """Create a new location"""
         return await self._locations.create_location(location)
 
+    @invalidates(invalidation.LOCATIONS)
     async def update_location(self, location_id: str, updates: LocationUpdate) -> Location:
         """Update an existing location"""
         return await self._locations.update_location(location_id, updates)
 
+    @invalidates(invalidation.LOCATIONS)
     async def delete_location(self, location_id: str) -> bool:
         """Delete a location"""
         return await self._locations.delete_location(location_id)
 
     # Calendar Administration Methods - Delegate to CalendarAdminClient
 
+    @invalidates(invalidation.CALENDARS)
     async def create_calendar(self, calendar: CalendarCreate) -> Calendar:
         """Create a new calendar"""
         return await self._calendar_admin.create_calendar(calendar)
 
+    @invalidates(invalidation.CALENDARS)
     async def update_calendar(self, calendar_id: str, updates: CalendarUpdate) -> Calendar:
         """Update an existing calendar"""
-        return await self._calendar_admin.update_calendar(calendar_id, updates)
+        updated = await self._calendar_admin.update_calendar(calendar_id, updates)
+        self.calendar_cache.invalidate_calendar(calendar_id)
+        return updated
 
+    @invalidates(invalidation.CALENDARS)
     async def delete_calendar(self, calendar_id: str) -> bool:
         """Delete a calendar"""
-        return await self._calendar_admin.delete_calendar(calendar_id)
+        deleted = await self._calendar_admin.delete_calendar(calendar_id)
+        self.calendar_cache.invalidate_calendar(calendar_id)
+        return deleted
 
     async def get_calendar_groups(
         self, location_id: str, limit: int = 100, skip: int = 0
     ) -> CalendarGroupList:
-        """Get calendar groups for a location"""
-        return await self._calendar_admin.get_calendar_groups(location_id, limit, skip)
+        """Get calendar groups for a location, served from the calendar cache"""
+        groups = (await self.calendar_cache.get(location_id)).groups
+        page = groups[skip:skip + limit]
+        return CalendarGroupList(groups=page, count=len(page), total=len(groups))
 
     # Calendar Events Management Methods - Delegate to CalendarAdminClient
 
+    @invalidates(invalidation.APPOINTMENTS)
     async def delete_calendar_event(self, event_id: str, location_id: str) -> bool:
         """Delete a calendar event"""
-        return await self._calendar_admin.delete_calendar_event(event_id, location_id)
+        deleted = await self._calendar_admin.delete_calendar_event(event_id, location_id)
+        if self.schedule_index is not None:
+            self.schedule_index.remove(location_id, event_id)
+        return deleted
 
+    @invalidates(invalidation.APPOINTMENTS)
     async def create_block_slot(self, block_slot_data: dict, location_id: str) -> dict:
         """Create a calendar block slot"""
-        return await self._calendar_admin.create_block_slot(block_slot_data, location_id)
+        created = await self._calendar_admin.create_block_slot(block_slot_data, location_id)
+        self._schedule(location_id, {**block_slot_data, **created}, BLOCK)
+        return created
 
+    @invalidates(invalidation.APPOINTMENTS)
     async def update_block_slot(self, event_id: str, block_slot_data: dict, location_id: str) -> dict:
         """Update a calendar block slot"""
-        return await self._calendar_admin.update_block_slot(event_id, block_slot_data, location_id)
+        updated = await self._calendar_admin.update_block_slot(event_id, block_slot_data, location_id)
+        self._schedule(location_id, {**block_slot_data, **updated, "id": event_id}, BLOCK)
+        return updated
 
     # Product Methods - Delegate to ProductsClient
 
@@ -635,29 +1399,56 @@ class GoHighLevelClient:
         return await self._products.get_products(location_id, limit, skip)
 
     async def get_product(self, product_id: str, location_id: str) -> Product:
-        """Get a specific product"""
+        """Get a specific product, from the catalog cache when it is loaded"""
+        catalog = self.catalog_cache.peek(location_id)
+        if catalog is not None and product_id in catalog.products:
+            return catalog.products[product_id]
         return await self._products.get_product(product_id, location_id)
 
+    async def get_product_catalog(self, location_id: str, refresh: bool = False) -> CatalogIndex:
+        """Get the location's products with their prices, from the catalog cache"""
+        return await self.catalog_cache.get(location_id, refresh=refresh)
+
+    @invalidates(invalidation.PRODUCTS)
     async def create_product(self, product: ProductCreate) -> Product:
         """Create a new product"""
-        return await self._products.create_product(product)
+        created = await self._products.create_product(product)
+        catalog = self.catalog_cache.patch(product.locationId)
+        if catalog is not None:
+            catalog.put_product(created)
+        return created
 
+    @invalidates(invalidation.PRODUCTS)
     async def update_product(
         self, product_id: str, updates: ProductUpdate, location_id: str
     ) -> Product:
         """Update an existing product"""
-        return await self._products.update_product(product_id, updates, location_id)
+        updated = await self._products.update_product(product_id, updates, location_id)
+        catalog = self.catalog_cache.patch(location_id)
+        if catalog is not None:
+            catalog.put_product(updated)
+        return updated
 
+    @invalidates(invalidation.PRODUCTS)
     async def delete_product(self, product_id: str, location_id: str) -> bool:
         """Delete a product"""
-        return await self._products.delete_product(product_id, location_id)
+        deleted = await self._products.delete_product(product_id, location_id)
+        catalog = self.catalog_cache.patch(location_id)
+        if catalog is not None:
+            catalog.remove_product(product_id)
+        return deleted
 
     # Product Price Methods - Delegate to ProductsClient
 
     async def get_product_prices(
         self, product_id: str, location_id: str, limit: int = 100, skip: int = 0
     ) -> ProductPriceList:
-        """Get all prices for a product"""
+        """Get all prices for a product, from the catalog cache when it is loaded"""
+        catalog = self.catalog_cache.peek(location_id)
+        if catalog is not None and product_id in catalog.prices:
+            prices = catalog.prices[product_id]
+            page = prices[skip:skip + limit]
+            return ProductPriceList(prices=page, count=len(page), total=len(prices))
         return await self._products.get_product_prices(product_id, location_id, limit, skip)
 
     async def get_product_price(
@@ -666,23 +1457,38 @@ class GoHighLevelClient:
         """Get a specific product price"""
         return await self._products.get_product_price(product_id, price_id, location_id)
 
+    @invalidates(invalidation.PRODUCTS)
     async def create_product_price(
         self, product_id: str, price: ProductPriceCreate, location_id: str
     ) -> ProductPrice:
         """Create a new product price"""
-        return await self._products.create_product_price(product_id, price, location_id)
+        created = await self._products.create_product_price(product_id, price, location_id)
+        catalog = self.catalog_cache.patch(location_id)
+        if catalog is not None:
+            catalog.put_price(created)
+        return created
 
+    @invalidates(invalidation.PRODUCTS)
     async def update_product_price(
         self, product_id: str, price_id: str, updates: ProductPriceUpdate, location_id: str
     ) -> ProductPrice:
         """Update an existing product price"""
-        return await self._products.update_product_price(product_id, price_id, updates, location_id)
+        updated = await self._products.update_product_price(product_id, price_id, updates, location_id)
+        catalog = self.catalog_cache.patch(location_id)
+        if catalog is not None:
+            catalog.put_price(updated)
+        return updated
 
+    @invalidates(invalidation.PRODUCTS)
     async def delete_product_price(
         self, product_id: str, price_id: str, location_id: str
     ) -> bool:
         """Delete a product price"""
-        return await self._products.delete_product_price(product_id, price_id, location_id)
+        deleted = await self._products.delete_product_price(product_id, price_id, location_id)
+        catalog = self.catalog_cache.patch(location_id)
+        if catalog is not None:
+            catalog.remove_price(product_id, price_id)
+        return deleted
 
     # Payment Methods - Delegate to PaymentsClient
 
@@ -692,6 +1498,12 @@ class GoHighLevelClient:
         """Get all payment orders for a location"""
         return await self._payments.get_payment_orders(location_id, limit, skip)
 
+    def iter_order_pages(
+        self, location_id: str, page_size: int = 100, max_pages: Optional[int] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Iterate over raw payment order pages for a location"""
+        return self._payments.iter_order_pages(location_id, page_size, max_pages)
+
     async def get_payment_order(self, order_id: str, location_id: str) -> PaymentOrder:
         """Get a specific payment order"""
         return await self._payments.get_payment_order(order_id, location_id)
@@ -702,6 +1514,7 @@ class GoHighLevelClient:
         """Get all fulfillments for a payment order"""
         return await self._payments.get_order_fulfillments(order_id, location_id, limit, skip)
 
+    @invalidates(invalidation.PAYMENTS)
     async def create_order_fulfillment(
         self, order_id: str, fulfillment: PaymentOrderFulfillmentCreate, location_id: str
     ) -> PaymentOrderFulfillment:
@@ -714,15 +1527,45 @@ class GoHighLevelClient:
         """Get all payment subscriptions for a location"""
         return await self._payments.get_payment_subscriptions(location_id, limit, skip)
 
+    def iter_subscription_pages(
+        self, location_id: str, page_size: int = 100, max_pages: Optional[int] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Iterate over raw payment subscription pages for a location"""
+        return self._payments.iter_subscription_pages(location_id, page_size, max_pages)
+
     async def get_payment_subscription(self, subscription_id: str, location_id: str) -> PaymentSubscription:
         """Get a specific payment subscription"""
         return await self._payments.get_payment_subscription(subscription_id, location_id)
 
     async def get_payment_transactions(
-        self, location_id: str, limit: int = 100, skip: int = 0
+        self,
+        location_id: str,
+        limit: int = 100,
+        skip: int = 0,
+        start_at: Optional[datetime] = None,
     ) -> PaymentTransactionList:
         """Get all payment transactions for a location"""
-        return await self._payments.get_payment_transactions(location_id, limit, skip)
+        return await self._payments.get_payment_transactions(
+            location_id, limit, skip, start_at
+        )
+
+    def iter_transaction_pages(
+        self, location_id: str, page_size: int = 100, max_pages: Optional[int] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Iterate over raw payment transaction pages for a location"""
+        return self._payments.iter_transaction_pages(location_id, page_size, max_pages)
+
+    async def analyze_payments(
+        self,
+        location_id: str,
+        period: str = "month",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        currency: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Revenue, ARPU, MRR and churn per period from the local payment ledger, without calling the API"""
+        ledger = await self._synced(self.payment_ledger, location_id, "Payment analytics")
+        return await ledger.analyze(location_id, period, start, end, currency)
 
     async def get_payment_transaction(self, transaction_id: str, location_id: str) -> PaymentTransaction:
         """Get a specific payment transaction"""
@@ -732,6 +1575,7 @@ class GoHighLevelClient:
         """Get the whitelabel payment integration for a location"""
         return await self._payments.get_payment_integration(location_id)
 
+    @invalidates(invalidation.PAYMENTS)
     async def create_payment_integration(
         self, integration: PaymentIntegrationCreate, location_id: str
     ) -> PaymentIntegration:
@@ -750,14 +1594,17 @@ class GoHighLevelClient:
         """Get a specific location tag"""
         return await self._locations_extended.get_location_tag(location_id, tag_id)
 
+    @invalidates(invalidation.TAGS)
     async def create_location_tag(self, location_id: str, tag: LocationTagCreate) -> LocationTag:
         """Create a new location tag"""
         return await self._locations_extended.create_location_tag(location_id, tag)
 
+    @invalidates(invalidation.TAGS)
     async def update_location_tag(self, location_id: str, tag_id: str, tag: LocationTagUpdate) -> LocationTag:
         """Update a location tag"""
         return await self._locations_extended.update_location_tag(location_id, tag_id, tag)
 
+    @invalidates(invalidation.TAGS)
     async def delete_location_tag(self, location_id: str, tag_id: str) -> Dict[str, Any]:
         """Delete a location tag"""
         return await self._locations_extended.delete_location_tag(location_id, tag_id)
@@ -774,14 +1621,17 @@ class GoHighLevelClient:
         """Get a specific location custom value"""
         return await self._locations_extended.get_location_custom_value(location_id, custom_value_id)
 
+    @invalidates(invalidation.CUSTOM_VALUES)
     async def create_location_custom_value(self, location_id: str, custom_value: LocationCustomValueCreate) -> LocationCustomValue:
         """Create a new location custom value"""
         return await self._locations_extended.create_location_custom_value(location_id, custom_value)
 
+    @invalidates(invalidation.CUSTOM_VALUES)
     async def update_location_custom_value(self, location_id: str, custom_value_id: str, custom_value: LocationCustomValueUpdate) -> LocationCustomValue:
         """Update a location custom value"""
         return await self._locations_extended.update_location_custom_value(location_id, custom_value_id, custom_value)
 
+    @invalidates(invalidation.CUSTOM_VALUES)
     async def delete_location_custom_value(self, location_id: str, custom_value_id: str) -> Dict[str, Any]:
         """Delete a location custom value"""
         return await self._locations_extended.delete_location_custom_value(location_id, custom_value_id)
@@ -798,14 +1648,23 @@ class GoHighLevelClient:
         """Get a specific location custom field"""
         return await self._locations_extended.get_location_custom_field(location_id, custom_field_id)
 
+    async def resolve_custom_fields(
+        self, location_id: str, values: Dict[str, Any], model: str = "contact"
+    ) -> List[Dict[str, Any]]:
+        """Map custom field keys or names to IDs and check the values' types"""
+        return await self.custom_field_cache.resolve(location_id, values, model)
+
+    @invalidates(invalidation.CUSTOM_FIELDS)
     async def create_location_custom_field(self, location_id: str, custom_field: LocationCustomFieldCreate) -> LocationCustomField:
         """Create a new location custom field"""
         return await self._locations_extended.create_location_custom_field(location_id, custom_field)
 
+    @invalidates(invalidation.CUSTOM_FIELDS)
     async def update_location_custom_field(self, location_id: str, custom_field_id: str, custom_field: LocationCustomFieldUpdate) -> LocationCustomField:
         """Update a location custom field"""
         return await self._locations_extended.update_location_custom_field(location_id, custom_field_id, custom_field)
 
+    @invalidates(invalidation.CUSTOM_FIELDS)
     async def delete_location_custom_field(self, location_id: str, custom_field_id: str) -> Dict[str, Any]:
         """Delete a location custom field"""
         return await self._locations_extended.delete_location_custom_field(location_id, custom_field_id)
@@ -820,14 +1679,17 @@ class GoHighLevelClient:
         """Get a specific link"""
         return await self._links.get_link(link_id, location_id)
 
+    @invalidates(invalidation.LINKS)
     async def create_link(self, link: LinkCreate, location_id: str) -> Link:
         """Create a new link"""
         return await self._links.create_link(link, location_id)
 
+    @invalidates(invalidation.LINKS)
     async def update_link(self, link_id: str, link: LinkUpdate, location_id: str) -> Link:
         """Update a link"""
         return await self._links.update_link(link_id, link, location_id)
 
+    @invalidates(invalidation.LINKS)
     async def delete_link(self, link_id: str, location_id: str) -> Dict[str, Any]:
         """Delete a link"""
         return await self._links.delete_link(link_id, location_id)
@@ -858,6 +1720,7 @@ class GoHighLevelClient:
         """Generate an OAuth token for a specific location"""
         return await self._oauth_management.generate_location_token(request)
 
+    @invalidates(invalidation.LOCATIONS)
     async def update_saas_subscription(self, location_id: str, subscription: SaasSubscriptionUpdate) -> SaasSubscription:
         """Update the SaaS subscription details for a specific location"""
         return await self._oauth_management.update_saas_subscription(location_id, subscription)
@@ -875,3 +1738,33 @@ class GoHighLevelClient:
     ) -> LocationTaskList:
         """Search tasks for a location"""
         return await self._locations_extended.search_location_tasks(location_id, filters, limit, skip)
+
+    async def search_tasks_local(
+        self,
+        location_id: str,
+        assigned_to: Optional[str] = None,
+        contact_id: Optional[str] = None,
+        completed: Optional[bool] = False,
+        overdue: bool = False,
+        due_after: Optional[str] = None,
+        due_before: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+    ) -> Tuple[List[LocationTask], int]:
+        """Tasks by due date, assignee or contact from the local task index, without calling the API"""
+        index = await self._synced(self.task_index, location_id, "Local task search")
+        rows, total = await index.search(
+            location_id, assigned_to, contact_id, completed, overdue, due_after, due_before, limit, skip
+        )
+        return [LocationTask(**row) for row in rows], total
+
+    async def task_workload(self, location_id: str, due_within_days: float = 7.0) -> List[Dict[str, Any]]:
+        """Open, overdue and soon-due task counts per assignee from the local task index"""
+        index = await self._synced(self.task_index, location_id, "Task workload")
+        rows = await index.workload(location_id, due_within_days)
+        users = None
+        for row in rows:
+            if row["assigned_to"]:
+                users = users or await self.user_cache.get(location_id)
+                row["assigned_to_name"] = users.name_of(row["assigned_to"])
+        return rows
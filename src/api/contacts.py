@@ -1,6 +1,6 @@
 """Contact management client for GoHighLevel API v2"""
 
-from typing import List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from .base import BaseGoHighLevelClient
 from ..models.contact import Contact, ContactCreate, ContactUpdate, ContactList
@@ -28,14 +28,7 @@ class ContactsClient(BaseGoHighLevelClient):
         if skip > 0:
             params["skip"] = skip
 
-        if query:
-            params["query"] = query
-        if email:
-            params["email"] = email
-        if phone:
-            params["phone"] = phone
-        if tags:
-            params["tags"] = ",".join(tags)
+        params.update(self._search_params(query, email, phone, tags))
 
         response = await self._request(
             "GET", "/contacts", params=params, location_id=location_id
@@ -49,6 +42,78 @@ class ContactsClient(BaseGoHighLevelClient):
             traceId=data.get("traceId"),
         )
 
+    def iter_contact_pages(
+        self,
+        location_id: str,
+        query: Optional[str] = None,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield raw contact dicts page by page, without building models"""
+        params = {"locationId": location_id, **self._search_params(query, email, phone, tags)}
+        return self._iter_raw_pages(
+            "/contacts",
+            "contacts",
+            params=params,
+            location_id=location_id,
+            page_size=page_size,
+            max_pages=max_pages,
+        )
+
+    async def iter_contacts_updated_since(
+        self,
+        location_id: str,
+        since: str,
+        page_size: int = 100,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield raw contact pages updated at or after ``since``, oldest change first
+
+        Uses the search endpoint, which (unlike GET /contacts) can filter and
+        sort on ``dateUpdated``.
+        """
+        page = 1
+        while True:
+            body = {
+                "locationId": location_id,
+                "page": page,
+                "pageLimit": page_size,
+                "filters": [
+                    {"field": "dateUpdated", "operator": "range", "value": {"gte": since}}
+                ],
+                "sort": [{"field": "dateUpdated", "direction": "asc"}],
+            }
+            response = await self._request(
+                "POST", "/contacts/search", json=body, location_id=location_id
+            )
+            contacts = response.json().get("contacts", [])
+            if contacts:
+                yield contacts
+            if len(contacts) < page_size:
+                return
+            page += 1
+
+    @staticmethod
+    def _search_params(
+        query: Optional[str],
+        email: Optional[str],
+        phone: Optional[str],
+        tags: Optional[List[str]],
+    ) -> Dict[str, Any]:
+        """Convert contact search filters to query parameters"""
+        params: Dict[str, Any] = {}
+        if query:
+            params["query"] = query
+        if email:
+            params["email"] = email
+        if phone:
+            params["phone"] = phone
+        if tags:
+            params["tags"] = ",".join(tags)
+        return params
+
     async def get_contact(self, contact_id: str, location_id: str) -> Contact:
         """Get a specific contact"""
         response = await self._request(
@@ -1,6 +1,7 @@
 """Conversation and messaging client for GoHighLevel API v2"""
 
-from typing import Optional
+import asyncio
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional
 
 from .base import BaseGoHighLevelClient
 from ..models.conversation import (
@@ -47,6 +48,18 @@ class ConversationsClient(BaseGoHighLevelClient):
             total=data.get("total"),
         )
 
+    def iter_conversations_by_last_message(
+        self, location_id: str, page_size: int = 100
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield raw conversation pages, most recent last message first"""
+        return self._iter_raw_pages(
+            "/conversations/search",
+            "conversations",
+            params={"location_id": location_id, "sortBy": "last_message_date", "sort": "desc"},
+            location_id=location_id,
+            page_size=page_size,
+        )
+
     async def get_conversation(
         self, conversation_id: str, location_id: str
     ) -> Conversation:
@@ -72,13 +85,32 @@ class ConversationsClient(BaseGoHighLevelClient):
         return Conversation(**data.get("conversation", data))
 
     async def get_messages(
-        self, conversation_id: str, location_id: str, limit: int = 100, skip: int = 0
+        self,
+        conversation_id: str,
+        location_id: str,
+        limit: int = 100,
+        skip: int = 0,
+        last_message_id: Optional[str] = None,
     ) -> MessageList:
-        """Get messages for a conversation"""
-        params = {"limit": limit}
+        """Get messages for a conversation
+
+        Args:
+            conversation_id: The conversation ID
+            location_id: The location ID
+            limit: Number of messages per page (max 100)
+            skip: Number of messages to skip
+            last_message_id: Cursor returned by the previous page; fetches the
+                next (older) page of the thread
+
+        Returns:
+            MessageList with messages (newest first) and the paging cursor
+        """
+        params: Dict[str, Any] = {"limit": limit}
 
         if skip > 0:
             params["skip"] = skip
+        if last_message_id:
+            params["lastMessageId"] = last_message_id
 
         response = await self._request(
             "GET",
@@ -89,20 +121,82 @@ class ConversationsClient(BaseGoHighLevelClient):
         data = response.json()
         # Handle nested response structure
         if isinstance(data.get("messages"), dict):
-            # Messages are nested under messages.messages
-            messages_data = data["messages"].get("messages", [])
-            total = len(messages_data)  # or data["messages"].get("total")
+            # Messages are nested under messages.messages along with the cursor
+            page = data["messages"]
         else:
             # Direct array of messages
-            messages_data = data.get("messages", [])
-            total = data.get("total")
+            page = data
+        messages_data = page.get("messages", [])
 
         return MessageList(
             messages=[Message(**m) for m in messages_data if isinstance(m, dict)],
             count=len(messages_data),
-            total=total,
+            total=page.get("total"),
+            lastMessageId=page.get("lastMessageId"),
+            nextPage=bool(page.get("nextPage", False)),
         )
 
+    async def iter_messages(
+        self,
+        conversation_id: str,
+        location_id: str,
+        page_size: int = 100,
+        since_message_id: Optional[str] = None,
+        prefetch: bool = True,
+        on_page: Optional[Callable[[MessageList], Awaitable[None]]] = None,
+    ) -> AsyncGenerator[Message, None]:
+        """Iterate over every message in a conversation thread
+
+        Walks the thread page by page using the ``lastMessageId`` cursor. While
+        a page is being consumed the next one is already requested, so long
+        threads are read at roughly the latency of a single request per page.
+
+        Args:
+            conversation_id: The conversation ID
+            location_id: The location ID
+            page_size: Messages per request (max 100)
+            since_message_id: Stop once this message is reached, yielding only
+                messages newer than it (incremental reads)
+            prefetch: Request the next page while the current one is consumed
+            on_page: Awaited with each page as it arrives (progress reporting)
+
+        Yields:
+            Messages from newest to oldest
+        """
+
+        def fetch(cursor: Optional[str]) -> "asyncio.Future[MessageList]":
+            return asyncio.ensure_future(
+                self.get_messages(
+                    conversation_id,
+                    location_id,
+                    limit=page_size,
+                    last_message_id=cursor,
+                )
+            )
+
+        pending: Optional["asyncio.Future[MessageList]"] = fetch(None)
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+                if on_page is not None:
+                    await on_page(page)
+
+                has_more = page.nextPage and bool(page.lastMessageId)
+                if prefetch and has_more:
+                    pending = fetch(page.lastMessageId)
+
+                for message in page.messages:
+                    if since_message_id and message.id == since_message_id:
+                        return
+                    yield message
+
+                if not prefetch and has_more:
+                    pending = fetch(page.lastMessageId)
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
     async def send_message(
         self, conversation_id: str, message: MessageCreate, location_id: str
     ) -> Message:
@@ -1,14 +1,27 @@
 """Forms client for GoHighLevel API v2"""
 
-from typing import Optional, Dict, Any
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, AsyncGenerator, Awaitable, Callable, Deque, Dict, List, Optional
+import asyncio
 import base64
 
 from .base import BaseGoHighLevelClient
 from ..models.form import (
     FormList,
+    FormSubmission,
     FormSubmissionList,
     FormFileUploadRequest,
 )
+from ..utils.pagination import page_offsets
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Normalize a timestamp to an aware UTC datetime so mixed values sort together"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
 
 
 class FormsClient(BaseGoHighLevelClient):
@@ -43,6 +56,7 @@ class FormsClient(BaseGoHighLevelClient):
 
     # NOTE: GET /forms/{id}/submissions is not supported by the API
     # Returns 404 Not Found
+    # Both routes are listed in UNSUPPORTED_ROUTES and fail locally
 
     async def get_all_submissions(
         self,
@@ -85,11 +99,178 @@ class FormsClient(BaseGoHighLevelClient):
         )
 
         data = response.json()
+        # The API reports paging info under "meta" rather than at the top level
+        meta = data.get("meta") or {}
+        if data.get("total") is None:
+            data["total"] = meta.get("total")
+        if data.get("count") is None:
+            data["count"] = len(data.get("submissions", []))
         return FormSubmissionList(**data)
 
+    def iter_submission_pages(
+        self,
+        location_id: str,
+        start_date: Optional[date] = None,
+        page_size: int = 100,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield raw form submission dicts page by page, without building models
+
+        ``start_date`` limits the pages to submissions from that day on.
+        """
+        params: Dict[str, Any] = {"locationId": location_id}
+        if start_date is not None:
+            params["startDate"] = start_date.isoformat()
+        return self._iter_raw_pages(
+            "/forms/submissions", "submissions", params=params, location_id=location_id,
+            page_size=page_size,
+        )
+
+    async def iter_submissions_by_window(
+        self,
+        location_id: str,
+        start_date: date,
+        end_date: date,
+        form_id: Optional[str] = None,
+        window_days: int = 7,
+        max_window_size: int = 2000,
+        page_size: int = 100,
+        concurrency: int = 4,
+        after: Optional[datetime] = None,
+        after_id: Optional[str] = None,
+        on_page: Optional[Callable[[FormSubmissionList], Awaitable[None]]] = None,
+        on_window_total: Optional[Callable[[int], None]] = None,
+    ) -> AsyncGenerator[FormSubmission, None]:
+        """Iterate over every submission in a date range, oldest first
+
+        The range is split into windows of ``window_days`` which are paged
+        through concurrently. A window reporting more than ``max_window_size``
+        submissions is split in half again (down to a single day) so no single
+        window becomes a long sequential scan. Windows are emitted in order,
+        giving one time-ordered stream.
+
+        Args:
+            location_id: The location ID
+            start_date: First day of the range (inclusive)
+            end_date: Last day of the range (inclusive)
+            form_id: Filter by specific form
+            window_days: Initial window size in days
+            max_window_size: Split windows reporting more submissions than this
+            page_size: Submissions per request (max 100)
+            concurrency: Maximum number of requests in flight
+            after: Resume point; skip submissions at or before this timestamp
+            after_id: ID of the last submission consumed at ``after``; when
+                given, only submissions at ``after`` ordered up to this ID are
+                skipped, so others sharing the timestamp are not lost
+            on_page: Awaited with each page as it arrives (progress reporting)
+            on_window_total: Called with the reported size of each final window
+
+        Yields:
+            FormSubmission objects ordered by submittedAt, then ID
+        """
+        if after is not None:
+            after = _as_utc(after)
+            start_date = max(start_date, after.date())
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_page(
+            window_start: date, window_end: date, skip: int
+        ) -> FormSubmissionList:
+            async with semaphore:
+                page = await self.get_all_submissions(
+                    location_id,
+                    form_id=form_id,
+                    start_date=window_start.isoformat(),
+                    end_date=window_end.isoformat(),
+                    limit=page_size,
+                    skip=skip,
+                )
+            if on_page is not None:
+                await on_page(page)
+            return page
+
+        async def fetch_window(window_start: date, window_end: date) -> List[FormSubmission]:
+            # Windows are half-open [window_start, window_end). The request covers
+            # window_end too so the boundary day is included whether the API treats
+            # endDate as inclusive or exclusive; the filter below drops the overlap.
+            first = await fetch_page(window_start, window_end, 0)
+            span = (window_end - window_start).days
+
+            if first.total is not None and first.total > max_window_size and span > 1:
+                middle = window_start + timedelta(days=span // 2)
+                left, right = await asyncio.gather(
+                    fetch_window(window_start, middle),
+                    fetch_window(middle, window_end),
+                )
+                return left + right
+
+            if on_window_total is not None and first.total is not None:
+                on_window_total(first.total)
+
+            submissions = list(first.submissions)
+            if first.total is not None:
+                pages = await asyncio.gather(
+                    *(
+                        fetch_page(window_start, window_end, skip)
+                        for skip in page_offsets(first.total, page_size)
+                    )
+                )
+                for page in pages:
+                    submissions.extend(page.submissions)
+            else:
+                # No total reported; page sequentially until a short page
+                page, skip = first, 0
+                while len(page.submissions) == page_size:
+                    skip += page_size
+                    page = await fetch_page(window_start, window_end, skip)
+                    submissions.extend(page.submissions)
+
+            in_window = [
+                s
+                for s in submissions
+                if window_start <= _as_utc(s.submittedAt).date() < window_end
+            ]
+            in_window.sort(key=lambda s: (_as_utc(s.submittedAt), s.id))
+            return in_window
+
+        windows = []
+        range_end = end_date + timedelta(days=1)
+        window_start = start_date
+        while window_start < range_end:
+            window_end = min(window_start + timedelta(days=max(1, window_days)), range_end)
+            windows.append((window_start, window_end))
+            window_start = window_end
+
+        # Keep a bounded number of windows in flight ahead of the consumer
+        remaining = iter(windows)
+        tasks: Deque["asyncio.Task[List[FormSubmission]]"] = deque(
+            asyncio.create_task(fetch_window(*w))
+            for w in islice(remaining, max(1, concurrency))
+        )
+        try:
+            while tasks:
+                window_submissions = await tasks.popleft()
+                next_window = next(remaining, None)
+                if next_window is not None:
+                    tasks.append(asyncio.create_task(fetch_window(*next_window)))
+
+                for submission in window_submissions:
+                    if after is not None:
+                        submitted = _as_utc(submission.submittedAt)
+                        if after_id is None:
+                            if submitted <= after:
+                                continue
+                        elif (submitted, submission.id) <= (after, after_id):
+                            continue
+                    yield submission
+        finally:
+            for task in tasks:
+                task.cancel()
+
     # NOTE: Form submission endpoints have been removed
     # POST /forms/submit returns 401 Unauthorized and needs further investigation
     # The authenticated endpoint also doesn't work as expected
+    # It is listed in UNSUPPORTED_ROUTES and fails locally
 
     async def upload_form_file(
         self, file_upload: FormFileUploadRequest
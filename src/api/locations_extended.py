@@ -1,6 +1,6 @@
 """Extended locations API client for GoHighLevel MCP integration"""
 
-from typing import Optional, Dict, Any
+from typing import Any, AsyncGenerator, Dict, List, Optional
 from .base import BaseGoHighLevelClient
 from ..models.location import (
     LocationTag, LocationTagList, LocationTagCreate, LocationTagUpdate,
@@ -357,3 +357,29 @@ class LocationsExtendedClient(BaseGoHighLevelClient):
             count=len(tasks_data),
             total=data.get("total", len(tasks_data)),
         )
+
+    async def iter_task_pages(
+        self,
+        location_id: str,
+        completed: Optional[bool] = None,
+        page_size: int = 100,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield raw task pages of a location, optionally only open or completed ones
+
+        The search endpoint cannot filter on ``dateUpdated``, so callers
+        narrow syncs with ``completed`` instead.
+        """
+        skip = 0
+        while True:
+            body: Dict[str, Any] = {"limit": page_size, "skip": skip}
+            if completed is not None:
+                body["completed"] = completed
+            response = await self._request(
+                "POST", f"/locations/{location_id}/tasks/search", json=body, location_id=location_id
+            )
+            tasks = response.json().get("tasks") or []
+            if tasks:
+                yield tasks
+            if len(tasks) < page_size:
+                return
+            skip += page_size
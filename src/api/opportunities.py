@@ -1,6 +1,6 @@
 """Opportunity and pipeline management client for GoHighLevel API v2"""
 
-from typing import List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from .base import BaseGoHighLevelClient
 from ..models.opportunity import (
@@ -29,13 +29,7 @@ class OpportunitiesClient(BaseGoHighLevelClient):
         if skip > 0:
             params["skip"] = skip
 
-        if filters:
-            filter_data = filters.model_dump(exclude_none=True)
-            for key, value in filter_data.items():
-                if key in ["startDate", "endDate"] and value:
-                    params[key] = value.isoformat()
-                elif value is not None:
-                    params[key] = value
+        params.update(self._filter_params(filters))
 
         response = await self._request(
             "GET", "/opportunities/search", params=params, location_id=location_id
@@ -47,6 +41,37 @@ class OpportunitiesClient(BaseGoHighLevelClient):
             aggregations=data.get("aggregations"),
         )
 
+    def iter_opportunity_pages(
+        self,
+        location_id: str,
+        filters: Optional[OpportunitySearchFilters] = None,
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield raw opportunity dicts page by page, without building models"""
+        params = {"location_id": location_id, **self._filter_params(filters)}
+        return self._iter_raw_pages(
+            "/opportunities/search",
+            "opportunities",
+            params=params,
+            location_id=location_id,
+            page_size=page_size,
+            max_pages=max_pages,
+        )
+
+    @staticmethod
+    def _filter_params(filters: Optional[OpportunitySearchFilters]) -> Dict[str, Any]:
+        """Convert search filters to query parameters"""
+        params: Dict[str, Any] = {}
+        if filters:
+            filter_data = filters.model_dump(exclude_none=True)
+            for key, value in filter_data.items():
+                if key in ["startDate", "endDate"] and value:
+                    params[key] = value.isoformat()
+                elif value is not None:
+                    params[key] = value
+        return params
+
     async def get_opportunity(
         self, opportunity_id: str, location_id: str
     ) -> Opportunity:
@@ -1,6 +1,7 @@
 """Payments management client for GoHighLevel API v2"""
 
-from typing import Optional
+from datetime import datetime
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from .base import BaseGoHighLevelClient
 from ..models.payment import (
@@ -156,7 +157,11 @@ class PaymentsClient(BaseGoHighLevelClient):
         return PaymentSubscription(**response.json())
 
     async def get_payment_transactions(
-        self, location_id: str, limit: int = 100, skip: int = 0
+        self,
+        location_id: str,
+        limit: int = 100,
+        skip: int = 0,
+        start_at: Optional[datetime] = None,
     ) -> PaymentTransactionList:
         """Get all payment transactions for a location
 
@@ -164,13 +169,16 @@ class PaymentsClient(BaseGoHighLevelClient):
             location_id: The location ID
             limit: Number of results to return (max 100)
             skip: Number of results to skip
+            start_at: Only return transactions created at or after this time
 
         Returns:
             PaymentTransactionList containing transactions and metadata
         """
-        params = {"limit": limit}
+        params: Dict[str, Any] = {"limit": limit}
         if skip > 0:
             params["skip"] = skip
+        if start_at is not None:
+            params["startAt"] = start_at.isoformat()
 
         response = await self._request(
             "GET", "/payments/transactions/", params=params, location_id=location_id
@@ -199,6 +207,41 @@ class PaymentsClient(BaseGoHighLevelClient):
         )
         return PaymentTransaction(**response.json())
 
+    def iter_order_pages(
+        self, location_id: str, page_size: int = 100, max_pages: Optional[int] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield raw payment order dicts page by page, without building models"""
+        return self._iter_raw_pages(
+            "/payments/orders/", "orders", location_id=location_id,
+            page_size=page_size, max_pages=max_pages,
+        )
+
+    def iter_subscription_pages(
+        self, location_id: str, page_size: int = 100, max_pages: Optional[int] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield raw payment subscription dicts page by page, without building models"""
+        return self._iter_raw_pages(
+            "/payments/subscriptions/", "subscriptions", location_id=location_id,
+            page_size=page_size, max_pages=max_pages,
+        )
+
+    def iter_transaction_pages(
+        self,
+        location_id: str,
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+        start_at: Optional[datetime] = None,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield raw payment transaction dicts page by page, without building models
+
+        ``start_at`` limits the pages to transactions created at or after it.
+        """
+        params = {"startAt": start_at.isoformat()} if start_at is not None else None
+        return self._iter_raw_pages(
+            "/payments/transactions/", "transactions", params=params, location_id=location_id,
+            page_size=page_size, max_pages=max_pages,
+        )
+
     async def get_payment_integration(self, location_id: str) -> PaymentIntegration:
         """Get the whitelabel payment integration for a location
 
@@ -1,6 +1,7 @@
 """Surveys management client for GoHighLevel API v2"""
 
-from typing import Optional
+from datetime import date
+from typing import Any, AsyncGenerator, Dict, List, Optional
 from .base import BaseGoHighLevelClient
 from ..models.survey import Survey, SurveySubmission, SurveyList, SurveySubmissionList
 
@@ -88,3 +89,21 @@ class SurveysClient(BaseGoHighLevelClient):
             count=len(submissions_data),
             total=data.get("total", len(submissions_data)),
         )
+
+    def iter_submission_pages(
+        self,
+        location_id: str,
+        start_date: Optional[date] = None,
+        page_size: int = 100,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield raw survey submission dicts page by page, without building models
+
+        ``start_date`` limits the pages to submissions from that day on.
+        """
+        params: Dict[str, Any] = {}
+        if start_date is not None:
+            params["startAt"] = start_date.isoformat()
+        return self._iter_raw_pages(
+            "/surveys/submissions", "submissions", params=params, location_id=location_id,
+            page_size=page_size,
+        )
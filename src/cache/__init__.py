@@ -0,0 +1,39 @@
+"""Caches for GoHighLevel location metadata and rendered resources"""
+
+from . import invalidation
+from .base import MetadataCache
+from .calendars import CalendarCache, CalendarIndex
+from .catalog import CatalogCache, CatalogIndex
+from .custom_fields import CustomFieldCache, CustomFieldIndex
+from .hot_keys import HotKeyTracker, prewarm
+from .invalidation import InvalidationBus, invalidates
+from .pipelines import PipelineCache, PipelineIndex
+from .resources import ResourceCache
+from .settings import CacheSettings
+from .slots import FreeSlotCache
+from .store import CacheStore, SQLiteCacheStore
+from .users import UserDirectoryCache, UserIndex
+
+__all__ = [
+    "CacheSettings",
+    "CacheStore",
+    "CalendarCache",
+    "CalendarIndex",
+    "CatalogCache",
+    "CatalogIndex",
+    "CustomFieldCache",
+    "CustomFieldIndex",
+    "FreeSlotCache",
+    "HotKeyTracker",
+    "InvalidationBus",
+    "MetadataCache",
+    "PipelineCache",
+    "PipelineIndex",
+    "ResourceCache",
+    "SQLiteCacheStore",
+    "UserDirectoryCache",
+    "UserIndex",
+    "invalidates",
+    "invalidation",
+    "prewarm",
+]
@@ -0,0 +1,155 @@
+"""Per-location, TTL-bound caches for slowly changing GoHighLevel metadata"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Generic, Optional, Tuple, TypeVar
+
+from .hot_keys import HotKeyTracker
+from .store import CacheStore
+
+T = TypeVar("T")
+
+
+def looks_like_id(ref: str) -> bool:
+    """GoHighLevel IDs are opaque alphanumeric strings with no spaces or @"""
+    return len(ref) >= 16 and ref.isalnum()
+
+
+class MetadataCache(ABC, Generic[T]):
+    """Caches one snapshot per location and rebuilds it when it expires
+
+    Subclasses implement ``_load`` to fetch a location's data and build the
+    snapshot (typically a set of lookup indexes). Concurrent misses for the
+    same location share a single load, and a load that was in flight when the
+    location was invalidated is not stored.
+
+    With a ``store``, snapshots are also written to disk under the class's
+    ``namespace`` (subclasses implement ``_dump`` and ``_restore``), so a
+    restarted process serves them until the TTL runs out instead of
+    reloading from the API.
+    """
+
+    namespace: str = ""
+
+    def __init__(self, ttl: float = 300.0, store: Optional[CacheStore] = None):
+        self.ttl = ttl
+        self.store = store if self.namespace else None
+        self.hot_keys: Optional[HotKeyTracker] = None
+        self._entries: Dict[str, Tuple[float, T]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+
+    @abstractmethod
+    async def _load(self, location_id: str) -> T:
+        """Fetch a location's data and build its snapshot"""
+
+    @abstractmethod
+    def _dump(self, snapshot: T) -> Any:
+        """Convert a snapshot to JSON-serializable data for the store"""
+
+    @abstractmethod
+    def _restore(self, data: Any) -> T:
+        """Rebuild a snapshot from data written by ``_dump``"""
+
+    async def _read_store(self, location_id: str) -> Optional[Tuple[float, T]]:
+        """A persisted snapshot younger than the TTL, with its monotonic timestamp"""
+        if self.store is None:
+            return None
+        try:
+            stored = await asyncio.to_thread(self.store.get, self.namespace, location_id)
+            if stored is None:
+                return None
+            age = time.time() - stored[0]
+            if not 0 <= age < self.ttl:
+                return None
+            return time.monotonic() - age, self._restore(stored[1])
+        except Exception:
+            # The store is an optimization; fall back to loading from the API
+            return None
+
+    async def _write_store(self, location_id: str, snapshot: T) -> None:
+        if self.store is None:
+            return
+        try:
+            await asyncio.to_thread(self.store.set, self.namespace, location_id, self._dump(snapshot))
+        except Exception:
+            pass
+
+    def _delete_store(self, location_id: Optional[str] = None) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.delete(self.namespace, location_id)
+        except Exception:
+            pass
+
+    def _generation(self, location_id: str) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(location_id, 0)
+
+    def peek(self, location_id: str) -> Optional[T]:
+        """Return the cached snapshot if it is still fresh, without loading"""
+        entry = self._entries.get(location_id)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+
+    async def get(self, location_id: str, refresh: bool = False) -> T:
+        """Return the location's snapshot, loading it on a miss or when expired"""
+        if self.hot_keys is not None and self.namespace:
+            self.hot_keys.record(self.namespace, location_id)
+        return await self._get(location_id, refresh)
+
+    async def warm(self, location_id: str) -> T:
+        """Load a location's snapshot ahead of use, without counting it as an access"""
+        return await self._get(location_id, refresh=False)
+
+    async def _get(self, location_id: str, refresh: bool) -> T:
+        requested_at = time.monotonic()
+        if not refresh:
+            cached = self.peek(location_id)
+            if cached is not None:
+                return cached
+
+        lock = self._locks.setdefault(location_id, asyncio.Lock())
+        async with lock:
+            # Reuse a load another caller finished while we waited for the lock
+            entry = self._entries.get(location_id)
+            if entry is not None and entry[0] >= requested_at:
+                return entry[1]
+            if not refresh:
+                cached = self.peek(location_id)
+                if cached is not None:
+                    return cached
+
+            generation = self._generation(location_id)
+            if not refresh:
+                restored = await self._read_store(location_id)
+                if restored is not None and self._generation(location_id) == generation:
+                    self._entries[location_id] = restored
+                    return restored[1]
+
+            snapshot = await self._load(location_id)
+            if self._generation(location_id) == generation:
+                self._entries[location_id] = (time.monotonic(), snapshot)
+                await self._write_store(location_id, snapshot)
+                if self._generation(location_id) != generation:
+                    # Invalidated while the snapshot was being written
+                    self._delete_store(location_id)
+            return snapshot
+
+    def _discard_in_flight(self, location_id: str) -> None:
+        """Make any load already in flight for the location skip storing its result"""
+        self._generations[location_id] = self._generations.get(location_id, 0) + 1
+        self._delete_store(location_id)
+
+    def invalidate(self, location_id: Optional[str] = None) -> None:
+        """Drop one location's snapshot, or every location's when none is given"""
+        if location_id is None:
+            self._entries.clear()
+            self._epoch += 1
+            self._delete_store()
+            return
+        self._entries.pop(location_id, None)
+        self._discard_in_flight(location_id)
@@ -0,0 +1,143 @@
+"""Calendar and calendar-group metadata cache"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from ..api.calendar_admin import CalendarAdminClient
+from ..api.calendars import CalendarsClient
+from ..models.calendar import Calendar, CalendarGroup
+from ..utils.exceptions import UnknownReferenceError
+from .base import MetadataCache, looks_like_id
+from .store import CacheStore
+
+
+def _name_key(name: str) -> str:
+    return name.strip().casefold()
+
+
+class CalendarIndex:
+    """Lookup indexes over a location's calendars and calendar groups"""
+
+    def __init__(self, calendars: List[Calendar], groups: List[CalendarGroup]):
+        self.calendars = calendars
+        self.groups = groups
+        self.by_id: Dict[str, Calendar] = {c.id: c for c in calendars}
+        self.by_name: Dict[str, Calendar] = {}
+        self.by_slug: Dict[str, Calendar] = {}
+        self.groups_by_id: Dict[str, CalendarGroup] = {g.id: g for g in groups}
+        self.groups_by_name: Dict[str, CalendarGroup] = {}
+        self.group_calendars: Dict[str, List[Calendar]] = {}
+
+        for calendar in calendars:
+            self.by_name.setdefault(_name_key(calendar.name), calendar)
+            for slug in (calendar.widgetSlug, calendar.slug):
+                if slug:
+                    self.by_slug.setdefault(_name_key(slug), calendar)
+            if calendar.groupId:
+                self.group_calendars.setdefault(calendar.groupId, []).append(calendar)
+        for group in groups:
+            self.groups_by_name.setdefault(_name_key(group.name), group)
+
+    def find(self, ref: str) -> Optional[Calendar]:
+        """Find a calendar by ID, name or widget slug"""
+        key = _name_key(ref)
+        return self.by_id.get(ref) or self.by_name.get(key) or self.by_slug.get(key)
+
+    def find_group(self, ref: str) -> Optional[CalendarGroup]:
+        """Find a calendar group by ID or name"""
+        return self.groups_by_id.get(ref) or self.groups_by_name.get(_name_key(ref))
+
+
+class CalendarCache(MetadataCache[CalendarIndex]):
+    """Per-location cache of calendars and calendar groups"""
+
+    namespace = "calendars"
+
+    def __init__(
+        self,
+        calendars_client: CalendarsClient,
+        admin_client: CalendarAdminClient,
+        ttl: float = 300.0,
+        page_size: int = 100,
+        store: Optional[CacheStore] = None,
+    ):
+        super().__init__(ttl, store)
+        self._calendars_client = calendars_client
+        self._admin_client = admin_client
+        self.page_size = page_size
+
+    async def _load_groups(self, location_id: str) -> List[CalendarGroup]:
+        groups: List[CalendarGroup] = []
+        skip = 0
+        while True:
+            page = await self._admin_client.get_calendar_groups(
+                location_id, limit=self.page_size, skip=skip
+            )
+            groups.extend(page.groups)
+            skip += self.page_size
+            if len(page.groups) < self.page_size or (
+                page.total is not None and len(groups) >= page.total
+            ):
+                return groups
+
+    async def _load(self, location_id: str) -> CalendarIndex:
+        calendar_list, groups = await asyncio.gather(
+            self._calendars_client.get_calendars(location_id),
+            self._load_groups(location_id),
+        )
+        return CalendarIndex(calendar_list.calendars, groups)
+
+    def _dump(self, snapshot: CalendarIndex) -> Any:
+        return {
+            "calendars": [c.model_dump(mode="json", by_alias=True) for c in snapshot.calendars],
+            "groups": [g.model_dump(mode="json", by_alias=True) for g in snapshot.groups],
+        }
+
+    def _restore(self, data: Any) -> CalendarIndex:
+        return CalendarIndex(
+            [Calendar.model_validate(c) for c in data["calendars"]],
+            [CalendarGroup.model_validate(g) for g in data["groups"]],
+        )
+
+    async def resolve(self, location_id: str, ref: str) -> Calendar:
+        """Resolve a calendar ID, name or widget slug to the cached calendar
+
+        An unknown reference triggers one reload before failing. Unknown
+        values that look like IDs are fetched directly instead, since the
+        calendar list may not include every calendar that can be read.
+        """
+        calendar = (await self.get(location_id)).find(ref)
+        if calendar is None and looks_like_id(ref):
+            return await self._calendars_client.get_calendar(ref, location_id)
+        if calendar is None:
+            index = await self.get(location_id, refresh=True)
+            calendar = index.find(ref)
+            if calendar is None:
+                names = ", ".join(c.name for c in index.calendars) or "none"
+                raise UnknownReferenceError(
+                    f"Unknown calendar '{ref}'. Available calendars: {names}"
+                )
+        return calendar
+
+    async def resolve_group(self, location_id: str, ref: str) -> List[Calendar]:
+        """Resolve a calendar group ID or name to the calendars in it
+
+        An unknown reference triggers one reload before failing.
+        """
+        index = await self.get(location_id)
+        group = index.find_group(ref)
+        if group is None:
+            index = await self.get(location_id, refresh=True)
+            group = index.find_group(ref)
+            if group is None:
+                names = ", ".join(g.name for g in index.groups) or "none"
+                raise UnknownReferenceError(
+                    f"Unknown calendar group '{ref}'. Available groups: {names}"
+                )
+        return index.group_calendars.get(group.id, [])
+
+    def invalidate_calendar(self, calendar_id: str) -> None:
+        """Drop every cached location that contains the given calendar"""
+        for location_id, (_, index) in list(self._entries.items()):
+            if calendar_id in index.by_id:
+                self.invalidate(location_id)
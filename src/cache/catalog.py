@@ -0,0 +1,179 @@
+"""Product catalog cache with nested prices"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from ..api.products import ProductsClient
+from ..models.product import Product, ProductPrice
+from .base import MetadataCache
+from .store import CacheStore
+
+
+def _name_key(name: str) -> str:
+    return name.strip().casefold()
+
+
+class CatalogIndex:
+    """A location's products with their prices, indexed by ID, name and SKU
+
+    The snapshot is patched in place when products or prices are written
+    through the client, so it stays usable without a reload.
+    """
+
+    def __init__(self, products: List[Product], prices: Dict[str, List[ProductPrice]]):
+        self.products: Dict[str, Product] = {p.id: p for p in products if p.id}
+        self.prices: Dict[str, List[ProductPrice]] = {
+            product_id: list(prices.get(product_id, [])) for product_id in self.products
+        }
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self.by_name: Dict[str, Product] = {}
+        self.by_sku: Dict[str, ProductPrice] = {}
+        self.price_by_id: Dict[str, ProductPrice] = {}
+        for product in self.products.values():
+            self.by_name.setdefault(_name_key(product.name), product)
+        for product_prices in self.prices.values():
+            for price in product_prices:
+                if price.id:
+                    self.price_by_id[price.id] = price
+                if price.sku:
+                    self.by_sku.setdefault(_name_key(price.sku), price)
+
+    def find(self, ref: str) -> Optional[Product]:
+        """Find a product by ID, name or the SKU of one of its prices"""
+        product = self.products.get(ref) or self.by_name.get(_name_key(ref))
+        if product is None:
+            price = self.by_sku.get(_name_key(ref))
+            if price is not None:
+                product = self.products.get(price.product)
+        return product
+
+    def search(self, query: str) -> List[Product]:
+        """Products whose name or price SKUs contain the query"""
+        key = _name_key(query)
+        matches = [p for p in self.products.values() if key in _name_key(p.name)]
+        for sku, price in self.by_sku.items():
+            product = self.products.get(price.product)
+            if key in sku and product is not None and product not in matches:
+                matches.append(product)
+        return matches
+
+    def entry(self, product: Product) -> Dict[str, Any]:
+        """A product dump with its prices nested under ``prices``"""
+        data = product.model_dump()
+        data["prices"] = [price.model_dump() for price in self.prices.get(product.id or "", [])]
+        return data
+
+    def put_product(self, product: Product) -> None:
+        if not product.id:
+            return
+        self.products[product.id] = product
+        self.prices.setdefault(product.id, [])
+        self._reindex()
+
+    def remove_product(self, product_id: str) -> None:
+        self.products.pop(product_id, None)
+        self.prices.pop(product_id, None)
+        self._reindex()
+
+    def put_price(self, price: ProductPrice) -> None:
+        product_prices = self.prices.setdefault(price.product, [])
+        product_prices[:] = [p for p in product_prices if p.id != price.id] + [price]
+        self._reindex()
+
+    def remove_price(self, product_id: str, price_id: str) -> None:
+        product_prices = self.prices.get(product_id)
+        if product_prices is not None:
+            product_prices[:] = [p for p in product_prices if p.id != price_id]
+        self._reindex()
+
+
+class CatalogCache(MetadataCache[CatalogIndex]):
+    """Per-location product catalog snapshot
+
+    A load pages through the products and then fetches every product's
+    prices concurrently, bounded by ``concurrency``.
+    """
+
+    namespace = "catalog"
+
+    def __init__(
+        self,
+        client: ProductsClient,
+        ttl: float = 600.0,
+        page_size: int = 100,
+        concurrency: int = 8,
+        store: Optional[CacheStore] = None,
+    ):
+        super().__init__(ttl, store)
+        self._client = client
+        self.page_size = page_size
+        self.concurrency = concurrency
+
+    async def _load_products(self, location_id: str) -> List[Product]:
+        products: List[Product] = []
+        skip = 0
+        while True:
+            page = await self._client.get_products(location_id, limit=self.page_size, skip=skip)
+            products.extend(page.products)
+            skip += self.page_size
+            if len(page.products) < self.page_size or (
+                page.total is not None and len(products) >= page.total
+            ):
+                return products
+
+    async def _load_prices(
+        self, product_id: str, location_id: str, semaphore: asyncio.Semaphore
+    ) -> List[ProductPrice]:
+        prices: List[ProductPrice] = []
+        skip = 0
+        async with semaphore:
+            while True:
+                page = await self._client.get_product_prices(
+                    product_id, location_id, limit=self.page_size, skip=skip
+                )
+                prices.extend(page.prices)
+                skip += self.page_size
+                if len(page.prices) < self.page_size or (
+                    page.total is not None and len(prices) >= page.total
+                ):
+                    return prices
+
+    async def _load(self, location_id: str) -> CatalogIndex:
+        products = [p for p in await self._load_products(location_id) if p.id]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        price_lists = await asyncio.gather(
+            *(self._load_prices(p.id, location_id, semaphore) for p in products if p.id)
+        )
+        return CatalogIndex(
+            products, {p.id: prices for p, prices in zip(products, price_lists) if p.id}
+        )
+
+    def _dump(self, snapshot: CatalogIndex) -> Any:
+        return {
+            "products": [p.model_dump(mode="json", by_alias=True) for p in snapshot.products.values()],
+            "prices": {
+                product_id: [price.model_dump(mode="json", by_alias=True) for price in prices]
+                for product_id, prices in snapshot.prices.items()
+            },
+        }
+
+    def _restore(self, data: Any) -> CatalogIndex:
+        return CatalogIndex(
+            [Product.model_validate(p) for p in data["products"]],
+            {
+                product_id: [ProductPrice.model_validate(price) for price in prices]
+                for product_id, prices in data["prices"].items()
+            },
+        )
+
+    def patch(self, location_id: str) -> Optional[CatalogIndex]:
+        """The cached snapshot to patch after a write, if there is one
+
+        Any load already in flight is discarded, since it may predate the
+        write, and so is the persisted copy.
+        """
+        self._discard_in_flight(location_id)
+        entry = self._entries.get(location_id)
+        return entry[1] if entry else None
@@ -0,0 +1,219 @@
+"""Custom-field schema cache with key resolution and local type checks"""
+
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..api.locations_extended import LocationsExtendedClient
+from ..models.location import LocationCustomField
+from ..utils.exceptions import UnknownReferenceError, ValidationError
+from .base import MetadataCache
+from .store import CacheStore
+
+NUMBER_TYPES = {"NUMERICAL", "MONETORY", "MONETARY", "NUMBER"}
+SINGLE_OPTION_TYPES = {"SINGLE_OPTIONS", "RADIO", "SELECT", "DROPDOWN"}
+MULTI_OPTION_TYPES = {"MULTIPLE_OPTIONS", "CHECKBOX"}
+TEXT_TYPES = {"TEXT", "LARGE_TEXT", "PHONE", "EMAIL", "TEXTBOX"}
+DATE_TYPES = {"DATE"}
+
+
+def _name_key(name: str) -> str:
+    return name.strip().casefold()
+
+
+def _field_model(field: LocationCustomField) -> Optional[str]:
+    if field.model:
+        return field.model.lower()
+    if field.fieldKey and "." in field.fieldKey:
+        return field.fieldKey.split(".", 1)[0].lower()
+    return None
+
+
+def _allowed_options(field: LocationCustomField) -> Dict[str, str]:
+    """Map each accepted option spelling to the value the API expects"""
+    allowed: Dict[str, str] = {}
+    for option in field.picklistOptions or []:
+        allowed[_name_key(option)] = option
+    for opt in field.options or []:
+        allowed[_name_key(opt.value)] = opt.value
+        allowed.setdefault(_name_key(opt.name), opt.value)
+    return allowed
+
+
+def coerce_value(field: LocationCustomField, value: Any) -> Any:
+    """Check a value against the field's data type, returning the value to send
+
+    Raises ValueError with a short reason when the value cannot be used.
+    """
+    data_type = (field.dataType or "").upper()
+    if value is None:
+        return None
+
+    if data_type in NUMBER_TYPES:
+        if isinstance(value, bool):
+            raise ValueError("expected a number")
+        if isinstance(value, (int, float)):
+            return value
+        try:
+            number = float(str(value).replace(",", ""))
+        except ValueError:
+            raise ValueError("expected a number") from None
+        return int(number) if number.is_integer() else number
+
+    if data_type in DATE_TYPES:
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        try:
+            datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            raise ValueError("expected an ISO date (YYYY-MM-DD)") from None
+        return str(value)
+
+    allowed = _allowed_options(field)
+    if data_type in SINGLE_OPTION_TYPES:
+        if isinstance(value, (list, dict)):
+            raise ValueError("expected a single option")
+        if allowed:
+            match = allowed.get(_name_key(str(value)))
+            if match is None:
+                raise ValueError(f"expected one of: {', '.join(sorted(set(allowed.values())))}")
+            return match
+        return value
+
+    if data_type in MULTI_OPTION_TYPES:
+        values = value if isinstance(value, list) else [value]
+        if allowed:
+            matched = []
+            for item in values:
+                match = allowed.get(_name_key(str(item)))
+                if match is None:
+                    raise ValueError(
+                        f"'{item}' is not one of: {', '.join(sorted(set(allowed.values())))}"
+                    )
+                matched.append(match)
+            return matched
+        return values
+
+    if data_type in TEXT_TYPES:
+        if isinstance(value, (list, dict)):
+            raise ValueError("expected text")
+        return str(value) if not isinstance(value, str) else value
+
+    return value
+
+
+class CustomFieldIndex:
+    """Lookup indexes over a location's custom fields
+
+    A field can be referenced by ID, by its full key (``contact.lead_score``),
+    by the key without the object prefix (``lead_score``) or by its display
+    name, all case-insensitively.
+    """
+
+    def __init__(self, fields: List[LocationCustomField]):
+        self.fields = fields
+        self.by_id: Dict[str, LocationCustomField] = {}
+        self._by_ref: Dict[Tuple[Optional[str], str], LocationCustomField] = {}
+        self._any_ref: Dict[str, LocationCustomField] = {}
+
+        for field in fields:
+            self.by_id[field.id] = field
+            model = _field_model(field)
+            refs = [field.name]
+            if field.fieldKey:
+                refs.append(field.fieldKey)
+                refs.append(field.fieldKey.split(".", 1)[-1])
+            for ref in refs:
+                self._by_ref.setdefault((model, _name_key(ref)), field)
+                self._any_ref.setdefault(_name_key(ref), field)
+
+    def find(self, ref: str, model: Optional[str] = None) -> Optional[LocationCustomField]:
+        """Find a field by ID, key or name
+
+        With ``model`` set, only fields of that object (or of no known object)
+        match.
+        """
+        key = _name_key(ref)
+        if model is None:
+            return self.by_id.get(ref) or self._any_ref.get(key)
+        field = self.by_id.get(ref)
+        if field is not None and _field_model(field) in (model, None):
+            return field
+        return self._by_ref.get((model, key)) or self._by_ref.get((None, key))
+
+
+class CustomFieldCache(MetadataCache[CustomFieldIndex]):
+    """Per-location cache of the custom-field schema"""
+
+    namespace = "custom_fields"
+
+    def __init__(
+        self,
+        client: LocationsExtendedClient,
+        ttl: float = 600.0,
+        page_size: int = 100,
+        store: Optional[CacheStore] = None,
+    ):
+        super().__init__(ttl, store)
+        self._client = client
+        self.page_size = page_size
+
+    async def _load(self, location_id: str) -> CustomFieldIndex:
+        fields: List[LocationCustomField] = []
+        skip = 0
+        while True:
+            page = await self._client.get_location_custom_fields(
+                location_id, limit=self.page_size, skip=skip
+            )
+            fields.extend(page.customFields)
+            skip += self.page_size
+            # A missing total comes back as 0, so it only ends paging when positive
+            if len(page.customFields) < self.page_size or 0 < page.total <= len(fields):
+                break
+        return CustomFieldIndex(fields)
+
+    def _dump(self, snapshot: CustomFieldIndex) -> Any:
+        return [f.model_dump(mode="json", by_alias=True) for f in snapshot.fields]
+
+    def _restore(self, data: Any) -> CustomFieldIndex:
+        return CustomFieldIndex([LocationCustomField.model_validate(f) for f in data])
+
+    async def resolve(
+        self, location_id: str, values: Dict[str, Any], model: str = "contact"
+    ) -> List[Dict[str, Any]]:
+        """Map ``{key_or_name: value}`` to the ``[{"id", "value"}]`` list the API expects
+
+        Every value is checked against its field's type before anything is
+        sent. Unknown fields trigger one reload of the schema before failing.
+        """
+        if not values:
+            return []
+        index = await self.get(location_id)
+        if any(index.find(ref, model) is None for ref in values):
+            index = await self.get(location_id, refresh=True)
+
+        resolved: List[Dict[str, Any]] = []
+        unknown: List[str] = []
+        errors: List[str] = []
+        for ref, value in values.items():
+            field = index.find(ref, model)
+            if field is None:
+                unknown.append(ref)
+                continue
+            try:
+                resolved.append({"id": field.id, "value": coerce_value(field, value)})
+            except ValueError as e:
+                errors.append(f"{ref} ({field.dataType}): {e}")
+
+        if unknown:
+            known = sorted(
+                field.fieldKey or field.name
+                for field in index.fields
+                if _field_model(field) in (model, None)
+            )
+            raise UnknownReferenceError(
+                f"Unknown custom field(s): {', '.join(unknown)}. "
+                f"Known {model} fields: {', '.join(known) or 'none'}"
+            )
+        if errors:
+            raise ValidationError("Invalid custom field values: " + "; ".join(errors))
+        return resolved
@@ -0,0 +1,98 @@
+"""Records which cache keys are hot and replays them on the next start"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+# (kind, key): the kind names the cache, the key is JSON-serializable
+HotKey = Tuple[str, Any]
+Warmer = Callable[[Any], Awaitable[Any]]
+
+
+class HotKeyTracker:
+    """Counts cache key accesses and keeps them across sessions
+
+    Counts from earlier sessions are halved each time they are loaded, so
+    keys that stop being used fade out of the replay list.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, decay: float = 0.5, max_keys: int = 500):
+        self.path = Path(path) if path is not None else None
+        self.decay = decay
+        self.max_keys = max_keys
+        self._counts: Dict[str, float] = {}
+
+    @staticmethod
+    def _encode(kind: str, key: Any) -> str:
+        return json.dumps([kind, key], sort_keys=True, separators=(",", ":"))
+
+    def record(self, kind: str, key: Any) -> None:
+        """Count one access to a cache key"""
+        encoded = self._encode(kind, key)
+        self._counts[encoded] = self._counts.get(encoded, 0.0) + 1.0
+
+    def top(self, limit: int) -> List[HotKey]:
+        """The ``limit`` most frequently accessed keys, hottest first"""
+        ranked = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+        return [tuple(json.loads(encoded)) for encoded, _ in ranked[:limit]]  # type: ignore[misc]
+
+    def load(self) -> None:
+        """Merge the decayed counts saved by the previous session"""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            saved = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        for encoded, count in saved.get("counts", {}).items():
+            self._counts[encoded] = self._counts.get(encoded, 0.0) + float(count) * self.decay
+
+    def save(self) -> None:
+        """Write the hottest keys for the next session"""
+        if self.path is None:
+            return
+        ranked = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+        data = {"saved_at": time.time(), "counts": dict(ranked[: self.max_keys])}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data))
+        tmp_path.replace(self.path)
+
+
+async def prewarm(
+    keys: List[HotKey],
+    warmers: Dict[str, Warmer],
+    concurrency: int = 4,
+    time_budget: float = 30.0,
+) -> Dict[str, int]:
+    """Load ``keys`` into their caches concurrently within a time budget
+
+    Keys whose kind has no warmer are skipped and failures are counted but
+    otherwise ignored; when the budget runs out the remaining loads are
+    cancelled.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"warmed": 0, "failed": 0, "skipped": 0}
+
+    async def warm(kind: str, key: Any) -> None:
+        warmer = warmers.get(kind)
+        if warmer is None:
+            stats["skipped"] += 1
+            return
+        async with semaphore:
+            try:
+                await warmer(key)
+                stats["warmed"] += 1
+            except Exception:
+                stats["failed"] += 1
+
+    tasks = [asyncio.create_task(warm(kind, key)) for kind, key in keys]
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=time_budget)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    stats["cancelled"] = len(keys) - sum(stats.values())
+    return stats
@@ -0,0 +1,90 @@
+"""Write-through invalidation of cached reads, keyed by entity and location"""
+
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+# Entities written through the client. A write publishes the entities it
+# touches together with the location, or None when it may affect any location.
+CONTACTS = "contacts"
+TASKS = "tasks"
+NOTES = "notes"
+CONVERSATIONS = "conversations"
+OPPORTUNITIES = "opportunities"
+PIPELINES = "pipelines"
+APPOINTMENTS = "appointments"
+CALENDARS = "calendars"
+FORMS = "forms"
+BUSINESSES = "businesses"
+USERS = "users"
+LOCATIONS = "locations"
+PRODUCTS = "products"
+PAYMENTS = "payments"
+TAGS = "tags"
+CUSTOM_VALUES = "custom_values"
+CUSTOM_FIELDS = "custom_fields"
+LINKS = "links"
+
+Listener = Callable[[Optional[str]], None]
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+class InvalidationBus:
+    """Routes write notifications to the caches holding the written entities
+
+    Caches subscribe a listener per entity; the listener receives the
+    location that was written, or None to drop every location. Listener
+    errors are ignored so a cache can never fail a write that succeeded.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: Dict[str, List[Listener]] = {}
+
+    def subscribe(self, entity: str, listener: Listener) -> None:
+        self._listeners.setdefault(entity, []).append(listener)
+
+    def publish(self, entities: List[str], location_id: Optional[str] = None) -> None:
+        for entity in entities:
+            for listener in self._listeners.get(entity, []):
+                try:
+                    listener(location_id)
+                except Exception:
+                    pass
+
+
+def _location_of(bound: Dict[str, Any], result: Any = None) -> Optional[str]:
+    """The location a write touched: a location_id argument, else a locationId attribute"""
+    location_id = bound.get("location_id")
+    if isinstance(location_id, str):
+        return location_id
+    for value in (*bound.values(), result):
+        location_id = getattr(value, "locationId", None)
+        if isinstance(location_id, str):
+            return location_id
+    return None
+
+
+def invalidates(*entities: str) -> Callable[[F], F]:
+    """Declare the entities a client write method touches
+
+    After the call, successful or not (a failed request may still have been
+    applied), the entities are published on the instance's
+    ``invalidation_bus`` for the location found in the arguments or result.
+    """
+
+    def decorator(fn: F) -> F:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(self, *args, **kwargs).arguments
+            result = None
+            try:
+                result = await fn(self, *args, **kwargs)
+                return result
+            finally:
+                self.invalidation_bus.publish(list(entities), _location_of(bound, result))
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,142 @@
+"""Pipeline and stage lookup cache"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..api.opportunities import OpportunitiesClient
+from ..models.opportunity import Pipeline, PipelineStage
+from ..utils.exceptions import UnknownReferenceError, ValidationError
+from .base import MetadataCache
+from .store import CacheStore
+
+
+def _name_key(name: str) -> str:
+    return name.strip().casefold()
+
+
+class PipelineIndex:
+    """Lookup indexes over a location's pipelines
+
+    Names are matched case-insensitively. Stage names are only unique within
+    a pipeline, so a stage name given without a pipeline must be unambiguous
+    across the location.
+    """
+
+    def __init__(self, pipelines: List[Pipeline]):
+        self.pipelines = pipelines
+        self.by_id: Dict[str, Pipeline] = {}
+        self.by_name: Dict[str, Pipeline] = {}
+        self.stage_ids: Dict[Tuple[str, str], str] = {}
+        self.stage_names: Dict[str, List[Tuple[str, str]]] = {}
+        self.stages: Dict[str, Tuple[str, PipelineStage]] = {}
+
+        for pipeline in pipelines:
+            self.by_id[pipeline.id] = pipeline
+            self.by_name.setdefault(_name_key(pipeline.name), pipeline)
+            for stage in pipeline.stages or []:
+                key = _name_key(stage.name)
+                self.stage_ids.setdefault((pipeline.id, key), stage.id)
+                self.stage_names.setdefault(key, []).append((pipeline.id, stage.id))
+                self.stages[stage.id] = (pipeline.id, stage)
+
+    def find_pipeline(self, ref: str) -> Optional[Pipeline]:
+        """Find a pipeline by ID or name"""
+        return self.by_id.get(ref) or self.by_name.get(_name_key(ref))
+
+    def find_stage(self, ref: str, pipeline_id: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """Find a stage by ID or name, returning ``(pipeline_id, stage_id)``
+
+        Raises ValidationError when a bare stage name matches stages in
+        several pipelines.
+        """
+        found = self.stages.get(ref)
+        if found is not None:
+            if pipeline_id is None or found[0] == pipeline_id:
+                return found[0], ref
+            return None
+
+        key = _name_key(ref)
+        if pipeline_id is not None:
+            stage_id = self.stage_ids.get((pipeline_id, key))
+            return (pipeline_id, stage_id) if stage_id else None
+
+        matches = self.stage_names.get(key, [])
+        if len(matches) > 1:
+            names = sorted(self.by_id[p].name for p, _ in matches)
+            raise ValidationError(
+                f"Stage '{ref}' exists in several pipelines ({', '.join(names)}); "
+                "specify the pipeline"
+            )
+        return matches[0] if matches else None
+
+    def stage_position(self, stage_id: str) -> Optional[int]:
+        """Position of a stage within its pipeline"""
+        found = self.stages.get(stage_id)
+        return found[1].position if found else None
+
+    def stage_name(self, stage_id: str) -> Optional[str]:
+        """Name of a stage, if it is known"""
+        found = self.stages.get(stage_id)
+        return found[1].name if found else None
+
+
+class PipelineCache(MetadataCache[PipelineIndex]):
+    """Per-location cache of pipelines with ID and name indexes"""
+
+    namespace = "pipelines"
+
+    def __init__(
+        self, client: OpportunitiesClient, ttl: float = 300.0, store: Optional[CacheStore] = None
+    ):
+        super().__init__(ttl, store)
+        self._client = client
+
+    async def _load(self, location_id: str) -> PipelineIndex:
+        return PipelineIndex(await self._client.get_pipelines(location_id))
+
+    def _dump(self, snapshot: PipelineIndex) -> Any:
+        return [p.model_dump(mode="json", by_alias=True) for p in snapshot.pipelines]
+
+    def _restore(self, data: Any) -> PipelineIndex:
+        return PipelineIndex([Pipeline.model_validate(p) for p in data])
+
+    async def resolve(
+        self,
+        location_id: str,
+        pipeline: Optional[str] = None,
+        stage: Optional[str] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Resolve pipeline and stage IDs or names to ``(pipeline_id, stage_id)``
+
+        A reference the cached snapshot does not know triggers one reload, in
+        case the pipeline or stage was created since the snapshot was taken.
+        """
+        if not pipeline and not stage:
+            return None, None
+        index = await self.get(location_id)
+        try:
+            return self._resolve(index, pipeline, stage)
+        except UnknownReferenceError:
+            index = await self.get(location_id, refresh=True)
+            return self._resolve(index, pipeline, stage)
+
+    @staticmethod
+    def _resolve(
+        index: PipelineIndex, pipeline: Optional[str], stage: Optional[str]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        pipeline_id = None
+        if pipeline:
+            found = index.find_pipeline(pipeline)
+            if found is None:
+                names = ", ".join(p.name for p in index.pipelines) or "none"
+                raise UnknownReferenceError(f"Unknown pipeline '{pipeline}'. Available pipelines: {names}")
+            pipeline_id = found.id
+
+        stage_id = None
+        if stage:
+            match = index.find_stage(stage, pipeline_id)
+            if match is None:
+                scope = index.by_id[pipeline_id].name if pipeline_id else "any pipeline"
+                raise UnknownReferenceError(f"Unknown stage '{stage}' in {scope}")
+            pipeline_id, stage_id = match
+
+        return pipeline_id, stage_id
@@ -0,0 +1,137 @@
+"""Stale-while-revalidate cache for rendered MCP resources"""
+
+import asyncio
+import functools
+import inspect
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from .hot_keys import HotKeyTracker, Warmer
+from .invalidation import LOCATIONS, InvalidationBus
+
+ResourceKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+class ResourceCache:
+    """Serves the last rendered text of a resource while refreshing it
+
+    A read younger than ``soft_ttl`` is served as is. Between ``soft_ttl``
+    and ``hard_ttl`` the stale text is served at once and a single
+    background refresh is started. Past ``hard_ttl`` (or on the first read)
+    the read waits for a fresh render. A failed background refresh keeps the
+    stale text until the hard TTL runs out.
+
+    Each resource declares the entities it renders, so a write published on
+    an ``InvalidationBus`` only drops the resources showing that entity.
+    """
+
+    def __init__(self, soft_ttl: float = 30.0, hard_ttl: float = 600.0):
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self._entries: Dict[ResourceKey, Tuple[float, str]] = {}
+        self._locks: Dict[ResourceKey, asyncio.Lock] = {}
+        self._refreshing: Dict[ResourceKey, asyncio.Task] = {}
+        self._generations: Dict[ResourceKey, int] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._entities: Dict[str, Set[str]] = {}
+        self._resources: Dict[str, Callable[..., Awaitable[str]]] = {}
+        self.hot_keys: Optional[HotKeyTracker] = None
+
+    def cached(
+        self, *entities: str
+    ) -> Callable[[Callable[..., Awaitable[str]]], Callable[..., Awaitable[str]]]:
+        """Decorate a resource function rendering ``entities`` so its reads go through the cache"""
+
+        def decorator(fn: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+            signature = inspect.signature(fn)
+            for entity in entities:
+                self._entities.setdefault(entity, set()).add(fn.__name__)
+
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any) -> str:
+                bound = signature.bind(*args, **kwargs)
+                key: ResourceKey = (fn.__name__, tuple(sorted(bound.arguments.items())))
+                if self.hot_keys is not None:
+                    self.hot_keys.record(f"resource:{fn.__name__}", dict(bound.arguments))
+                return await self.get(key, lambda: fn(*args, **kwargs))
+
+            self._resources[fn.__name__] = fn
+            return wrapper
+
+        return decorator
+
+    async def get(self, key: ResourceKey, render: Callable[[], Awaitable[str]]) -> str:
+        """Return the cached text for ``key``, rendering or refreshing as needed"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.soft_ttl:
+                return entry[1]
+            if age < self.hard_ttl:
+                self._refresh_in_background(key, render)
+                return entry[1]
+        return await self._render(key, render)
+
+    async def _render(self, key: ResourceKey, render: Callable[[], Awaitable[str]]) -> str:
+        requested_at = time.monotonic()
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Reuse a render that finished while we waited for the lock
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= requested_at:
+                return entry[1]
+
+            generation = self._generations.get(key, 0)
+            text = await render()
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = (time.monotonic(), text)
+            return text
+
+    def _refresh_in_background(self, key: ResourceKey, render: Callable[[], Awaitable[str]]) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._render(key, render)
+            except Exception:
+                # Keep serving the stale text; the hard TTL bounds how long
+                pass
+            finally:
+                self._refreshing.pop(key, None)
+
+        task = asyncio.create_task(refresh())
+        self._refreshing[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def invalidate(self, location_id: Optional[str] = None, entity: Optional[str] = None) -> None:
+        """Drop rendered resources for a location (or all), optionally only those showing ``entity``"""
+        names = None if entity is None else self._entities.get(entity, set())
+        # Keys with a render in flight have a lock but may not have an entry yet
+        for key in set(self._entries) | set(self._locks):
+            if names is not None and key[0] not in names:
+                continue
+            if location_id is None or ("location_id", location_id) in key[1]:
+                self._entries.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def subscribe(self, bus: InvalidationBus) -> None:
+        """Drop rendered resources when a write to an entity they show is published"""
+        for entity in self._entities:
+            bus.subscribe(entity, functools.partial(self._invalidate_entity, entity))
+        bus.subscribe(LOCATIONS, self.invalidate)
+
+    def warmers(self) -> Dict[str, Warmer]:
+        """Warm-start loaders for the hot keys recorded by cached resources"""
+
+        def warmer(name: str, fn: Callable[..., Awaitable[str]]) -> Warmer:
+            # Goes through get() directly so replayed reads are not counted as hot again
+            return lambda arguments: self.get(
+                (name, tuple(sorted(arguments.items()))), lambda: fn(**arguments)
+            )
+
+        return {f"resource:{name}": warmer(name, fn) for name, fn in self._resources.items()}
+
+    def _invalidate_entity(self, entity: str, location_id: Optional[str]) -> None:
+        self.invalidate(location_id, entity)
@@ -0,0 +1,34 @@
+"""Cache configuration"""
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class CacheSettings(BaseSettings):
+    """Cache configuration from environment (``CACHE_*`` variables)"""
+
+    resource_soft_ttl: float = Field(
+        default=30.0, description="Seconds before a rendered resource is refreshed in the background"
+    )
+    resource_hard_ttl: float = Field(
+        default=600.0, description="Seconds before a rendered resource must be re-rendered before serving"
+    )
+    metadata_persist: bool = Field(
+        default=True, description="Keep metadata snapshots on disk so they survive restarts"
+    )
+    metadata_store_path: str = Field(
+        default="./config/cache.db", description="SQLite file holding persisted metadata snapshots"
+    )
+    warm_start: bool = Field(
+        default=True, description="Prefetch the previous session's hot cache keys on startup"
+    )
+    hot_keys_path: str = Field(
+        default="./config/hot_keys.json", description="File the hot cache keys are saved to on shutdown"
+    )
+    warm_max_keys: int = Field(default=32, description="Most hot keys prefetched on startup")
+    warm_concurrency: int = Field(default=4, description="Concurrent loads while prefetching")
+    warm_time_budget: float = Field(
+        default=30.0, description="Seconds after which unfinished prefetches are cancelled"
+    )
+
+    model_config = SettingsConfigDict(env_prefix="CACHE_", extra="ignore")
@@ -0,0 +1,85 @@
+"""Short-lived cache of calendar free slots per calendar, day and timezone"""
+
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from ..api.calendars import CalendarsClient
+
+# (epoch seconds, start time as the API wrote it)
+SlotStart = Tuple[float, str]
+SlotKey = Tuple[str, str, str, str]
+
+
+def _days(start_date: date, end_date: date) -> List[date]:
+    return [start_date + timedelta(days=n) for n in range((end_date - start_date).days + 1)]
+
+
+class FreeSlotCache:
+    """Free slot start times per ``(location, calendar, day, timezone)``
+
+    A request fetches only the days missing from the cache, in one call
+    spanning them, and days without slots are cached as empty. Each day's
+    starts are parsed once and kept sorted, so callers can merge calendars
+    without parsing again. Availability changes with every booking, so
+    entries live for ``ttl`` seconds and a location's entries are dropped on
+    appointment and calendar writes.
+    """
+
+    def __init__(self, client: CalendarsClient, ttl: float = 60.0):
+        self._client = client
+        self.ttl = ttl
+        self._entries: Dict[SlotKey, Tuple[float, List[SlotStart]]] = {}
+        self._locks: Dict[Tuple[str, str, str], asyncio.Lock] = {}
+
+    def _fresh(self, key: SlotKey) -> Optional[List[SlotStart]]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+
+    async def get(
+        self,
+        location_id: str,
+        calendar_id: str,
+        start_date: date,
+        end_date: date,
+        timezone: Optional[str] = None,
+    ) -> List[SlotStart]:
+        """The calendar's free slot starts from ``start_date`` through ``end_date``, in order"""
+        tz = timezone or ""
+        days = _days(start_date, end_date)
+
+        def missing() -> List[date]:
+            return [d for d in days if self._fresh((location_id, calendar_id, d.isoformat(), tz)) is None]
+
+        if missing():
+            async with self._locks.setdefault((location_id, calendar_id, tz), asyncio.Lock()):
+                todo = missing()
+                if todo:
+                    # End at the midnight after the last day so it is covered in full
+                    fetched = await self._client.get_free_slot_days(
+                        calendar_id, location_id, todo[0], todo[-1] + timedelta(days=1), timezone
+                    )
+                    loaded_at = time.monotonic()
+                    for day in _days(todo[0], todo[-1]):
+                        starts = [
+                            (datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp(), text)
+                            for text in fetched.get(day.isoformat(), [])
+                        ]
+                        starts.sort()
+                        self._entries[(location_id, calendar_id, day.isoformat(), tz)] = (loaded_at, starts)
+
+        slots: List[SlotStart] = []
+        for day in days:
+            slots.extend(self._entries[(location_id, calendar_id, day.isoformat(), tz)][1])
+        return slots
+
+    def invalidate(self, location_id: Optional[str] = None) -> None:
+        """Drop one location's slots, or every location's when none is given"""
+        if location_id is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == location_id]:
+            del self._entries[key]
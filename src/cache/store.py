@@ -0,0 +1,95 @@
+"""Persistent storage for metadata cache snapshots"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+
+class CacheStore(ABC):
+    """Interface for a persistent snapshot store shared by the metadata caches
+
+    Values are JSON-serializable data keyed by ``(namespace, key)`` and
+    stamped with the wall-clock time they were written, so their age
+    survives a process restart.
+    """
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[Tuple[float, Any]]:
+        """Return ``(stored_at, value)`` or None"""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """Store a value, stamped with the current time"""
+
+    @abstractmethod
+    def delete(self, namespace: str, key: Optional[str] = None) -> None:
+        """Delete one key, or every key in the namespace"""
+
+
+class SQLiteCacheStore(CacheStore):
+    """CacheStore in a local SQLite file with zlib-compressed JSON values"""
+
+    def __init__(self, path: Union[str, Path], compression_level: int = 6):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        # Calls arrive from worker threads (asyncio.to_thread), serialized by the lock
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    value BLOB NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, value FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return row[0], json.loads(zlib.decompress(row[1]))
+        except (zlib.error, ValueError):
+            # A corrupt entry is just a miss
+            self.delete(namespace, key)
+            return None
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        blob = zlib.compress(
+            json.dumps(value, separators=(",", ":")).encode(), self.compression_level
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, stored_at, value) "
+                "VALUES (?, ?, ?, ?)",
+                (namespace, key, time.time(), blob),
+            )
+
+    def delete(self, namespace: str, key: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            if key is None:
+                self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+            else:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,133 @@
+"""User directory cache for resolving and displaying assigned users"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from ..api.users import UsersClient
+from ..models.user import User
+from ..utils.exceptions import UnknownReferenceError, ValidationError
+from .base import MetadataCache, looks_like_id
+from .store import CacheStore
+
+ASSIGNEE_FIELDS = ("assignedTo", "assignedUserId")
+
+
+def _name_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def display_name(user: User) -> str:
+    """Name to show for a user, falling back to first and last name"""
+    full_name = " ".join(part for part in (user.firstName, user.lastName) if part)
+    return user.name or full_name or user.email
+
+
+class UserIndex:
+    """Lookup indexes over a location's users
+
+    Users can be found by ID, email or name (either ``name`` or first and
+    last name), case-insensitively. Names shared by several users are kept
+    so lookups by them can be reported as ambiguous.
+    """
+
+    def __init__(self, users: List[User]):
+        self.users = users
+        self.by_id: Dict[str, User] = {}
+        self.by_email: Dict[str, User] = {}
+        self.by_name: Dict[str, List[User]] = {}
+
+        for user in users:
+            if user.id:
+                self.by_id[user.id] = user
+            if user.email:
+                self.by_email[user.email.strip().casefold()] = user
+            full_name = " ".join(part for part in (user.firstName, user.lastName) if part)
+            for name in {_name_key(n) for n in (user.name, full_name) if n}:
+                self.by_name.setdefault(name, []).append(user)
+
+    def find(self, ref: str) -> Optional[User]:
+        """Find a user by ID, email or unambiguous name"""
+        user = self.by_id.get(ref) or self.by_email.get(ref.strip().casefold())
+        if user is not None:
+            return user
+        matches = self.by_name.get(_name_key(ref), [])
+        if len(matches) > 1:
+            emails = ", ".join(sorted(u.email for u in matches))
+            raise ValidationError(f"Several users are named '{ref}' ({emails}); use an email or ID")
+        return matches[0] if matches else None
+
+    def name_of(self, user_id: str) -> Optional[str]:
+        """Display name for a user ID, if it is known"""
+        user = self.by_id.get(user_id)
+        return display_name(user) if user else None
+
+
+class UserDirectoryCache(MetadataCache[UserIndex]):
+    """Per-location cache of the user directory"""
+
+    namespace = "users"
+
+    def __init__(
+        self,
+        client: UsersClient,
+        ttl: float = 600.0,
+        page_size: int = 100,
+        store: Optional[CacheStore] = None,
+    ):
+        super().__init__(ttl, store)
+        self._client = client
+        self.page_size = page_size
+
+    async def _load(self, location_id: str) -> UserIndex:
+        users: List[User] = []
+        skip = 0
+        while True:
+            page = await self._client.get_users(location_id, limit=self.page_size, skip=skip)
+            users.extend(page.users)
+            skip += self.page_size
+            if len(page.users) < self.page_size or len(users) >= page.total:
+                break
+        return UserIndex(users)
+
+    def _dump(self, snapshot: UserIndex) -> Any:
+        return [u.model_dump(mode="json", by_alias=True) for u in snapshot.users]
+
+    def _restore(self, data: Any) -> UserIndex:
+        return UserIndex([User.model_validate(u) for u in data])
+
+    async def resolve(self, location_id: str, ref: Optional[str]) -> Optional[str]:
+        """Resolve a user ID, email or name to a user ID
+
+        Values that look like IDs are passed through without loading the
+        directory, since it may not list every user (e.g. agency users) who
+        can be assigned. An unknown email or name triggers one reload before
+        failing.
+        """
+        if not ref or looks_like_id(ref):
+            return ref
+        user = (await self.get(location_id)).find(ref)
+        if user is None:
+            index = await self.get(location_id, refresh=True)
+            user = index.find(ref)
+            if user is None:
+                raise UnknownReferenceError(f"Unknown user '{ref}' in location {location_id}")
+        return user.id
+
+    async def enrich(
+        self,
+        location_id: str,
+        rows: Iterable[Dict[str, Any]],
+        fields: Sequence[str] = ASSIGNEE_FIELDS,
+    ) -> None:
+        """Add a ``<field>Name`` display name next to each assigned user ID
+
+        Rows without any assigned user do not load the directory.
+        """
+        rows = [row for row in rows if any(row.get(field) for field in fields)]
+        if not rows:
+            return
+        index = await self.get(location_id)
+        for row in rows:
+            for field in fields:
+                user_id = row.get(field)
+                if user_id:
+                    row[f"{field}Name"] = index.name_of(user_id)
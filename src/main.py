@@ -3,12 +3,22 @@
 
 import asyncio
 import sys
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
 
 from fastmcp import FastMCP
 
 from .api.client import GoHighLevelClient
+from .cache import (
+    CacheSettings,
+    HotKeyTracker,
+    ResourceCache,
+    SQLiteCacheStore,
+    invalidation,
+    prewarm,
+)
 from .services.oauth import OAuthService
+from .store import LocalDatabase, StoreSettings
 from .services.setup import StandardModeSetup
 from .utils.client_helpers import get_client_with_token_override
 
@@ -137,19 +147,93 @@ async def startup_check_and_setup():
         return "exit_after_setup"
 
 
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
+    """Prefetch the last session's hot cache keys; save this session's on shutdown"""
+    warm_task = None
+    if hot_keys is not None and ghl_client is not None and cache_settings is not None:
+        warm_task = asyncio.create_task(
+            prewarm(
+                hot_keys.top(cache_settings.warm_max_keys),
+                {**ghl_client.warmers(), **resource_cache.warmers()},
+                concurrency=cache_settings.warm_concurrency,
+                time_budget=cache_settings.warm_time_budget,
+            )
+        )
+    try:
+        yield {}
+    finally:
+        if warm_task is not None:
+            warm_task.cancel()
+        if hot_keys is not None:
+            try:
+                hot_keys.save()
+            except OSError:
+                pass
+        if ghl_client is not None and ghl_client.local_db is not None:
+            for mirror in ghl_client.mirrors():
+                await mirror.stop()
+            ghl_client.local_db.close()
+
+
 # Initialize FastMCP server
-mcp: FastMCP = FastMCP("ghl-mcp-server")
+mcp: FastMCP = FastMCP("ghl-mcp-server", lifespan=server_lifespan)
 
 # Global clients - will be initialized after startup check
 oauth_service: Optional[OAuthService] = None
 ghl_client: Optional[GoHighLevelClient] = None
+cache_settings: Optional[CacheSettings] = None
+
+# Rendered resources are served stale-while-revalidate
+resource_cache = ResourceCache()
+
+# Cache keys used this session, replayed on the next start
+hot_keys: Optional[HotKeyTracker] = None
 
 
 def initialize_clients():
     """Initialize OAuth service and GHL client after setup"""
-    global oauth_service, ghl_client
+    global oauth_service, ghl_client, cache_settings, hot_keys
     oauth_service = OAuthService()
-    ghl_client = GoHighLevelClient(oauth_service)
+
+    cache_settings = CacheSettings()
+    cache_store = (
+        SQLiteCacheStore(cache_settings.metadata_store_path)
+        if cache_settings.metadata_persist
+        else None
+    )
+    if cache_settings.warm_start:
+        hot_keys = HotKeyTracker(cache_settings.hot_keys_path)
+        hot_keys.load()
+
+    store_settings = StoreSettings()
+    local_db = LocalDatabase(store_settings.path) if store_settings.enabled else None
+    ghl_client = GoHighLevelClient(
+        oauth_service,
+        cache_store=cache_store,
+        hot_keys=hot_keys,
+        local_db=local_db,
+        duplicate_index=store_settings.duplicate_index,
+        schedule_index=store_settings.schedule_index,
+    )
+    for mirror in ghl_client.mirrors():
+        mirror.sync_interval = store_settings.sync_interval
+        mirror.max_staleness = store_settings.max_staleness
+        mirror.full_sync_interval = store_settings.full_sync_interval
+    if ghl_client.opportunity_store is not None:
+        # Each sync reads every opportunity; reads stay local until the next one is due
+        opportunities = ghl_client.opportunity_store
+        opportunities.sync_interval = max(store_settings.opportunity_sync_interval, store_settings.sync_interval)
+        opportunities.max_staleness = max(store_settings.max_staleness, 2 * opportunities.sync_interval)
+    if ghl_client.duplicate_index is not None:
+        ghl_client.duplicate_index.ttl = store_settings.duplicate_index_ttl
+        ghl_client.duplicate_index.default_country_code = store_settings.default_country_code
+    if ghl_client.schedule_index is not None:
+        ghl_client.schedule_index.ttl = store_settings.schedule_index_ttl
+    resource_cache.soft_ttl = cache_settings.resource_soft_ttl
+    resource_cache.hard_ttl = cache_settings.resource_hard_ttl
+    resource_cache.subscribe(ghl_client.invalidation_bus)
+    resource_cache.hot_keys = hot_keys
 
 
 # Helper function to get client with optional token override
@@ -186,6 +270,7 @@ def register_all_tools():
 
 
 @mcp.resource("contacts://{location_id}")
+@resource_cache.cached(invalidation.CONTACTS)
 async def list_contacts_resource(location_id: str) -> str:
     """List all contacts for a location as a resource"""
     if ghl_client is None:
@@ -216,6 +301,7 @@ async def list_contacts_resource(location_id: str) -> str:
 
 
 @mcp.resource("contact://{location_id}/{contact_id}")
+@resource_cache.cached(invalidation.CONTACTS)
 async def get_contact_resource(location_id: str, contact_id: str) -> str:
     """Get a single contact as a resource"""
     if ghl_client is None:
@@ -256,6 +342,7 @@ async def get_contact_resource(location_id: str, contact_id: str) -> str:
 
 
 @mcp.resource("conversations://{location_id}")
+@resource_cache.cached(invalidation.CONVERSATIONS)
 async def list_conversations_resource(location_id: str) -> str:
     """List all conversations for a location as a resource"""
     if ghl_client is None:
@@ -282,6 +369,7 @@ async def list_conversations_resource(location_id: str) -> str:
 
 
 @mcp.resource("conversation://{location_id}/{conversation_id}")
+@resource_cache.cached(invalidation.CONVERSATIONS)
 async def get_conversation_resource(location_id: str, conversation_id: str) -> str:
     """Get a single conversation as a resource"""
     if ghl_client is None:
@@ -307,7 +395,11 @@ async def get_conversation_resource(location_id: str, conversation_id: str) -> s
         )
         if messages_result.messages:
             lines.append(f"\n## Recent Messages ({len(messages_result.messages)})")
-            for msg in messages_result.messages[-5:]:  # Show last 5 messages
+            if messages_result.nextPage:
+                lines.append(
+                    "Older messages are available via the get_conversation_thread tool."
+                )
+            for msg in messages_result.messages:  # Newest first
                 lines.append(f"\n### Message {msg.id}")
                 if msg.body:
                     lines.append(f"- Content: {msg.body[:100]}...")
@@ -323,6 +415,7 @@ async def get_conversation_resource(location_id: str, conversation_id: str) -> s
 
 
 @mcp.resource("opportunities://{location_id}")
+@resource_cache.cached(invalidation.OPPORTUNITIES)
 async def list_opportunities_resource(location_id: str) -> str:
     """List all opportunities for a location as a resource"""
     if ghl_client is None:
@@ -372,6 +465,7 @@ async def list_opportunities_resource(location_id: str) -> str:
 
 
 @mcp.resource("opportunity://{location_id}/{opportunity_id}")
+@resource_cache.cached(invalidation.OPPORTUNITIES)
 async def get_opportunity_resource(location_id: str, opportunity_id: str) -> str:
     """Get a single opportunity as a resource"""
     if ghl_client is None:
@@ -406,6 +500,7 @@ async def get_opportunity_resource(location_id: str, opportunity_id: str) -> str
 
 
 @mcp.resource("pipelines://{location_id}")
+@resource_cache.cached(invalidation.PIPELINES)
 async def list_pipelines_resource(location_id: str) -> str:
     """List all pipelines for a location as a resource"""
     if ghl_client is None:
@@ -437,6 +532,7 @@ async def list_pipelines_resource(location_id: str) -> str:
 
 
 @mcp.resource("calendars://{location_id}")
+@resource_cache.cached(invalidation.CALENDARS)
 async def list_calendars_resource(location_id: str) -> str:
     """List all calendars for a location as a resource"""
     if ghl_client is None:
@@ -464,6 +560,7 @@ async def list_calendars_resource(location_id: str) -> str:
 
 
 @mcp.resource("calendar://{location_id}/{calendar_id}")
+@resource_cache.cached(invalidation.CALENDARS)
 async def get_calendar_resource(location_id: str, calendar_id: str) -> str:
     """Get a single calendar as a resource"""
     if ghl_client is None:
@@ -487,6 +584,7 @@ async def get_calendar_resource(location_id: str, calendar_id: str) -> str:
 
 
 @mcp.resource("appointments://{location_id}/{contact_id}")
+@resource_cache.cached(invalidation.APPOINTMENTS)
 async def list_appointments_resource(location_id: str, contact_id: str) -> str:
     """List all appointments for a contact as a resource"""
     if ghl_client is None:
@@ -522,6 +620,7 @@ async def list_appointments_resource(location_id: str, contact_id: str) -> str:
 
 
 @mcp.resource("appointment://{location_id}/{appointment_id}")
+@resource_cache.cached(invalidation.APPOINTMENTS)
 async def get_appointment_resource(location_id: str, appointment_id: str) -> str:
     """Get a single appointment as a resource"""
     if ghl_client is None:
@@ -0,0 +1,44 @@
+"""Aggregate-only mode shared by the MCP list tools"""
+
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from fastmcp import Context
+
+from ..utils.aggregation import RunningAggregate
+from .params.aggregation import AggregateSpec
+from .progress import ProgressReporter
+
+
+async def run_aggregate(
+    pages: AsyncGenerator[List[Dict[str, Any]], None],
+    spec: AggregateSpec,
+    ctx: Optional[Context] = None,
+    unit: str = "items",
+    page_size: int = 100,
+) -> Dict[str, Any]:
+    """Fold raw pages into running totals and build the tool response
+
+    Rows are never turned into models and are dropped as soon as they have
+    been counted, so memory stays flat however many pages are read.
+    ``page_size`` is the one the pager was given: ``max_pages_reached`` is
+    only set when the last page allowed was full, so the pager stopped with
+    more pages to read rather than at the end of the data.
+    """
+    aggregate = RunningAggregate(sum_fields=spec.sum_fields, group_by=spec.group_by)
+    last_page_full = False
+    async with ProgressReporter(ctx, unit=unit) as progress:
+        async with aclosing(pages) as page_iter:
+            async for rows in page_iter:
+                aggregate.add_many(rows)
+                last_page_full = len(rows) >= page_size
+                await progress.advance(items=len(rows), pages=1)
+
+    return {
+        "success": True,
+        "aggregate": aggregate.result(max_groups=spec.max_groups),
+        "pages": progress.pages,
+        "max_pages_reached": (
+            spec.max_pages is not None and progress.pages >= spec.max_pages and last_page_full
+        ),
+    }
@@ -16,3 +16,4 @@ from .locations import *  # noqa: F403
 from .calendar_admin import *  # noqa: F403
 from .products import *  # noqa: F403
 from .payments import *  # noqa: F403
+from .aggregation import *  # noqa: F403
@@ -0,0 +1,27 @@
+"""Aggregate-mode parameter classes for MCP list tools"""
+
+from typing import Optional, List
+from pydantic import BaseModel, Field
+
+
+class AggregateSpec(BaseModel):
+    """Aggregate-only mode for list tools
+
+    When given, the tool pages through all matching records and returns only
+    counts and sums instead of the records themselves.
+    """
+
+    group_by: Optional[str] = Field(
+        None,
+        description="Raw API field to group by; dotted paths such as 'contact.source' are allowed",
+    )
+    sum_fields: List[str] = Field(
+        default_factory=list,
+        description="Numeric raw API fields to sum, e.g. ['monetaryValue'] or ['amount']",
+    )
+    max_pages: Optional[int] = Field(
+        None, description="Stop after this many pages (default: all pages)", ge=1
+    )
+    max_groups: int = Field(
+        100, description="Maximum number of groups to return, largest first", ge=1, le=1000
+    )
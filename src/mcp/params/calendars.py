@@ -1,6 +1,6 @@
 """Calendar parameter classes for MCP tools"""
 
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -9,6 +9,9 @@ class GetAppointmentsParams(BaseModel):
 
     contact_id: str = Field(..., description="The contact ID")
     location_id: str = Field(..., description="The location ID")
+    include_user_names: bool = Field(
+        False, description="Add display names for assigned users from the cached user directory"
+    )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -28,7 +31,7 @@ class CreateAppointmentParams(BaseModel):
     """Parameters for creating an appointment"""
 
     location_id: str = Field(..., description="The location ID")
-    calendar_id: str = Field(..., description="The calendar ID")
+    calendar_id: str = Field(..., description="The calendar ID, name or widget slug")
     contact_id: str = Field(..., description="The contact ID")
     start_time: str = Field(
         ...,
@@ -40,9 +43,14 @@ class CreateAppointmentParams(BaseModel):
     )
     title: Optional[str] = Field(None, description="Appointment title")
     appointment_status: Optional[str] = Field(None, description="Appointment status")
-    assigned_user_id: Optional[str] = Field(None, description="Assigned user ID")
+    assigned_user_id: Optional[str] = Field(
+        None, description="Assigned user ID, email or name"
+    )
     notes: Optional[str] = Field(None, description="Appointment notes")
     address: Optional[str] = Field(None, description="Appointment address")
+    allow_overlap: bool = Field(
+        False, description="Book even if the time overlaps a known appointment or block slot"
+    )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -57,9 +65,14 @@ class UpdateAppointmentParams(BaseModel):
     end_time: Optional[str] = Field(None, description="End time (ISO 8601 format)")
     title: Optional[str] = Field(None, description="Appointment title")
     appointment_status: Optional[str] = Field(None, description="Appointment status")
-    assigned_user_id: Optional[str] = Field(None, description="Assigned user ID")
+    assigned_user_id: Optional[str] = Field(
+        None, description="Assigned user ID, email or name"
+    )
     notes: Optional[str] = Field(None, description="Appointment notes")
     address: Optional[str] = Field(None, description="Appointment address")
+    allow_overlap: bool = Field(
+        False, description="Book even if the time overlaps a known appointment or block slot"
+    )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -79,6 +92,9 @@ class GetCalendarsParams(BaseModel):
     """Parameters for getting calendars"""
 
     location_id: str = Field(..., description="The location ID")
+    refresh: bool = Field(
+        False, description="Reload calendars from the API instead of the cache"
+    )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -87,7 +103,7 @@ class GetCalendarsParams(BaseModel):
 class GetCalendarParams(BaseModel):
     """Parameters for getting a single calendar"""
 
-    calendar_id: str = Field(..., description="The calendar ID")
+    calendar_id: str = Field(..., description="The calendar ID, name or widget slug")
     location_id: str = Field(..., description="The location ID")
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
@@ -97,7 +113,7 @@ class GetCalendarParams(BaseModel):
 class GetFreeSlotsParams(BaseModel):
     """Parameters for getting free time slots"""
 
-    calendar_id: str = Field(..., description="The calendar ID")
+    calendar_id: str = Field(..., description="The calendar ID, name or widget slug")
     location_id: str = Field(..., description="The location ID")
     start_date: str = Field(
         ..., description="Start date (YYYY-MM-DD). Example: '2025-06-09'"
@@ -113,3 +129,27 @@ class GetFreeSlotsParams(BaseModel):
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
+
+
+class FindFreeSlotsParams(BaseModel):
+    """Parameters for finding free slots across several calendars"""
+
+    location_id: str = Field(..., description="The location ID")
+    calendar_ids: List[str] = Field(
+        default_factory=list, description="Calendar IDs, names or widget slugs to search"
+    )
+    calendar_group: Optional[str] = Field(
+        None, description="Calendar group ID or name; every calendar in it is searched"
+    )
+    start_date: str = Field(..., description="First day (YYYY-MM-DD). Example: '2025-06-09'")
+    end_date: Optional[str] = Field(
+        None, description="Last day, inclusive (YYYY-MM-DD); defaults to start_date"
+    )
+    timezone: Optional[str] = Field(
+        None,
+        description="Timezone for the slots (e.g., 'America/Chicago'). If not provided, uses each calendar's default timezone",
+    )
+    limit: int = Field(default=50, description="Maximum number of slots to return", ge=1)
+    access_token: Optional[str] = Field(
+        None, description="Optional access token to use instead of stored token"
+    )
@@ -12,6 +12,9 @@ class GetContactTasksParams(BaseModel):
     location_id: str = Field(
         ..., description="The location ID where the contact exists"
     )
+    include_user_names: bool = Field(
+        False, description="Add display names for assigned users from the cached user directory"
+    )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -40,7 +43,9 @@ class CreateContactTaskParams(BaseModel):
     title: str = Field(..., description="Task title")
     body: Optional[str] = Field(None, description="Task description/body")
     due_date: Optional[datetime] = Field(None, description="Task due date")
-    assigned_to: Optional[str] = Field(None, description="User ID to assign the task to")
+    assigned_to: Optional[str] = Field(
+        None, description="User ID, email or name to assign the task to"
+    )
     completed: bool = Field(False, description="Whether the task is completed")
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
@@ -58,7 +63,9 @@ class UpdateContactTaskParams(BaseModel):
     title: Optional[str] = Field(None, description="Task title")
     body: Optional[str] = Field(None, description="Task description/body")
     due_date: Optional[datetime] = Field(None, description="Task due date")
-    assigned_to: Optional[str] = Field(None, description="User ID to assign the task to")
+    assigned_to: Optional[str] = Field(
+        None, description="User ID, email or name to assign the task to"
+    )
     completed: Optional[bool] = Field(None, description="Whether the task is completed")
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
@@ -3,6 +3,8 @@
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 
+from .aggregation import AggregateSpec
+
 
 class CreateContactParams(BaseModel):
     """Parameters for creating a contact"""
@@ -22,7 +24,12 @@ class CreateContactParams(BaseModel):
     state: Optional[str] = Field(None, description="Contact's state")
     postal_code: Optional[str] = Field(None, description="Contact's postal code")
     custom_fields: Optional[Dict[str, Any]] = Field(
-        None, description="Custom field values"
+        None, description="Custom field values keyed by field key, name or ID"
+    )
+    update_duplicate: bool = Field(
+        True,
+        description="If a contact with the same email or phone exists, update it (adding tags; a phone match "
+        "keeps its email); set false to return it unchanged",
     )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
@@ -47,7 +54,7 @@ class UpdateContactParams(BaseModel):
     state: Optional[str] = Field(None, description="Contact's state")
     postal_code: Optional[str] = Field(None, description="Contact's postal code")
     custom_fields: Optional[Dict[str, Any]] = Field(
-        None, description="Custom field values"
+        None, description="Custom field values keyed by field key, name or ID"
     )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
@@ -76,6 +83,36 @@ class SearchContactsParams(BaseModel):
     tags: Optional[List[str]] = Field(None, description="Filter by tags")
     limit: int = Field(100, description="Number of results to return", ge=1, le=100)
     skip: int = Field(0, description="Number of results to skip", ge=0)
+    aggregate: Optional[AggregateSpec] = Field(
+        None,
+        description="Return only counts/sums over all pages instead of the records (limit and skip are ignored)",
+    )
+    live: bool = Field(
+        False, description="Always query the API instead of the local contact mirror"
+    )
+    access_token: Optional[str] = Field(
+        None, description="Optional access token to use instead of stored token"
+    )
+
+
+class LocalSearchContactsParams(BaseModel):
+    """Parameters for full-text contact search over the local mirror"""
+
+    location_id: str = Field(..., description="The location ID to search contacts in")
+    text: Optional[str] = Field(
+        None,
+        description="Words to match as prefixes against name, email, phone, company, address, tags and source",
+    )
+    company: Optional[str] = Field(None, description="Filter by company name (substring)")
+    city: Optional[str] = Field(None, description="Filter by city")
+    state: Optional[str] = Field(None, description="Filter by state")
+    source: Optional[str] = Field(None, description="Filter by contact source")
+    tags: Optional[List[str]] = Field(None, description="Only contacts with all of these tags")
+    assigned_to: Optional[str] = Field(None, description="Filter by assigned user (name, email or ID)")
+    added_after: Optional[str] = Field(None, description="Only contacts added at or after this ISO date")
+    added_before: Optional[str] = Field(None, description="Only contacts added before this ISO date")
+    limit: int = Field(20, description="Number of results to return", ge=1, le=100)
+    skip: int = Field(0, description="Number of results to skip", ge=0)
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -88,6 +125,9 @@ class GetContactParams(BaseModel):
     location_id: str = Field(
         ..., description="The location ID where the contact exists"
     )
+    live: bool = Field(
+        False, description="Always query the API instead of the local contact mirror"
+    )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -53,6 +53,46 @@ class GetMessagesParams(BaseModel):
     location_id: str = Field(..., description="The location ID")
     limit: int = Field(100, description="Number of results to return", ge=1, le=100)
     skip: int = Field(0, description="Number of results to skip", ge=0)
+    last_message_id: Optional[str] = Field(
+        None,
+        description="Paging cursor (last_message_id from the previous page) to fetch older messages",
+    )
+    access_token: Optional[str] = Field(
+        None, description="Optional access token to use instead of stored token"
+    )
+
+
+class GetConversationThreadParams(BaseModel):
+    """Parameters for reading a whole conversation thread"""
+
+    conversation_id: str = Field(..., description="The conversation ID")
+    location_id: str = Field(..., description="The location ID")
+    since_message_id: Optional[str] = Field(
+        None,
+        description="Only return messages newer than this message ID (incremental read)",
+    )
+    max_messages: int = Field(
+        1000, description="Maximum number of messages to return", ge=1, le=10000
+    )
+    access_token: Optional[str] = Field(
+        None, description="Optional access token to use instead of stored token"
+    )
+
+
+class LocalSearchMessagesParams(BaseModel):
+    """Parameters for full-text message search over the local archive"""
+
+    location_id: str = Field(..., description="The location ID")
+    text: str = Field(
+        ..., description="Words to find in message bodies and email subjects (prefixes match)"
+    )
+    contact_id: Optional[str] = Field(None, description="Only messages with this contact")
+    conversation_id: Optional[str] = Field(None, description="Only messages in this conversation")
+    direction: Optional[str] = Field(None, description="Only 'inbound' or 'outbound' messages")
+    after: Optional[str] = Field(None, description="Only messages sent at or after this ISO date")
+    before: Optional[str] = Field(None, description="Only messages sent before this ISO date")
+    limit: int = Field(20, description="Number of results to return", ge=1, le=100)
+    skip: int = Field(0, description="Number of results to skip", ge=0)
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -1,6 +1,7 @@
 """Parameter models for Forms MCP tools"""
 
-from typing import Optional
+from datetime import date, datetime
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -34,6 +35,60 @@ class GetAllSubmissionsParams(BaseModel):
     )
 
 
+class GetSubmissionsBulkParams(BaseModel):
+    """Parameters for fetching every form submission in a date range"""
+
+    location_id: str = Field(..., description="The location ID")
+    start_date: date = Field(..., description="First day of the range (YYYY-MM-DD)")
+    end_date: date = Field(..., description="Last day of the range (YYYY-MM-DD), inclusive")
+    form_id: Optional[str] = Field(None, description="Filter by specific form")
+    window_days: int = Field(
+        default=7, ge=1, le=366, description="Initial size of each date window in days"
+    )
+    max_results: int = Field(
+        default=5000, ge=1, le=100000, description="Maximum number of submissions to return"
+    )
+    resume_after: Optional[datetime] = Field(
+        None,
+        description="Resume point: only return submissions after this timestamp "
+        "(use resume_after from a previous truncated call)",
+    )
+    resume_after_id: Optional[str] = Field(
+        None,
+        description="ID of the last submission returned at resume_after, so others with the same "
+        "timestamp are not skipped (use resume_after_id from a previous truncated call)",
+    )
+    access_token: Optional[str] = Field(
+        None, description="Optional access token override"
+    )
+
+
+class AnalyzeSubmissionsParams(BaseModel):
+    """Parameters for answer analytics over the local submission store"""
+
+    location_id: str = Field(..., description="The location ID")
+    report: Literal["fields", "distribution", "crosstab", "histogram"] = Field(
+        "fields",
+        description="fields lists answered fields; distribution counts answers to a field; "
+        "crosstab counts a field's answers against another's; histogram counts submissions per period",
+    )
+    form_id: Optional[str] = Field(None, description="Only submissions of this form")
+    survey_id: Optional[str] = Field(None, description="Only submissions of this survey")
+    field: Optional[str] = Field(
+        None, description="Field to count answers of (histograms break down by its top answers)"
+    )
+    by: Optional[str] = Field(None, description="Second field for the crosstab report")
+    period: Literal["day", "week", "month"] = Field("month", description="Bucket size for histograms")
+    start: Optional[str] = Field(
+        None, description="Only submissions at or after this ISO date (histogram default: 30 days, 12 weeks or 12 months back)"
+    )
+    end: Optional[str] = Field(None, description="Only submissions before this ISO date")
+    top: int = Field(default=20, ge=1, le=100, description="Number of most common answers to list")
+    access_token: Optional[str] = Field(
+        None, description="Optional access token override"
+    )
+
+
 class UploadFormFileParams(BaseModel):
     """Parameters for uploading a file to a form field"""
 
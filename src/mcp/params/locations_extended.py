@@ -1,6 +1,6 @@
 """Parameter models for extended locations MCP tools"""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from pydantic import BaseModel, Field
 
 
@@ -208,3 +208,33 @@ class SearchLocationTasksParams(BaseModel):
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
+
+
+class SearchTasksLocalParams(BaseModel):
+    """Parameters for task queries over the local task index"""
+
+    location_id: str = Field(..., description="The location ID to search tasks in")
+    assigned_to: Optional[str] = Field(None, description="Filter by assigned user (name, email or ID)")
+    contact_id: Optional[str] = Field(None, description="Filter by contact ID")
+    status: Literal["open", "completed", "all"] = Field("open", description="Which tasks to return")
+    overdue: bool = Field(False, description="Only open tasks whose due date has passed")
+    due_after: Optional[str] = Field(None, description="Only tasks due at or after this ISO date")
+    due_before: Optional[str] = Field(None, description="Only tasks due before this ISO date")
+    due_within_days: Optional[float] = Field(
+        None, description="Only tasks due between now and this many days from now", gt=0
+    )
+    limit: int = Field(100, description="Number of results to return", ge=1, le=500)
+    skip: int = Field(0, description="Number of results to skip", ge=0)
+    access_token: Optional[str] = Field(
+        None, description="Optional access token to use instead of stored token"
+    )
+
+
+class TaskWorkloadParams(BaseModel):
+    """Parameters for per-assignee task counts over the local task index"""
+
+    location_id: str = Field(..., description="The location ID")
+    due_within_days: float = Field(7.0, description="Window in days counted as due soon", gt=0)
+    access_token: Optional[str] = Field(
+        None, description="Optional access token to use instead of stored token"
+    )
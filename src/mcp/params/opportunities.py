@@ -1,25 +1,35 @@
 """Opportunity parameter classes for MCP tools"""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Literal
 from pydantic import BaseModel, Field
 
 from ...models.opportunity import OpportunityStatus
+from .aggregation import AggregateSpec
 
 
 class GetOpportunitiesParams(BaseModel):
     """Parameters for getting opportunities"""
 
     location_id: str = Field(..., description="The location ID")
-    pipeline_id: Optional[str] = Field(None, description="Filter by pipeline ID")
+    pipeline_id: Optional[str] = Field(None, description="Filter by pipeline ID or name")
     pipeline_stage_id: Optional[str] = Field(
-        None, description="Filter by pipeline stage ID"
+        None, description="Filter by pipeline stage ID or name"
+    )
+    assigned_to: Optional[str] = Field(
+        None, description="Filter by assigned user ID, email or name"
     )
-    assigned_to: Optional[str] = Field(None, description="Filter by assigned user ID")
     status: Optional[OpportunityStatus] = Field(None, description="Filter by status")
     contact_id: Optional[str] = Field(None, description="Filter by contact ID")
     query: Optional[str] = Field(None, description="Search query for opportunity name")
     limit: int = Field(100, description="Number of results to return", ge=1, le=100)
     skip: int = Field(0, description="Number of results to skip", ge=0)
+    aggregate: Optional[AggregateSpec] = Field(
+        None,
+        description="Return only counts/sums over all pages instead of the records (limit and skip are ignored)",
+    )
+    include_user_names: bool = Field(
+        False, description="Add display names for assigned users from the cached user directory"
+    )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -30,6 +40,9 @@ class GetOpportunityParams(BaseModel):
 
     opportunity_id: str = Field(..., description="The opportunity ID")
     location_id: str = Field(..., description="The location ID")
+    include_user_names: bool = Field(
+        False, description="Add display names for assigned users from the cached user directory"
+    )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -40,10 +53,10 @@ class CreateOpportunityParams(BaseModel):
 
     location_id: str = Field(..., description="The location ID")
     pipeline_id: str = Field(
-        ..., description="Pipeline ID where the opportunity will be created"
+        ..., description="Pipeline ID or name where the opportunity will be created"
     )
     name: str = Field(..., description="Opportunity name")
-    pipeline_stage_id: str = Field(..., description="Pipeline stage ID")
+    pipeline_stage_id: str = Field(..., description="Pipeline stage ID or name")
     contact_id: str = Field(
         ..., description="Contact ID associated with the opportunity"
     )
@@ -53,11 +66,13 @@ class CreateOpportunityParams(BaseModel):
     monetary_value: Optional[float] = Field(
         None, description="Monetary value of the opportunity"
     )
-    assigned_to: Optional[str] = Field(None, description="User ID of the assigned user")
+    assigned_to: Optional[str] = Field(
+        None, description="User ID, email or name of the assigned user"
+    )
     source: Optional[str] = Field(None, description="Source of the opportunity")
     notes: Optional[str] = Field(None, description="Notes about the opportunity")
     custom_fields: Optional[Dict[str, Any]] = Field(
-        None, description="Custom field values"
+        None, description="Custom field values keyed by field key, name or ID"
     )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
@@ -70,16 +85,21 @@ class UpdateOpportunityParams(BaseModel):
     opportunity_id: str = Field(..., description="The opportunity ID")
     location_id: str = Field(..., description="The location ID")
     name: Optional[str] = Field(None, description="Opportunity name")
-    pipeline_stage_id: Optional[str] = Field(None, description="Pipeline stage ID")
+    pipeline_stage_id: Optional[str] = Field(None, description="Pipeline stage ID or name")
+    pipeline_id: Optional[str] = Field(
+        None, description="Pipeline ID or name, used to resolve a stage name shared by several pipelines"
+    )
     status: Optional[OpportunityStatus] = Field(None, description="Opportunity status")
     monetary_value: Optional[float] = Field(
         None, description="Monetary value of the opportunity"
     )
-    assigned_to: Optional[str] = Field(None, description="User ID of the assigned user")
+    assigned_to: Optional[str] = Field(
+        None, description="User ID, email or name of the assigned user"
+    )
     source: Optional[str] = Field(None, description="Source of the opportunity")
     notes: Optional[str] = Field(None, description="Notes about the opportunity")
     custom_fields: Optional[Dict[str, Any]] = Field(
-        None, description="Custom field values"
+        None, description="Custom field values keyed by field key, name or ID"
     )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
@@ -111,6 +131,9 @@ class GetPipelinesParams(BaseModel):
     """Parameters for getting pipelines"""
 
     location_id: str = Field(..., description="The location ID")
+    refresh: bool = Field(
+        False, description="Reload pipelines from the API instead of the cache"
+    )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -134,3 +157,37 @@ class GetPipelineStagesParams(BaseModel):
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
+
+
+class AnalyzeOpportunitiesParams(BaseModel):
+    """Parameters for pipeline analytics over the local opportunity store"""
+
+    location_id: str = Field(..., description="The location ID")
+    report: Literal["summary", "stage_conversion", "time_in_stage"] = Field(
+        "summary",
+        description=(
+            "summary: counts, value sums and win rates per group; "
+            "stage_conversion: how many deals reached each stage and moved on (needs pipeline_id); "
+            "time_in_stage: days spent in each stage"
+        ),
+    )
+    group_by: List[
+        Literal["pipeline", "stage", "status", "source", "assigned_to", "created_month", "created_week"]
+    ] = Field(default_factory=list, description="Groups for the summary report")
+    pipeline_id: Optional[str] = Field(None, description="Only this pipeline (ID or name)")
+    pipeline_stage_id: Optional[str] = Field(
+        None, description="Only deals currently in this stage (ID or name)"
+    )
+    status: Optional[OpportunityStatus] = Field(None, description="Only deals with this status")
+    source: Optional[str] = Field(None, description="Only deals from this source")
+    assigned_to: Optional[str] = Field(
+        None, description="Only deals assigned to this user (ID, email or name)"
+    )
+    created_after: Optional[str] = Field(None, description="Only deals created at or after this ISO date")
+    created_before: Optional[str] = Field(None, description="Only deals created before this ISO date")
+    stale_days: Optional[float] = Field(
+        None, description="Only open deals that have not changed stage for this many days", ge=0
+    )
+    access_token: Optional[str] = Field(
+        None, description="Optional access token to use instead of stored token"
+    )
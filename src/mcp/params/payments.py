@@ -1,8 +1,10 @@
 """Payment parameter classes for MCP tools"""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from pydantic import BaseModel, Field
 
+from .aggregation import AggregateSpec
+
 
 class GetPaymentOrdersParams(BaseModel):
     """Parameters for getting payment orders"""
@@ -10,6 +12,10 @@ class GetPaymentOrdersParams(BaseModel):
     location_id: str = Field(..., description="The location ID to get payment orders for")
     limit: int = Field(default=100, description="Number of results to return (max 100)")
     skip: int = Field(default=0, description="Number of results to skip")
+    aggregate: Optional[AggregateSpec] = Field(
+        None,
+        description="Return only counts/sums over all pages instead of the records (limit and skip are ignored)",
+    )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -58,6 +64,10 @@ class GetPaymentSubscriptionsParams(BaseModel):
     location_id: str = Field(..., description="The location ID to get payment subscriptions for")
     limit: int = Field(default=100, description="Number of results to return (max 100)")
     skip: int = Field(default=0, description="Number of results to skip")
+    aggregate: Optional[AggregateSpec] = Field(
+        None,
+        description="Return only counts/sums over all pages instead of the records (limit and skip are ignored)",
+    )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -79,6 +89,10 @@ class GetPaymentTransactionsParams(BaseModel):
     location_id: str = Field(..., description="The location ID to get payment transactions for")
     limit: int = Field(default=100, description="Number of results to return (max 100)")
     skip: int = Field(default=0, description="Number of results to skip")
+    aggregate: Optional[AggregateSpec] = Field(
+        None,
+        description="Return only counts/sums over all pages instead of the records (limit and skip are ignored)",
+    )
     access_token: Optional[str] = Field(
         None, description="Optional access token to use instead of stored token"
     )
@@ -94,6 +108,32 @@ class GetPaymentTransactionParams(BaseModel):
     )
 
 
+class ExportPaymentTransactionsParams(BaseModel):
+    """Parameters for exporting new payment transactions to disk"""
+
+    location_id: str = Field(..., description="The location ID to export payment transactions for")
+    access_token: Optional[str] = Field(
+        None, description="Optional access token to use instead of stored token"
+    )
+
+
+class AnalyzePaymentsParams(BaseModel):
+    """Parameters for revenue and subscription analytics over the local payment ledger"""
+
+    location_id: str = Field(..., description="The location ID")
+    period: Literal["day", "week", "month"] = Field("month", description="Bucket size for the report")
+    start: Optional[str] = Field(
+        None, description="ISO date of the first period (default: 30 days, 12 weeks or 12 months back)"
+    )
+    end: Optional[str] = Field(None, description="ISO date the report stops before (default: now)")
+    currency: Optional[str] = Field(
+        None, description="Currency to report in (default: the location's most used currency)"
+    )
+    access_token: Optional[str] = Field(
+        None, description="Optional access token to use instead of stored token"
+    )
+
+
 class GetPaymentIntegrationParams(BaseModel):
     """Parameters for getting payment integration"""
 
@@ -15,6 +15,24 @@ class GetProductsParams(BaseModel):
     )
 
 
+class GetProductCatalogParams(BaseModel):
+    """Parameters for getting the product catalog with prices"""
+
+    location_id: str = Field(..., description="The location ID")
+    product: Optional[str] = Field(
+        None, description="Return only this product, by ID, name or price SKU"
+    )
+    query: Optional[str] = Field(
+        None, description="Return only products whose name or SKU contains this text"
+    )
+    refresh: bool = Field(
+        False, description="Reload the catalog from the API instead of the cache"
+    )
+    access_token: Optional[str] = Field(
+        None, description="Optional access token to use instead of stored token"
+    )
+
+
 class GetProductParams(BaseModel):
     """Parameters for getting a single product"""
 
@@ -0,0 +1,96 @@
+"""Progress reporting for long-running, multi-page MCP tools"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from fastmcp import Context
+
+
+class ProgressReporter:
+    """Sends MCP progress notifications while a tool iterates over pages
+
+    Notifications carry the number of items processed and, in the message,
+    the pages fetched and an ETA once the total is known. They are throttled
+    to one per ``min_interval`` seconds so large exports do not flood the
+    client.
+
+    Used as an async context manager, a final notification is sent when the
+    block exits, including when the tool is cancelled. Cancellation still
+    propagates: the MCP SDK drops the result of a cancelled request, so
+    tools resume from their own checkpoint or cursor instead.
+    """
+
+    def __init__(
+        self,
+        ctx: Optional[Context],
+        total: Optional[int] = None,
+        unit: str = "items",
+        min_interval: float = 0.5,
+    ):
+        self.ctx = ctx
+        self.total = total
+        self.unit = unit
+        self.min_interval = min_interval
+        self.processed = 0
+        self.pages = 0
+        self._started = time.monotonic()
+        self._last_report = 0.0
+
+    async def __aenter__(self) -> "ProgressReporter":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        if exc_type is None or issubclass(exc_type, asyncio.CancelledError):
+            await self.report(force=True)
+        return False
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds remaining, once a total and a rate are known"""
+        if not self.total or not self.processed:
+            return None
+        rate = self.processed / max(self.elapsed, 1e-6)
+        return max(self.total - self.processed, 0) / rate
+
+    def add_total(self, count: int) -> None:
+        """Grow the expected total as it is discovered (e.g. per date window)"""
+        self.total = (self.total or 0) + count
+
+    async def advance(self, items: int = 0, pages: int = 0) -> None:
+        """Record processed items and fetched pages, notifying the client"""
+        self.processed += items
+        self.pages += pages
+        await self.report()
+
+    async def report(self, force: bool = False) -> None:
+        """Send a progress notification unless one was sent very recently"""
+        if self.ctx is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_report < self.min_interval:
+            return
+        self._last_report = now
+
+        message = f"{self.processed} {self.unit}, {self.pages} pages"
+        eta = self.eta_seconds
+        if eta is not None:
+            message += f", ETA {eta:.0f}s"
+        try:
+            await self.ctx.report_progress(self.processed, self.total, message)
+        except Exception:
+            # Progress is best effort; never fail the tool because of it
+            pass
+
+    def summary(self) -> Dict[str, Any]:
+        """Progress counters to include in a tool response"""
+        return {
+            "processed": self.processed,
+            "pages": self.pages,
+            "total": self.total,
+            "elapsed_seconds": round(self.elapsed, 2),
+        }
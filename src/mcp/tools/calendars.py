@@ -4,6 +4,7 @@ from datetime import datetime, date
 from typing import Dict, Any
 
 from ...models.calendar import AppointmentCreate, AppointmentUpdate, AppointmentStatus
+from ...utils.exceptions import ScheduleConflictError, ValidationError
 from ..params.calendars import (
     GetAppointmentsParams,
     GetAppointmentParams,
@@ -13,6 +14,7 @@ from ..params.calendars import (
     GetCalendarsParams,
     GetCalendarParams,
     GetFreeSlotsParams,
+    FindFreeSlotsParams,
 )
 
 
@@ -22,6 +24,16 @@ mcp = None
 get_client = None
 
 
+def _conflict(error: ScheduleConflictError) -> Dict[str, Any]:
+    """Tool result for a booking rejected locally, with free alternatives"""
+    return {
+        "success": False,
+        "error": "Schedule conflict",
+        "message": str(error),
+        **error.response_data,
+    }
+
+
 def _register_calendar_tools(_mcp, _get_client):
     """Register calendar tools with the MCP instance"""
     global mcp, get_client
@@ -37,7 +49,10 @@ def _register_calendar_tools(_mcp, _get_client):
             contact_id=params.contact_id,
             location_id=params.location_id,
         )
-        return {"success": True, "appointments": appointments.model_dump()}
+        result = appointments.model_dump()
+        if params.include_user_names:
+            await client.enrich_user_names(params.location_id, result["appointments"])
+        return {"success": True, "appointments": result}
 
     @mcp.tool()
     async def get_appointment(params: GetAppointmentParams) -> Dict[str, Any]:
@@ -60,6 +75,8 @@ def _register_calendar_tools(_mcp, _get_client):
         - Pacific Time: '2025-06-09T11:00:00-07:00'
 
         The times should match the timezone of the calendar's location.
+        A time overlapping a known appointment or block slot is rejected with
+        free alternatives unless allow_overlap is set.
         """
         client = await get_client(params.access_token)
 
@@ -67,9 +84,11 @@ def _register_calendar_tools(_mcp, _get_client):
         start_time = datetime.fromisoformat(params.start_time.replace("Z", "+00:00"))
         end_time = datetime.fromisoformat(params.end_time.replace("Z", "+00:00"))
 
+        calendar = await client.resolve_calendar(params.location_id, params.calendar_id)
+
         appointment_data = AppointmentCreate(
             locationId=params.location_id,
-            calendarId=params.calendar_id,
+            calendarId=calendar.id,
             contactId=params.contact_id,
             startTime=start_time,
             endTime=end_time,
@@ -80,14 +99,21 @@ def _register_calendar_tools(_mcp, _get_client):
                 if params.appointment_status
                 else AppointmentStatus.CONFIRMED
             ),
-            assignedUserId=params.assigned_user_id,
+            assignedUserId=await client.resolve_user_id(
+                params.location_id, params.assigned_user_id
+            ),
             notes=params.notes,
             address=params.address,
             ignoreDateRange=None,  # Default/optional
             toNotify=None,  # Default/optional
         )
 
-        appointment = await client.create_appointment(appointment_data)
+        try:
+            appointment = await client.create_appointment(
+                appointment_data, allow_overlap=params.allow_overlap
+            )
+        except ScheduleConflictError as e:
+            return _conflict(e)
         return {"success": True, "appointment": appointment.model_dump()}
 
     @mcp.tool()
@@ -115,15 +141,23 @@ def _register_calendar_tools(_mcp, _get_client):
                 if params.appointment_status
                 else None
             ),
-            assignedUserId=params.assigned_user_id,
+            assignedUserId=await client.resolve_user_id(
+                params.location_id, params.assigned_user_id
+            ),
             notes=params.notes,
             address=params.address,
             toNotify=None,  # Default/optional
         )
 
-        appointment = await client.update_appointment(
-            params.appointment_id, update_data, params.location_id
-        )
+        try:
+            appointment = await client.update_appointment(
+                params.appointment_id,
+                update_data,
+                params.location_id,
+                allow_overlap=params.allow_overlap,
+            )
+        except ScheduleConflictError as e:
+            return _conflict(e)
         return {"success": True, "appointment": appointment.model_dump()}
 
     @mcp.tool()
@@ -138,10 +172,10 @@ def _register_calendar_tools(_mcp, _get_client):
 
     @mcp.tool()
     async def get_calendars(params: GetCalendarsParams) -> Dict[str, Any]:
-        """Get all calendars for a location"""
+        """Get all calendars for a location (cached per location)"""
         client = await get_client(params.access_token)
 
-        calendars = await client.get_calendars(params.location_id)
+        calendars = await client.get_calendars(params.location_id, refresh=params.refresh)
         return {"success": True, "calendars": calendars.model_dump()}
 
     @mcp.tool()
@@ -149,7 +183,7 @@ def _register_calendar_tools(_mcp, _get_client):
         """Get a specific calendar"""
         client = await get_client(params.access_token)
 
-        calendar = await client.get_calendar(params.calendar_id, params.location_id)
+        calendar = await client.resolve_calendar(params.location_id, params.calendar_id)
         return {"success": True, "calendar": calendar.model_dump()}
 
     @mcp.tool()
@@ -174,11 +208,59 @@ def _register_calendar_tools(_mcp, _get_client):
         if params.end_date:
             end_date = date.fromisoformat(params.end_date)
 
+        calendar = await client.resolve_calendar(params.location_id, params.calendar_id)
+
         slots = await client.get_free_slots(
-            calendar_id=params.calendar_id,
+            calendar_id=calendar.id,
             location_id=params.location_id,
             start_date=start_date,
             end_date=end_date,
             timezone=params.timezone,
         )
         return {"success": True, "slots": slots.model_dump()}
+
+    @mcp.tool()
+    async def find_free_slots(params: FindFreeSlotsParams) -> Dict[str, Any]:
+        """Find the earliest free slots across several calendars, e.g. a round-robin team
+
+        Give calendar_ids and/or a calendar_group. Slots from all calendars are
+        merged in time order; a time offered by several calendars is listed
+        once with every calendar_id offering it. Each calendar's slots last its
+        configured slot duration.
+        """
+        client = await get_client(params.access_token)
+
+        calendars = [
+            await client.resolve_calendar(params.location_id, ref) for ref in params.calendar_ids
+        ]
+        if params.calendar_group:
+            calendars.extend(
+                await client.resolve_calendar_group(params.location_id, params.calendar_group)
+            )
+        if not calendars:
+            raise ValidationError("Give calendar_ids or a calendar_group with calendars in it")
+
+        start_date = date.fromisoformat(params.start_date)
+        end_date = date.fromisoformat(params.end_date) if params.end_date else None
+        slots = await client.find_free_slots(
+            params.location_id,
+            [calendar.id for calendar in calendars],
+            start_date,
+            end_date,
+            timezone=params.timezone,
+            limit=params.limit,
+        )
+        return {
+            "success": True,
+            "slots": slots,
+            "count": len(slots),
+            "first_available": slots[0] if slots else None,
+            "calendars": [
+                {
+                    "id": calendar.id,
+                    "name": calendar.name,
+                    "slot_minutes": int(calendar.slot_length().total_seconds() // 60),
+                }
+                for calendar in {c.id: c for c in calendars}.values()
+            ],
+        }
@@ -2,15 +2,19 @@
 
 from typing import Dict, Any
 
+from fastmcp import Context
+
 from ...models.contact import ContactCreate, ContactUpdate
 from ...models.task import TaskCreate, TaskUpdate
 from ...models.note import NoteCreate, NoteUpdate
+from ..aggregation import run_aggregate
 from ..params.contacts import (
     CreateContactParams,
     UpdateContactParams,
     DeleteContactParams,
     GetContactParams,
     SearchContactsParams,
+    LocalSearchContactsParams,
     ManageTagsParams,
 )
 from ..params.contact_tasks import (
@@ -44,7 +48,11 @@ def _register_contact_tools(_mcp, _get_client):
 
     @mcp.tool()
     async def create_contact(params: CreateContactParams) -> Dict[str, Any]:
-        """Create a new contact in GoHighLevel"""
+        """Create a new contact in GoHighLevel unless one with the same email or phone exists
+
+        An existing contact is updated instead, or returned unchanged when
+        update_duplicate is false.
+        """
         client = await get_client(params.access_token)
 
         contact_data = ContactCreate(
@@ -60,13 +68,24 @@ def _register_contact_tools(_mcp, _get_client):
             city=params.city,
             state=params.state,
             postalCode=params.postal_code,
-            customFields=[
-                {"key": k, "value": v} for k, v in (params.custom_fields or {}).items()
-            ],
+            customFields=await client.resolve_custom_fields(
+                params.location_id, params.custom_fields or {}
+            ),
         )
 
-        contact = await client.create_contact(contact_data)
-        return {"success": True, "contact": contact.model_dump()}
+        contact, duplicate_of = await client.upsert_contact(
+            contact_data, update_duplicate=params.update_duplicate
+        )
+        if duplicate_of is None:
+            action = "created"
+        else:
+            action = "updated" if params.update_duplicate else "matched"
+        return {
+            "success": True,
+            "contact": contact.model_dump(),
+            "action": action,
+            "duplicate_of": duplicate_of,
+        }
 
     @mcp.tool()
     async def update_contact(params: UpdateContactParams) -> Dict[str, Any]:
@@ -85,10 +104,7 @@ def _register_contact_tools(_mcp, _get_client):
             state=params.state,
             postalCode=params.postal_code,
             customFields=(
-                [
-                    {"key": k, "value": v}
-                    for k, v in (params.custom_fields or {}).items()
-                ]
+                await client.resolve_custom_fields(params.location_id, params.custom_fields)
                 if params.custom_fields
                 else None
             ),
@@ -119,14 +135,27 @@ def _register_contact_tools(_mcp, _get_client):
         """Get a single contact by ID"""
         client = await get_client(params.access_token)
 
-        contact = await client.get_contact(params.contact_id, params.location_id)
+        contact = await client.get_contact(
+            params.contact_id, params.location_id, live=params.live
+        )
         return {"success": True, "contact": contact.model_dump()}
 
     @mcp.tool()
-    async def search_contacts(params: SearchContactsParams) -> Dict[str, Any]:
-        """Search contacts in a location"""
+    async def search_contacts(params: SearchContactsParams, ctx: Context) -> Dict[str, Any]:
+        """Search contacts in a location, or only count them in aggregate mode"""
         client = await get_client(params.access_token)
 
+        if params.aggregate:
+            pages = client.iter_contact_pages(
+                params.location_id,
+                query=params.query,
+                email=params.email,
+                phone=params.phone,
+                tags=params.tags,
+                max_pages=params.aggregate.max_pages,
+            )
+            return await run_aggregate(pages, params.aggregate, ctx, unit="contacts")
+
         result = await client.get_contacts(
             location_id=params.location_id,
             limit=params.limit,
@@ -135,6 +164,7 @@ def _register_contact_tools(_mcp, _get_client):
             email=params.email,
             phone=params.phone,
             tags=params.tags,
+            live=params.live,
         )
 
         return {
@@ -144,6 +174,37 @@ def _register_contact_tools(_mcp, _get_client):
             "total": result.total,
         }
 
+    @mcp.tool()
+    async def search_contacts_local(params: LocalSearchContactsParams) -> Dict[str, Any]:
+        """Ranked full-text search of contacts from the local mirror, with prefix matching and filters"""
+        client = await get_client(params.access_token)
+
+        results, total = await client.search_contacts_local(
+            params.location_id,
+            text=params.text,
+            company=params.company,
+            city=params.city,
+            state=params.state,
+            source=params.source,
+            tags=params.tags,
+            assigned_to=await client.resolve_user_id(params.location_id, params.assigned_to),
+            added_after=params.added_after,
+            added_before=params.added_before,
+            limit=params.limit,
+            skip=params.skip,
+        )
+        state = await client.contact_mirror.state(params.location_id)
+
+        return {
+            "success": True,
+            "contacts": [
+                {**contact.model_dump(), "score": score} for contact, score in results
+            ],
+            "count": len(results),
+            "total": total,
+            "synced_at": state.last_sync,
+        }
+
     @mcp.tool()
     async def add_contact_tags(params: ManageTagsParams) -> Dict[str, Any]:
         """Add tags to a contact"""
@@ -174,9 +235,12 @@ def _register_contact_tools(_mcp, _get_client):
         task_list = await client.get_contact_tasks(
             params.contact_id, params.location_id
         )
+        tasks = [task.model_dump() for task in task_list.tasks]
+        if params.include_user_names:
+            await client.enrich_user_names(params.location_id, tasks)
         return {
             "success": True,
-            "tasks": [task.model_dump() for task in task_list.tasks],
+            "tasks": tasks,
             "count": task_list.count,
             "total": task_list.total,
         }
@@ -200,7 +264,7 @@ def _register_contact_tools(_mcp, _get_client):
             title=params.title,
             body=params.body,
             dueDate=params.due_date,
-            assignedTo=params.assigned_to,
+            assignedTo=await client.resolve_user_id(params.location_id, params.assigned_to),
             completed=params.completed,
         )
 
@@ -218,7 +282,7 @@ def _register_contact_tools(_mcp, _get_client):
             title=params.title,
             body=params.body,
             dueDate=params.due_date,
-            assignedTo=params.assigned_to,
+            assignedTo=await client.resolve_user_id(params.location_id, params.assigned_to),
             completed=params.completed,
         )
 
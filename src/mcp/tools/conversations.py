@@ -1,13 +1,19 @@
 """Conversation tools for GoHighLevel MCP integration"""
 
-from typing import Dict, Any
+from contextlib import aclosing
+from typing import Dict, Any, List
 
-from ...models.conversation import ConversationCreate, MessageCreate, MessageType
+from fastmcp import Context
+
+from ...models.conversation import ConversationCreate, MessageCreate, MessageList, MessageType
+from ..progress import ProgressReporter
 from ..params.conversations import (
     GetConversationsParams,
     GetConversationParams,
     CreateConversationParams,
     GetMessagesParams,
+    GetConversationThreadParams,
+    LocalSearchMessagesParams,
     SendMessageParams,
     UpdateMessageStatusParams,
 )
@@ -82,6 +88,7 @@ def _register_conversation_tools(_mcp, _get_client):
             location_id=params.location_id,
             limit=params.limit,
             skip=params.skip,
+            last_message_id=params.last_message_id,
         )
 
         return {
@@ -89,6 +96,77 @@ def _register_conversation_tools(_mcp, _get_client):
             "messages": [m.model_dump() for m in result.messages],
             "count": result.count,
             "total": result.total,
+            "last_message_id": result.lastMessageId,
+            "next_page": result.nextPage,
+        }
+
+    @mcp.tool()
+    async def get_conversation_thread(
+        params: GetConversationThreadParams, ctx: Context
+    ) -> Dict[str, Any]:
+        """Read a whole conversation thread, following the paging cursor
+
+        Messages are returned newest first. Pass since_message_id (for example the
+        newest message ID from a previous read) to fetch only newer messages.
+        Progress is reported while paging. When the result is truncated, pass the
+        returned newest message ID as since_message_id on a later read.
+        """
+        client = await get_client(params.access_token)
+
+        messages: List[Dict[str, Any]] = []
+        truncated = False
+        async with ProgressReporter(ctx, unit="messages") as progress:
+
+            async def on_page(page: MessageList) -> None:
+                await progress.advance(pages=1)
+
+            thread = client.iter_messages(
+                conversation_id=params.conversation_id,
+                location_id=params.location_id,
+                since_message_id=params.since_message_id,
+                on_page=on_page,
+            )
+            async with aclosing(thread):
+                async for message in thread:
+                    if len(messages) >= params.max_messages:
+                        truncated = True
+                        break
+                    messages.append(message.model_dump())
+                    await progress.advance(items=1)
+
+        return {
+            "success": True,
+            "messages": messages,
+            "count": len(messages),
+            "truncated": truncated,
+            "newest_message_id": messages[0]["id"] if messages else None,
+            "progress": progress.summary(),
+        }
+
+    @mcp.tool()
+    async def search_messages_local(params: LocalSearchMessagesParams) -> Dict[str, Any]:
+        """Full-text search of archived message bodies, returning snippets with conversation and contact IDs"""
+        client = await get_client(params.access_token)
+
+        hits, total = await client.search_messages_local(
+            params.location_id,
+            params.text,
+            contact_id=params.contact_id,
+            conversation_id=params.conversation_id,
+            direction=params.direction,
+            after=params.after,
+            before=params.before,
+            limit=params.limit,
+            skip=params.skip,
+        )
+        state = await client.conversation_archive.state(params.location_id)
+
+        return {
+            "success": True,
+            "messages": hits,
+            "count": len(hits),
+            "total": total,
+            "synced_at": state.last_sync,
         }
 
     @mcp.tool()
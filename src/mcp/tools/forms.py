@@ -1,11 +1,17 @@
 """Form tools for GoHighLevel MCP integration"""
 
-from typing import Dict, Any
+from contextlib import aclosing
+from typing import Dict, Any, List
 
-from ...models.form import FormFileUploadRequest
+from fastmcp import Context
+
+from ...models.form import FormFileUploadRequest, FormSubmissionList
+from ..progress import ProgressReporter
 from ..params.forms import (
+    AnalyzeSubmissionsParams,
     GetFormsParams,
     GetAllSubmissionsParams,
+    GetSubmissionsBulkParams,
     UploadFormFileParams,
 )
 
@@ -67,9 +73,81 @@ def _register_form_tools(_mcp, _get_client):
             "count": submissions.count,
         }
 
+    @mcp.tool()
+    async def get_form_submissions_bulk(
+        params: GetSubmissionsBulkParams, ctx: Context
+    ) -> Dict[str, Any]:
+        """Get every form submission in a date range, oldest first
+
+        The range is fetched in parallel date windows, so month-long pulls are fast.
+        Progress is reported while fetching. When the result is truncated, pass the
+        returned resume_after and resume_after_id to continue.
+        """
+        client = await get_client(params.access_token)
+
+        submissions: List[Dict[str, Any]] = []
+        truncated = False
+        async with ProgressReporter(ctx, unit="submissions") as progress:
+
+            async def on_page(page: FormSubmissionList) -> None:
+                await progress.advance(pages=1)
+
+            stream = client.iter_submissions_by_window(
+                location_id=params.location_id,
+                start_date=params.start_date,
+                end_date=params.end_date,
+                form_id=params.form_id,
+                window_days=params.window_days,
+                after=params.resume_after,
+                after_id=params.resume_after_id,
+                on_page=on_page,
+                on_window_total=progress.add_total,
+            )
+            async with aclosing(stream):
+                async for submission in stream:
+                    if len(submissions) >= params.max_results:
+                        truncated = True
+                        break
+                    submissions.append(submission.model_dump(mode="json"))
+                    await progress.advance(items=1)
+
+        return {
+            "success": True,
+            "submissions": submissions,
+            "count": len(submissions),
+            "truncated": truncated,
+            "resume_after": submissions[-1]["submittedAt"] if truncated and submissions else None,
+            "resume_after_id": submissions[-1]["id"] if truncated and submissions else None,
+            "progress": progress.summary(),
+        }
+
     # NOTE: POST /forms/submit endpoint has been removed
     # The unauthenticated endpoint returns 401 and requires further investigation
 
+    @mcp.tool()
+    async def analyze_submissions(params: AnalyzeSubmissionsParams) -> Dict[str, Any]:
+        """Answer analytics over form and survey submissions from the local store, without paging the API
+
+        Lists the answered fields, counts the answers to a field, cross-tabs
+        two fields or counts submissions per day, week or month.
+        """
+        client = await get_client(params.access_token)
+
+        report = await client.analyze_submissions(
+            params.location_id,
+            report=params.report,
+            source_id=params.form_id or params.survey_id,
+            field=params.field,
+            by=params.by,
+            period=params.period,
+            start=params.start,
+            end=params.end,
+            top=params.top,
+        )
+        state = await client.submission_store.state(params.location_id)
+
+        return {"success": True, **report, "synced_at": state.last_sync}
+
     @mcp.tool()
     async def upload_form_file(params: UploadFormFileParams) -> Dict[str, Any]:
         """Upload a file to a form's custom field
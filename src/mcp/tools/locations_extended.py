@@ -1,5 +1,6 @@
 """Extended locations MCP tools for GoHighLevel integration"""
 
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any
 
 from ...models.location import (
@@ -12,7 +13,7 @@ from ..params.locations_extended import (
     GetLocationTagsParams, GetLocationTagParams, CreateLocationTagParams, UpdateLocationTagParams, DeleteLocationTagParams,
     GetLocationCustomValuesParams, GetLocationCustomValueParams, CreateLocationCustomValueParams, UpdateLocationCustomValueParams, DeleteLocationCustomValueParams,
     GetLocationCustomFieldsParams, GetLocationCustomFieldParams, CreateLocationCustomFieldParams, UpdateLocationCustomFieldParams, DeleteLocationCustomFieldParams,
-    GetLocationTemplatesParams, SearchLocationTasksParams,
+    GetLocationTemplatesParams, SearchLocationTasksParams, SearchTasksLocalParams, TaskWorkloadParams,
 )
 
 
@@ -229,3 +230,58 @@ def _register_locations_extended_tools(_mcp, _get_client):
 
         tasks = await client.search_location_tasks(params.location_id, filters, params.limit, params.skip)
         return {"success": True, "tasks": tasks.model_dump()}
+
+    @mcp.tool()
+    async def search_tasks_local(params: SearchTasksLocalParams) -> Dict[str, Any]:
+        """Tasks by due date, assignee or contact from the local task index, soonest due first
+
+        Answers questions such as overdue tasks for a user or tasks due this
+        week in one local query, without fetching each contact's tasks.
+        """
+        client = await get_client(params.access_token)
+
+        due_after, due_before = params.due_after, params.due_before
+        if params.due_within_days is not None:
+            now = datetime.now(timezone.utc)
+            due_after = due_after or now.isoformat()
+            due_before = due_before or (now + timedelta(days=params.due_within_days)).isoformat()
+        completed = {"open": False, "completed": True, "all": None}[params.status]
+
+        tasks, total = await client.search_tasks_local(
+            params.location_id,
+            assigned_to=await client.resolve_user_id(params.location_id, params.assigned_to),
+            contact_id=params.contact_id,
+            completed=completed,
+            overdue=params.overdue,
+            due_after=due_after,
+            due_before=due_before,
+            limit=params.limit,
+            skip=params.skip,
+        )
+        rows = await client.enrich_user_names(
+            params.location_id, [task.model_dump(mode="json") for task in tasks]
+        )
+        state = await client.task_index.state(params.location_id)
+
+        return {
+            "success": True,
+            "tasks": rows,
+            "count": len(tasks),
+            "total": total,
+            "synced_at": state.last_sync,
+        }
+
+    @mcp.tool()
+    async def task_workload(params: TaskWorkloadParams) -> Dict[str, Any]:
+        """Open, overdue and soon-due task counts per assigned user from the local task index"""
+        client = await get_client(params.access_token)
+
+        rows = await client.task_workload(params.location_id, params.due_within_days)
+        state = await client.task_index.state(params.location_id)
+
+        return {
+            "success": True,
+            "workload": rows,
+            "count": len(rows),
+            "synced_at": state.last_sync,
+        }
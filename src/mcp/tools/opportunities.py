@@ -4,12 +4,15 @@ import sys
 from typing import Dict, Any
 from pathlib import Path
 
+from fastmcp import Context
+
 from ...models.opportunity import (
     OpportunityCreate,
     OpportunityUpdate,
     OpportunityStatus,
     OpportunitySearchFilters,
 )
+from ..aggregation import run_aggregate
 from ..params.opportunities import (
     GetOpportunitiesParams,
     GetOpportunityParams,
@@ -18,6 +21,7 @@ from ..params.opportunities import (
     DeleteOpportunityParams,
     UpdateOpportunityStatusParams,
     GetPipelinesParams,
+    AnalyzeOpportunitiesParams,
 )
 
 
@@ -36,15 +40,19 @@ def _register_opportunity_tools(_mcp, _get_client, _oauth_service):
     oauth_service = _oauth_service
 
     @mcp.tool()
-    async def get_opportunities(params: GetOpportunitiesParams) -> Dict[str, Any]:
-        """Get opportunities for a location"""
+    async def get_opportunities(params: GetOpportunitiesParams, ctx: Context) -> Dict[str, Any]:
+        """Get opportunities for a location, or only totals in aggregate mode"""
         client = await get_client(params.access_token)
 
+        pipeline_id, stage_id = await client.resolve_pipeline_stage(
+            params.location_id, params.pipeline_id, params.pipeline_stage_id
+        )
+
         # Build filters
         filters = OpportunitySearchFilters(
-            pipelineId=params.pipeline_id,
-            pipelineStageId=params.pipeline_stage_id,
-            assignedTo=params.assigned_to,
+            pipelineId=pipeline_id,
+            pipelineStageId=stage_id,
+            assignedTo=await client.resolve_user_id(params.location_id, params.assigned_to),
             status=params.status,
             contactId=params.contact_id,
             startDate=None,
@@ -52,6 +60,12 @@ def _register_opportunity_tools(_mcp, _get_client, _oauth_service):
             query=params.query,
         )
 
+        if params.aggregate:
+            pages = client.iter_opportunity_pages(
+                params.location_id, filters, max_pages=params.aggregate.max_pages
+            )
+            return await run_aggregate(pages, params.aggregate, ctx, unit="opportunities")
+
         result = await client.get_opportunities(
             location_id=params.location_id,
             limit=params.limit,
@@ -59,9 +73,12 @@ def _register_opportunity_tools(_mcp, _get_client, _oauth_service):
             filters=filters,
         )
 
+        opportunities = [o.model_dump() for o in result.opportunities]
+        if params.include_user_names:
+            await client.enrich_user_names(params.location_id, opportunities)
         return {
             "success": True,
-            "opportunities": [o.model_dump() for o in result.opportunities],
+            "opportunities": opportunities,
             "count": result.count,
             "total": result.total,
         }
@@ -74,28 +91,34 @@ def _register_opportunity_tools(_mcp, _get_client, _oauth_service):
         opportunity = await client.get_opportunity(
             params.opportunity_id, params.location_id
         )
-        return {"success": True, "opportunity": opportunity.model_dump()}
+        result = opportunity.model_dump()
+        if params.include_user_names:
+            await client.enrich_user_names(params.location_id, [result])
+        return {"success": True, "opportunity": result}
 
     @mcp.tool()
     async def create_opportunity(params: CreateOpportunityParams) -> Dict[str, Any]:
         """Create a new opportunity in GoHighLevel"""
         client = await get_client(params.access_token)
 
+        pipeline_id, stage_id = await client.resolve_pipeline_stage(
+            params.location_id, params.pipeline_id, params.pipeline_stage_id
+        )
+
         opportunity_data = OpportunityCreate(
-            pipelineId=params.pipeline_id,
+            pipelineId=pipeline_id,
             locationId=params.location_id,
             name=params.name,
-            pipelineStageId=params.pipeline_stage_id,
+            pipelineStageId=stage_id,
             status=params.status or OpportunityStatus.OPEN,
             contactId=params.contact_id,
             monetaryValue=params.monetary_value,
-            assignedTo=params.assigned_to,
+            assignedTo=await client.resolve_user_id(params.location_id, params.assigned_to),
             source=params.source,
             customFields=(
-                [
-                    {"key": k, "value": v}
-                    for k, v in (params.custom_fields or {}).items()
-                ]
+                await client.resolve_custom_fields(
+                    params.location_id, params.custom_fields, model="opportunity"
+                )
                 if params.custom_fields
                 else None
             ),
@@ -109,18 +132,21 @@ def _register_opportunity_tools(_mcp, _get_client, _oauth_service):
         """Update an existing opportunity in GoHighLevel"""
         client = await get_client(params.access_token)
 
+        _, stage_id = await client.resolve_pipeline_stage(
+            params.location_id, params.pipeline_id, params.pipeline_stage_id
+        )
+
         update_data = OpportunityUpdate(
             name=params.name,
-            pipelineStageId=params.pipeline_stage_id,
+            pipelineStageId=stage_id,
             status=params.status,
             monetaryValue=params.monetary_value,
-            assignedTo=params.assigned_to,
+            assignedTo=await client.resolve_user_id(params.location_id, params.assigned_to),
             source=params.source,
             customFields=(
-                [
-                    {"key": k, "value": v}
-                    for k, v in (params.custom_fields or {}).items()
-                ]
+                await client.resolve_custom_fields(
+                    params.location_id, params.custom_fields, model="opportunity"
+                )
                 if params.custom_fields
                 else None
             ),
@@ -169,17 +195,54 @@ def _register_opportunity_tools(_mcp, _get_client, _oauth_service):
 
         NOTE: This is the only pipeline endpoint that exists in the API.
         Individual pipeline and stage endpoints do not exist.
-        Stages are included in each pipeline object.
+        Stages are included in each pipeline object. Results are cached per
+        location; other opportunity tools accept pipeline and stage names and
+        resolve them from the same cache.
         """
         client = await get_client(params.access_token)
 
-        pipelines = await client.get_pipelines(params.location_id)
+        pipelines = await client.get_pipelines(params.location_id, refresh=params.refresh)
         return {
             "success": True,
             "pipelines": [p.model_dump() for p in pipelines],
             "count": len(pipelines),
         }
 
+    @mcp.tool()
+    async def analyze_opportunities(params: AnalyzeOpportunitiesParams) -> Dict[str, Any]:
+        """Pipeline analytics from the local opportunity store, without paging the API
+
+        Answers questions such as value by stage, win rate by source, stage
+        conversion or stale deals over every opportunity in one local query.
+        """
+        client = await get_client(params.access_token)
+
+        pipeline_id, stage_id = await client.resolve_pipeline_stage(
+            params.location_id, params.pipeline_id, params.pipeline_stage_id
+        )
+        rows = await client.analyze_opportunities(
+            params.location_id,
+            report=params.report,
+            group_by=params.group_by,
+            pipeline_id=pipeline_id,
+            stage_id=stage_id,
+            status=params.status.value if params.status else None,
+            source=params.source,
+            assigned_to=await client.resolve_user_id(params.location_id, params.assigned_to),
+            created_after=params.created_after,
+            created_before=params.created_before,
+            stale_days=params.stale_days,
+        )
+        state = await client.opportunity_store.state(params.location_id)
+
+        return {
+            "success": True,
+            "report": params.report,
+            "rows": rows,
+            "count": len(rows),
+            "synced_at": state.last_sync,
+        }
+
     @mcp.tool()
     async def debug_config() -> Dict[str, Any]:
         """Debug tool to show current MCP server configuration and auth status"""
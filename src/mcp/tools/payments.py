@@ -2,7 +2,12 @@
 
 from typing import Dict, Any
 
+from fastmcp import Context
+
 from ...models.payment import PaymentOrderFulfillmentCreate, PaymentIntegrationCreate
+from ...services.exports import TransactionExportService
+from ..aggregation import run_aggregate
+from ..progress import ProgressReporter
 from ..params.payments import (
     GetPaymentOrdersParams,
     GetPaymentOrderParams,
@@ -12,6 +17,8 @@ from ..params.payments import (
     GetPaymentSubscriptionParams,
     GetPaymentTransactionsParams,
     GetPaymentTransactionParams,
+    ExportPaymentTransactionsParams,
+    AnalyzePaymentsParams,
     GetPaymentIntegrationParams,
     CreatePaymentIntegrationParams,
 )
@@ -21,10 +28,16 @@ def _register_payment_tools(mcp, get_client):
     """Register payment-related MCP tools"""
 
     @mcp.tool()
-    async def get_payment_orders(params: GetPaymentOrdersParams) -> Dict[str, Any]:
-        """Get all payment orders for a location"""
+    async def get_payment_orders(params: GetPaymentOrdersParams, ctx: Context) -> Dict[str, Any]:
+        """Get all payment orders for a location, or only totals in aggregate mode"""
         client = await get_client(params.access_token)
 
+        if params.aggregate:
+            pages = client.iter_order_pages(
+                params.location_id, max_pages=params.aggregate.max_pages
+            )
+            return await run_aggregate(pages, params.aggregate, ctx, unit="orders")
+
         orders = await client.get_payment_orders(
             params.location_id, params.limit, params.skip
         )
@@ -67,10 +80,18 @@ def _register_payment_tools(mcp, get_client):
         return {"success": True, "fulfillment": fulfillment.model_dump()}
 
     @mcp.tool()
-    async def get_payment_subscriptions(params: GetPaymentSubscriptionsParams) -> Dict[str, Any]:
-        """Get all payment subscriptions for a location"""
+    async def get_payment_subscriptions(
+        params: GetPaymentSubscriptionsParams, ctx: Context
+    ) -> Dict[str, Any]:
+        """Get all payment subscriptions for a location, or only totals in aggregate mode"""
         client = await get_client(params.access_token)
 
+        if params.aggregate:
+            pages = client.iter_subscription_pages(
+                params.location_id, max_pages=params.aggregate.max_pages
+            )
+            return await run_aggregate(pages, params.aggregate, ctx, unit="subscriptions")
+
         subscriptions = await client.get_payment_subscriptions(
             params.location_id, params.limit, params.skip
         )
@@ -85,10 +106,18 @@ def _register_payment_tools(mcp, get_client):
         return {"success": True, "subscription": subscription.model_dump()}
 
     @mcp.tool()
-    async def get_payment_transactions(params: GetPaymentTransactionsParams) -> Dict[str, Any]:
-        """Get all payment transactions for a location"""
+    async def get_payment_transactions(
+        params: GetPaymentTransactionsParams, ctx: Context
+    ) -> Dict[str, Any]:
+        """Get all payment transactions for a location, or only totals in aggregate mode"""
         client = await get_client(params.access_token)
 
+        if params.aggregate:
+            pages = client.iter_transaction_pages(
+                params.location_id, max_pages=params.aggregate.max_pages
+            )
+            return await run_aggregate(pages, params.aggregate, ctx, unit="transactions")
+
         transactions = await client.get_payment_transactions(
             params.location_id, params.limit, params.skip
         )
@@ -102,6 +131,59 @@ def _register_payment_tools(mcp, get_client):
         transaction = await client.get_payment_transaction(params.transaction_id, params.location_id)
         return {"success": True, "transaction": transaction.model_dump()}
 
+    @mcp.tool()
+    async def export_payment_transactions(
+        params: ExportPaymentTransactionsParams, ctx: Context
+    ) -> Dict[str, Any]:
+        """Export payment transactions newer than the last export to a JSON Lines file
+
+        Only transactions created since the previous run are fetched. A per-day summary is
+        written next to the export, and an interrupted run resumes without duplicating rows.
+        Progress is reported per page; a cancelled export keeps its checkpoint and resumes
+        on the next call.
+        """
+        client = await get_client(params.access_token)
+
+        async with ProgressReporter(ctx, unit="transactions") as progress:
+
+            async def on_page(rows: int) -> None:
+                await progress.advance(items=rows, pages=1)
+
+            result = await TransactionExportService(client).export(
+                params.location_id, on_page=on_page
+            )
+
+        return {
+            "success": True,
+            "export": result.model_dump(mode="json"),
+            "progress": progress.summary(),
+        }
+
+    @mcp.tool()
+    async def analyze_payments(params: AnalyzePaymentsParams) -> Dict[str, Any]:
+        """Revenue and subscription analytics from the local payment ledger, without paging the API
+
+        Reports gross and net revenue, refunds, ARPU, MRR, new and canceled
+        subscriptions and churn per day, week or month.
+        """
+        client = await get_client(params.access_token)
+
+        report = await client.analyze_payments(
+            params.location_id,
+            period=params.period,
+            start=params.start,
+            end=params.end,
+            currency=params.currency,
+        )
+        state = await client.payment_ledger.state(params.location_id)
+
+        return {
+            "success": True,
+            **report,
+            "count": len(report["buckets"]),
+            "synced_at": state.last_sync,
+        }
+
     @mcp.tool()
     async def get_payment_integration(params: GetPaymentIntegrationParams) -> Dict[str, Any]:
         """Get the whitelabel payment integration for a location"""
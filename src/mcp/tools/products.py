@@ -6,6 +6,7 @@ from ...models.product import ProductCreate, ProductUpdate, ProductPriceCreate,
 from ..params.products import (
     GetProductsParams,
     GetProductParams,
+    GetProductCatalogParams,
     CreateProductParams,
     UpdateProductParams,
     DeleteProductParams,
@@ -44,6 +45,34 @@ def _register_product_tools(mcp_instance, get_client_func):
             "total": product_list.total,
         }
 
+    @mcp.tool()
+    async def get_product_catalog(params: GetProductCatalogParams) -> Dict[str, Any]:
+        """Get products with their prices nested, served from the catalog cache
+
+        Use this instead of calling get_product_prices for each product when
+        building orders or quotes.
+        """
+        client = await get_client(params.access_token)
+
+        catalog = await client.get_product_catalog(params.location_id, refresh=params.refresh)
+        if params.product:
+            product = catalog.find(params.product)
+            if product is None:
+                catalog = await client.get_product_catalog(params.location_id, refresh=True)
+                product = catalog.find(params.product)
+            products = [product] if product is not None else []
+        elif params.query:
+            products = catalog.search(params.query)
+        else:
+            products = list(catalog.products.values())
+
+        return {
+            "success": True,
+            "products": [catalog.entry(product) for product in products],
+            "count": len(products),
+            "total": len(catalog.products),
+        }
+
     @mcp.tool()
     async def get_product(params: GetProductParams) -> Dict[str, Any]:
         """Get a specific product"""
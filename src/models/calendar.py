@@ -1,6 +1,6 @@
 """Calendar and appointment models for GoHighLevel API v2"""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List, Union, Dict, Any
 from pydantic import BaseModel, Field, field_validator
 from enum import Enum
@@ -370,6 +370,14 @@ class Calendar(BaseModel):
                 return None
         return v
 
+    def slot_length(self) -> timedelta:
+        """Configured length of a booking slot, 30 minutes when unset"""
+        if not self.slotDuration:
+            return timedelta(minutes=30)
+        if (self.slotDurationUnit or "").lower().startswith("hour"):
+            return timedelta(hours=self.slotDuration)
+        return timedelta(minutes=self.slotDuration)
+
 
 class AppointmentList(BaseModel):
     """Result model for appointment list"""
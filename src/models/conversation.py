@@ -174,3 +174,5 @@ class MessageList(BaseModel):
     messages: List[Message]
     total: Optional[int] = None
     count: int
+    lastMessageId: Optional[str] = None  # Cursor for the next (older) page
+    nextPage: bool = False
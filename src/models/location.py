@@ -220,6 +220,8 @@ class LocationCustomField(BaseModel):
     isRequired: Optional[bool] = Field(None, description="Whether field is required")
     placeholder: Optional[str] = Field(None, description="Field placeholder text")
     options: Optional[List[LocationCustomFieldOption]] = Field(None, description="Field options for select/radio")
+    picklistOptions: Optional[List[str]] = Field(None, description="Allowed values for option fields")
+    model: Optional[str] = Field(None, description="Object the field belongs to (contact or opportunity)")
     createdAt: Optional[datetime] = Field(None, description="Creation date")
     updatedAt: Optional[datetime] = Field(None, description="Last update date")
 
@@ -125,6 +125,7 @@ class ProductPrice(BaseModel):
     type: str  # e.g., "one_time", "recurring"
     currency: str  # e.g., "USD", "INR"
     amount: int  # Amount in cents
+    sku: Optional[str] = None
     membershipOffers: Optional[List[ProductPriceMembershipOffer]] = None
     variantOptionIds: Optional[List[str]] = None
     recurring: Optional[ProductPriceRecurring] = None
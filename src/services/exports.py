@@ -0,0 +1,284 @@
+"""Incremental, checkpointed exports of GoHighLevel data to local files"""
+
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from aiofiles import open as aio_open
+from pydantic import BaseModel, Field
+
+from ..models.payment import PaymentTransaction
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Normalize a timestamp to an aware UTC datetime"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _truncate_partial_line(path: Path, chunk_size: int = 65536) -> None:
+    """Drop a trailing line left half-written by an interrupted run"""
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - chunk_size)
+            f.seek(start)
+            chunk = f.read(position - start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                keep = start + newline + 1
+                break
+            position = start
+        else:
+            keep = 0
+        if keep != end:
+            f.truncate(keep)
+
+
+class TransactionExportState(BaseModel):
+    """Per-location export checkpoint
+
+    ``high_water_mark`` is the newest transaction time covered by a completed
+    run and ``high_water_ids`` the transactions exported at exactly that
+    time, so later runs skip only those and not others sharing it. While a
+    run is in progress its output file and next page offset are recorded so
+    an interrupted run can pick up where it stopped.
+    """
+
+    location_id: str
+    high_water_mark: Optional[datetime] = None
+    high_water_ids: List[str] = Field(default_factory=list)
+    run_file: Optional[str] = None
+    run_started_at: Optional[datetime] = None
+    run_high_water_mark: Optional[datetime] = None
+    run_high_water_ids: List[str] = Field(default_factory=list)
+    next_skip: int = 0
+
+
+class TransactionExportResult(BaseModel):
+    """Outcome of a transaction export run"""
+
+    location_id: str
+    rows_exported: int
+    pages_fetched: int
+    resumed: bool
+    output_file: str
+    summary_file: str
+    previous_high_water_mark: Optional[datetime] = None
+    high_water_mark: Optional[datetime] = None
+
+
+class TransactionExportService:
+    """Exports payment transactions incrementally to JSON Lines files
+
+    Each run fetches only transactions newer than the location's high-water
+    mark, appends them to a run file page by page and checkpoints after every
+    page. Rows already present in the run file are never written twice, so a
+    resumed run does not duplicate output. When the run completes a compact
+    per-day summary is written next to it and the high-water mark advances.
+    """
+
+    CHECKPOINT_FILE = "transactions_checkpoint.json"
+
+    def __init__(self, client, export_dir: Optional[Path] = None, page_size: int = 100):
+        self.client = client
+        if export_dir is None:
+            export_dir = Path(__file__).parent.parent.parent / "exports"
+        self.export_dir = Path(export_dir)
+        self.page_size = page_size
+
+    @property
+    def checkpoint_path(self) -> Path:
+        return self.export_dir / self.CHECKPOINT_FILE
+
+    async def load_state(self, location_id: str) -> TransactionExportState:
+        """Load the checkpoint for a location"""
+        checkpoints = await self._load_checkpoints()
+        if location_id in checkpoints:
+            return TransactionExportState(**checkpoints[location_id])
+        return TransactionExportState(location_id=location_id)
+
+    async def save_state(self, state: TransactionExportState) -> None:
+        """Persist the checkpoint for a location atomically"""
+        checkpoints = await self._load_checkpoints()
+        checkpoints[state.location_id] = state.model_dump(mode="json")
+
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        async with aio_open(tmp_path, "w") as f:
+            await f.write(json.dumps(checkpoints, indent=2))
+        os.replace(tmp_path, self.checkpoint_path)
+
+    async def export(
+        self,
+        location_id: str,
+        on_page: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> TransactionExportResult:
+        """Export every transaction newer than the location's high-water mark
+
+        Args:
+            location_id: The location ID
+            on_page: Awaited after each checkpointed page with the number of
+                rows it added (progress reporting)
+        """
+        state = await self.load_state(location_id)
+        mark = _as_utc(state.high_water_mark) if state.high_water_mark else None
+
+        resumed = state.run_file is not None
+        if not resumed:
+            started = datetime.now(timezone.utc)
+            state.run_started_at = started
+            state.run_file = str(
+                self.export_dir
+                / f"transactions_{location_id}_{started:%Y%m%dT%H%M%S%f}.jsonl"
+            )
+            state.run_high_water_mark = mark
+            state.run_high_water_ids = list(state.high_water_ids)
+            state.next_skip = 0
+            await self.save_state(state)
+
+        seen_at_mark = set(state.high_water_ids)
+        run_path = Path(state.run_file or "")
+        run_path.parent.mkdir(parents=True, exist_ok=True)
+        written_ids = await self._read_exported_ids(run_path)
+
+        rows_exported = 0
+        pages_fetched = 0
+        async with aio_open(run_path, "a") as out:
+            while True:
+                page = await self.client.get_payment_transactions(
+                    location_id,
+                    limit=self.page_size,
+                    skip=state.next_skip,
+                    start_at=mark,
+                )
+                pages_fetched += 1
+                rows_before_page = rows_exported
+
+                reached_mark = bool(page.transactions)
+                for transaction in page.transactions:
+                    created = (
+                        _as_utc(transaction.createdAt) if transaction.createdAt else None
+                    )
+                    if mark is not None and created is not None and (
+                        created < mark or (created == mark and transaction.id in seen_at_mark)
+                    ):
+                        continue
+                    reached_mark = False
+                    if transaction.id in written_ids:
+                        continue
+
+                    await out.write(json.dumps(transaction.model_dump(mode="json")) + "\n")
+                    written_ids.add(transaction.id)
+                    rows_exported += 1
+                    if created is not None:
+                        run_mark = (
+                            _as_utc(state.run_high_water_mark) if state.run_high_water_mark else None
+                        )
+                        if run_mark is None or created > run_mark:
+                            state.run_high_water_mark = created
+                            state.run_high_water_ids = [transaction.id]
+                        elif created == run_mark:
+                            state.run_high_water_ids.append(transaction.id)
+
+                await out.flush()
+                state.next_skip += len(page.transactions)
+                await self.save_state(state)
+                if on_page is not None:
+                    await on_page(rows_exported - rows_before_page)
+
+                # Stop on a short page, or once a whole page is already exported
+                if len(page.transactions) < self.page_size:
+                    break
+                if mark is not None and reached_mark:
+                    break
+
+        summary_path = run_path.with_name(run_path.stem + "_summary.json")
+        await self._write_summary(location_id, run_path, summary_path)
+
+        previous_mark = state.high_water_mark
+        state.high_water_mark = state.run_high_water_mark
+        state.high_water_ids = state.run_high_water_ids
+        state.run_file = None
+        state.run_started_at = None
+        state.run_high_water_mark = None
+        state.run_high_water_ids = []
+        state.next_skip = 0
+        await self.save_state(state)
+
+        return TransactionExportResult(
+            location_id=location_id,
+            rows_exported=rows_exported,
+            pages_fetched=pages_fetched,
+            resumed=resumed,
+            output_file=str(run_path),
+            summary_file=str(summary_path),
+            previous_high_water_mark=previous_mark,
+            high_water_mark=state.high_water_mark,
+        )
+
+    async def _load_checkpoints(self) -> Dict[str, Any]:
+        if not self.checkpoint_path.exists():
+            return {}
+        async with aio_open(self.checkpoint_path, "r") as f:
+            return json.loads(await f.read() or "{}")
+
+    async def _read_exported_ids(self, run_path: Path) -> Set[str]:
+        ids: Set[str] = set()
+        if not run_path.exists():
+            return ids
+
+        _truncate_partial_line(run_path)
+        async with aio_open(run_path, "r") as f:
+            async for line in f:
+                line = line.strip()
+                if line:
+                    ids.add(json.loads(line)["id"])
+        return ids
+
+    async def _write_summary(self, location_id: str, run_path: Path, summary_path: Path) -> None:
+        """Write per-day totals for the rows in a run file"""
+        days: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {
+                "count": 0,
+                "amount": defaultdict(float),
+                "fee": defaultdict(float),
+                "net": defaultdict(float),
+                "statuses": defaultdict(int),
+            }
+        )
+        rows = 0
+        async with aio_open(run_path, "r") as f:
+            async for line in f:
+                try:
+                    transaction = PaymentTransaction(**json.loads(line))
+                except ValueError:
+                    continue
+                rows += 1
+                day_key = (
+                    _as_utc(transaction.createdAt).date().isoformat()
+                    if transaction.createdAt
+                    else "unknown"
+                )
+                currency = transaction.currency or "unknown"
+                day = days[day_key]
+                day["count"] += 1
+                day["amount"][currency] += transaction.amount or 0.0
+                day["fee"][currency] += transaction.fee or 0.0
+                day["net"][currency] += transaction.netAmount or 0.0
+                day["statuses"][transaction.status or "unknown"] += 1
+
+        summary = {
+            "location_id": location_id,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "source_file": run_path.name,
+            "rows": rows,
+            "days": {key: days[key] for key in sorted(days)},
+        }
+        async with aio_open(summary_path, "w") as f:
+            await f.write(json.dumps(summary, indent=2))
@@ -0,0 +1,32 @@
+"""Local SQLite mirrors of GoHighLevel location data"""
+
+from .base import SyncedStore, SyncState, normalize_timestamp
+from .contacts import ContactMirror
+from .conversations import ConversationArchive
+from .database import LocalDatabase
+from .duplicates import DuplicateIndex, normalize_email, normalize_phone
+from .opportunities import OpportunityStore
+from .payments import PaymentLedger
+from .schedule import Booking, ScheduleIndex
+from .settings import StoreSettings
+from .submissions import SubmissionStore
+from .tasks import TaskIndex
+
+__all__ = [
+    "Booking",
+    "ContactMirror",
+    "ConversationArchive",
+    "DuplicateIndex",
+    "LocalDatabase",
+    "OpportunityStore",
+    "PaymentLedger",
+    "ScheduleIndex",
+    "StoreSettings",
+    "SubmissionStore",
+    "SyncState",
+    "SyncedStore",
+    "TaskIndex",
+    "normalize_email",
+    "normalize_phone",
+    "normalize_timestamp",
+]
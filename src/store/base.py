@@ -0,0 +1,269 @@
+"""Per-location local mirrors kept current by background syncs"""
+
+import asyncio
+import re
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from ..utils.exceptions import ValidationError
+from .database import LocalDatabase
+
+
+def normalize_timestamp(value: Any) -> Optional[str]:
+    """ISO-8601 UTC text for an API timestamp, so stored values sort correctly"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        # Epoch milliseconds
+        parsed = datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+    elif isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def epoch_seconds(value: Any) -> Optional[float]:
+    """Seconds since the epoch for an API timestamp, for arithmetic and bisection"""
+    stamp = normalize_timestamp(value)
+    if stamp is None:
+        return None
+    return datetime.fromisoformat(stamp.replace("Z", "+00:00")).timestamp()
+
+
+def timestamp_bound(value: Any, name: str) -> Optional[str]:
+    """Normalized timestamp of an optional query bound, rejecting one that cannot be parsed"""
+    if value is None or value == "":
+        return None
+    stamp = normalize_timestamp(value)
+    if stamp is None:
+        raise ValidationError(f"Invalid {name} '{value}'; use an ISO-8601 date or timestamp")
+    return stamp
+
+
+def epoch_bound(value: Any, name: str) -> Optional[float]:
+    """Epoch seconds of an optional query bound, rejecting one that cannot be parsed"""
+    stamp = timestamp_bound(value, name)
+    return epoch_seconds(stamp) if stamp is not None else None
+
+
+# Bucket sizes for time-series reports; weeks start on Monday
+PERIODS = ("day", "week", "month")
+
+
+def period_start(moment: datetime, period: str) -> datetime:
+    """Start of the day, week or month containing ``moment``"""
+    moment = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "week":
+        return moment - timedelta(days=moment.weekday())
+    if period == "month":
+        return moment.replace(day=1)
+    return moment
+
+
+def next_period(moment: datetime, period: str) -> datetime:
+    """Start of the period after the one starting at ``moment``"""
+    if period == "day":
+        return moment + timedelta(days=1)
+    if period == "week":
+        return moment + timedelta(days=7)
+    return (moment.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def period_label(moment: datetime, period: str) -> str:
+    """``2025-01-31``, ``2025-W05`` or ``2025-01`` for a period start"""
+    if period == "week":
+        year, week, _ = moment.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "month":
+        return moment.strftime("%Y-%m")
+    return moment.strftime("%Y-%m-%d")
+
+
+def fts_prefix_query(terms: List[str]) -> Optional[str]:
+    """An FTS5 query matching every term as a prefix
+
+    Terms are quoted so user input cannot inject FTS syntax.
+    """
+    terms = [t for term in terms for t in re.findall(r"\w+", term)]
+    return " ".join(f'"{term}"*' for term in terms) or None
+
+
+# Overlap subtracted from a full load's start when it becomes the high-water
+# mark, so changes made while the load was paging are fetched again
+FULL_LOAD_OVERLAP = 60.0
+
+
+def full_load_mark(started_at: float) -> Optional[str]:
+    """High-water mark after a full load that started at ``started_at``"""
+    return normalize_timestamp((started_at - FULL_LOAD_OVERLAP) * 1000)
+
+
+class SyncState(BaseModel):
+    """Progress of a location's mirror"""
+
+    high_water_mark: Optional[str] = None
+    last_sync: Optional[float] = None
+    last_full_sync: Optional[float] = None
+
+
+class SyncedStore(ABC):
+    """A local mirror of one entity, synced per location
+
+    The first sync of a location is a full load; later syncs fetch only
+    records changed since the high-water mark, and a full load is repeated
+    every ``full_sync_interval`` to drop records deleted elsewhere.
+
+    Reads call ``ready``: it starts a background sync when the last one is
+    older than ``sync_interval`` and reports whether the mirror is fresh
+    enough (synced within ``max_staleness``) to answer from. Until then
+    callers should fall back to the API.
+    """
+
+    entity: str = ""
+    # Bumped when the store's tables change; older tables are dropped and
+    # reloaded in full
+    schema_version: int = 1
+    tables: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        db: LocalDatabase,
+        sync_interval: float = 60.0,
+        max_staleness: float = 300.0,
+        full_sync_interval: float = 86400.0,
+    ):
+        self.db = db
+        self.sync_interval = sync_interval
+        self.max_staleness = max_staleness
+        self.full_sync_interval = full_sync_interval
+        self._states: Dict[str, SyncState] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._syncing: Dict[str, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        db.call(self._migrate)
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        """Create the store's tables if they do not exist"""
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        row = conn.execute(
+            "SELECT version FROM store_schema WHERE entity = ?", (self.entity,)
+        ).fetchone()
+        if row is None or row["version"] != self.schema_version:
+            for table in self.tables:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute("DELETE FROM sync_state WHERE entity = ?", (self.entity,))
+            conn.execute(
+                "INSERT OR REPLACE INTO store_schema (entity, version) VALUES (?, ?)",
+                (self.entity, self.schema_version),
+            )
+        self._create_schema(conn)
+
+    @abstractmethod
+    async def _full_load(self, location_id: str, started_at: float) -> Optional[str]:
+        """Replace the location's records, returning the new high-water mark"""
+
+    @abstractmethod
+    async def _incremental(self, location_id: str, since: str) -> Optional[str]:
+        """Apply records changed since ``since``, returning the new high-water mark"""
+
+    async def state(self, location_id: str) -> SyncState:
+        state = self._states.get(location_id)
+        if state is None:
+            def read(conn: sqlite3.Connection) -> Optional[sqlite3.Row]:
+                return conn.execute(
+                    "SELECT high_water_mark, last_sync, last_full_sync FROM sync_state "
+                    "WHERE entity = ? AND location_id = ?",
+                    (self.entity, location_id),
+                ).fetchone()
+
+            row = await self.db.run(read)
+            state = SyncState(**dict(row)) if row is not None else SyncState()
+            self._states[location_id] = state
+        return state
+
+    async def _save_state(self, location_id: str, state: SyncState) -> None:
+        self._states[location_id] = state
+
+        def write(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state "
+                "(entity, location_id, high_water_mark, last_sync, last_full_sync) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.entity, location_id, state.high_water_mark, state.last_sync, state.last_full_sync),
+            )
+
+        await self.db.run(write)
+
+    async def sync(self, location_id: str, full: bool = False) -> SyncState:
+        """Bring the location's mirror up to date; concurrent calls share one sync"""
+        requested_at = time.time()
+        lock = self._locks.setdefault(location_id, asyncio.Lock())
+        async with lock:
+            state = await self.state(location_id)
+            if state.last_sync is not None and state.last_sync >= requested_at and not full:
+                return state
+
+            started_at = time.time()
+            since = state.high_water_mark
+            needs_full = (
+                full
+                or state.last_full_sync is None
+                or started_at - state.last_full_sync >= self.full_sync_interval
+            )
+            if needs_full or since is None:
+                mark = await self._full_load(location_id, started_at)
+                state = SyncState(high_water_mark=mark, last_sync=started_at, last_full_sync=started_at)
+            else:
+                mark = await self._incremental(location_id, since)
+                state = SyncState(
+                    high_water_mark=max(mark or since, since),
+                    last_sync=started_at,
+                    last_full_sync=state.last_full_sync,
+                )
+            await self._save_state(location_id, state)
+            return state
+
+    def _sync_in_background(self, location_id: str) -> None:
+        if location_id in self._syncing:
+            return
+
+        async def run() -> None:
+            try:
+                await self.sync(location_id)
+            except Exception:
+                # Reads fall back to the API until a sync succeeds
+                pass
+            finally:
+                self._syncing.pop(location_id, None)
+
+        task = asyncio.create_task(run())
+        self._syncing[location_id] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> None:
+        """Cancel background syncs and wait for them, before the database is closed"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def ready(self, location_id: str) -> bool:
+        """Whether reads can be answered locally; starts a background sync when due"""
+        state = await self.state(location_id)
+        age = None if state.last_sync is None else time.time() - state.last_sync
+        if age is None or age >= self.sync_interval:
+            self._sync_in_background(location_id)
+        return age is not None and age < self.max_staleness
@@ -0,0 +1,329 @@
+"""Local SQLite mirror of a location's contacts"""
+
+import json
+import re
+import sqlite3
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..api.contacts import ContactsClient
+from .base import SyncedStore, fts_prefix_query, full_load_mark, normalize_timestamp, timestamp_bound
+from .database import LocalDatabase
+
+
+# bm25 weights of the full-text columns: name, email, phone, company,
+# address, tags, source
+FTS_WEIGHTS = (10.0, 4.0, 4.0, 3.0, 1.0, 2.0, 1.0)
+
+_PHONE_LIKE = re.compile(r"[\d\s()+.-]+")
+
+
+def _display_name(contact: Dict[str, Any]) -> str:
+    full_name = " ".join(p for p in (contact.get("firstName"), contact.get("lastName")) if p)
+    return contact.get("contactName") or contact.get("name") or full_name
+
+
+def _phone_terms(phone: Optional[str]) -> str:
+    """Phone digits with and without the country code, so either prefix matches"""
+    digits = re.sub(r"\D", "", phone or "")
+    return " ".join(dict.fromkeys(d for d in (digits, digits[-10:]) if d))
+
+
+def fts_query(text: str) -> Optional[str]:
+    """An FTS5 query matching every word of ``text`` as a prefix
+
+    Phone-like input is collapsed to its digits.
+    """
+    if _PHONE_LIKE.fullmatch(text.strip()) and re.search(r"\d", text):
+        return fts_prefix_query([re.sub(r"\D", "", text)])
+    return fts_prefix_query([text])
+
+
+class ContactMirror(SyncedStore):
+    """Contacts per location, loaded in full once and then synced on ``dateUpdated``
+
+    Rows keep the API's raw contact dict, plus the columns searches filter
+    and sort on. An FTS5 index over names, email, phone, company, address,
+    tags and source (rowid-linked to ``contacts``) backs ranked text search.
+    """
+
+    entity = "contacts"
+    schema_version = 2
+    tables = ("contacts", "contacts_fts")
+
+    def __init__(self, client: ContactsClient, db: LocalDatabase, page_size: int = 100, **kwargs: Any):
+        super().__init__(db, **kwargs)
+        self._client = client
+        self.page_size = page_size
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS contacts (
+                location_id TEXT NOT NULL,
+                id TEXT NOT NULL,
+                name TEXT,
+                email_lower TEXT,
+                phone TEXT,
+                company_name TEXT,
+                city TEXT,
+                state TEXT,
+                source TEXT,
+                assigned_to TEXT,
+                tags TEXT NOT NULL DEFAULT '[]',
+                date_added TEXT,
+                date_updated TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (location_id, id)
+            );
+            CREATE INDEX IF NOT EXISTS contacts_by_date_added
+                ON contacts (location_id, date_added DESC);
+            CREATE INDEX IF NOT EXISTS contacts_by_email
+                ON contacts (location_id, email_lower);
+            CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+                name, email, phone, company, address, tags, source,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            );
+            """
+        )
+
+    @staticmethod
+    def _row(location_id: str, contact: Dict[str, Any]) -> Tuple[Any, ...]:
+        email = contact.get("emailLowerCase") or contact.get("email")
+        return (
+            location_id,
+            contact["id"],
+            _display_name(contact),
+            email.lower() if email else None,
+            contact.get("phone"),
+            contact.get("companyName"),
+            contact.get("city"),
+            contact.get("state"),
+            contact.get("source"),
+            contact.get("assignedTo"),
+            json.dumps(contact.get("tags") or []),
+            normalize_timestamp(contact.get("dateAdded")),
+            normalize_timestamp(contact.get("dateUpdated")),
+            json.dumps(contact, default=str),
+        )
+
+    @staticmethod
+    def _fts_row(location_id: str, contact: Dict[str, Any]) -> Tuple[Any, ...]:
+        address = " ".join(
+            str(contact[key])
+            for key in ("address1", "city", "state", "postalCode", "country")
+            if contact.get(key)
+        )
+        emails = [contact.get("email"), *(contact.get("additionalEmails") or [])]
+        return (
+            _display_name(contact),
+            " ".join(e for e in emails if isinstance(e, str)),
+            _phone_terms(contact.get("phone")),
+            contact.get("companyName"),
+            address,
+            " ".join(contact.get("tags") or []),
+            contact.get("source"),
+            location_id,
+            contact["id"],
+        )
+
+    def _unindex(self, conn: sqlite3.Connection, location_id: str, contact_ids: Iterable[str]) -> None:
+        conn.executemany(
+            "DELETE FROM contacts_fts WHERE rowid = "
+            "(SELECT rowid FROM contacts WHERE location_id = ? AND id = ?)",
+            [(location_id, contact_id) for contact_id in contact_ids],
+        )
+
+    def _upsert(self, conn: sqlite3.Connection, location_id: str, contacts: Iterable[Dict[str, Any]]) -> None:
+        contacts = [c for c in contacts if c.get("id")]
+        self._unindex(conn, location_id, [c["id"] for c in contacts])
+        # An upsert rather than REPLACE keeps the rowid the index links to
+        conn.executemany(
+            "INSERT INTO contacts (location_id, id, name, email_lower, phone, company_name, "
+            "city, state, source, assigned_to, tags, date_added, date_updated, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (location_id, id) DO UPDATE SET name = excluded.name, "
+            "email_lower = excluded.email_lower, phone = excluded.phone, "
+            "company_name = excluded.company_name, city = excluded.city, state = excluded.state, "
+            "source = excluded.source, assigned_to = excluded.assigned_to, tags = excluded.tags, "
+            "date_added = excluded.date_added, date_updated = excluded.date_updated, data = excluded.data",
+            [self._row(location_id, c) for c in contacts],
+        )
+        conn.executemany(
+            "INSERT INTO contacts_fts (rowid, name, email, phone, company, address, tags, source) "
+            "SELECT rowid, ?, ?, ?, ?, ?, ?, ? FROM contacts WHERE location_id = ? AND id = ?",
+            [self._fts_row(location_id, c) for c in contacts],
+        )
+
+    def _delete(self, conn: sqlite3.Connection, location_id: str, contact_ids: Iterable[str]) -> None:
+        contact_ids = list(contact_ids)
+        self._unindex(conn, location_id, contact_ids)
+        conn.executemany(
+            "DELETE FROM contacts WHERE location_id = ? AND id = ?",
+            [(location_id, contact_id) for contact_id in contact_ids],
+        )
+
+    async def _full_load(self, location_id: str, started_at: float) -> Optional[str]:
+        seen: Set[str] = set()
+        async for page in self._client.iter_contact_pages(location_id, page_size=self.page_size):
+            seen.update(c["id"] for c in page if c.get("id"))
+            await self.db.run(partial(self._upsert, location_id=location_id, contacts=page))
+
+        mark = full_load_mark(started_at)
+
+        def drop_missing(conn: sqlite3.Connection) -> None:
+            # Rows written through the client during the load are kept
+            stored = conn.execute(
+                "SELECT id FROM contacts WHERE location_id = ? AND (date_updated IS NULL OR date_updated < ?)",
+                (location_id, mark),
+            ).fetchall()
+            self._delete(conn, location_id, [row["id"] for row in stored if row["id"] not in seen])
+
+        await self.db.run(drop_missing)
+        return mark
+
+    async def _incremental(self, location_id: str, since: str) -> Optional[str]:
+        mark: Optional[str] = None
+        async for page in self._client.iter_contacts_updated_since(location_id, since, self.page_size):
+            await self.db.run(partial(self._upsert, location_id=location_id, contacts=page))
+            for contact in page:
+                updated = normalize_timestamp(contact.get("dateUpdated"))
+                if updated is not None and (mark is None or updated > mark):
+                    mark = updated
+        return mark
+
+    async def put(self, location_id: str, contact: Dict[str, Any]) -> None:
+        """Write a contact returned by the API through to the mirror"""
+        await self.db.run(lambda conn: self._upsert(conn, location_id, [contact]))
+
+    async def remove(self, location_id: str, contact_id: str) -> None:
+        await self.db.run(lambda conn: self._delete(conn, location_id, [contact_id]))
+
+    async def get(self, location_id: str, contact_id: str) -> Optional[Dict[str, Any]]:
+        """The mirrored contact, or None when it is not in the mirror"""
+        row = await self.db.run(
+            lambda conn: conn.execute(
+                "SELECT data FROM contacts WHERE location_id = ? AND id = ?",
+                (location_id, contact_id),
+            ).fetchone()
+        )
+        return json.loads(row["data"]) if row is not None else None
+
+    async def search(
+        self,
+        location_id: str,
+        query: Optional[str] = None,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        limit: int = 100,
+        skip: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Filter mirrored contacts like GET /contacts, returning ``(page, total)``
+
+        ``query`` matches a substring of the name, email, phone or company;
+        every tag given must be on the contact. Newest contacts come first.
+        """
+        where = ["location_id = ?"]
+        args: List[Any] = [location_id]
+        if query:
+            where.append(
+                "(name LIKE ? OR email_lower LIKE ? OR phone LIKE ? OR company_name LIKE ?)"
+            )
+            pattern = f"%{query.strip()}%"
+            args.extend([pattern] * 4)
+        if email:
+            where.append("email_lower = ?")
+            args.append(email.strip().lower())
+        if phone:
+            where.append("phone = ?")
+            args.append(phone.strip())
+        for tag in tags or []:
+            where.append("EXISTS (SELECT 1 FROM json_each(contacts.tags) WHERE value = ?)")
+            args.append(tag)
+        clause = " AND ".join(where)
+
+        def run(conn: sqlite3.Connection) -> Tuple[List[Dict[str, Any]], int]:
+            total = conn.execute(f"SELECT COUNT(*) FROM contacts WHERE {clause}", args).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT data FROM contacts WHERE {clause} "
+                "ORDER BY date_added DESC, id LIMIT ? OFFSET ?",
+                [*args, limit, skip],
+            ).fetchall()
+            return [json.loads(row["data"]) for row in rows], total
+
+        return await self.db.run(run)
+
+    async def search_text(
+        self,
+        location_id: str,
+        text: Optional[str] = None,
+        company: Optional[str] = None,
+        city: Optional[str] = None,
+        state: Optional[str] = None,
+        source: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        assigned_to: Optional[str] = None,
+        added_after: Optional[str] = None,
+        added_before: Optional[str] = None,
+        limit: int = 20,
+        skip: int = 0,
+    ) -> Tuple[List[Tuple[Dict[str, Any], Optional[float]]], int]:
+        """Ranked full-text search with structured filters, returning ``(page, total)``
+
+        Every word of ``text`` must prefix-match a word in the name, email,
+        phone, company, address, tags or source; matches are ranked by bm25
+        with name hits weighted highest and paired with their score. Without
+        ``text`` the filtered contacts come newest first, unscored.
+        """
+        match = fts_query(text) if text else None
+        joins = ""
+        where = ["c.location_id = ?"]
+        args: List[Any] = [location_id]
+        if match is not None:
+            joins = "JOIN contacts_fts ON contacts_fts.rowid = c.rowid"
+            where.append("contacts_fts MATCH ?")
+            args.append(match)
+        if company:
+            where.append("c.company_name LIKE ?")
+            args.append(f"%{company.strip()}%")
+        for column, value in (("city", city), ("state", state), ("source", source)):
+            if value:
+                where.append(f"c.{column} = ? COLLATE NOCASE")
+                args.append(value.strip())
+        if assigned_to:
+            where.append("c.assigned_to = ?")
+            args.append(assigned_to)
+        for tag in tags or []:
+            where.append("EXISTS (SELECT 1 FROM json_each(c.tags) WHERE value = ?)")
+            args.append(tag)
+        for condition, value, name in (
+            ("c.date_added >= ?", added_after, "added_after"),
+            ("c.date_added < ?", added_before, "added_before"),
+        ):
+            bound = timestamp_bound(value, name)
+            if bound is not None:
+                where.append(condition)
+                args.append(bound)
+        clause = " AND ".join(where)
+        if match is not None:
+            weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+            score = f"-bm25(contacts_fts, {weights})"
+            order = "score DESC, c.date_added DESC"
+        else:
+            score = "NULL"
+            order = "c.date_added DESC, c.id"
+
+        def run(conn: sqlite3.Connection) -> Tuple[List[Tuple[Dict[str, Any], Optional[float]]], int]:
+            total = conn.execute(
+                f"SELECT COUNT(*) FROM contacts c {joins} WHERE {clause}", args
+            ).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT c.data, {score} AS score FROM contacts c {joins} WHERE {clause} "
+                f"ORDER BY {order} LIMIT ? OFFSET ?",
+                [*args, limit, skip],
+            ).fetchall()
+            return [(json.loads(row["data"]), row["score"]) for row in rows], total
+
+        return await self.db.run(run)
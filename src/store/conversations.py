@@ -0,0 +1,283 @@
+"""Local SQLite archive of a location's conversations and messages"""
+
+import asyncio
+import html
+import json
+import re
+import sqlite3
+from contextlib import aclosing
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..api.conversations import ConversationsClient
+from .base import SyncedStore, fts_prefix_query, full_load_mark, normalize_timestamp, timestamp_bound
+from .database import LocalDatabase
+
+_TAG = re.compile(r"<[^>]+>")
+_SPACE = re.compile(r"\s+")
+
+
+def plain_text(body: Optional[str]) -> str:
+    """Message body without HTML markup, for indexing and snippets"""
+    if not body:
+        return ""
+    if "<" in body:
+        body = html.unescape(_TAG.sub(" ", body))
+    return _SPACE.sub(" ", body).strip()
+
+
+def _subject(message: Dict[str, Any]) -> Optional[str]:
+    meta = message.get("meta") or {}
+    email = meta.get("email") if isinstance(meta, dict) else None
+    subject = (email or {}).get("subject") if isinstance(email, dict) else None
+    return subject or message.get("subject")
+
+
+class ConversationArchive(SyncedStore):
+    """Conversations and their messages per location, synced on ``lastMessageDate``
+
+    Each sync walks conversations newest message first and, for every
+    conversation whose last message is newer than the high-water mark,
+    fetches only the messages after the newest one archived. Message bodies
+    and email subjects are indexed with FTS5 for snippet search.
+    """
+
+    entity = "conversations"
+    tables = ("conversations", "messages", "messages_fts")
+
+    def __init__(
+        self,
+        client: ConversationsClient,
+        db: LocalDatabase,
+        page_size: int = 100,
+        concurrency: int = 4,
+        **kwargs: Any,
+    ):
+        super().__init__(db, **kwargs)
+        self._client = client
+        self.page_size = page_size
+        self.concurrency = concurrency
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS conversations (
+                location_id TEXT NOT NULL,
+                id TEXT NOT NULL,
+                contact_id TEXT,
+                contact_name TEXT,
+                last_message_date TEXT,
+                newest_message_id TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (location_id, id)
+            );
+            CREATE TABLE IF NOT EXISTS messages (
+                location_id TEXT NOT NULL,
+                id TEXT NOT NULL,
+                conversation_id TEXT NOT NULL,
+                contact_id TEXT,
+                direction TEXT,
+                message_type TEXT,
+                date_added TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (location_id, id)
+            );
+            CREATE INDEX IF NOT EXISTS messages_by_conversation
+                ON messages (location_id, conversation_id, date_added);
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                subject, body,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+            """
+        )
+
+    @staticmethod
+    def _put_conversation(
+        conn: sqlite3.Connection, location_id: str, conversation: Dict[str, Any], newest_message_id: Optional[str]
+    ) -> None:
+        conn.execute(
+            "INSERT INTO conversations (location_id, id, contact_id, contact_name, last_message_date, "
+            "newest_message_id, data) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (location_id, id) DO UPDATE SET contact_id = excluded.contact_id, "
+            "contact_name = excluded.contact_name, last_message_date = excluded.last_message_date, "
+            "newest_message_id = COALESCE(excluded.newest_message_id, conversations.newest_message_id), "
+            "data = excluded.data",
+            (
+                location_id,
+                conversation["id"],
+                conversation.get("contactId"),
+                conversation.get("fullName") or conversation.get("contactName"),
+                normalize_timestamp(conversation.get("lastMessageDate")),
+                newest_message_id,
+                json.dumps(conversation, default=str),
+            ),
+        )
+
+    @staticmethod
+    def _put_messages(conn: sqlite3.Connection, location_id: str, messages: Iterable[Dict[str, Any]]) -> None:
+        for message in messages:
+            key = (location_id, message["id"])
+            conn.execute(
+                "DELETE FROM messages_fts WHERE rowid = "
+                "(SELECT rowid FROM messages WHERE location_id = ? AND id = ?)",
+                key,
+            )
+            # An upsert rather than REPLACE keeps the rowid the index links to
+            conn.execute(
+                "INSERT INTO messages (location_id, id, conversation_id, contact_id, direction, "
+                "message_type, date_added, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (location_id, id) DO UPDATE SET conversation_id = excluded.conversation_id, "
+                "contact_id = excluded.contact_id, direction = excluded.direction, "
+                "message_type = excluded.message_type, date_added = excluded.date_added, data = excluded.data",
+                (
+                    *key,
+                    message.get("conversationId"),
+                    message.get("contactId"),
+                    message.get("direction"),
+                    message.get("messageType") or str(message.get("type") or ""),
+                    normalize_timestamp(message.get("dateAdded")),
+                    json.dumps(message, default=str),
+                ),
+            )
+            conn.execute(
+                "INSERT INTO messages_fts (rowid, subject, body) "
+                "SELECT rowid, ?, ? FROM messages WHERE location_id = ? AND id = ?",
+                (_subject(message), plain_text(message.get("body")), *key),
+            )
+
+    @staticmethod
+    def _delete_conversations(conn: sqlite3.Connection, location_id: str, conversation_ids: Iterable[str]) -> None:
+        for conversation_id in conversation_ids:
+            key = (location_id, conversation_id)
+            conn.execute(
+                "DELETE FROM messages_fts WHERE rowid IN "
+                "(SELECT rowid FROM messages WHERE location_id = ? AND conversation_id = ?)",
+                key,
+            )
+            conn.execute("DELETE FROM messages WHERE location_id = ? AND conversation_id = ?", key)
+            conn.execute("DELETE FROM conversations WHERE location_id = ? AND id = ?", key)
+
+    async def _archive(self, location_id: str, conversation: Dict[str, Any]) -> None:
+        """Fetch the conversation's messages newer than the newest archived one"""
+        row = await self.db.run(
+            lambda conn: conn.execute(
+                "SELECT newest_message_id FROM conversations WHERE location_id = ? AND id = ?",
+                (location_id, conversation["id"]),
+            ).fetchone()
+        )
+        since_id = row["newest_message_id"] if row is not None else None
+
+        messages: List[Dict[str, Any]] = []
+        thread = self._client.iter_messages(
+            conversation["id"], location_id, page_size=self.page_size, since_message_id=since_id
+        )
+        async with aclosing(thread) as thread_iter:
+            async for message in thread_iter:
+                messages.append(message.model_dump(mode="json"))
+
+        # Messages arrive newest first
+        newest_id = messages[0]["id"] if messages else None
+
+        def write(conn: sqlite3.Connection) -> None:
+            self._put_messages(conn, location_id, messages)
+            self._put_conversation(conn, location_id, conversation, newest_id)
+
+        await self.db.run(write)
+
+    async def _archive_all(self, location_id: str, conversations: List[Dict[str, Any]]) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def archive(conversation: Dict[str, Any]) -> None:
+            async with semaphore:
+                await self._archive(location_id, conversation)
+
+        await asyncio.gather(*(archive(c) for c in conversations))
+
+    async def _full_load(self, location_id: str, started_at: float) -> Optional[str]:
+        seen: Set[str] = set()
+        pages = self._client.iter_conversations_by_last_message(location_id, self.page_size)
+        async with aclosing(pages) as page_iter:
+            async for page in page_iter:
+                page = [c for c in page if c.get("id")]
+                seen.update(c["id"] for c in page)
+                await self._archive_all(location_id, page)
+
+        def drop_missing(conn: sqlite3.Connection) -> None:
+            stored = conn.execute(
+                "SELECT id FROM conversations WHERE location_id = ?", (location_id,)
+            ).fetchall()
+            self._delete_conversations(conn, location_id, [r["id"] for r in stored if r["id"] not in seen])
+
+        await self.db.run(drop_missing)
+        return full_load_mark(started_at)
+
+    async def _incremental(self, location_id: str, since: str) -> Optional[str]:
+        mark: Optional[str] = None
+        pages = self._client.iter_conversations_by_last_message(location_id, self.page_size)
+        async with aclosing(pages) as page_iter:
+            async for page in page_iter:
+                changed = [
+                    c for c in page
+                    if c.get("id") and (normalize_timestamp(c.get("lastMessageDate")) or "") >= since
+                ]
+                await self._archive_all(location_id, changed)
+                for conversation in changed:
+                    last = normalize_timestamp(conversation.get("lastMessageDate"))
+                    if last is not None and (mark is None or last > mark):
+                        mark = last
+                # Pages are newest first, so the rest are older than the mark
+                if len(changed) < len(page):
+                    break
+        return mark
+
+    async def search(
+        self,
+        location_id: str,
+        text: str,
+        contact_id: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        direction: Optional[str] = None,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        limit: int = 20,
+        skip: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Messages matching every word of ``text`` as a prefix, best first
+
+        Returns ``(page, total)``; each hit carries the message, conversation
+        and contact IDs and a snippet of the matching subject or body.
+        """
+        match = fts_prefix_query([text])
+        if match is None:
+            return [], 0
+        where = ["m.location_id = ?", "messages_fts MATCH ?"]
+        args: List[Any] = [location_id, match]
+        for column, value in (
+            ("contact_id", contact_id),
+            ("conversation_id", conversation_id),
+            ("direction", direction),
+        ):
+            if value:
+                where.append(f"m.{column} = ?")
+                args.append(value)
+        for condition, value, name in (("m.date_added >= ?", after, "after"), ("m.date_added < ?", before, "before")):
+            bound = timestamp_bound(value, name)
+            if bound is not None:
+                where.append(condition)
+                args.append(bound)
+        clause = " AND ".join(where)
+        joins = "FROM messages m JOIN messages_fts ON messages_fts.rowid = m.rowid"
+
+        def run(conn: sqlite3.Connection) -> Tuple[List[Dict[str, Any]], int]:
+            total = conn.execute(f"SELECT COUNT(*) {joins} WHERE {clause}", args).fetchone()[0]
+            rows = conn.execute(
+                "SELECT m.id AS message_id, m.conversation_id, m.contact_id, m.direction, "
+                "m.message_type, m.date_added, "
+                "snippet(messages_fts, 0, '[', ']', '…', 8) AS subject, "
+                "snippet(messages_fts, 1, '[', ']', '…', 16) AS snippet, "
+                "-bm25(messages_fts, 2.0, 1.0) AS score "
+                f"{joins} WHERE {clause} ORDER BY score DESC, m.date_added DESC LIMIT ? OFFSET ?",
+                [*args, limit, skip],
+            ).fetchall()
+            return [dict(row) for row in rows], total
+
+        return await self.db.run(run)
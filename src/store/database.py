@@ -0,0 +1,56 @@
+"""Shared SQLite database for the local mirrors"""
+
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, TypeVar, Union
+
+R = TypeVar("R")
+
+
+class LocalDatabase:
+    """One SQLite file shared by every local mirror
+
+    Queries run in a worker thread through ``run`` so the event loop is never
+    blocked; a lock serializes them on the single connection.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            if str(path) != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    entity TEXT NOT NULL,
+                    location_id TEXT NOT NULL,
+                    high_water_mark TEXT,
+                    last_sync REAL,
+                    last_full_sync REAL,
+                    PRIMARY KEY (entity, location_id)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS store_schema (entity TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+
+    def call(self, fn: Callable[[sqlite3.Connection], R]) -> R:
+        """Run ``fn`` with the connection inside a transaction"""
+        with self._lock, self._conn:
+            return fn(self._conn)
+
+    async def run(self, fn: Callable[[sqlite3.Connection], R]) -> R:
+        """Run ``fn`` with the connection inside a transaction, off the event loop"""
+        return await asyncio.to_thread(self.call, fn)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,168 @@
+"""In-memory email/phone index for spotting duplicate contacts before a create"""
+
+import asyncio
+import re
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..api.contacts import ContactsClient
+from .contacts import ContactMirror
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Lowercased, trimmed email, or None when it is blank"""
+    email = (email or "").strip().lower()
+    return email or None
+
+
+def normalize_phone(phone: Optional[str], default_country_code: str = "1") -> Optional[str]:
+    """E.164 form of a phone number, or None when it has too few digits
+
+    Numbers without a ``+``/``00`` international prefix are national numbers
+    in ``default_country_code``; a leading trunk ``0`` or a repeated country
+    code is dropped. Unprefixed numbers longer than a national number (more
+    than ten digits) are taken to carry their own country code, so a
+    foreign number typed without ``+`` is not matched as a local one.
+    """
+    text = (phone or "").strip()
+    digits = re.sub(r"\D", "", text)
+    if text.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif digits.startswith(default_country_code) and len(digits) == len(default_country_code) + 10:
+        pass
+    elif len(digits.lstrip("0")) <= 10:
+        digits = default_country_code + digits.lstrip("0")
+    if len(digits) < 8 or len(digits) > 15:
+        return None
+    return f"+{digits}"
+
+
+class _LocationKeys:
+    def __init__(self) -> None:
+        self.emails: Dict[str, str] = {}
+        self.phones: Dict[str, str] = {}
+        self.keys: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self.loaded_at = time.monotonic()
+
+
+class DuplicateIndex:
+    """Per-location maps of normalized email and phone to contact ID
+
+    A location is indexed on first use, from the contact mirror when it has
+    been synced and otherwise by paging through the API, and rebuilt after
+    ``ttl`` seconds. Contacts written through the client are added and
+    removed as they change, so lookups stay O(1) dictionary reads.
+    """
+
+    def __init__(
+        self,
+        client: ContactsClient,
+        mirror: Optional[ContactMirror] = None,
+        ttl: float = 600.0,
+        default_country_code: str = "1",
+        page_size: int = 100,
+    ):
+        self._client = client
+        self._mirror = mirror
+        self.ttl = ttl
+        self.default_country_code = default_country_code
+        self.page_size = page_size
+        self._locations: Dict[str, _LocationKeys] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _normalized(self, contact: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        email = normalize_email(contact.get("emailLowerCase") or contact.get("email"))
+        return email, normalize_phone(contact.get("phone"), self.default_country_code)
+
+    def _add(self, keys: _LocationKeys, contact_id: str, email: Optional[str], phone: Optional[str]) -> None:
+        self._discard(keys, contact_id)
+        if email:
+            keys.emails.setdefault(email, contact_id)
+        if phone:
+            keys.phones.setdefault(phone, contact_id)
+        keys.keys[contact_id] = (email, phone)
+
+    @staticmethod
+    def _discard(keys: _LocationKeys, contact_id: str) -> None:
+        email, phone = keys.keys.pop(contact_id, (None, None))
+        if email and keys.emails.get(email) == contact_id:
+            del keys.emails[email]
+        if phone and keys.phones.get(phone) == contact_id:
+            del keys.phones[phone]
+
+    async def _contacts(self, location_id: str) -> List[Dict[str, Any]]:
+        if self._mirror is not None and (await self._mirror.state(location_id)).last_sync is not None:
+            def read(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+                rows = conn.execute(
+                    "SELECT id, email_lower, phone FROM contacts WHERE location_id = ? ORDER BY date_added",
+                    (location_id,),
+                ).fetchall()
+                return [{"id": r["id"], "email": r["email_lower"], "phone": r["phone"]} for r in rows]
+
+            return await self._mirror.db.run(read)
+
+        contacts: List[Dict[str, Any]] = []
+        async for page in self._client.iter_contact_pages(location_id, page_size=self.page_size):
+            contacts.extend(page)
+        # Pages come newest first; the oldest contact keeps a shared key
+        contacts.reverse()
+        return contacts
+
+    async def _keys(self, location_id: str) -> _LocationKeys:
+        keys = self._locations.get(location_id)
+        if keys is not None and time.monotonic() - keys.loaded_at < self.ttl:
+            return keys
+        async with self._locks.setdefault(location_id, asyncio.Lock()):
+            keys = self._locations.get(location_id)
+            if keys is None or time.monotonic() - keys.loaded_at >= self.ttl:
+                keys = _LocationKeys()
+                for contact in await self._contacts(location_id):
+                    if contact.get("id"):
+                        self._add(keys, contact["id"], *self._normalized(contact))
+                self._locations[location_id] = keys
+            return keys
+
+    async def match(
+        self, location_id: str, email: Optional[str] = None, phone: Optional[str] = None
+    ) -> Optional[Tuple[str, str]]:
+        """``(contact_id, "email" | "phone")`` of an existing contact sharing the email, else the phone"""
+        email = normalize_email(email)
+        phone = normalize_phone(phone, self.default_country_code)
+        if not email and not phone:
+            return None
+        keys = await self._keys(location_id)
+        if email and email in keys.emails:
+            return keys.emails[email], "email"
+        if phone and phone in keys.phones:
+            return keys.phones[phone], "phone"
+        return None
+
+    async def find(
+        self, location_id: str, email: Optional[str] = None, phone: Optional[str] = None
+    ) -> Optional[str]:
+        """ID of an existing contact sharing the email, else the phone"""
+        found = await self.match(location_id, email, phone)
+        return found[0] if found else None
+
+    def put(self, location_id: str, contacts: Iterable[Dict[str, Any]]) -> None:
+        """Index contacts written through the client, if the location is indexed"""
+        keys = self._locations.get(location_id)
+        if keys is None:
+            return
+        for contact in contacts:
+            if contact.get("id"):
+                self._add(keys, contact["id"], *self._normalized(contact))
+
+    def remove(self, location_id: str, contact_id: str) -> None:
+        keys = self._locations.get(location_id)
+        if keys is not None:
+            self._discard(keys, contact_id)
+
+    def invalidate(self, location_id: Optional[str] = None) -> None:
+        if location_id is None:
+            self._locations.clear()
+        else:
+            self._locations.pop(location_id, None)
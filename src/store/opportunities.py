@@ -0,0 +1,369 @@
+"""Local SQLite store of a location's opportunities, with pipeline analytics"""
+
+import json
+import sqlite3
+import time
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..api.opportunities import OpportunitiesClient
+from ..utils.exceptions import ValidationError
+from .base import SyncedStore, full_load_mark, normalize_timestamp, timestamp_bound
+from .database import LocalDatabase
+
+# Grouping keys accepted by ``summary`` and the SQL expressions behind them
+GROUP_COLUMNS = {
+    "pipeline": "o.pipeline_id",
+    "stage": "o.stage_id",
+    "status": "o.status",
+    "source": "o.source",
+    "assigned_to": "o.assigned_to",
+    "created_month": "substr(o.created_at, 1, 7)",
+    # ISO week, like ``period_label``: the week's Thursday gives its year and number
+    "created_week": (
+        "printf('%s-W%02d', strftime('%Y', o.created_at, '-3 days', 'weekday 4'), "
+        "(strftime('%j', o.created_at, '-3 days', 'weekday 4') - 1) / 7 + 1)"
+    ),
+}
+
+
+def _changed_at(opportunity: Dict[str, Any]) -> Optional[str]:
+    """Latest of ``updatedAt`` and ``lastStageChangeAt``"""
+    stamps = [
+        normalize_timestamp(opportunity.get(key)) for key in ("updatedAt", "lastStageChangeAt")
+    ]
+    return max((s for s in stamps if s is not None), default=None)
+
+
+class OpportunityStore(SyncedStore):
+    """Opportunities per location, synced on ``updatedAt``/``lastStageChangeAt``
+
+    The search endpoint can neither filter nor reliably sort on either
+    field, so every sync pages through all of a location's opportunities:
+    incremental syncs write only those changed since the mark, and like
+    full loads drop the ones no longer listed. That costs one request per
+    ``page_size`` opportunities, so this store is given its own, longer
+    ``sync_interval`` (``STORE_OPPORTUNITY_SYNC_INTERVAL``).
+
+    Besides the current row of each opportunity, every stage an opportunity
+    is seen entering is recorded, so stage conversion and time in stage can
+    be computed locally. Histories start when the store first sees an
+    opportunity; earlier stage moves are not available from the API.
+    """
+
+    entity = "opportunities"
+    tables = ("opportunities", "opportunity_stage_events")
+
+    def __init__(self, client: OpportunitiesClient, db: LocalDatabase, page_size: int = 100, **kwargs: Any):
+        super().__init__(db, **kwargs)
+        self._client = client
+        self.page_size = page_size
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS opportunities (
+                location_id TEXT NOT NULL,
+                id TEXT NOT NULL,
+                name TEXT,
+                pipeline_id TEXT,
+                stage_id TEXT,
+                status TEXT,
+                source TEXT,
+                assigned_to TEXT,
+                contact_id TEXT,
+                monetary_value REAL,
+                created_at TEXT,
+                updated_at TEXT,
+                last_stage_change_at TEXT,
+                last_status_change_at TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (location_id, id)
+            );
+            CREATE INDEX IF NOT EXISTS opportunities_by_stage
+                ON opportunities (location_id, pipeline_id, stage_id);
+            CREATE TABLE IF NOT EXISTS opportunity_stage_events (
+                location_id TEXT NOT NULL,
+                opportunity_id TEXT NOT NULL,
+                stage_id TEXT NOT NULL,
+                entered_at TEXT NOT NULL,
+                PRIMARY KEY (location_id, opportunity_id, entered_at, stage_id)
+            );
+            """
+        )
+
+    @staticmethod
+    def _row(location_id: str, opportunity: Dict[str, Any]) -> Tuple[Any, ...]:
+        value = opportunity.get("monetaryValue")
+        return (
+            location_id,
+            opportunity["id"],
+            opportunity.get("name"),
+            opportunity.get("pipelineId"),
+            opportunity.get("pipelineStageId"),
+            opportunity.get("status"),
+            opportunity.get("source"),
+            opportunity.get("assignedTo"),
+            opportunity.get("contactId"),
+            float(value) if isinstance(value, (int, float)) else None,
+            normalize_timestamp(opportunity.get("createdAt")),
+            normalize_timestamp(opportunity.get("updatedAt")),
+            normalize_timestamp(opportunity.get("lastStageChangeAt")),
+            normalize_timestamp(opportunity.get("lastStatusChangeAt")),
+            json.dumps(opportunity, default=str),
+        )
+
+    def _upsert(self, conn: sqlite3.Connection, location_id: str, opportunities: Iterable[Dict[str, Any]]) -> None:
+        rows = [self._row(location_id, o) for o in opportunities if o.get("id")]
+        events = []
+        for row in rows:
+            stored = conn.execute(
+                "SELECT stage_id FROM opportunities WHERE location_id = ? AND id = ?",
+                (location_id, row[1]),
+            ).fetchone()
+            stage_id = row[4]
+            if stage_id and (stored is None or stored["stage_id"] != stage_id):
+                # Entered the stage at its last stage change, or when created
+                entered_at = row[12] or row[10] or row[11]
+                if entered_at:
+                    events.append((location_id, row[1], stage_id, entered_at))
+        conn.executemany(
+            "INSERT OR IGNORE INTO opportunity_stage_events "
+            "(location_id, opportunity_id, stage_id, entered_at) VALUES (?, ?, ?, ?)",
+            events,
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO opportunities (location_id, id, name, pipeline_id, stage_id, "
+            "status, source, assigned_to, contact_id, monetary_value, created_at, updated_at, "
+            "last_stage_change_at, last_status_change_at, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def _delete(self, conn: sqlite3.Connection, location_id: str, opportunity_ids: Iterable[str]) -> None:
+        keys = [(location_id, opportunity_id) for opportunity_id in opportunity_ids]
+        conn.executemany("DELETE FROM opportunities WHERE location_id = ? AND id = ?", keys)
+        conn.executemany(
+            "DELETE FROM opportunity_stage_events WHERE location_id = ? AND opportunity_id = ?", keys
+        )
+
+    async def _scan(self, location_id: str, started_at: float, since: Optional[str] = None) -> Optional[str]:
+        """Page through every opportunity, writing those changed since ``since`` (all without it)
+
+        Opportunities not stored yet are written whatever their change time,
+        and ones no longer listed are dropped. Returns the latest change
+        written.
+        """
+        known: Set[str] = set()
+        if since is not None:
+            rows = await self.db.run(
+                lambda conn: conn.execute(
+                    "SELECT id FROM opportunities WHERE location_id = ?", (location_id,)
+                ).fetchall()
+            )
+            known = {row["id"] for row in rows}
+        seen: Set[str] = set()
+        mark: Optional[str] = None
+        async for page in self._client.iter_opportunity_pages(location_id, page_size=self.page_size):
+            seen.update(o["id"] for o in page if o.get("id"))
+            changed = (
+                page
+                if since is None
+                else [o for o in page if (_changed_at(o) or "") >= since or o.get("id") not in known]
+            )
+            if changed:
+                await self.db.run(partial(self._upsert, location_id=location_id, opportunities=changed))
+            for opportunity in changed:
+                changed_at = _changed_at(opportunity)
+                if changed_at is not None and (mark is None or changed_at > mark):
+                    mark = changed_at
+
+        started = full_load_mark(started_at)
+
+        def drop_missing(conn: sqlite3.Connection) -> None:
+            # Rows written through the client during the scan are kept
+            stored = conn.execute(
+                "SELECT id FROM opportunities WHERE location_id = ? AND (updated_at IS NULL OR updated_at < ?)",
+                (location_id, started),
+            ).fetchall()
+            self._delete(conn, location_id, [row["id"] for row in stored if row["id"] not in seen])
+
+        await self.db.run(drop_missing)
+        return mark
+
+    async def _full_load(self, location_id: str, started_at: float) -> Optional[str]:
+        await self._scan(location_id, started_at)
+        return full_load_mark(started_at)
+
+    async def _incremental(self, location_id: str, since: str) -> Optional[str]:
+        return await self._scan(location_id, time.time(), since)
+
+    async def put(self, location_id: str, opportunity: Dict[str, Any]) -> None:
+        """Write an opportunity returned by the API through to the store"""
+        await self.db.run(lambda conn: self._upsert(conn, location_id, [opportunity]))
+
+    async def remove(self, location_id: str, opportunity_id: str) -> None:
+        await self.db.run(lambda conn: self._delete(conn, location_id, [opportunity_id]))
+
+    @staticmethod
+    def _where(
+        location_id: str,
+        pipeline_id: Optional[str] = None,
+        stage_id: Optional[str] = None,
+        status: Optional[str] = None,
+        source: Optional[str] = None,
+        assigned_to: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        stale_days: Optional[float] = None,
+    ) -> Tuple[str, List[Any]]:
+        where = ["o.location_id = ?"]
+        args: List[Any] = [location_id]
+        for column, value in (
+            ("pipeline_id", pipeline_id),
+            ("stage_id", stage_id),
+            ("status", status),
+            ("assigned_to", assigned_to),
+        ):
+            if value:
+                where.append(f"o.{column} = ?")
+                args.append(value)
+        if source:
+            where.append("o.source = ? COLLATE NOCASE")
+            args.append(source)
+        for condition, value, name in (
+            ("o.created_at >= ?", created_after, "created_after"),
+            ("o.created_at < ?", created_before, "created_before"),
+        ):
+            bound = timestamp_bound(value, name)
+            if bound is not None:
+                where.append(condition)
+                args.append(bound)
+        if stale_days is not None:
+            # Open deals that have not moved stage for ``stale_days``
+            where.append("o.status = 'open' AND COALESCE(o.last_stage_change_at, o.created_at) < ?")
+            args.append(normalize_timestamp((time.time() - stale_days * 86400) * 1000))
+        return " AND ".join(where), args
+
+    async def summary(
+        self, location_id: str, group_by: Optional[List[str]] = None, **filters: Any
+    ) -> List[Dict[str, Any]]:
+        """Counts, value sums and win rates of matching opportunities per group
+
+        ``group_by`` takes keys of ``GROUP_COLUMNS``; groups come largest first.
+        """
+        keys = list(group_by or [])
+        unknown = [key for key in keys if key not in GROUP_COLUMNS]
+        if unknown:
+            raise ValidationError(f"Unknown group_by {unknown}; use {sorted(GROUP_COLUMNS)}")
+        clause, args = self._where(location_id, **filters)
+        columns = "".join(f"{GROUP_COLUMNS[key]} AS {key}, " for key in keys)
+        group = f"GROUP BY {', '.join(keys)} " if keys else ""
+        sql = (
+            f"SELECT {columns}COUNT(*) AS count, "
+            "COALESCE(SUM(o.monetary_value), 0) AS total_value, "
+            "AVG(o.monetary_value) AS average_value, "
+            "SUM(o.status = 'open') AS open, "
+            "SUM(o.status = 'won') AS won, "
+            "SUM(o.status = 'lost') AS lost, "
+            "COALESCE(SUM(CASE WHEN o.status = 'won' THEN o.monetary_value END), 0) AS won_value "
+            f"FROM opportunities o WHERE {clause} {group}ORDER BY count DESC"
+        )
+
+        def run(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+            # Without groups an empty match still yields one all-NULL row
+            groups = [dict(row) for row in conn.execute(sql, args).fetchall() if row["count"]]
+            for row in groups:
+                closed = row["won"] + row["lost"]
+                row["win_rate"] = round(row["won"] / closed, 4) if closed else None
+            return groups
+
+        return await self.db.run(run)
+
+    async def stage_conversion(
+        self, location_id: str, stage_ids: List[str], **filters: Any
+    ) -> List[Dict[str, Any]]:
+        """How many opportunities reached each stage and moved on to the next
+
+        ``stage_ids`` is the pipeline's stage order. An opportunity has reached
+        every stage up to the furthest one it is in or was seen in.
+        """
+        if not stage_ids:
+            return []
+        clause, args = self._where(location_id, **filters)
+        positions = ", ".join("(?, ?)" for _ in stage_ids)
+        sql = (
+            f"WITH positions (stage_id, position) AS (VALUES {positions}), "
+            "furthest AS ("
+            "SELECT o.id, MAX(p.position) AS position, "
+            "MAX(CASE WHEN p.stage_id = o.stage_id THEN p.position END) AS current "
+            "FROM opportunities o "
+            "LEFT JOIN opportunity_stage_events e "
+            "ON e.location_id = o.location_id AND e.opportunity_id = o.id "
+            "JOIN positions p ON p.stage_id = o.stage_id OR p.stage_id = e.stage_id "
+            f"WHERE {clause} GROUP BY o.id) "
+            "SELECT position, current, COUNT(*) AS count FROM furthest GROUP BY position, current"
+        )
+        params = [value for i, stage_id in enumerate(stage_ids) for value in (stage_id, i)] + args
+
+        rows = await self.db.run(lambda conn: conn.execute(sql, params).fetchall())
+        furthest = [0] * len(stage_ids)
+        current = [0] * len(stage_ids)
+        for row in rows:
+            furthest[row["position"]] += row["count"]
+            if row["current"] is not None:
+                current[row["current"]] += row["count"]
+
+        result = []
+        reached = sum(furthest)
+        for position, stage_id in enumerate(stage_ids):
+            next_reached = reached - furthest[position]
+            result.append(
+                {
+                    "stage": stage_id,
+                    "position": position,
+                    "reached": reached,
+                    "current": current[position],
+                    "conversion_rate": (
+                        round(next_reached / reached, 4)
+                        if reached and position < len(stage_ids) - 1
+                        else None
+                    ),
+                }
+            )
+            reached = next_reached
+        return result
+
+    async def time_in_stage(self, location_id: str, **filters: Any) -> List[Dict[str, Any]]:
+        """Days spent in each stage, over every observed stage visit
+
+        A visit ends when the opportunity enters another stage; the visit in
+        its current stage ends at its status change when closed, or now.
+        """
+        clause, args = self._where(location_id, **filters)
+        now = normalize_timestamp(time.time() * 1000)
+        sql = (
+            "WITH visits AS ("
+            "SELECT e.stage_id, e.entered_at, "
+            "LEAD(e.entered_at) OVER (PARTITION BY e.opportunity_id ORDER BY e.entered_at) AS left_at, "
+            "CASE WHEN o.status = 'open' THEN ? ELSE COALESCE(o.last_status_change_at, o.updated_at) END AS ended_at "
+            "FROM opportunity_stage_events e JOIN opportunities o "
+            "ON o.location_id = e.location_id AND o.id = e.opportunity_id "
+            f"WHERE {clause}) "
+            "SELECT stage_id AS stage, COUNT(*) AS visits, SUM(left_at IS NULL) AS still_in_stage, "
+            "AVG(julianday(COALESCE(left_at, ended_at)) - julianday(entered_at)) AS average_days, "
+            "AVG(CASE WHEN left_at IS NOT NULL THEN julianday(left_at) - julianday(entered_at) END) "
+            "AS average_days_before_moving, "
+            "MAX(julianday(COALESCE(left_at, ended_at)) - julianday(entered_at)) AS max_days "
+            "FROM visits GROUP BY stage_id ORDER BY visits DESC"
+        )
+
+        def run(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+            rows = [dict(row) for row in conn.execute(sql, [now, *args]).fetchall()]
+            for row in rows:
+                for key in ("average_days", "average_days_before_moving", "max_days"):
+                    if row[key] is not None:
+                        row[key] = round(row[key], 2)
+            return rows
+
+        return await self.db.run(run)
@@ -0,0 +1,376 @@
+"""Local payment ledger with columnar revenue and subscription analytics"""
+
+import json
+import math
+import sqlite3
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..api.payments import PaymentsClient
+from ..utils.exceptions import ValidationError
+from .base import (
+    PERIODS,
+    SyncState,
+    SyncedStore,
+    epoch_bound,
+    epoch_seconds,
+    full_load_mark,
+    next_period,
+    normalize_timestamp,
+    period_label,
+    period_start,
+)
+from .database import LocalDatabase
+
+# Transactions that took money; refunds are subtracted separately
+PAID_STATUSES = {"succeeded", "paid", "completed", "refunded", "partially_refunded"}
+# Subscriptions in these states never billed and never count as active
+NEVER_ACTIVE = {"incomplete", "incomplete_expired"}
+DAYS_PER_INTERVAL = {
+    "day": 1.0,
+    "daily": 1.0,
+    "week": 7.0,
+    "weekly": 7.0,
+    "month": 30.4375,
+    "monthly": 30.4375,
+    "year": 365.25,
+    "yearly": 365.25,
+    "annual": 365.25,
+    "annually": 365.25,
+}
+# Incremental syncs re-read transactions this recent, so refunds of them are seen
+REFUND_LOOKBACK = 30 * 86400.0
+
+
+def monthly_amount(subscription: Dict[str, Any]) -> Optional[float]:
+    """A subscription's amount normalized to a 30.4375-day month"""
+    amount = subscription.get("amount")
+    days = DAYS_PER_INTERVAL.get(str(subscription.get("interval") or "month").lower())
+    if not isinstance(amount, (int, float)) or days is None:
+        return None
+    count = subscription.get("intervalCount") or 1
+    return float(amount) * DAYS_PER_INTERVAL["month"] / (days * count)
+
+
+class _Ledger:
+    """One currency's paid transactions and subscriptions as parallel arrays
+
+    Transactions are sorted by time, so a period is a contiguous slice found
+    by bisection and summed without a Python-level loop. Subscription starts
+    and cancellations are sorted with running sums of their monthly amounts,
+    which gives MRR and active counts at any moment in O(log n).
+    """
+
+    def __init__(
+        self,
+        transactions: List[Tuple[float, float, float, Optional[str]]],
+        subscriptions: List[Tuple[float, Optional[float], float]],
+    ):
+        codes: Dict[Optional[str], int] = {}
+        self.times = array("d", (t[0] for t in transactions))
+        self.gross = array("d", (t[1] for t in transactions))
+        self.refunds = array("d", (t[2] for t in transactions))
+        self.contacts = array("q", (codes.setdefault(t[3], len(codes)) for t in transactions))
+
+        starts = sorted((s[0], s[2]) for s in subscriptions)
+        cancels = sorted((s[1], s[2]) for s in subscriptions if s[1] is not None)
+        self.starts = array("d", (s[0] for s in starts))
+        self.start_sums = array("d", accumulate((s[1] for s in starts), initial=0.0))
+        self.cancels = array("d", (c[0] for c in cancels))
+        self.cancel_sums = array("d", accumulate((c[1] for c in cancels), initial=0.0))
+
+    def revenue(self, start: float, end: float) -> Dict[str, Any]:
+        i, j = bisect_left(self.times, start), bisect_left(self.times, end)
+        gross = math.fsum(self.gross[i:j])
+        refunds = math.fsum(self.refunds[i:j])
+        payers = len(set(self.contacts[i:j]))
+        return {
+            "gross": round(gross, 2),
+            "refunds": round(refunds, 2),
+            "net": round(gross - refunds, 2),
+            "transactions": j - i,
+            "paying_contacts": payers,
+            "arpu": round((gross - refunds) / payers, 2) if payers else None,
+        }
+
+    def subscriptions(self, start: float, end: float) -> Dict[str, Any]:
+        started_before = bisect_left(self.starts, start)
+        canceled_before = bisect_left(self.cancels, start)
+        started_by_end = bisect_left(self.starts, end)
+        canceled_by_end = bisect_left(self.cancels, end)
+        active_at_start = started_before - canceled_before
+        canceled = canceled_by_end - canceled_before
+        return {
+            "mrr": round(self.start_sums[started_by_end] - self.cancel_sums[canceled_by_end], 2),
+            "active_subscriptions": started_by_end - canceled_by_end,
+            "new_subscriptions": started_by_end - started_before,
+            "canceled_subscriptions": canceled,
+            "churn_rate": round(canceled / active_at_start, 4) if active_at_start else None,
+        }
+
+
+class PaymentLedger(SyncedStore):
+    """Payment transactions and subscriptions per location
+
+    Transactions sync incrementally through the ``startAt`` filter, re-reading
+    the last ``refund_lookback`` seconds so later refunds are picked up; the
+    subscription list has no date filter and is re-read on every sync.
+    Analytics run over an in-memory columnar snapshot rebuilt after each sync.
+    """
+
+    entity = "payments"
+    tables = ("payment_transactions", "payment_subscriptions")
+
+    def __init__(
+        self,
+        client: PaymentsClient,
+        db: LocalDatabase,
+        page_size: int = 100,
+        refund_lookback: float = REFUND_LOOKBACK,
+        **kwargs: Any,
+    ):
+        super().__init__(db, **kwargs)
+        self._client = client
+        self.page_size = page_size
+        self.refund_lookback = refund_lookback
+        self._ledgers: Dict[str, Dict[str, _Ledger]] = {}
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS payment_transactions (
+                location_id TEXT NOT NULL,
+                id TEXT NOT NULL,
+                created_at REAL,
+                status TEXT,
+                currency TEXT,
+                amount REAL,
+                refunded REAL,
+                contact_id TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (location_id, id)
+            );
+            CREATE TABLE IF NOT EXISTS payment_subscriptions (
+                location_id TEXT NOT NULL,
+                id TEXT NOT NULL,
+                status TEXT,
+                currency TEXT,
+                monthly_amount REAL,
+                started_at REAL,
+                canceled_at REAL,
+                contact_id TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (location_id, id)
+            );
+            """
+        )
+
+    @staticmethod
+    def _transaction_row(location_id: str, transaction: Dict[str, Any]) -> Tuple[Any, ...]:
+        amount = transaction.get("amount")
+        amount = float(amount) if isinstance(amount, (int, float)) else 0.0
+        status = str(transaction.get("status") or "").lower()
+        refunded = transaction.get("amountRefunded", transaction.get("refundedAmount"))
+        if not isinstance(refunded, (int, float)):
+            refunded = amount if status == "refunded" else 0.0
+        return (
+            location_id,
+            transaction.get("_id") or transaction.get("id"),
+            epoch_seconds(transaction.get("createdAt")),
+            status,
+            (transaction.get("currency") or "").upper(),
+            amount,
+            float(refunded),
+            transaction.get("contactId"),
+            json.dumps(transaction, default=str),
+        )
+
+    @staticmethod
+    def _subscription_row(location_id: str, subscription: Dict[str, Any]) -> Tuple[Any, ...]:
+        status = str(subscription.get("status") or "").lower()
+        canceled_at = epoch_seconds(subscription.get("canceledAt"))
+        if canceled_at is None and status in ("canceled", "cancelled"):
+            canceled_at = epoch_seconds(subscription.get("updatedAt"))
+        return (
+            location_id,
+            subscription.get("_id") or subscription.get("id"),
+            status,
+            (subscription.get("currency") or "").upper(),
+            monthly_amount(subscription),
+            epoch_seconds(subscription.get("createdAt")),
+            canceled_at,
+            subscription.get("contactId"),
+            json.dumps(subscription, default=str),
+        )
+
+    def _put_transactions(self, conn: sqlite3.Connection, location_id: str, rows: Iterable[Dict[str, Any]]) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO payment_transactions (location_id, id, created_at, status, currency, "
+            "amount, refunded, contact_id, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [self._transaction_row(location_id, r) for r in rows if r.get("_id") or r.get("id")],
+        )
+
+    def _put_subscriptions(self, conn: sqlite3.Connection, location_id: str, rows: Iterable[Dict[str, Any]]) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO payment_subscriptions (location_id, id, status, currency, "
+            "monthly_amount, started_at, canceled_at, contact_id, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [self._subscription_row(location_id, r) for r in rows if r.get("_id") or r.get("id")],
+        )
+
+    async def _load_subscriptions(self, location_id: str) -> None:
+        seen: Set[str] = set()
+        async for page in self._client.iter_subscription_pages(location_id, page_size=self.page_size):
+            seen.update(str(s.get("_id") or s.get("id")) for s in page)
+            await self.db.run(partial(self._put_subscriptions, location_id=location_id, rows=page))
+
+        def drop_missing(conn: sqlite3.Connection) -> None:
+            stored = conn.execute(
+                "SELECT id FROM payment_subscriptions WHERE location_id = ?", (location_id,)
+            ).fetchall()
+            conn.executemany(
+                "DELETE FROM payment_subscriptions WHERE location_id = ? AND id = ?",
+                [(location_id, row["id"]) for row in stored if row["id"] not in seen],
+            )
+
+        await self.db.run(drop_missing)
+
+    async def _full_load(self, location_id: str, started_at: float) -> Optional[str]:
+        seen: Set[str] = set()
+        async for page in self._client.iter_transaction_pages(location_id, page_size=self.page_size):
+            seen.update(str(t.get("_id") or t.get("id")) for t in page)
+            await self.db.run(partial(self._put_transactions, location_id=location_id, rows=page))
+
+        mark = full_load_mark(started_at)
+        cutoff = epoch_seconds(mark)
+
+        def drop_missing(conn: sqlite3.Connection) -> None:
+            stored = conn.execute(
+                "SELECT id FROM payment_transactions WHERE location_id = ? "
+                "AND (created_at IS NULL OR created_at < ?)",
+                (location_id, cutoff),
+            ).fetchall()
+            conn.executemany(
+                "DELETE FROM payment_transactions WHERE location_id = ? AND id = ?",
+                [(location_id, row["id"]) for row in stored if row["id"] not in seen],
+            )
+
+        await self.db.run(drop_missing)
+        await self._load_subscriptions(location_id)
+        return mark
+
+    async def _incremental(self, location_id: str, since: str) -> Optional[str]:
+        mark: Optional[str] = None
+        start_at = datetime.fromtimestamp((epoch_seconds(since) or 0.0) - self.refund_lookback, tz=timezone.utc)
+        async for page in self._client.iter_transaction_pages(
+            location_id, page_size=self.page_size, start_at=start_at
+        ):
+            await self.db.run(partial(self._put_transactions, location_id=location_id, rows=page))
+            for transaction in page:
+                created = normalize_timestamp(transaction.get("createdAt"))
+                if created is not None and (mark is None or created > mark):
+                    mark = created
+        await self._load_subscriptions(location_id)
+        return mark
+
+    async def sync(self, location_id: str, full: bool = False) -> SyncState:
+        state = await super().sync(location_id, full)
+        self._ledgers.pop(location_id, None)
+        return state
+
+    async def _snapshot(self, location_id: str) -> Dict[str, _Ledger]:
+        ledgers = self._ledgers.get(location_id)
+        if ledgers is not None:
+            return ledgers
+
+        paid = sorted(PAID_STATUSES)
+
+        def read(conn: sqlite3.Connection) -> Tuple[List[sqlite3.Row], List[sqlite3.Row]]:
+            transactions = conn.execute(
+                "SELECT currency, created_at, amount, refunded, contact_id FROM payment_transactions "
+                f"WHERE location_id = ? AND created_at IS NOT NULL AND status IN ({', '.join('?' * len(paid))}) "
+                "ORDER BY created_at",
+                (location_id, *paid),
+            ).fetchall()
+            subscriptions = conn.execute(
+                "SELECT currency, started_at, canceled_at, monthly_amount FROM payment_subscriptions "
+                "WHERE location_id = ? AND started_at IS NOT NULL AND monthly_amount IS NOT NULL "
+                f"AND status NOT IN ({', '.join('?' * len(NEVER_ACTIVE))})",
+                (location_id, *sorted(NEVER_ACTIVE)),
+            ).fetchall()
+            return transactions, subscriptions
+
+        transactions, subscriptions = await self.db.run(read)
+        by_currency: Dict[str, Tuple[list, list]] = {}
+        for t in transactions:
+            by_currency.setdefault(t["currency"], ([], []))[0].append(
+                (t["created_at"], t["amount"], t["refunded"], t["contact_id"])
+            )
+        for s in subscriptions:
+            by_currency.setdefault(s["currency"], ([], []))[1].append(
+                (s["started_at"], s["canceled_at"], s["monthly_amount"])
+            )
+        ledgers = {currency: _Ledger(*rows) for currency, rows in by_currency.items()}
+        self._ledgers[location_id] = ledgers
+        return ledgers
+
+    async def analyze(
+        self,
+        location_id: str,
+        period: str = "month",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        currency: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Revenue, refunds, ARPU, MRR and churn per day, week or month
+
+        Without ``currency`` the location's most used currency is reported.
+        Periods default to the last 30 days, 12 weeks or 12 months. MRR and
+        active subscriptions are measured at the end of each period; churn is
+        cancellations in the period over subscriptions active at its start.
+        """
+        if period not in PERIODS:
+            raise ValidationError(f"Unknown period '{period}'; use {', '.join(PERIODS)}")
+        ledgers = await self._snapshot(location_id)
+        currencies = Counter({c: len(ledger.times) + len(ledger.starts) for c, ledger in ledgers.items()})
+        if currency is None and currencies:
+            currency = currencies.most_common(1)[0][0]
+        currency = (currency or "").upper()
+        ledger = ledgers.get(currency) or _Ledger([], [])
+
+        start_seconds, end_seconds = epoch_bound(start, "start"), epoch_bound(end, "end")
+        now = datetime.now(timezone.utc)
+        end_at = datetime.fromtimestamp(end_seconds, tz=timezone.utc) if end_seconds is not None else now
+        if start_seconds is not None:
+            start_at = datetime.fromtimestamp(start_seconds, tz=timezone.utc)
+        else:
+            back = {"day": timedelta(days=29), "week": timedelta(weeks=11), "month": timedelta(days=334)}
+            start_at = end_at - back[period]
+
+        buckets = []
+        moment = period_start(start_at, period)
+        while moment < end_at:
+            following = next_period(moment, period)
+            lo, hi = moment.timestamp(), min(following, end_at).timestamp()
+            buckets.append(
+                {
+                    "period": period_label(moment, period),
+                    **ledger.revenue(lo, hi),
+                    **ledger.subscriptions(lo, min(hi, time.time())),
+                }
+            )
+            moment = following
+
+        totals = ledger.revenue(period_start(start_at, period).timestamp(), end_at.timestamp())
+        return {
+            "currency": currency or None,
+            "currencies": sorted(c for c in currencies if c),
+            "period": period,
+            "buckets": buckets,
+            "totals": totals,
+        }
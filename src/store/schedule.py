@@ -0,0 +1,276 @@
+"""In-memory interval index of appointments and block slots for conflict checks"""
+
+import asyncio
+import time
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..api.calendars import CalendarsClient
+from .base import epoch_seconds
+
+# Appointments in these states no longer hold their time
+RELEASED_STATUSES = {"cancelled", "invalid"}
+# Calendars of these types book several contacts into the same slot
+SHARED_SLOT_CALENDAR_TYPES = {"class_booking", "service_booking"}
+APPOINTMENT = "appointment"
+BLOCK = "block"
+
+
+class Booking(NamedTuple):
+    """An appointment or block slot holding ``[start, end)``, in epoch seconds"""
+
+    start: float
+    end: float
+    id: str
+    kind: str
+    calendar_id: Optional[str]
+    user_id: Optional[str]
+    title: Optional[str]
+
+    @classmethod
+    def from_event(
+        cls, event: Dict[str, Any], kind: str = APPOINTMENT, known: Optional["Booking"] = None
+    ) -> Optional["Booking"]:
+        """A booking for an API event, or None without an ID or a valid span
+
+        Fields missing from a partial ``event`` fall back to ``known``.
+        """
+        start = epoch_seconds(event.get("startTime"))
+        end = epoch_seconds(event.get("endTime"))
+        if known is not None:
+            start = known.start if start is None else start
+            end = known.end if end is None else end
+        event_id = event.get("id") or event.get("_id")
+        if not event_id or start is None or end is None or end <= start:
+            return None
+        return cls(
+            start,
+            end,
+            event_id,
+            kind,
+            event.get("calendarId") or (known.calendar_id if known else None),
+            event.get("assignedUserId") or (known.user_id if known else None),
+            event.get("title") or (known.title if known else None),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "calendar_id": self.calendar_id,
+            "user_id": self.user_id,
+            "title": self.title,
+            "start_time": datetime.fromtimestamp(self.start, tz=timezone.utc).isoformat(),
+            "end_time": datetime.fromtimestamp(self.end, tz=timezone.utc).isoformat(),
+        }
+
+
+class _Timeline:
+    """Bookings of one calendar or user sorted by start
+
+    Anything overlapping ``[start, end)`` starts before ``end`` and no earlier
+    than ``start`` minus the longest booking, so a query bisects to that
+    slice and only checks end times within it.
+    """
+
+    def __init__(self, lo: float, hi: float) -> None:
+        self.lo = lo
+        self.hi = hi
+        self.bookings: List[Booking] = []
+        self.starts: List[float] = []
+        self.by_id: Dict[str, Booking] = {}
+        self.longest = 0.0
+        self.loaded_at = time.monotonic()
+
+    def add(self, booking: Booking) -> None:
+        self.discard(booking.id)
+        i = bisect_left(self.bookings, booking)
+        self.bookings.insert(i, booking)
+        self.starts.insert(i, booking.start)
+        self.by_id[booking.id] = booking
+        self.longest = max(self.longest, booking.end - booking.start)
+
+    def discard(self, booking_id: str) -> None:
+        booking = self.by_id.pop(booking_id, None)
+        if booking is not None:
+            i = bisect_left(self.bookings, booking)
+            del self.bookings[i]
+            del self.starts[i]
+
+    def overlapping(self, start: float, end: float) -> List[Booking]:
+        i = bisect_left(self.starts, start - self.longest)
+        j = bisect_left(self.starts, end)
+        return [b for b in self.bookings[i:j] if b.end > start]
+
+
+class ScheduleIndex:
+    """Per-calendar and per-user timelines of known appointments and block slots
+
+    A calendar or user is loaded on first check from the events and
+    blocked-slots endpoints, covering a day back to ``horizon_days`` ahead,
+    and reloaded after ``ttl`` seconds. Bookings written through the client
+    are added, moved and removed as they change, so an overlap check is a
+    bisection over in-memory lists rather than an API call.
+    """
+
+    def __init__(self, client: CalendarsClient, ttl: float = 300.0, horizon_days: float = 60.0):
+        self._client = client
+        self.ttl = ttl
+        self.horizon_days = horizon_days
+        self._timelines: Dict[Tuple[str, str, str], _Timeline] = {}
+        self._locks: Dict[Tuple[str, str, str], asyncio.Lock] = {}
+
+    def _fresh(self, timeline: Optional[_Timeline], start: float, end: float) -> bool:
+        return (
+            timeline is not None
+            and time.monotonic() - timeline.loaded_at < self.ttl
+            and timeline.lo <= start
+            and end <= timeline.hi
+        )
+
+    async def _timeline(self, location_id: str, scope: str, key: str, start: float, end: float) -> _Timeline:
+        timeline_key = (location_id, scope, key)
+        timeline = self._timelines.get(timeline_key)
+        if timeline is not None and self._fresh(timeline, start, end):
+            return timeline
+        async with self._locks.setdefault(timeline_key, asyncio.Lock()):
+            timeline = self._timelines.get(timeline_key)
+            if timeline is not None and self._fresh(timeline, start, end):
+                return timeline
+            now = time.time()
+            timeline = _Timeline(min(start, now - 86400), max(end, now + self.horizon_days * 86400))
+            window = (
+                location_id,
+                datetime.fromtimestamp(timeline.lo, tz=timezone.utc),
+                datetime.fromtimestamp(timeline.hi, tz=timezone.utc),
+                key if scope == "calendar" else None,
+                key if scope == "user" else None,
+            )
+            appointments, blocks = await asyncio.gather(
+                self._client.get_calendar_events(*window),
+                self._client.get_blocked_slots(*window),
+            )
+            for events, kind in ((appointments, APPOINTMENT), (blocks, BLOCK)):
+                for event in events:
+                    if str(event.get("appointmentStatus") or "").lower() in RELEASED_STATUSES:
+                        continue
+                    booking = Booking.from_event(event, kind)
+                    if booking is not None:
+                        timeline.add(booking)
+            self._timelines[timeline_key] = timeline
+            return timeline
+
+    async def _scopes(
+        self, location_id: str, calendar_id: Optional[str], user_id: Optional[str], start: float, end: float
+    ) -> List[_Timeline]:
+        keys = [("calendar", calendar_id), ("user", user_id)]
+        return list(
+            await asyncio.gather(
+                *(self._timeline(location_id, scope, key, start, end) for scope, key in keys if key)
+            )
+        )
+
+    @staticmethod
+    def _overlapping(
+        timelines: List[_Timeline], start: float, end: float, exclude_id: Optional[str]
+    ) -> List[Booking]:
+        found: Dict[str, Booking] = {}
+        for timeline in timelines:
+            for booking in timeline.overlapping(start, end):
+                if booking.id != exclude_id:
+                    found[booking.id] = booking
+        return sorted(found.values())
+
+    @staticmethod
+    def _span(start: datetime, end: datetime) -> Tuple[float, float]:
+        # Naive times are UTC, as everywhere else in the store
+        return epoch_seconds(start) or 0.0, epoch_seconds(end) or 0.0
+
+    async def conflicts(
+        self,
+        location_id: str,
+        calendar_id: Optional[str],
+        start: datetime,
+        end: datetime,
+        user_id: Optional[str] = None,
+        exclude_id: Optional[str] = None,
+    ) -> List[Booking]:
+        """Known bookings on the calendar or the user's schedule overlapping ``[start, end)``
+
+        ``exclude_id`` leaves out the appointment being moved.
+        """
+        lo, hi = self._span(start, end)
+        timelines = await self._scopes(location_id, calendar_id, user_id, lo, hi)
+        return self._overlapping(timelines, lo, hi, exclude_id)
+
+    async def suggest(
+        self,
+        location_id: str,
+        calendar_id: Optional[str],
+        start: datetime,
+        end: datetime,
+        user_id: Optional[str] = None,
+        exclude_id: Optional[str] = None,
+        count: int = 3,
+    ) -> List[Tuple[datetime, datetime]]:
+        """The first ``count`` free spans of the same length from ``start`` on
+
+        Only known bookings are avoided; the calendar's opening hours are
+        still enforced by the API.
+        """
+        lo, hi = self._span(start, end)
+        duration = hi - lo
+        timelines = await self._scopes(location_id, calendar_id, user_id, lo, hi)
+        horizon = min((t.hi for t in timelines), default=lo)
+        tz = start.tzinfo or timezone.utc
+
+        suggestions: List[Tuple[datetime, datetime]] = []
+        candidate = lo
+        while len(suggestions) < count and candidate + duration <= horizon:
+            clashes = self._overlapping(timelines, candidate, candidate + duration, exclude_id)
+            if clashes:
+                candidate = max(b.end for b in clashes)
+                continue
+            suggestions.append(
+                (datetime.fromtimestamp(candidate, tz=tz), datetime.fromtimestamp(candidate + duration, tz=tz))
+            )
+            candidate += duration
+        return suggestions
+
+    def booking(self, location_id: str, event_id: str) -> Optional[Booking]:
+        """A known booking by ID, from any loaded timeline of the location"""
+        for (location, _, _), timeline in self._timelines.items():
+            if location == location_id and event_id in timeline.by_id:
+                return timeline.by_id[event_id]
+        return None
+
+    def put(self, location_id: str, event: Dict[str, Any], kind: str = APPOINTMENT) -> None:
+        """Add or move a booking written through the client in the loaded timelines
+
+        Fields missing from ``event`` (partial updates) keep their known values;
+        cancelled appointments are removed.
+        """
+        event_id = event.get("id") or event.get("_id")
+        if not event_id:
+            return
+        known = self.booking(location_id, event_id)
+        self.remove(location_id, event_id)
+        if str(event.get("appointmentStatus") or "").lower() in RELEASED_STATUSES:
+            return
+        booking = Booking.from_event(event, kind, known)
+        if booking is None:
+            return
+        for scope, key in (("calendar", booking.calendar_id), ("user", booking.user_id)):
+            timeline = self._timelines.get((location_id, scope, key or ""))
+            if timeline is not None and timeline.lo <= booking.start < timeline.hi:
+                timeline.add(booking)
+
+    def remove(self, location_id: str, event_id: str) -> None:
+        for (location, _, _), timeline in self._timelines.items():
+            if location == location_id:
+                timeline.discard(event_id)
+
+    def invalidate(self, location_id: Optional[str] = None) -> None:
+        for key in [k for k in self._timelines if location_id is None or k[0] == location_id]:
+            del self._timelines[key]
@@ -0,0 +1,48 @@
+"""Local mirror configuration"""
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class StoreSettings(BaseSettings):
+    """Local mirror configuration from environment (``STORE_*`` variables)"""
+
+    enabled: bool = Field(
+        default=False, description="Mirror location data into a local SQLite database"
+    )
+    path: str = Field(default="./config/mirror.db", description="SQLite file holding the mirrors")
+    sync_interval: float = Field(
+        default=60.0, description="Seconds between background syncs of a location in use"
+    )
+    max_staleness: float = Field(
+        default=300.0, description="Oldest sync (seconds) reads may still be answered from"
+    )
+    full_sync_interval: float = Field(
+        default=86400.0, description="Seconds between full reloads, which drop deleted records"
+    )
+    opportunity_sync_interval: float = Field(
+        default=900.0,
+        description="Seconds between background syncs of a location's opportunities; each one pages "
+        "through every opportunity, since the API cannot filter them on update time",
+    )
+
+    duplicate_index: bool = Field(
+        default=False,
+        description="Check new contacts against an email/phone index even without the mirror (pages through all contacts)",
+    )
+    duplicate_index_ttl: float = Field(
+        default=600.0, description="Seconds before a location's duplicate index is rebuilt"
+    )
+    default_country_code: str = Field(
+        default="1", description="Country calling code assumed for phone numbers without one"
+    )
+
+    schedule_index: bool = Field(
+        default=False,
+        description="Check appointments for overlaps with known appointments and block slots before booking (skipped for calendars taking several bookings per slot)",
+    )
+    schedule_index_ttl: float = Field(
+        default=300.0, description="Seconds before a calendar's or user's known bookings are reloaded"
+    )
+
+    model_config = SettingsConfigDict(env_prefix="STORE_", extra="ignore")
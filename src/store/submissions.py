@@ -0,0 +1,501 @@
+"""Local store of form and survey submissions with columnar answer analytics"""
+
+import json
+import sqlite3
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from functools import partial
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..api.forms import FormsClient
+from ..api.surveys import SurveysClient
+from ..utils.exceptions import ValidationError
+from .base import (
+    PERIODS,
+    SyncState,
+    SyncedStore,
+    epoch_bound,
+    epoch_seconds,
+    full_load_mark,
+    next_period,
+    normalize_timestamp,
+    period_label,
+    period_start,
+)
+from .database import LocalDatabase
+
+FORM = "form"
+SURVEY = "survey"
+REPORTS = ("fields", "distribution", "crosstab", "histogram")
+# The submission date filters are whole days, so incremental syncs start a day early
+OVERLAP_DAYS = 1
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def flatten_answers(submission: Dict[str, Any]) -> Dict[str, List[str]]:
+    """A submission's answers as ``field -> values``, with nested fields dotted
+
+    List answers (checkboxes) give one value per distinct item. Empty
+    answers and objects inside lists (uploaded files) are left out.
+    """
+    answers: Dict[str, Any] = next(
+        (submission[key] for key in ("data", "responses", "others") if isinstance(submission.get(key), dict)),
+        {},
+    )
+    flat: Dict[str, List[str]] = {}
+
+    def walk(prefix: str, value: Any) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                walk(f"{prefix}.{key}" if prefix else str(key), item)
+            return
+        items = value if isinstance(value, list) else [value]
+        texts = (_text(item) for item in items if not isinstance(item, (dict, list)))
+        values = list(dict.fromkeys(text for text in texts if text))
+        if values:
+            flat[prefix] = values
+
+    walk("", answers)
+    return flat
+
+
+class _Column:
+    """One field's answers as dictionary codes, ordered by submission
+
+    ``rows`` holds the submission (row) each code belongs to, so a time range
+    of submissions is one contiguous slice of codes found by bisection, which
+    ``Counter`` tallies without a Python-level loop. Fields most submissions
+    leave blank take no space for the submissions without an answer.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[int, str]]):
+        self._index: Dict[str, int] = {}
+        self.values: List[str] = []
+        rows: List[int] = []
+        codes: List[int] = []
+        for row, value in entries:
+            rows.append(row)
+            codes.append(self._code(value))
+        self.rows = array("i", rows)
+        self.codes = array("i", codes)
+        self.answered_rows = array("i", sorted(set(rows)))
+
+    def _code(self, value: str) -> int:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, row: int, value: str) -> None:
+        """Add an answer of a submission newer than every one in the column"""
+        self.rows.append(row)
+        self.codes.append(self._code(value))
+        if not self.answered_rows or self.answered_rows[-1] != row:
+            self.answered_rows.append(row)
+
+    def _span(self, i: int, j: int) -> Tuple[int, int]:
+        return bisect_left(self.rows, i), bisect_left(self.rows, j)
+
+    def counts(self, i: int, j: int) -> Counter:
+        lo, hi = self._span(i, j)
+        return Counter(self.codes[lo:hi])
+
+    def answered(self, i: int, j: int) -> int:
+        return bisect_left(self.answered_rows, j) - bisect_left(self.answered_rows, i)
+
+    def pairs(self, i: int, j: int) -> Iterable[Tuple[int, int]]:
+        """``(row, code)`` of every answer given in rows ``[i, j)``"""
+        lo, hi = self._span(i, j)
+        return zip(self.rows[lo:hi], self.codes[lo:hi])
+
+
+class _Submissions:
+    """Submissions of a form, a survey or a whole location, sorted by time
+
+    A time range is a slice of rows found by bisection on ``times``.
+    Columns are loaded one field at a time, on first use.
+    """
+
+    def __init__(self, source_id: Optional[str], ids: List[str], times: List[float]):
+        self.source_id = source_id
+        self.times = array("d", times)
+        self.positions = {submission_id: row for row, submission_id in enumerate(ids)}
+        self.columns: Dict[str, _Column] = {}
+
+    def rows(self, start: float, end: float) -> Tuple[int, int]:
+        return bisect_left(self.times, start), bisect_left(self.times, end)
+
+    def append(self, submission_id: str, submitted: float, answers: Dict[str, List[str]]) -> None:
+        """Add a submission newer than every one in the snapshot to it and its loaded columns"""
+        row = self.positions[submission_id] = len(self.times)
+        self.times.append(submitted)
+        for field, values in answers.items():
+            column = self.columns.get(field)
+            if column is not None:
+                for value in values:
+                    column.append(row, value)
+
+
+class SubmissionStore(SyncedStore):
+    """Form and survey submissions per location, with their answers flattened
+
+    Submissions do not change once made, so incremental syncs only fetch
+    those from the day before the high-water mark on. Answers are stored one
+    row per field value, clustered by field, so analytics load only the
+    fields they ask about into an in-memory columnar snapshot per form or
+    survey: one dictionary-encoded column per field, making distributions,
+    cross-tabs and date histograms counts over array slices rather than
+    walks over nested submission dicts. Incremental syncs append new
+    submissions to loaded snapshots; full loads drop them.
+    """
+
+    entity = "submissions"
+    tables = ("submissions", "submission_answers")
+
+    def __init__(
+        self,
+        forms: FormsClient,
+        surveys: SurveysClient,
+        db: LocalDatabase,
+        page_size: int = 100,
+        **kwargs: Any,
+    ):
+        super().__init__(db, **kwargs)
+        self._forms = forms
+        self._surveys = surveys
+        self.page_size = page_size
+        self._snapshots: Dict[Tuple[str, str], _Submissions] = {}
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS submissions (
+                location_id TEXT NOT NULL,
+                id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                source_id TEXT,
+                contact_id TEXT,
+                submitted_at REAL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (location_id, id)
+            );
+            CREATE INDEX IF NOT EXISTS submissions_by_source
+                ON submissions (location_id, source_id, submitted_at);
+            CREATE TABLE IF NOT EXISTS submission_answers (
+                location_id TEXT NOT NULL,
+                field TEXT NOT NULL,
+                submission_id TEXT NOT NULL,
+                value TEXT NOT NULL,
+                source_id TEXT,
+                submitted_at REAL,
+                PRIMARY KEY (location_id, field, submission_id, value)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS submission_answers_by_submission
+                ON submission_answers (location_id, submission_id);
+            """
+        )
+
+    @staticmethod
+    def _submitted(submission: Dict[str, Any]) -> Any:
+        return submission.get("submittedAt") or submission.get("createdAt")
+
+    def _put(self, conn: sqlite3.Connection, location_id: str, kind: str, rows: Iterable[Dict[str, Any]]) -> None:
+        submissions: List[Tuple[Any, ...]] = []
+        answers: List[Tuple[Any, ...]] = []
+        for submission in rows:
+            submission_id = submission.get("id") or submission.get("_id")
+            if not submission_id:
+                continue
+            source_id = submission.get("formId") or submission.get("surveyId")
+            submitted = epoch_seconds(self._submitted(submission))
+            submissions.append(
+                (
+                    location_id,
+                    submission_id,
+                    kind,
+                    source_id,
+                    submission.get("contactId"),
+                    submitted,
+                    json.dumps(submission, default=str),
+                )
+            )
+            # Source and time are repeated on every answer so reports need no join
+            for field, values in flatten_answers(submission).items():
+                answers.extend(
+                    (location_id, field, submission_id, value, source_id, submitted) for value in values
+                )
+        self._delete(conn, location_id, [row[1] for row in submissions])
+        conn.executemany(
+            "INSERT INTO submissions (location_id, id, kind, source_id, contact_id, submitted_at, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            submissions,
+        )
+        conn.executemany(
+            "INSERT INTO submission_answers (location_id, field, submission_id, value, source_id, submitted_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            answers,
+        )
+
+    def _delete(self, conn: sqlite3.Connection, location_id: str, submission_ids: Iterable[str]) -> None:
+        keys = [(location_id, submission_id) for submission_id in submission_ids]
+        conn.executemany("DELETE FROM submissions WHERE location_id = ? AND id = ?", keys)
+        conn.executemany("DELETE FROM submission_answers WHERE location_id = ? AND submission_id = ?", keys)
+
+    def _sources(
+        self, location_id: str, start_date: Optional[date] = None
+    ) -> List[Tuple[str, AsyncGenerator[List[Dict[str, Any]], None]]]:
+        return [
+            (FORM, self._forms.iter_submission_pages(location_id, start_date, page_size=self.page_size)),
+            (SURVEY, self._surveys.iter_submission_pages(location_id, start_date, page_size=self.page_size)),
+        ]
+
+    async def _full_load(self, location_id: str, started_at: float) -> Optional[str]:
+        seen: Set[str] = set()
+        for kind, pages in self._sources(location_id):
+            async for page in pages:
+                seen.update(str(s.get("id") or s.get("_id")) for s in page)
+                await self.db.run(partial(self._put, location_id=location_id, kind=kind, rows=page))
+
+        mark = full_load_mark(started_at)
+        cutoff = epoch_seconds(mark)
+
+        def drop_missing(conn: sqlite3.Connection) -> None:
+            stored = conn.execute(
+                "SELECT id FROM submissions WHERE location_id = ? AND (submitted_at IS NULL OR submitted_at < ?)",
+                (location_id, cutoff),
+            ).fetchall()
+            self._delete(conn, location_id, [row["id"] for row in stored if row["id"] not in seen])
+
+        await self.db.run(drop_missing)
+        return mark
+
+    async def _incremental(self, location_id: str, since: str) -> Optional[str]:
+        mark: Optional[str] = None
+        since_at = datetime.fromtimestamp(epoch_seconds(since) or 0.0, tz=timezone.utc)
+        start_date = (since_at - timedelta(days=OVERLAP_DAYS)).date()
+        fetched: List[Dict[str, Any]] = []
+        for kind, pages in self._sources(location_id, start_date):
+            async for page in pages:
+                await self.db.run(partial(self._put, location_id=location_id, kind=kind, rows=page))
+                fetched.extend(page)
+                for submission in page:
+                    submitted = normalize_timestamp(self._submitted(submission))
+                    if submitted is not None and (mark is None or submitted > mark):
+                        mark = submitted
+        self._extend_snapshots(location_id, fetched)
+        return mark
+
+    def _extend_snapshots(self, location_id: str, submissions: List[Dict[str, Any]]) -> None:
+        """Append newly synced submissions to the location's loaded snapshots
+
+        A snapshot that would receive a submission older than its newest one
+        is dropped and reloaded on next use instead.
+        """
+        fresh = []
+        for submission in submissions:
+            submitted = epoch_seconds(self._submitted(submission))
+            submission_id = submission.get("id") or submission.get("_id")
+            if submitted is not None and submission_id:
+                source_id = submission.get("formId") or submission.get("surveyId")
+                fresh.append((submitted, str(submission_id), source_id, submission))
+        fresh.sort(key=lambda entry: entry[:2])
+
+        for key in [k for k in self._snapshots if k[0] == location_id]:
+            snapshot = self._snapshots[key]
+            added = [
+                entry for entry in fresh
+                if entry[1] not in snapshot.positions and (not key[1] or entry[2] == key[1])
+            ]
+            if added and snapshot.times and added[0][0] < snapshot.times[-1]:
+                del self._snapshots[key]
+                continue
+            for submitted, submission_id, _, submission in added:
+                snapshot.append(submission_id, submitted, flatten_answers(submission))
+
+    async def sync(self, location_id: str, full: bool = False) -> SyncState:
+        state = await super().sync(location_id, full)
+        if state.last_sync == state.last_full_sync:
+            # A full load may have dropped submissions, so snapshots are reloaded
+            for key in [k for k in self._snapshots if k[0] == location_id]:
+                del self._snapshots[key]
+        return state
+
+    @staticmethod
+    def _source_filter(location_id: str, source_id: Optional[str]) -> Tuple[str, List[Any]]:
+        where = "location_id = ? AND submitted_at IS NOT NULL"
+        args: List[Any] = [location_id]
+        if source_id:
+            where += " AND source_id = ?"
+            args.append(source_id)
+        return where, args
+
+    async def _snapshot(self, location_id: str, source_id: Optional[str]) -> _Submissions:
+        key = (location_id, source_id or "")
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            where, args = self._source_filter(location_id, source_id)
+            rows = await self.db.run(
+                lambda conn: conn.execute(
+                    f"SELECT id, submitted_at FROM submissions WHERE {where} ORDER BY submitted_at, id",
+                    args,
+                ).fetchall()
+            )
+            snapshot = _Submissions(source_id, [row[0] for row in rows], [row[1] for row in rows])
+            self._snapshots[key] = snapshot
+        return snapshot
+
+    async def _column(self, location_id: str, snapshot: _Submissions, field: str) -> _Column:
+        if field in snapshot.columns:
+            return snapshot.columns[field]
+        where, args = self._source_filter(location_id, snapshot.source_id)
+        rows = await self.db.run(
+            lambda conn: conn.execute(
+                f"SELECT submission_id, value FROM submission_answers WHERE {where} AND field = ?",
+                [*args, field],
+            ).fetchall()
+        )
+        positions = snapshot.positions
+        entries = sorted((positions[row[0]], row[1]) for row in rows if row[0] in positions)
+        if not entries:
+            raise ValidationError(f"No answers to field '{field}'; run the fields report to list them")
+        snapshot.columns[field] = _Column(entries)
+        return snapshot.columns[field]
+
+    async def _fields(
+        self, location_id: str, source_id: Optional[str], start: float, end: float
+    ) -> List[Dict[str, Any]]:
+        where, args = self._source_filter(location_id, source_id)
+        sql = (
+            "SELECT field, COUNT(DISTINCT submission_id) AS answered, COUNT(DISTINCT value) AS distinct_values "
+            f"FROM submission_answers WHERE {where} AND submitted_at >= ? AND submitted_at < ? "
+            "GROUP BY field ORDER BY answered DESC, field"
+        )
+        rows = await self.db.run(lambda conn: conn.execute(sql, [*args, start, end]).fetchall())
+        return [
+            {"field": row["field"], "answered": row["answered"], "distinct": row["distinct_values"]}
+            for row in rows
+        ]
+
+    @staticmethod
+    def _distribution(column: _Column, i: int, j: int, top: int) -> Dict[str, Any]:
+        counts = column.counts(i, j)
+        answered = column.answered(i, j)
+        return {
+            "answered": answered,
+            "distinct": len(counts),
+            "values": [
+                {"value": column.values[code], "count": count, "share": round(count / answered, 4)}
+                for code, count in counts.most_common(top)
+            ],
+        }
+
+    @staticmethod
+    def _crosstab(column: _Column, by: _Column, i: int, j: int, top: int) -> Dict[str, Any]:
+        by_row: Dict[int, List[int]] = {}
+        for r, y in by.pairs(i, j):
+            by_row.setdefault(r, []).append(y)
+        pairs: Counter = Counter()
+        for r, x in column.pairs(i, j):
+            for y in by_row.get(r, ()):
+                pairs[(x, y)] += 1
+        row_totals: Counter = Counter()
+        column_totals: Counter = Counter()
+        for (x, y), count in pairs.items():
+            row_totals[x] += count
+            column_totals[y] += count
+        shown = [y for y, _ in column_totals.most_common(top)]
+        return {
+            "columns": [by.values[y] for y in shown],
+            "rows": [
+                {
+                    "value": column.values[x],
+                    "total": total,
+                    "counts": {by.values[y]: pairs[(x, y)] for y in shown},
+                }
+                for x, total in row_totals.most_common(top)
+            ],
+        }
+
+    async def analyze(
+        self,
+        location_id: str,
+        report: str = "fields",
+        source_id: Optional[str] = None,
+        field: Optional[str] = None,
+        by: Optional[str] = None,
+        period: str = "month",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        top: int = 20,
+    ) -> Dict[str, Any]:
+        """Answer analytics over one form or survey, or every submission of the location
+
+        ``fields`` lists the answered fields; ``distribution`` counts the
+        answers to ``field``; ``crosstab`` counts ``field`` answers against
+        ``by`` answers on the same submissions; ``histogram`` counts
+        submissions per day, week or month, broken down by the top ``field``
+        answers when a field is given. Only the ``top`` most common values
+        are listed. Histograms default to the last 30 days, 12 weeks or 12
+        months; the other reports to every submission.
+        """
+        if report not in REPORTS:
+            raise ValidationError(f"Unknown report '{report}'; use {', '.join(REPORTS)}")
+        if report in ("distribution", "crosstab") and not field:
+            raise ValidationError(f"The {report} report needs a field")
+        if report == "crosstab" and not by:
+            raise ValidationError("The crosstab report needs a field to break down by")
+        if report == "histogram" and period not in PERIODS:
+            raise ValidationError(f"Unknown period '{period}'; use {', '.join(PERIODS)}")
+
+        start_seconds, end_seconds = epoch_bound(start, "start"), epoch_bound(end, "end")
+        snapshot = await self._snapshot(location_id, source_id)
+        now = datetime.now(timezone.utc)
+        end_at = datetime.fromtimestamp(end_seconds, tz=timezone.utc) if end_seconds is not None else now
+        if start_seconds is not None:
+            start_at = datetime.fromtimestamp(start_seconds, tz=timezone.utc)
+        elif report == "histogram":
+            back = {"day": timedelta(days=29), "week": timedelta(weeks=11), "month": timedelta(days=334)}
+            start_at = period_start(end_at - back[period], period)
+        else:
+            start_at = datetime.fromtimestamp(0, tz=timezone.utc)
+        lo_time, hi_time = start_at.timestamp(), end_at.timestamp() if end_seconds is not None else float("inf")
+        i, j = snapshot.rows(lo_time, hi_time)
+
+        result: Dict[str, Any] = {"report": report, "source_id": source_id, "submissions": j - i}
+        if report == "fields":
+            result["fields"] = await self._fields(location_id, source_id, lo_time, hi_time)
+        elif report == "distribution":
+            column = await self._column(location_id, snapshot, field or "")
+            result.update(field=field, **self._distribution(column, i, j, top))
+        elif report == "crosstab":
+            column = await self._column(location_id, snapshot, field or "")
+            by_column = await self._column(location_id, snapshot, by or "")
+            result.update(field=field, by=by, **self._crosstab(column, by_column, i, j, top))
+        else:
+            values = await self._column(location_id, snapshot, field) if field else None
+            shown = [code for code, _ in values.counts(i, j).most_common(top)] if values else []
+            buckets = []
+            moment = period_start(start_at, period)
+            while moment < end_at:
+                following = next_period(moment, period)
+                lo, hi = snapshot.rows(moment.timestamp(), min(following, end_at).timestamp())
+                bucket: Dict[str, Any] = {"period": period_label(moment, period), "submissions": hi - lo}
+                if values is not None:
+                    counts = values.counts(lo, hi)
+                    bucket["values"] = {values.values[code]: counts[code] for code in shown}
+                buckets.append(bucket)
+                moment = following
+            result.update(field=field, period=period, buckets=buckets)
+        return result
@@ -0,0 +1,232 @@
+"""Local SQLite index of a location's tasks by due date and assignee"""
+
+import json
+import sqlite3
+import time
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..api.locations_extended import LocationsExtendedClient
+from .base import SyncedStore, full_load_mark, normalize_timestamp, timestamp_bound
+from .database import LocalDatabase
+
+
+class TaskIndex(SyncedStore):
+    """Tasks per location, indexed on ``(completed, due_date)`` and ``(assigned_to, completed, due_date)``
+
+    Overdue, due-soon and per-assignee queries walk one of the two indexes in
+    due-date order instead of fetching each contact's tasks. The task search
+    endpoint cannot filter on ``dateUpdated``, so incremental syncs re-read
+    only the open tasks: a stored open task missing from them was completed
+    or deleted elsewhere and is marked completed until the next full load
+    drops deleted ones.
+    """
+
+    entity = "tasks"
+    tables = ("tasks",)
+
+    def __init__(self, client: LocationsExtendedClient, db: LocalDatabase, page_size: int = 100, **kwargs: Any):
+        super().__init__(db, **kwargs)
+        self._client = client
+        self.page_size = page_size
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                location_id TEXT NOT NULL,
+                id TEXT NOT NULL,
+                title TEXT,
+                contact_id TEXT,
+                assigned_to TEXT,
+                due_date TEXT,
+                completed INTEGER NOT NULL DEFAULT 0,
+                date_added TEXT,
+                date_updated TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (location_id, id)
+            );
+            CREATE INDEX IF NOT EXISTS tasks_by_due
+                ON tasks (location_id, completed, due_date);
+            CREATE INDEX IF NOT EXISTS tasks_by_assignee
+                ON tasks (location_id, assigned_to, completed, due_date);
+            CREATE INDEX IF NOT EXISTS tasks_by_contact
+                ON tasks (location_id, contact_id);
+            """
+        )
+
+    @staticmethod
+    def _row(location_id: str, task: Dict[str, Any]) -> Tuple[Any, ...]:
+        task = {**task, "locationId": task.get("locationId") or location_id}
+        return (
+            location_id,
+            task["id"],
+            task.get("title"),
+            task.get("contactId"),
+            task.get("assignedTo"),
+            normalize_timestamp(task.get("dueDate")),
+            1 if task.get("completed") else 0,
+            normalize_timestamp(task.get("dateAdded")),
+            normalize_timestamp(task.get("dateUpdated")),
+            json.dumps(task, default=str),
+        )
+
+    def _upsert(self, conn: sqlite3.Connection, location_id: str, tasks: Iterable[Dict[str, Any]]) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO tasks (location_id, id, title, contact_id, assigned_to, due_date, "
+            "completed, date_added, date_updated, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [self._row(location_id, task) for task in tasks if task.get("id")],
+        )
+
+    @staticmethod
+    def _newest(tasks: Iterable[Dict[str, Any]], mark: Optional[str]) -> Optional[str]:
+        for task in tasks:
+            updated = normalize_timestamp(task.get("dateUpdated"))
+            if updated is not None and (mark is None or updated > mark):
+                mark = updated
+        return mark
+
+    async def _full_load(self, location_id: str, started_at: float) -> Optional[str]:
+        seen: Set[str] = set()
+        async for page in self._client.iter_task_pages(location_id, page_size=self.page_size):
+            seen.update(str(t["id"]) for t in page if t.get("id"))
+            await self.db.run(partial(self._upsert, location_id=location_id, tasks=page))
+
+        mark = full_load_mark(started_at)
+
+        def drop_missing(conn: sqlite3.Connection) -> None:
+            # Rows written through the client during the load are kept
+            stored = conn.execute(
+                "SELECT id FROM tasks WHERE location_id = ? AND (date_updated IS NULL OR date_updated < ?)",
+                (location_id, mark),
+            ).fetchall()
+            conn.executemany(
+                "DELETE FROM tasks WHERE location_id = ? AND id = ?",
+                [(location_id, row["id"]) for row in stored if row["id"] not in seen],
+            )
+
+        await self.db.run(drop_missing)
+        return mark
+
+    async def _incremental(self, location_id: str, since: str) -> Optional[str]:
+        started = normalize_timestamp(time.time() * 1000)
+        seen: Set[str] = set()
+        mark: Optional[str] = None
+        async for page in self._client.iter_task_pages(location_id, completed=False, page_size=self.page_size):
+            seen.update(str(t["id"]) for t in page if t.get("id"))
+            mark = self._newest(page, mark)
+            await self.db.run(partial(self._upsert, location_id=location_id, tasks=page))
+
+        def close_missing(conn: sqlite3.Connection) -> None:
+            stored = conn.execute(
+                "SELECT id FROM tasks WHERE location_id = ? AND completed = 0 "
+                "AND (date_updated IS NULL OR date_updated < ?)",
+                (location_id, started),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET completed = 1, data = json_set(data, '$.completed', json('true')) "
+                "WHERE location_id = ? AND id = ?",
+                [(location_id, row["id"]) for row in stored if row["id"] not in seen],
+            )
+
+        await self.db.run(close_missing)
+        return mark
+
+    async def put(self, location_id: str, task: Dict[str, Any]) -> None:
+        """Write a task returned by the API through to the index
+
+        Fields missing from ``task`` keep their stored values, since some
+        task endpoints return only part of the task.
+        """
+
+        def write(conn: sqlite3.Connection) -> None:
+            row = conn.execute(
+                "SELECT data FROM tasks WHERE location_id = ? AND id = ?", (location_id, task.get("id"))
+            ).fetchone()
+            stored = json.loads(row["data"]) if row is not None else {}
+            merged = {**stored, **{key: value for key, value in task.items() if value is not None}}
+            if not task.get("dateUpdated"):
+                # Syncs running meanwhile must not close or drop the task as unseen
+                merged["dateUpdated"] = normalize_timestamp(time.time() * 1000)
+            self._upsert(conn, location_id, [merged])
+
+        await self.db.run(write)
+
+    async def remove(self, location_id: str, task_id: str) -> None:
+        await self.db.run(
+            lambda conn: conn.execute("DELETE FROM tasks WHERE location_id = ? AND id = ?", (location_id, task_id))
+        )
+
+    async def search(
+        self,
+        location_id: str,
+        assigned_to: Optional[str] = None,
+        contact_id: Optional[str] = None,
+        completed: Optional[bool] = False,
+        overdue: bool = False,
+        due_after: Optional[str] = None,
+        due_before: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Matching tasks, soonest due first (undated last), and the total number of matches
+
+        ``overdue`` keeps open tasks due before now; ``completed=None``
+        matches open and completed tasks alike.
+        """
+        where = ["location_id = ?"]
+        args: List[Any] = [location_id]
+        after = timestamp_bound(due_after, "due_after")
+        before = timestamp_bound(due_before, "due_before")
+        if overdue:
+            completed = False
+            now = normalize_timestamp(time.time() * 1000) or ""
+            before = min(before or now, now)
+        for column, value in (("assigned_to", assigned_to), ("contact_id", contact_id)):
+            if value:
+                where.append(f"{column} = ?")
+                args.append(value)
+        if completed is not None:
+            where.append("completed = ?")
+            args.append(1 if completed else 0)
+        if after:
+            where.append("due_date >= ?")
+            args.append(after)
+        if before:
+            where.append("due_date < ?")
+            args.append(before)
+        clause = " AND ".join(where)
+
+        def run(conn: sqlite3.Connection) -> Tuple[List[Dict[str, Any]], int]:
+            total = conn.execute(f"SELECT COUNT(*) FROM tasks WHERE {clause}", args).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT data FROM tasks WHERE {clause} "
+                "ORDER BY due_date IS NULL, due_date, id LIMIT ? OFFSET ?",
+                [*args, limit, skip],
+            ).fetchall()
+            return [json.loads(row["data"]) for row in rows], total
+
+        return await self.db.run(run)
+
+    async def workload(self, location_id: str, due_within_days: float = 7.0) -> List[Dict[str, Any]]:
+        """Open, overdue and soon-due task counts per assignee, busiest first
+
+        Unassigned tasks are grouped under an ``assigned_to`` of None.
+        """
+        now = time.time()
+        overdue_before = normalize_timestamp(now * 1000)
+        due_soon_before = normalize_timestamp((now + due_within_days * 86400) * 1000)
+
+        def run(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+            rows = conn.execute(
+                "SELECT assigned_to, COUNT(*) AS open, "
+                "COALESCE(SUM(due_date < ?), 0) AS overdue, "
+                "COALESCE(SUM(due_date >= ? AND due_date < ?), 0) AS due_soon, "
+                "MIN(CASE WHEN due_date >= ? THEN due_date END) AS next_due "
+                "FROM tasks WHERE location_id = ? AND completed = 0 "
+                "GROUP BY assigned_to ORDER BY open DESC, overdue DESC",
+                (overdue_before, overdue_before, due_soon_before, overdue_before, location_id),
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+        return await self.db.run(run)
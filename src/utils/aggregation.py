@@ -0,0 +1,82 @@
+"""Streaming aggregation over raw API rows"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def get_field(row: Dict[str, Any], path: str) -> Any:
+    """Read a possibly dotted field path (e.g. ``contact.source``) from a raw row"""
+    value: Any = row
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RunningAggregate:
+    """Folds raw rows into counts and sums without keeping the rows
+
+    Memory use depends only on the number of distinct groups, not on the
+    number of rows. A list-valued group-by field (such as ``tags``) counts the
+    row once under each of its values.
+    """
+
+    def __init__(self, sum_fields: Optional[List[str]] = None, group_by: Optional[str] = None):
+        self.sum_fields = list(sum_fields or [])
+        self.group_by = group_by
+        self.count = 0
+        self.sums: Dict[str, float] = {field: 0.0 for field in self.sum_fields}
+        self.groups: Dict[str, Dict[str, Any]] = {}
+
+    def _new_bucket(self) -> Dict[str, Any]:
+        return {"count": 0, "sums": {field: 0.0 for field in self.sum_fields}}
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """Fold a single row into the running totals"""
+        self.count += 1
+        values = {field: _as_number(get_field(row, field)) for field in self.sum_fields}
+        for field, value in values.items():
+            if value is not None:
+                self.sums[field] += value
+
+        if self.group_by is None:
+            return
+        key = get_field(row, self.group_by)
+        keys = key if isinstance(key, list) else [key]
+        for group_key in keys or [None]:
+            bucket_key = "(none)" if group_key is None else str(group_key)
+            bucket = self.groups.get(bucket_key)
+            if bucket is None:
+                bucket = self.groups[bucket_key] = self._new_bucket()
+            bucket["count"] += 1
+            for field, value in values.items():
+                if value is not None:
+                    bucket["sums"][field] += value
+
+    def add_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Fold a page of rows into the running totals"""
+        for row in rows:
+            self.add(row)
+
+    def result(self, max_groups: int = 100) -> Dict[str, Any]:
+        """Compact result; only the ``max_groups`` largest groups are listed"""
+        result: Dict[str, Any] = {"count": self.count}
+        if self.sum_fields:
+            result["sums"] = self.sums
+        if self.group_by is not None:
+            ranked = sorted(self.groups.items(), key=lambda item: item[1]["count"], reverse=True)
+            result["group_by"] = self.group_by
+            result["groups"] = dict(ranked[:max_groups])
+            result["group_count"] = len(self.groups)
+        return result
@@ -27,5 +27,7 @@ async def get_client_with_token_override(
             return access_token
 
         temp_oauth.get_valid_token = return_token  # type: ignore
-        return GoHighLevelClient(temp_oauth)
+        # Share the bus, stores and settings so writes made with the override
+        # still invalidate and local tools work the same
+        return ghl_client.with_oauth(temp_oauth)
     return ghl_client
@@ -48,6 +48,30 @@ class DuplicateResourceError(GoHighLevelError):
     pass
 
 
+class UnsupportedRouteError(GoHighLevelError):
+    """Raised locally for routes the API is known not to support"""
+
+    pass
+
+
+class LocalStoreDisabledError(GoHighLevelError):
+    """Raised when a local-only query needs a mirror that is not enabled"""
+
+    pass
+
+
+class ScheduleConflictError(ValidationError):
+    """Raised locally when a booking overlaps a known appointment or block slot"""
+
+    pass
+
+
+class UnknownReferenceError(ValidationError):
+    """Raised when a name or ID cannot be resolved from cached location metadata"""
+
+    pass
+
+
 def handle_api_error(response: httpx.Response) -> None:
     """Convert HTTP errors to appropriate exceptions
 
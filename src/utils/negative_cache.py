@@ -0,0 +1,56 @@
+"""Short-lived memory of lookups the API answered with 404"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# (endpoint, location ID, sorted query parameters)
+NotFoundKey = Tuple[str, Optional[str], Tuple[Tuple[str, str], ...]]
+
+
+def not_found_key(
+    endpoint: str, location_id: Optional[str], params: Optional[Dict[str, Any]] = None
+) -> NotFoundKey:
+    """Key for a GET lookup; the endpoint carries the resource ID"""
+    query = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return endpoint.rstrip("/"), location_id, query
+
+
+class NegativeCache:
+    """Remembers not-found responses for ``ttl`` seconds
+
+    Entries under an endpoint are dropped when it is written, so a resource
+    that is recreated or restored is seen again at once.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[NotFoundKey, Tuple[float, str, Dict[str, Any]]] = {}
+
+    def get(self, key: NotFoundKey) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """The remembered ``(message, response_data)`` for a lookup, if still fresh"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[key]
+            return None
+        return entry[1], entry[2]
+
+    def record(self, key: NotFoundKey, message: str, response_data: Dict[str, Any]) -> None:
+        if self.ttl <= 0:
+            return
+        if len(self._entries) >= self.max_entries:
+            # Drop the oldest entry; dicts keep insertion order
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic(), message, response_data)
+
+    def forget(self, endpoint: str) -> None:
+        """Drop entries for an endpoint and everything below it"""
+        prefix = endpoint.rstrip("/")
+        for key in list(self._entries):
+            if key[0] == prefix or key[0].startswith(prefix + "/"):
+                del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,8 @@
+"""Pagination helpers for walking multi-page API results"""
+
+from typing import List
+
+
+def page_offsets(total: int, page_size: int, start: int = 0) -> List[int]:
+    """Return the skip offsets of every page after ``start`` needed to cover ``total`` rows"""
+    return list(range(start + page_size, total, page_size))
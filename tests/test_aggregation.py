@@ -0,0 +1,143 @@
+"""Tests for aggregate-only mode on list tools"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.api.opportunities import OpportunitiesClient
+from src.mcp.aggregation import run_aggregate
+from src.mcp.params.aggregation import AggregateSpec
+from src.models.opportunity import OpportunitySearchFilters
+from src.services.oauth import OAuthService
+from src.utils.aggregation import RunningAggregate, get_field
+
+
+@pytest.fixture
+def mock_oauth_service():
+    """Create a mock OAuth service"""
+    oauth_service = MagicMock(spec=OAuthService)
+    oauth_service.get_valid_token = AsyncMock(return_value="test_token")
+    oauth_service.get_location_token = AsyncMock(return_value="location_token")
+    return oauth_service
+
+
+def _opportunities(count):
+    return [
+        {
+            "id": f"opp_{i}",
+            "pipelineStageId": "stage_won" if i % 3 == 0 else "stage_new",
+            "monetaryValue": 100 * (i % 5),
+            "contact": {"tags": ["vip"] if i % 2 else []},
+        }
+        for i in range(count)
+    ]
+
+
+def _mock_request(rows):
+    async def request(method, endpoint, params=None, location_id=None, **kwargs):
+        skip = params.get("skip", 0)
+        response = MagicMock()
+        response.json.return_value = {"opportunities": rows[skip:skip + params["limit"]]}
+        return response
+
+    return AsyncMock(side_effect=request)
+
+
+class TestRunningAggregate:
+    """Test folding raw rows into totals"""
+
+    def test_count_sum_and_group_by(self):
+        """Test counts and sums overall and per group"""
+        aggregate = RunningAggregate(sum_fields=["monetaryValue"], group_by="pipelineStageId")
+        aggregate.add_many(_opportunities(10))
+
+        result = aggregate.result()
+        assert result["count"] == 10
+        assert result["sums"]["monetaryValue"] == 2000
+        assert result["groups"]["stage_won"]["count"] == 4
+        assert result["groups"]["stage_won"]["sums"]["monetaryValue"] == 800
+        assert result["group_count"] == 2
+
+    def test_list_and_missing_group_keys(self):
+        """Test list-valued keys count once per value and missing keys are bucketed"""
+        aggregate = RunningAggregate(group_by="tags")
+        aggregate.add_many([{"tags": ["a", "b"]}, {"tags": ["a"]}, {}, {"tags": []}])
+
+        groups = aggregate.result()["groups"]
+        assert groups == {
+            "a": {"count": 2, "sums": {}},
+            "(none)": {"count": 2, "sums": {}},
+            "b": {"count": 1, "sums": {}},
+        }
+
+    def test_non_numeric_values_are_skipped(self):
+        """Test that strings that are not numbers do not break the sum"""
+        aggregate = RunningAggregate(sum_fields=["amount"])
+        aggregate.add_many([{"amount": "12.5"}, {"amount": "n/a"}, {"amount": None}, {"amount": 2}])
+        assert aggregate.result()["sums"]["amount"] == 14.5
+
+    def test_max_groups_keeps_largest(self):
+        """Test that only the largest groups are returned"""
+        aggregate = RunningAggregate(group_by="k")
+        aggregate.add_many([{"k": "big"}] * 3 + [{"k": "small"}])
+        result = aggregate.result(max_groups=1)
+        assert list(result["groups"]) == ["big"]
+        assert result["group_count"] == 2
+
+    def test_dotted_field_path(self):
+        """Test reading nested fields"""
+        assert get_field({"contact": {"source": "web"}}, "contact.source") == "web"
+        assert get_field({"contact": None}, "contact.source") is None
+
+
+class TestAggregateMode:
+    """Test streaming raw pages into an aggregate response"""
+
+    @pytest.mark.asyncio
+    async def test_streams_all_pages_without_models(self, mock_oauth_service):
+        """Test every page is read with the search filters and folded into totals"""
+        client = OpportunitiesClient(mock_oauth_service)
+        mock_request = _mock_request(_opportunities(250))
+        filters = OpportunitySearchFilters(pipelineId="pipe_1")
+
+        with patch.object(client, "_request", mock_request):
+            pages = client.iter_opportunity_pages("loc_123", filters)
+            result = await run_aggregate(
+                pages, AggregateSpec(sum_fields=["monetaryValue"], group_by="pipelineStageId")
+            )
+
+        assert result["success"] is True
+        assert result["aggregate"]["count"] == 250
+        assert result["aggregate"]["sums"]["monetaryValue"] == 50000
+        assert result["pages"] == 3
+        assert mock_request.call_count == 3
+        first_params = mock_request.call_args_list[0].kwargs["params"]
+        assert first_params["pipelineId"] == "pipe_1"
+        assert first_params["location_id"] == "loc_123"
+        assert mock_request.call_args_list[2].kwargs["params"]["skip"] == 200
+
+    @pytest.mark.asyncio
+    async def test_max_pages_limits_requests(self, mock_oauth_service):
+        """Test that max_pages stops paging early"""
+        client = OpportunitiesClient(mock_oauth_service)
+        mock_request = _mock_request(_opportunities(500))
+
+        with patch.object(client, "_request", mock_request):
+            pages = client.iter_opportunity_pages("loc_123", max_pages=2)
+            result = await run_aggregate(pages, AggregateSpec(max_pages=2))
+
+        assert result["aggregate"]["count"] == 200
+        assert result["max_pages_reached"] is True
+        assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_data_ending_at_max_pages_is_not_reported_as_cut_off(self, mock_oauth_service):
+        """Test max_pages_reached stays false when the last page allowed was also the last one"""
+        client = OpportunitiesClient(mock_oauth_service)
+
+        with patch.object(client, "_request", _mock_request(_opportunities(150))):
+            pages = client.iter_opportunity_pages("loc_123", max_pages=2)
+            result = await run_aggregate(pages, AggregateSpec(max_pages=2))
+
+        assert result["aggregate"]["count"] == 150
+        assert result["pages"] == 2
+        assert result["max_pages_reached"] is False
@@ -250,6 +250,7 @@ class TestGoHighLevelClient:
             "get_conversation",
             "create_conversation",
             "get_messages",
+            "iter_messages",
             "send_message",
             "update_message_status",
         ]
@@ -271,6 +272,8 @@ class TestGoHighLevelClient:
             "delete_opportunity",
             "update_opportunity_status",
             "get_pipelines",
+            "resolve_pipeline_stage",
+            "invalidate_pipelines",
         ]
 
         for method_name in opportunity_methods:
@@ -290,6 +293,8 @@ class TestGoHighLevelClient:
             "delete_appointment",
             "get_calendars",
             "get_calendar",
+            "resolve_calendar",
+            "invalidate_calendars",
             "get_free_slots",
         ]
 
@@ -0,0 +1,123 @@
+"""Tests for the calendar metadata cache"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.cache import CalendarCache
+from src.models.calendar import Calendar, CalendarGroup, CalendarGroupList, CalendarList
+from src.services.oauth import OAuthService
+from src.utils.exceptions import UnknownReferenceError
+
+
+def _calendars():
+    return [
+        Calendar(id="cal_demo", name="Product Demo", locationId="loc_123", widgetSlug="demo", slotDuration=30, groupId="grp_sales"),
+        Calendar(id="cal_onboard", name="Onboarding", locationId="loc_123", slug="onboarding-call", slotDuration=60),
+    ]
+
+
+@pytest.fixture
+def client():
+    """Main client whose calendar endpoints are mocked"""
+    ghl_client = GoHighLevelClient(MagicMock(spec=OAuthService))
+    ghl_client._calendars.get_calendars = AsyncMock(
+        return_value=CalendarList(calendars=_calendars(), count=2)
+    )
+    ghl_client._calendars.get_calendar = AsyncMock()
+    ghl_client._calendar_admin.get_calendar_groups = AsyncMock(
+        return_value=CalendarGroupList(
+            groups=[CalendarGroup(id="grp_sales", name="Sales", locationId="loc_123")],
+            count=1,
+            total=1,
+        )
+    )
+    return ghl_client
+
+
+class TestCalendarCache:
+    """Test calendar indexes, cached reads and write invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_indexes(self, client):
+        """Test lookups by ID, name, slug and group"""
+        index = await client.calendar_cache.get("loc_123")
+
+        assert index.find("cal_demo").name == "Product Demo"
+        assert index.find("product demo").id == "cal_demo"
+        assert index.find("DEMO").id == "cal_demo"
+        assert index.find("onboarding-call").slotDuration == 60
+        assert index.find_group("sales").id == "grp_sales"
+        assert [c.id for c in index.group_calendars["grp_sales"]] == ["cal_demo"]
+
+    @pytest.mark.asyncio
+    async def test_reads_are_served_from_cache(self, client):
+        """Test calendars, single calendars and groups cost one load"""
+        await client.get_calendars("loc_123")
+        calendar = await client.get_calendar("cal_onboard", "loc_123")
+        groups = await client.get_calendar_groups("loc_123")
+        resolved = await client.resolve_calendar("loc_123", "Onboarding")
+
+        assert calendar.name == "Onboarding"
+        assert resolved.id == "cal_onboard"
+        assert groups.total == 1
+        assert client._calendars.get_calendars.await_count == 1
+        assert client._calendar_admin.get_calendar_groups.await_count == 1
+        client._calendars.get_calendar.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unknown_calendar(self, client):
+        """Test an unknown calendar reloads once and lists the known ones"""
+        with pytest.raises(UnknownReferenceError, match="Product Demo, Onboarding"):
+            await client.resolve_calendar("loc_123", "Consultation")
+        assert client._calendars.get_calendars.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unlisted_calendar_id_is_fetched_directly(self, client):
+        """Test an ID missing from the calendar list is read with a direct GET"""
+        hidden = Calendar(id="aB3dE5gH7jK9mN1p", name="Hidden", locationId="loc_123")
+        client._calendars.get_calendar.return_value = hidden
+
+        resolved = await client.resolve_calendar("loc_123", "aB3dE5gH7jK9mN1p")
+
+        assert resolved is hidden
+        assert client._calendars.get_calendars.await_count == 1
+        client._calendars.get_calendar.assert_awaited_once_with("aB3dE5gH7jK9mN1p", "loc_123")
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate(self, client):
+        """Test calendar create, update and delete drop the cached location"""
+        client._calendar_admin.update_calendar = AsyncMock(return_value=_calendars()[0])
+        client._calendar_admin.delete_calendar = AsyncMock(return_value=True)
+
+        await client.get_calendars("loc_123")
+        await client.update_calendar("cal_demo", MagicMock())
+        assert client.calendar_cache.peek("loc_123") is None
+
+        await client.get_calendars("loc_123")
+        await client.delete_calendar("cal_onboard")
+        assert client.calendar_cache.peek("loc_123") is None
+
+    @pytest.mark.asyncio
+    async def test_refresh(self, client):
+        """Test refresh reloads from the API"""
+        await client.get_calendars("loc_123")
+        await client.get_calendars("loc_123", refresh=True)
+        assert client._calendars.get_calendars.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_groups_are_paged(self):
+        """Test that every page of calendar groups is loaded"""
+        groups = [CalendarGroup(id=f"grp_{i}", name=f"Group {i}", locationId="loc_123") for i in range(5)]
+
+        async def get_calendar_groups(location_id, limit=100, skip=0):
+            page = groups[skip:skip + limit]
+            return CalendarGroupList(groups=page, count=len(page), total=len(groups))
+
+        calendars_client = MagicMock()
+        calendars_client.get_calendars = AsyncMock(return_value=CalendarList(calendars=[], count=0))
+        admin_client = MagicMock()
+        admin_client.get_calendar_groups = AsyncMock(side_effect=get_calendar_groups)
+
+        index = await CalendarCache(calendars_client, admin_client, page_size=2).get("loc_123")
+        assert len(index.groups) == 5
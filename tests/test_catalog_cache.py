@@ -0,0 +1,123 @@
+"""Tests for the product catalog cache"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.models.product import Product, ProductCreate, ProductList, ProductPrice, ProductPriceList
+from src.services.oauth import OAuthService
+
+
+def _price(price_id, product_id, amount, sku=None):
+    return ProductPrice(
+        _id=price_id, product=product_id, name="Standard", type="one_time",
+        currency="USD", amount=amount, sku=sku,
+    )
+
+
+PRICES = {
+    "prod_mug": [_price("price_mug", "prod_mug", 1500, sku="MUG-01")],
+    "prod_tee": [_price("price_tee_s", "prod_tee", 2000, sku="TEE-S"), _price("price_tee_l", "prod_tee", 2200, sku="TEE-L")],
+    "prod_cap": [],
+}
+
+
+@pytest.fixture
+def client():
+    """Main client whose product endpoints are mocked"""
+    ghl_client = GoHighLevelClient(MagicMock(spec=OAuthService))
+    products = [
+        Product(_id="prod_mug", name="Coffee Mug"),
+        Product(_id="prod_tee", name="T-Shirt"),
+        Product(_id="prod_cap", name="Cap"),
+    ]
+    in_flight = {"now": 0, "max": 0}
+
+    async def get_product_prices(product_id, location_id, limit=100, skip=0):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        prices = PRICES[product_id]
+        return ProductPriceList(prices=prices, count=len(prices), total=len(prices))
+
+    ghl_client._products.get_products = AsyncMock(
+        return_value=ProductList(products=products, count=3, total=3)
+    )
+    ghl_client._products.get_product_prices = AsyncMock(side_effect=get_product_prices)
+    ghl_client.in_flight = in_flight
+    return ghl_client
+
+
+class TestCatalogCache:
+    """Test catalog snapshots, lookups and write patching"""
+
+    @pytest.mark.asyncio
+    async def test_loads_prices_concurrently(self, client):
+        """Test one snapshot holds every product's prices, fetched in parallel"""
+        catalog = await client.get_product_catalog("loc_123")
+
+        assert client._products.get_product_prices.await_count == 3
+        assert client.in_flight["max"] > 1
+        assert [p.amount for p in catalog.prices["prod_tee"]] == [2000, 2200]
+        assert catalog.entry(catalog.products["prod_mug"])["prices"][0]["sku"] == "MUG-01"
+
+    @pytest.mark.asyncio
+    async def test_lookups(self, client):
+        """Test products are found by ID, name, SKU and substring search"""
+        catalog = await client.get_product_catalog("loc_123")
+
+        assert catalog.find("prod_cap").name == "Cap"
+        assert catalog.find("coffee mug").id == "prod_mug"
+        assert catalog.find("tee-l").id == "prod_tee"
+        assert [p.id for p in catalog.search("tee")] == ["prod_tee"]
+
+    @pytest.mark.asyncio
+    async def test_reads_use_loaded_catalog(self, client):
+        """Test product and price reads are served from a loaded snapshot"""
+        client._products.get_product = AsyncMock()
+        await client.get_product_catalog("loc_123")
+
+        prices = await client.get_product_prices("prod_tee", "loc_123", limit=1)
+        product = await client.get_product("prod_mug", "loc_123")
+
+        assert prices.total == 2 and len(prices.prices) == 1
+        assert product.name == "Coffee Mug"
+        assert client._products.get_product_prices.await_count == 3
+        client._products.get_product.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_writes_patch_snapshot(self, client):
+        """Test product and price writes patch the snapshot instead of reloading it"""
+        client._products.create_product = AsyncMock(return_value=Product(_id="prod_bag", name="Tote Bag"))
+        client._products.create_product_price = AsyncMock(
+            return_value=_price("price_bag", "prod_bag", 900, sku="BAG-01")
+        )
+        client._products.update_product_price = AsyncMock(
+            return_value=_price("price_mug", "prod_mug", 1700, sku="MUG-01")
+        )
+        client._products.delete_product = AsyncMock(return_value=True)
+        catalog = await client.get_product_catalog("loc_123")
+
+        await client.create_product(ProductCreate(locationId="loc_123", name="Tote Bag"))
+        await client.create_product_price("prod_bag", MagicMock(), "loc_123")
+        await client.update_product_price("prod_mug", "price_mug", MagicMock(), "loc_123")
+        await client.delete_product("prod_cap", "loc_123")
+
+        assert catalog.find("BAG-01").id == "prod_bag"
+        assert [p.amount for p in catalog.prices["prod_mug"]] == [1700]
+        assert catalog.find("Cap") is None
+        assert await client.get_product_catalog("loc_123") is catalog
+        assert client._products.get_products.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_write_discards_in_flight_load(self, client):
+        """Test a load racing a write is not stored"""
+        client._products.delete_product = AsyncMock(return_value=True)
+
+        load = asyncio.create_task(client.get_product_catalog("loc_123"))
+        await asyncio.sleep(0)
+        await client.delete_product("prod_cap", "loc_123")
+        await load
+        assert client.catalog_cache.peek("loc_123") is None
@@ -0,0 +1,335 @@
+"""Tests for the local contact mirror"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.api.contacts import ContactsClient
+from src.models.contact import Contact, ContactUpdate
+from src.services.oauth import OAuthService
+from src.store import ContactMirror, LocalDatabase, SyncedStore
+from src.utils.exceptions import LocalStoreDisabledError, ValidationError
+
+
+def _contact(contact_id, updated="2025-06-01T10:00:00.000Z", **fields):
+    return {
+        "id": contact_id,
+        "locationId": "loc_123",
+        "dateAdded": "2025-05-01T10:00:00.000Z",
+        "dateUpdated": updated,
+        **fields,
+    }
+
+
+CONTACTS = [
+    _contact("c1", firstName="Ann", lastName="Lee", email="Ann@Example.com", tags=["vip", "lead"]),
+    _contact("c2", firstName="Bob", lastName="Stone", companyName="Acme Corp", tags=["lead"]),
+    _contact("c3", firstName="Cy", lastName="Park", phone="+15550001111", dateAdded="2025-05-20T10:00:00.000Z"),
+]
+
+
+def _pages(rows, page_size=2):
+    async def iter_pages(location_id, page_size=page_size, **kwargs):
+        for start in range(0, len(rows), page_size):
+            yield rows[start:start + page_size]
+
+    return MagicMock(side_effect=iter_pages)
+
+
+def _updated_since(rows):
+    calls = []
+
+    async def iter_updated(location_id, since, page_size=100):
+        calls.append(since)
+        yield [r for r in rows if r["dateUpdated"] >= since]
+
+    mock = MagicMock(side_effect=iter_updated)
+    mock.calls = calls
+    return mock
+
+
+@pytest.fixture
+def contacts_client():
+    client = MagicMock(spec=ContactsClient)
+    client.iter_contact_pages = _pages(CONTACTS)
+    client.iter_contacts_updated_since = _updated_since([])
+    return client
+
+
+@pytest.fixture
+def mirror(contacts_client):
+    return ContactMirror(contacts_client, LocalDatabase(":memory:"))
+
+
+class TestContactMirrorSync:
+    """Test full loads and incremental syncs"""
+
+    @pytest.mark.asyncio
+    async def test_full_load_then_local_reads(self, mirror):
+        """Test the first sync loads every page and reads are answered locally"""
+        state = await mirror.sync("loc_123")
+
+        assert state.last_full_sync is not None
+        assert state.high_water_mark < time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
+        assert (await mirror.get("loc_123", "c2"))["companyName"] == "Acme Corp"
+        assert await mirror.get("loc_other", "c2") is None
+
+    @pytest.mark.asyncio
+    async def test_search_filters(self, mirror):
+        """Test query, email, phone and tag filters mirror the API's"""
+        await mirror.sync("loc_123")
+
+        rows, total = await mirror.search("loc_123", query="acme")
+        assert [r["id"] for r in rows] == ["c2"] and total == 1
+        rows, _ = await mirror.search("loc_123", email="ann@example.com")
+        assert [r["id"] for r in rows] == ["c1"]
+        rows, _ = await mirror.search("loc_123", phone="+15550001111")
+        assert [r["id"] for r in rows] == ["c3"]
+        rows, total = await mirror.search("loc_123", tags=["lead"], limit=1)
+        assert total == 2 and len(rows) == 1
+        rows, _ = await mirror.search("loc_123", tags=["lead", "vip"])
+        assert [r["id"] for r in rows] == ["c1"]
+
+        rows, _ = await mirror.search("loc_123")
+        assert rows[0]["id"] == "c3"  # newest first
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync_applies_changes_since_the_mark(self, mirror, contacts_client):
+        """Test later syncs fetch only changed contacts and advance the mark"""
+        first = await mirror.sync("loc_123")
+        changed = _contact("c2", updated="2099-01-01T00:00:00.000Z", firstName="Bobby", companyName="Acme")
+        contacts_client.iter_contacts_updated_since = _updated_since([changed])
+
+        second = await mirror.sync("loc_123")
+
+        assert contacts_client.iter_contacts_updated_since.calls == [first.high_water_mark]
+        assert second.high_water_mark == "2099-01-01T00:00:00.000Z"
+        assert second.last_full_sync == first.last_full_sync
+        assert (await mirror.get("loc_123", "c2"))["firstName"] == "Bobby"
+        assert contacts_client.iter_contact_pages.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_full_resync_drops_deleted_contacts(self, mirror, contacts_client):
+        """Test a periodic full load removes contacts deleted elsewhere"""
+        await mirror.sync("loc_123")
+        contacts_client.iter_contact_pages = _pages(CONTACTS[:2])
+
+        await mirror.sync("loc_123", full=True)
+
+        assert await mirror.get("loc_123", "c3") is None
+        assert await mirror.get("loc_123", "c1") is not None
+
+    @pytest.mark.asyncio
+    async def test_state_survives_a_restart(self, tmp_path, contacts_client):
+        """Test a new process resumes with incremental syncs"""
+        path = tmp_path / "mirror.db"
+        await ContactMirror(contacts_client, LocalDatabase(path)).sync("loc_123")
+
+        restarted = ContactMirror(contacts_client, LocalDatabase(path))
+        await restarted.sync("loc_123")
+
+        assert contacts_client.iter_contact_pages.call_count == 1
+        assert len(contacts_client.iter_contacts_updated_since.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_cancelled_background_syncs(self, mirror, contacts_client):
+        """Test stopping leaves no sync running when the database is closed"""
+        started = asyncio.Event()
+
+        async def slow_pages(location_id, page_size=100, **kwargs):
+            started.set()
+            await asyncio.sleep(60)
+            yield []
+
+        contacts_client.iter_contact_pages = MagicMock(side_effect=slow_pages)
+        await mirror.ready("loc_123")
+        await started.wait()
+
+        await mirror.stop()
+
+        assert mirror._tasks == set()
+        assert (await mirror.state("loc_123")).last_sync is None
+
+    def test_store_without_sync_hooks_fails_on_creation(self):
+        """Test a store missing _full_load or _incremental cannot be created"""
+
+        class NoIncremental(SyncedStore):
+            entity = "partial"
+
+            async def _full_load(self, location_id, started_at):
+                return None
+
+        with pytest.raises(TypeError):
+            NoIncremental(LocalDatabase(":memory:"))
+
+    @pytest.mark.asyncio
+    async def test_updated_since_uses_search_filter(self):
+        """Test incremental pages come from the search endpoint filtered on dateUpdated"""
+        client = ContactsClient(MagicMock(spec=OAuthService))
+        responses = [[_contact("c1"), _contact("c2")], [_contact("c3")]]
+
+        async def request(method, endpoint, json=None, location_id=None, **kwargs):
+            response = MagicMock()
+            response.json.return_value = {"contacts": responses[json["page"] - 1]}
+            return response
+
+        client._request = AsyncMock(side_effect=request)
+        pages = [p async for p in client.iter_contacts_updated_since("loc_123", "2025-01-01T00:00:00.000Z", page_size=2)]
+
+        assert [len(p) for p in pages] == [2, 1]
+        method, endpoint = client._request.call_args.args
+        body = client._request.call_args.kwargs["json"]
+        assert (method, endpoint) == ("POST", "/contacts/search")
+        assert body["filters"][0]["value"] == {"gte": "2025-01-01T00:00:00.000Z"}
+        assert body["sort"] == [{"field": "dateUpdated", "direction": "asc"}]
+
+
+class TestClientMirrorReads:
+    """Test that client reads use the mirror only while it is fresh"""
+
+    @pytest.fixture
+    def client(self, contacts_client):
+        ghl_client = GoHighLevelClient(MagicMock(spec=OAuthService), local_db=LocalDatabase(":memory:"))
+        ghl_client.contact_mirror._client = contacts_client
+        ghl_client._contacts.get_contact = AsyncMock(return_value=Contact(**CONTACTS[0]))
+        ghl_client._contacts.get_contacts = AsyncMock()
+        return ghl_client
+
+    @pytest.mark.asyncio
+    async def test_cold_mirror_falls_back_and_syncs_in_background(self, client):
+        """Test the first read goes to the API while the mirror loads"""
+        contact = await client.get_contact("c1", "loc_123")
+        assert contact.id == "c1"
+        client._contacts.get_contact.assert_awaited_once()
+
+        await asyncio.gather(*client.contact_mirror._tasks)
+        result = await client.get_contacts("loc_123", query="acme")
+
+        assert [c.id for c in result.contacts] == ["c2"]
+        client._contacts.get_contacts.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_stale_mirror_and_live_reads_use_the_api(self, client):
+        """Test reads bypass a mirror older than the staleness bound, or on request"""
+        await client.contact_mirror.sync("loc_123")
+
+        await client.get_contact("c1", "loc_123", live=True)
+        client.contact_mirror.max_staleness = 0
+        await client.get_contact("c1", "loc_123")
+
+        assert client._contacts.get_contact.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_writes_go_through_to_the_mirror(self, client):
+        """Test updates and deletes made through the client are visible locally at once"""
+        await client.contact_mirror.sync("loc_123")
+        client._contacts.update_contact = AsyncMock(
+            return_value=Contact(**{**CONTACTS[1], "companyName": "Globex"})
+        )
+        client._contacts.delete_contact = AsyncMock(return_value=True)
+
+        await client.update_contact("c2", ContactUpdate(companyName="Globex"), "loc_123")
+        await client.delete_contact("c3", "loc_123")
+
+        assert (await client.get_contact("c2", "loc_123")).companyName == "Globex"
+        result = await client.get_contacts("loc_123")
+        assert sorted(c.id for c in result.contacts) == ["c1", "c2"]
+        client._contacts.get_contact.assert_not_awaited()
+
+
+class TestContactFullTextSearch:
+    """Test ranked full-text search over the mirror"""
+
+    @pytest.fixture
+    def rows(self):
+        return [
+            _contact("c1", firstName="Maria", lastName="Garcia", email="maria@acme.io",
+                     companyName="Acme Corp", city="Austin", state="TX", source="webinar", tags=["vip"]),
+            _contact("c2", firstName="Mario", lastName="Rossi", companyName="Marigold Ltd",
+                     city="Boston", source="referral", phone="+1 (555) 010-2030"),
+            _contact("c3", firstName="Ann", lastName="Lee", companyName="Acme Corp", city="austin",
+                     address1="12 Maria Street", assignedTo="u1", dateAdded="2025-05-20T10:00:00.000Z"),
+        ]
+
+    @pytest.fixture
+    def synced(self, contacts_client, rows):
+        contacts_client.iter_contact_pages = _pages(rows)
+        mirror = ContactMirror(contacts_client, LocalDatabase(":memory:"))
+        asyncio.run(mirror.sync("loc_123"))
+        return mirror
+
+    @staticmethod
+    def _ids(results):
+        return [contact["id"] for contact, _ in results]
+
+    @pytest.mark.asyncio
+    async def test_prefix_matches_rank_names_first(self, synced):
+        """Test partial words match and name hits outrank address hits"""
+        results, total = await synced.search_text("loc_123", text="mari")
+
+        assert total == 3
+        assert self._ids(results)[-1] == "c3"  # only the street name matches
+        assert all(score is not None for _, score in results)
+        results, _ = await synced.search_text("loc_123", text="maria garc")
+        assert self._ids(results) == ["c1"]
+
+    @pytest.mark.asyncio
+    async def test_phone_email_and_tag_terms(self, synced):
+        """Test phone digits, email parts and tags are searchable"""
+        assert self._ids((await synced.search_text("loc_123", text="555-010"))[0]) == ["c2"]
+        assert self._ids((await synced.search_text("loc_123", text="+15550102030"))[0]) == ["c2"]
+        assert self._ids((await synced.search_text("loc_123", text="acme.io"))[0]) == ["c1"]
+        assert self._ids((await synced.search_text("loc_123", text="vip"))[0]) == ["c1"]
+        assert (await synced.search_text("loc_123", text='"); DROP'))[1] == 0
+
+    @pytest.mark.asyncio
+    async def test_structured_filters(self, synced):
+        """Test filters combine with or without text"""
+        results, total = await synced.search_text("loc_123", company="acme", city="AUSTIN")
+        assert total == 2 and self._ids(results) == ["c3", "c1"]
+        assert results[0][1] is None
+
+        results, _ = await synced.search_text("loc_123", text="acme", source="webinar")
+        assert self._ids(results) == ["c1"]
+        results, _ = await synced.search_text("loc_123", assigned_to="u1")
+        assert self._ids(results) == ["c3"]
+        results, _ = await synced.search_text("loc_123", added_after="2025-05-10")
+        assert self._ids(results) == ["c3"]
+        with pytest.raises(ValidationError, match="Invalid added_after"):
+            await synced.search_text("loc_123", added_after="May 10")
+
+    @pytest.mark.asyncio
+    async def test_index_follows_writes_and_deletes(self, synced):
+        """Test written-through and deleted contacts update the index"""
+        await synced.put("loc_123", _contact("c2", firstName="Mario", companyName="Zephyr Inc"))
+        await synced.remove("loc_123", "c1")
+
+        assert self._ids((await synced.search_text("loc_123", text="zeph"))[0]) == ["c2"]
+        assert (await synced.search_text("loc_123", text="marigold"))[1] == 0
+        assert (await synced.search_text("loc_123", text="garcia"))[1] == 0
+
+    @pytest.mark.asyncio
+    async def test_older_schema_is_rebuilt(self, tmp_path, contacts_client):
+        """Test a mirror from an older layout is dropped and reloaded in full"""
+        db = LocalDatabase(tmp_path / "mirror.db")
+        await ContactMirror(contacts_client, db).sync("loc_123")
+        db.call(lambda conn: conn.execute("UPDATE store_schema SET version = 1"))
+
+        mirror = ContactMirror(contacts_client, db)
+
+        assert (await mirror.state("loc_123")).last_sync is None
+        assert await mirror.get("loc_123", "c1") is None
+
+    @pytest.mark.asyncio
+    async def test_client_waits_for_the_first_load(self, contacts_client):
+        """Test the client's local search loads a cold location, and needs the mirror"""
+        client = GoHighLevelClient(MagicMock(spec=OAuthService), local_db=LocalDatabase(":memory:"))
+        client.contact_mirror._client = contacts_client
+
+        results, total = await client.search_contacts_local("loc_123", text="acme")
+
+        assert total == 1 and results[0][0].companyName == "Acme Corp"
+        with pytest.raises(LocalStoreDisabledError):
+            await GoHighLevelClient(MagicMock(spec=OAuthService)).search_contacts_local("loc_123")
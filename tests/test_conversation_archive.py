@@ -0,0 +1,145 @@
+"""Tests for the local conversation and message archive"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.api.conversations import ConversationsClient
+from src.models.conversation import Message
+from src.services.oauth import OAuthService
+from src.store import ConversationArchive, LocalDatabase
+from src.store.conversations import plain_text
+from src.utils.exceptions import ValidationError
+
+
+def _conversation(conversation_id, last_message_date, contact_id="c1"):
+    return {
+        "id": conversation_id,
+        "locationId": "loc_123",
+        "contactId": contact_id,
+        "fullName": "Ann Lee",
+        "lastMessageDate": last_message_date,
+    }
+
+
+def _message(message_id, conversation_id, body, date="2025-06-01T10:00:00.000Z", **fields):
+    return Message(
+        id=message_id,
+        conversationId=conversation_id,
+        contactId="c1",
+        body=body,
+        type=1,
+        direction="inbound",
+        dateAdded=date,
+        **fields,
+    )
+
+
+THREADS = {
+    "v1": [
+        _message("m2", "v1", "<p>Any update on my <b>refund</b>? It&#39;s been a week.</p>",
+                 meta={"email": {"subject": "Refund request"}}),
+        _message("m1", "v1", "I would like a refund for order 1042", date="2025-05-30T10:00:00.000Z"),
+    ],
+    "v2": [_message("m3", "v2", "Can we reschedule Tuesday's appointment?")],
+}
+
+
+def _pages(rows):
+    async def iter_pages(location_id, page_size=100):
+        yield rows
+
+    return MagicMock(side_effect=iter_pages)
+
+
+@pytest.fixture
+def conversations_client():
+    client = MagicMock(spec=ConversationsClient)
+    client.iter_conversations_by_last_message = _pages(
+        [_conversation("v2", 1748800000000, contact_id="c2"), _conversation("v1", 1748790000000)]
+    )
+    fetched = []
+
+    async def iter_messages(conversation_id, location_id, page_size=100, since_message_id=None):
+        fetched.append((conversation_id, since_message_id))
+        for message in THREADS.get(conversation_id, []):
+            if message.id == since_message_id:
+                return
+            yield message
+
+    client.iter_messages = MagicMock(side_effect=iter_messages)
+    client.fetched = fetched
+    return client
+
+
+@pytest.fixture
+def archive(conversations_client):
+    return ConversationArchive(conversations_client, LocalDatabase(":memory:"))
+
+
+class TestConversationArchive:
+    """Test archiving, incremental syncs and snippet search"""
+
+    def test_plain_text_strips_markup(self):
+        assert plain_text("<div>Hi&nbsp;<b>there</b></div>\n\n") == "Hi there"
+
+    @pytest.mark.asyncio
+    async def test_search_returns_snippets_with_ids(self, archive):
+        await archive.sync("loc_123")
+
+        hits, total = await archive.search("loc_123", "refund")
+
+        assert total == 2
+        assert {hit["conversation_id"] for hit in hits} == {"v1"}
+        # The subject match ranks the email first
+        assert hits[0]["message_id"] == "m2"
+        assert "[refund]" in hits[0]["snippet"] and "<b>" not in hits[0]["snippet"]
+        assert hits[0]["subject"] == "[Refund] request"
+
+    @pytest.mark.asyncio
+    async def test_search_filters_and_prefixes(self, archive):
+        await archive.sync("loc_123")
+
+        hits, _ = await archive.search("loc_123", "resched")
+        assert [(h["message_id"], h["contact_id"]) for h in hits] == [("m3", "c1")]
+        assert (await archive.search("loc_123", "refund", after="2025-05-31"))[1] == 1
+        assert (await archive.search("loc_123", "refund", conversation_id="v2"))[1] == 0
+        assert await archive.search("loc_123", "  ") == ([], 0)
+        with pytest.raises(ValidationError, match="Invalid before"):
+            await archive.search("loc_123", "refund", before="yesterday")
+
+    @pytest.mark.asyncio
+    async def test_incremental_fetches_only_new_messages(self, archive, conversations_client):
+        """Test only conversations with newer messages are read, from the newest archived message"""
+        await archive.sync("loc_123")
+        conversations_client.fetched.clear()
+        THREADS["v1"].insert(0, _message("m4", "v1", "Refund received, thanks!"))
+        conversations_client.iter_conversations_by_last_message = _pages(
+            [_conversation("v1", 4102444800000), _conversation("v2", 1748800000000, contact_id="c2")]
+        )
+        try:
+            state = await archive.sync("loc_123")
+        finally:
+            THREADS["v1"].pop(0)
+
+        assert conversations_client.fetched == [("v1", "m2")]
+        assert state.high_water_mark == "2100-01-01T00:00:00.000Z"
+        assert (await archive.search("loc_123", "received"))[1] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_resync_drops_deleted_conversations(self, archive, conversations_client):
+        await archive.sync("loc_123")
+        conversations_client.iter_conversations_by_last_message = _pages([_conversation("v2", 1748800000000)])
+
+        await archive.sync("loc_123", full=True)
+
+        assert (await archive.search("loc_123", "refund"))[1] == 0
+
+    @pytest.mark.asyncio
+    async def test_client_search(self, conversations_client):
+        client = GoHighLevelClient(MagicMock(spec=OAuthService), local_db=LocalDatabase(":memory:"))
+        client.conversation_archive._client = conversations_client
+
+        hits, total = await client.search_messages_local("loc_123", "order 104")
+
+        assert total == 1 and hits[0]["message_id"] == "m1"
@@ -0,0 +1,141 @@
+"""Tests for conversation message paging and thread iteration"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.api.conversations import ConversationsClient
+from src.models.conversation import MessageList
+from src.services.oauth import OAuthService
+
+
+@pytest.fixture
+def mock_oauth_service():
+    """Create a mock OAuth service"""
+    oauth_service = MagicMock(spec=OAuthService)
+    oauth_service.get_valid_token = AsyncMock(return_value="test_token")
+    oauth_service.get_location_token = AsyncMock(return_value="location_token")
+    return oauth_service
+
+
+@pytest.fixture
+def conversations_client(mock_oauth_service):
+    """Create a conversations client with mocked OAuth"""
+    return ConversationsClient(mock_oauth_service)
+
+
+def _message(message_id):
+    return {"id": message_id, "conversationId": "conv_123", "type": 1, "body": message_id}
+
+
+def _thread_pages(message_ids, page_size):
+    """Build nested API pages (newest first) keyed by the cursor that requests them"""
+    pages = {}
+    cursor = None
+    for start in range(0, len(message_ids), page_size):
+        chunk = message_ids[start:start + page_size]
+        has_more = start + page_size < len(message_ids)
+        pages[cursor] = {
+            "messages": {
+                "lastMessageId": chunk[-1],
+                "nextPage": has_more,
+                "messages": [_message(m) for m in chunk],
+            }
+        }
+        cursor = chunk[-1]
+    return pages
+
+
+def _mock_request(pages):
+    async def request(method, endpoint, params=None, location_id=None, **kwargs):
+        response = MagicMock()
+        response.json.return_value = pages[params.get("lastMessageId")]
+        return response
+
+    return AsyncMock(side_effect=request)
+
+
+@pytest.mark.asyncio
+async def test_get_messages_exposes_cursor(conversations_client):
+    """Test that the nested paging cursor is returned instead of a fake total"""
+    pages = _thread_pages(["m5", "m4", "m3", "m2", "m1"], page_size=2)
+
+    with patch.object(conversations_client, "_request", _mock_request(pages)):
+        result = await conversations_client.get_messages("conv_123", "loc_123", limit=2)
+
+    assert isinstance(result, MessageList)
+    assert [m.id for m in result.messages] == ["m5", "m4"]
+    assert result.lastMessageId == "m4"
+    assert result.nextPage is True
+    assert result.total is None
+
+
+@pytest.mark.asyncio
+async def test_get_messages_sends_cursor(conversations_client):
+    """Test that last_message_id is sent as the lastMessageId query parameter"""
+    pages = _thread_pages(["m5", "m4", "m3", "m2", "m1"], page_size=2)
+    mock_request = _mock_request(pages)
+
+    with patch.object(conversations_client, "_request", mock_request):
+        result = await conversations_client.get_messages(
+            "conv_123", "loc_123", limit=2, last_message_id="m4"
+        )
+
+    assert [m.id for m in result.messages] == ["m3", "m2"]
+    mock_request.assert_called_once_with(
+        "GET",
+        "/conversations/conv_123/messages",
+        params={"limit": 2, "lastMessageId": "m4"},
+        location_id="loc_123",
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch", [True, False])
+async def test_iter_messages_walks_whole_thread(conversations_client, prefetch):
+    """Test that the iterator follows the cursor through every page"""
+    message_ids = [f"m{i}" for i in range(25, 0, -1)]
+    pages = _thread_pages(message_ids, page_size=10)
+    mock_request = _mock_request(pages)
+
+    with patch.object(conversations_client, "_request", mock_request):
+        seen = [
+            m.id
+            async for m in conversations_client.iter_messages(
+                "conv_123", "loc_123", page_size=10, prefetch=prefetch
+            )
+        ]
+
+    assert seen == message_ids
+    assert mock_request.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_since_message_stops_early(conversations_client):
+    """Test that since_message_id yields only newer messages"""
+    message_ids = [f"m{i}" for i in range(25, 0, -1)]
+    pages = _thread_pages(message_ids, page_size=10)
+
+    with patch.object(conversations_client, "_request", _mock_request(pages)):
+        seen = [
+            m.id
+            async for m in conversations_client.iter_messages(
+                "conv_123", "loc_123", page_size=10, since_message_id="m22"
+            )
+        ]
+
+    assert seen == ["m25", "m24", "m23"]
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_reports_each_page(conversations_client):
+    """Test that on_page is awaited once per fetched page"""
+    pages = _thread_pages([f"m{i}" for i in range(25, 0, -1)], page_size=10)
+    on_page = AsyncMock()
+
+    with patch.object(conversations_client, "_request", _mock_request(pages)):
+        async for _ in conversations_client.iter_messages(
+            "conv_123", "loc_123", page_size=10, on_page=on_page
+        ):
+            pass
+
+    assert on_page.await_count == 3
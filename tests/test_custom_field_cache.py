@@ -0,0 +1,132 @@
+"""Tests for the custom-field schema cache"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.cache import CustomFieldCache
+from src.models.location import LocationCustomField, LocationCustomFieldList
+from src.services.oauth import OAuthService
+from src.utils.exceptions import UnknownReferenceError, ValidationError
+
+
+def _fields():
+    return [
+        LocationCustomField(_id="cf_score", name="Lead Score", fieldKey="contact.lead_score", dataType="NUMERICAL"),
+        LocationCustomField(
+            _id="cf_tier",
+            name="Tier",
+            fieldKey="contact.tier",
+            dataType="SINGLE_OPTIONS",
+            picklistOptions=["Gold", "Silver"],
+        ),
+        LocationCustomField(
+            _id="cf_langs",
+            name="Languages",
+            fieldKey="contact.languages",
+            dataType="MULTIPLE_OPTIONS",
+            picklistOptions=["English", "Spanish"],
+        ),
+        LocationCustomField(_id="cf_renewal", name="Renewal", fieldKey="contact.renewal", dataType="DATE"),
+        LocationCustomField(_id="cf_opp_score", name="Lead Score", fieldKey="opportunity.lead_score", dataType="TEXT"),
+    ]
+
+
+@pytest.fixture
+def locations_client():
+    """Mock extended locations client serving the fields in pages of two"""
+    fields = _fields()
+
+    async def get_location_custom_fields(location_id, limit=100, skip=0):
+        page = fields[skip:skip + limit]
+        return LocationCustomFieldList(customFields=page, count=len(page), total=len(fields))
+
+    client = MagicMock()
+    client.get_location_custom_fields = AsyncMock(side_effect=get_location_custom_fields)
+    return client
+
+
+class TestCustomFieldCache:
+    """Test key resolution and local type checks"""
+
+    @pytest.mark.asyncio
+    async def test_loads_every_page(self, locations_client):
+        """Test the schema is assembled from all pages"""
+        cache = CustomFieldCache(locations_client, page_size=2)
+        index = await cache.get("loc_123")
+        assert len(index.fields) == 5
+        assert locations_client.get_location_custom_fields.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_loads_every_page_without_a_total(self):
+        """Test a response without a total keeps paging until a short page"""
+        fields = _fields()
+
+        async def get_location_custom_fields(location_id, limit=100, skip=0):
+            return LocationCustomFieldList(customFields=fields[skip:skip + limit])
+
+        client = MagicMock()
+        client.get_location_custom_fields = AsyncMock(side_effect=get_location_custom_fields)
+
+        index = await CustomFieldCache(client, page_size=2).get("loc_123")
+
+        assert len(index.fields) == 5
+
+    @pytest.mark.asyncio
+    async def test_resolves_keys_names_and_ids(self, locations_client):
+        """Test fields can be referenced by full key, short key, name or ID"""
+        cache = CustomFieldCache(locations_client)
+        resolved = await cache.resolve(
+            "loc_123",
+            {"contact.lead_score": 5, "tier": "gold", "Languages": "spanish", "cf_renewal": "2025-07-01"},
+        )
+        assert resolved == [
+            {"id": "cf_score", "value": 5},
+            {"id": "cf_tier", "value": "Gold"},
+            {"id": "cf_langs", "value": ["Spanish"]},
+            {"id": "cf_renewal", "value": "2025-07-01"},
+        ]
+        assert locations_client.get_location_custom_fields.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_model_selects_matching_field(self, locations_client):
+        """Test a name shared by contact and opportunity fields resolves per object"""
+        cache = CustomFieldCache(locations_client)
+        assert await cache.resolve("loc_123", {"Lead Score": "7"}) == [{"id": "cf_score", "value": 7}]
+        assert await cache.resolve("loc_123", {"Lead Score": 7}, model="opportunity") == [
+            {"id": "cf_opp_score", "value": "7"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_values_fail_locally(self, locations_client):
+        """Test type errors are reported together without calling the write API"""
+        cache = CustomFieldCache(locations_client)
+        with pytest.raises(ValidationError) as exc_info:
+            await cache.resolve(
+                "loc_123", {"lead_score": "high", "tier": "Bronze", "renewal": "next week"}
+            )
+        message = str(exc_info.value)
+        assert "lead_score (NUMERICAL): expected a number" in message
+        assert "expected one of: Gold, Silver" in message
+        assert "renewal (DATE)" in message
+
+    @pytest.mark.asyncio
+    async def test_unknown_field_reloads_once(self, locations_client):
+        """Test an unknown key reloads the schema before failing"""
+        cache = CustomFieldCache(locations_client)
+        with pytest.raises(UnknownReferenceError, match="Unknown custom field"):
+            await cache.resolve("loc_123", {"favourite_colour": "blue"})
+        assert locations_client.get_location_custom_fields.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_schema_writes_invalidate(self, locations_client):
+        """Test custom field writes through the main client drop the cached schema"""
+        client = GoHighLevelClient(MagicMock(spec=OAuthService))
+        client.custom_field_cache = CustomFieldCache(locations_client)
+        client._locations_extended.delete_location_custom_field = AsyncMock(
+            return_value={"success": True}
+        )
+
+        await client.resolve_custom_fields("loc_123", {"tier": "Gold"})
+        await client.delete_location_custom_field("loc_123", "cf_tier")
+        assert client.custom_field_cache.peek("loc_123") is None
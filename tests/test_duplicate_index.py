@@ -0,0 +1,191 @@
+"""Tests for pre-create duplicate contact detection"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.api.contacts import ContactsClient
+from src.models.contact import Contact, ContactCreate
+from src.services.oauth import OAuthService
+from src.store import ContactMirror, DuplicateIndex, LocalDatabase, normalize_phone
+from src.utils.exceptions import DuplicateResourceError
+
+
+CONTACTS = [
+    {"id": "c2", "locationId": "loc_123", "email": "NEW@example.com", "phone": "(555) 010-2030"},
+    {"id": "c1", "locationId": "loc_123", "emailLowerCase": "old@example.com", "phone": "+1 555 010 2030"},
+]
+
+
+def _pages(rows):
+    async def iter_pages(location_id, page_size=100, **kwargs):
+        yield rows
+
+    return MagicMock(side_effect=iter_pages)
+
+
+@pytest.fixture
+def contacts_client():
+    client = MagicMock(spec=ContactsClient)
+    client.iter_contact_pages = _pages(CONTACTS)
+    return client
+
+
+class TestNormalizePhone:
+    """Test E.164 normalization"""
+
+    @pytest.mark.parametrize(
+        "phone",
+        ["5550102030", "(555) 010-2030", "1-555-010-2030", "+1 555.010.2030", "001 555 010 2030"],
+    )
+    def test_national_and_international_forms_agree(self, phone):
+        assert normalize_phone(phone) == "+15550102030"
+
+    def test_other_country_codes(self):
+        assert normalize_phone("+44 20 7946 0958") == "+442079460958"
+        assert normalize_phone("020 7946 0958", default_country_code="44") == "+442079460958"
+
+    def test_unprefixed_foreign_numbers_keep_their_country_code(self):
+        assert normalize_phone("44 7700 900123") == "+447700900123"
+
+    def test_too_short_or_blank(self):
+        assert normalize_phone("12345") is None
+        assert normalize_phone(None) is None
+
+
+class TestDuplicateIndex:
+    """Test index building and write-through"""
+
+    @pytest.mark.asyncio
+    async def test_scan_builds_index_once(self, contacts_client):
+        """Test a paged scan indexes a location once and the oldest contact wins shared keys"""
+        index = DuplicateIndex(contacts_client)
+
+        assert await index.find("loc_123", email=" New@Example.com ") == "c2"
+        assert await index.find("loc_123", phone="555-010-2030") == "c1"
+        assert await index.find("loc_123", email="nobody@example.com", phone="555 999 0000") is None
+        assert contacts_client.iter_contact_pages.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_update_the_index(self, contacts_client):
+        """Test put and remove keep lookups current without a rebuild"""
+        index = DuplicateIndex(contacts_client)
+        await index.find("loc_123", email="old@example.com")
+
+        index.put("loc_123", [{"id": "c1", "email": "changed@example.com"}])
+        index.remove("loc_123", "c2")
+
+        assert await index.find("loc_123", email="old@example.com") is None
+        assert await index.find("loc_123", email="changed@example.com") == "c1"
+        assert await index.find("loc_123", email="new@example.com") is None
+        assert contacts_client.iter_contact_pages.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_index_is_rebuilt(self, contacts_client):
+        index = DuplicateIndex(contacts_client, ttl=0)
+        await index.find("loc_123", email="old@example.com")
+        await index.find("loc_123", email="old@example.com")
+        assert contacts_client.iter_contact_pages.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_built_from_synced_mirror(self, contacts_client):
+        """Test a synced mirror is read instead of paging through the API"""
+        mirror = ContactMirror(contacts_client, LocalDatabase(":memory:"))
+        await mirror.sync("loc_123")
+        index = DuplicateIndex(contacts_client, mirror=mirror)
+
+        assert await index.find("loc_123", phone="+15550102030") in {"c1", "c2"}
+        assert contacts_client.iter_contact_pages.call_count == 1  # the mirror's own load
+
+
+class TestUpsertContact:
+    """Test that creating a known duplicate becomes an update"""
+
+    @pytest.fixture
+    def client(self, contacts_client):
+        ghl_client = GoHighLevelClient(MagicMock(spec=OAuthService), duplicate_index=True)
+        ghl_client.duplicate_index._client = contacts_client
+        ghl_client._contacts.create_contact = AsyncMock(
+            return_value=Contact(id="c9", locationId="loc_123", email="fresh@example.com")
+        )
+        ghl_client._contacts.update_contact = AsyncMock(
+            return_value=Contact(id="c1", locationId="loc_123", firstName="Ann")
+        )
+        ghl_client._contacts.add_contact_tags = AsyncMock(
+            return_value=Contact(id="c1", locationId="loc_123", tags=["import"])
+        )
+        return ghl_client
+
+    @pytest.mark.asyncio
+    async def test_duplicate_is_updated_without_a_failed_create(self, client):
+        contact, duplicate_of = await client.upsert_contact(
+            ContactCreate(locationId="loc_123", firstName="Ann", phone="555.010.2030", tags=["import"])
+        )
+
+        assert duplicate_of == "c1" and contact.tags == ["import"]
+        client._contacts.create_contact.assert_not_awaited()
+        update = client._contacts.update_contact.call_args.args[1]
+        assert update.model_dump(exclude_none=True) == {"firstName": "Ann", "phone": "555.010.2030"}
+        client._contacts.add_contact_tags.assert_awaited_once_with("c1", ["import"], "loc_123")
+
+    @pytest.mark.asyncio
+    async def test_duplicate_is_returned_unchanged_when_not_updating(self, client):
+        """Test a caller opting out of the update gets the existing contact back"""
+        client._contacts.get_contact = AsyncMock(
+            return_value=Contact(id="c1", locationId="loc_123", email="old@example.com")
+        )
+
+        contact, duplicate_of = await client.upsert_contact(
+            ContactCreate(locationId="loc_123", firstName="Ann", email="old@example.com"),
+            update_duplicate=False,
+        )
+
+        assert (contact.id, contact.firstName, duplicate_of) == ("c1", None, "c1")
+        client._contacts.create_contact.assert_not_awaited()
+        client._contacts.update_contact.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_phone_match_keeps_the_existing_email(self, client):
+        await client.upsert_contact(
+            ContactCreate(locationId="loc_123", firstName="Ann", email="other@example.com", phone="5550102030")
+        )
+
+        update = client._contacts.update_contact.call_args.args[1]
+        assert update.model_dump(exclude_none=True) == {"firstName": "Ann", "phone": "5550102030"}
+
+    @pytest.mark.asyncio
+    async def test_new_contact_is_created_and_indexed(self, client):
+        contact, duplicate_of = await client.upsert_contact(
+            ContactCreate(locationId="loc_123", email="fresh@example.com")
+        )
+
+        assert (contact.id, duplicate_of) == ("c9", None)
+        assert await client.find_duplicate_contact("loc_123", email="FRESH@example.com") == "c9"
+
+    @pytest.mark.asyncio
+    async def test_api_duplicate_error_falls_back_to_update(self, client):
+        """Test a duplicate the index missed is updated using the ID in the API error"""
+        client._contacts.create_contact.side_effect = DuplicateResourceError(
+            "This location does not allow duplicated contacts.",
+            400,
+            {"meta": {"contactId": "c1", "matchingField": "email"}},
+        )
+
+        contact, duplicate_of = await client.upsert_contact(
+            ContactCreate(locationId="loc_123", email="elsewhere@example.com", firstName="Ann")
+        )
+
+        assert duplicate_of == "c1" and contact.firstName == "Ann"
+
+    @pytest.mark.asyncio
+    async def test_disabled_index_creates_directly(self):
+        client = GoHighLevelClient(MagicMock(spec=OAuthService))
+        client._contacts.create_contact = AsyncMock(
+            return_value=Contact(id="c9", locationId="loc_123")
+        )
+
+        _, duplicate_of = await client.upsert_contact(
+            ContactCreate(locationId="loc_123", email="old@example.com")
+        )
+
+        assert client.duplicate_index is None and duplicate_of is None
@@ -175,3 +175,209 @@ async def test_get_all_submissions(forms_client, sample_submission):
             },
             location_id="loc_123",
         )
+
+
+def _submission_dataset(days, per_day):
+    """Build raw submissions spread evenly over the given days"""
+    rows = []
+    for day in days:
+        for i in range(per_day):
+            rows.append(
+                {
+                    "id": f"sub_{day.isoformat()}_{i}",
+                    "formId": "form_123",
+                    "contactId": f"contact_{i}",
+                    "locationId": "loc_123",
+                    "data": {},
+                    "submittedAt": datetime(
+                        day.year, day.month, day.day, i % 24, tzinfo=timezone.utc
+                    ).isoformat(),
+                }
+            )
+    return rows
+
+
+def _mock_submissions_request(rows):
+    """Serve rows filtered by an inclusive startDate/endDate and paged by skip"""
+
+    async def request(method, endpoint, params=None, location_id=None, **kwargs):
+        start = params["startDate"]
+        end = params["endDate"]
+        matching = [r for r in rows if start <= r["submittedAt"][:10] <= end]
+        skip = params.get("skip", 0)
+        response = MagicMock()
+        response.json.return_value = {
+            "submissions": matching[skip:skip + params["limit"]],
+            "meta": {"total": len(matching)},
+        }
+        return response
+
+    return AsyncMock(side_effect=request)
+
+
+@pytest.mark.asyncio
+async def test_get_all_submissions_reads_meta_total(forms_client, sample_submission):
+    """Test that the total is taken from the meta block"""
+    with patch.object(forms_client, "_request") as mock_request:
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "submissions": [sample_submission.model_dump()],
+            "meta": {"total": 250, "currentPage": 1, "nextPage": 2},
+        }
+        mock_request.return_value = mock_response
+
+        result = await forms_client.get_all_submissions("loc_123")
+
+    assert result.total == 250
+    assert result.count == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_submissions_by_window_returns_ordered_unique_stream(forms_client):
+    """Test windowed fetching covers the range once, in time order"""
+    from datetime import date, timedelta
+
+    days = [date(2025, 6, 1) + timedelta(days=d) for d in range(30)]
+    rows = _submission_dataset(days, per_day=7)
+    mock_request = _mock_submissions_request(rows)
+
+    with patch.object(forms_client, "_request", mock_request):
+        seen = [
+            s
+            async for s in forms_client.iter_submissions_by_window(
+                "loc_123", days[0], days[-1], window_days=7, page_size=10
+            )
+        ]
+
+    assert len(seen) == len(rows)
+    assert len({s.id for s in seen}) == len(rows)
+    assert [s.submittedAt for s in seen] == sorted(s.submittedAt for s in seen)
+
+
+@pytest.mark.asyncio
+async def test_iter_submissions_by_window_splits_large_windows(forms_client):
+    """Test that windows reporting too many submissions are split"""
+    from datetime import date, timedelta
+
+    days = [date(2025, 6, 1) + timedelta(days=d) for d in range(8)]
+    rows = _submission_dataset(days, per_day=20)
+    mock_request = _mock_submissions_request(rows)
+
+    with patch.object(forms_client, "_request", mock_request):
+        seen = [
+            s
+            async for s in forms_client.iter_submissions_by_window(
+                "loc_123", days[0], days[-1], window_days=8, max_window_size=50, page_size=100
+            )
+        ]
+
+    assert len(seen) == len(rows)
+    requested_spans = {
+        (call.kwargs["params"]["startDate"], call.kwargs["params"]["endDate"])
+        for call in mock_request.call_args_list
+    }
+    assert ("2025-06-01", "2025-06-09") in requested_spans
+    assert ("2025-06-01", "2025-06-03") in requested_spans
+
+
+@pytest.mark.asyncio
+async def test_iter_submissions_by_window_resumes_after_timestamp(forms_client):
+    """Test that the after argument skips already-consumed submissions"""
+    from datetime import date, timedelta
+
+    days = [date(2025, 6, 1) + timedelta(days=d) for d in range(10)]
+    rows = _submission_dataset(days, per_day=3)
+
+    with patch.object(forms_client, "_request", _mock_submissions_request(rows)):
+        first_pass = [
+            s
+            async for s in forms_client.iter_submissions_by_window(
+                "loc_123", days[0], days[-1], window_days=3
+            )
+        ]
+        resumed = [
+            s
+            async for s in forms_client.iter_submissions_by_window(
+                "loc_123", days[0], days[-1], window_days=3, after=first_pass[11].submittedAt
+            )
+        ]
+
+    assert [s.id for s in resumed] == [s.id for s in first_pass[12:]]
+
+
+@pytest.mark.asyncio
+async def test_iter_submissions_by_window_resumes_within_a_timestamp(forms_client):
+    """Test that resuming at (timestamp, id) keeps submissions sharing the timestamp"""
+    from datetime import date
+
+    day = date(2025, 6, 1)
+    rows = _submission_dataset([day], per_day=1) * 4
+    rows = [{**row, "id": f"sub_{i}"} for i, row in enumerate(rows)]
+
+    with patch.object(forms_client, "_request", _mock_submissions_request(rows)):
+        first_pass = [
+            s async for s in forms_client.iter_submissions_by_window("loc_123", day, day)
+        ]
+        resumed = [
+            s
+            async for s in forms_client.iter_submissions_by_window(
+                "loc_123", day, day, after=first_pass[1].submittedAt, after_id=first_pass[1].id
+            )
+        ]
+
+    assert [s.id for s in first_pass] == ["sub_0", "sub_1", "sub_2", "sub_3"]
+    assert [s.id for s in resumed] == ["sub_2", "sub_3"]
+
+
+class _ToolRecorder:
+    """Stand-in MCP instance that keeps registered tools callable by name"""
+
+    def __init__(self):
+        self.tools = {}
+
+    def tool(self):
+        def register(fn):
+            self.tools[fn.__name__] = fn
+            return fn
+
+        return register
+
+
+@pytest.mark.asyncio
+async def test_bulk_submissions_tool_truncates_and_resumes(mock_oauth_service):
+    """Test the bulk tool through a real client, resuming where a truncated call stopped"""
+    from datetime import date
+
+    from src.api.client import GoHighLevelClient
+    from src.mcp.params.forms import GetSubmissionsBulkParams
+    from src.mcp.tools import forms as form_tools
+
+    day = date(2025, 6, 1)
+    rows = [{**row, "id": f"sub_{i}"} for i, row in enumerate(_submission_dataset([day], per_day=1) * 5)]
+    client = GoHighLevelClient(mock_oauth_service)
+    recorder = _ToolRecorder()
+
+    # Registering rebinds the module's mcp and get_client; the patches restore them
+    with patch.object(form_tools, "mcp"), patch.object(form_tools, "get_client"), \
+            patch.object(client._forms, "_request", _mock_submissions_request(rows)):
+        form_tools._register_form_tools(recorder, AsyncMock(return_value=client))
+        bulk = recorder.tools["get_form_submissions_bulk"]
+        first = await bulk(
+            GetSubmissionsBulkParams(location_id="loc_123", start_date=day, end_date=day, max_results=2),
+            None,
+        )
+        rest = await bulk(
+            GetSubmissionsBulkParams(
+                location_id="loc_123",
+                start_date=day,
+                end_date=day,
+                resume_after=first["resume_after"],
+                resume_after_id=first["resume_after_id"],
+            ),
+            None,
+        )
+
+    assert [s["id"] for s in first["submissions"]] == ["sub_0", "sub_1"]
+    assert (first["truncated"], first["resume_after_id"]) == (True, "sub_1")
+    assert [s["id"] for s in rest["submissions"]] == ["sub_2", "sub_3", "sub_4"]
+    assert rest["truncated"] is False
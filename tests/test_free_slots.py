@@ -0,0 +1,121 @@
+"""Tests for cached, merged free slots across calendars"""
+
+import pytest
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.models.calendar import Calendar, CalendarGroup, CalendarGroupList, CalendarList
+from src.services.oauth import OAuthService
+from src.utils.exceptions import UnknownReferenceError
+
+SLOTS = {
+    "cal_a": {
+        "2025-06-10": ["2025-06-10T09:00:00-05:00", "2025-06-10T10:00:00-05:00"],
+        "2025-06-11": ["2025-06-11T09:00:00-05:00"],
+    },
+    "cal_b": {
+        "2025-06-10": ["2025-06-10T14:00:00Z", "2025-06-10T09:30:00-05:00"],
+    },
+    "cal_c": {
+        "2025-06-10": ["2025-06-10T09:00:00-05:00"],
+    },
+}
+
+
+def _calendars():
+    return [
+        Calendar(id="cal_a", name="Ann", locationId="loc_123", slotDuration=30, groupId="grp_team"),
+        Calendar(id="cal_b", name="Ben", locationId="loc_123", slotDuration=30, groupId="grp_team"),
+        Calendar(id="cal_c", name="Cat", locationId="loc_123", slotDuration=1, slotDurationUnit="hours"),
+    ]
+
+
+@pytest.fixture
+def client():
+    ghl_client = GoHighLevelClient(MagicMock(spec=OAuthService))
+    ghl_client._calendars.get_calendars = AsyncMock(
+        return_value=CalendarList(calendars=_calendars(), count=3)
+    )
+    ghl_client._calendar_admin.get_calendar_groups = AsyncMock(
+        return_value=CalendarGroupList(
+            groups=[CalendarGroup(id="grp_team", name="Team", locationId="loc_123")], count=1, total=1
+        )
+    )
+
+    async def free_slot_days(calendar_id, location_id, start_date, end_date=None, timezone=None):
+        days = SLOTS[calendar_id]
+        wanted = {(start_date + timedelta(days=n)).isoformat() for n in range((end_date - start_date).days)}
+        return {day: slots for day, slots in days.items() if day in wanted}
+
+    ghl_client._calendars.get_free_slot_days = AsyncMock(side_effect=free_slot_days)
+    return ghl_client
+
+
+class TestFindFreeSlots:
+    """Test merging, de-duplication, slot lengths and per-day caching"""
+
+    @pytest.mark.asyncio
+    async def test_merged_in_time_order_and_deduplicated(self, client):
+        slots = await client.find_free_slots(
+            "loc_123", ["cal_a", "cal_b", "cal_c"], date(2025, 6, 10), date(2025, 6, 11)
+        )
+
+        # 14:00Z is cal_a's 09:00-05:00, so the two are one slot
+        assert [(s["start_time"], s["calendar_ids"]) for s in slots] == [
+            ("2025-06-10T09:00:00-05:00", ["cal_a", "cal_b"]),
+            ("2025-06-10T09:00:00-05:00", ["cal_c"]),
+            ("2025-06-10T09:30:00-05:00", ["cal_b"]),
+            ("2025-06-10T10:00:00-05:00", ["cal_a"]),
+            ("2025-06-11T09:00:00-05:00", ["cal_a"]),
+        ]
+        # The hour-long calendar's slot is not merged with the half-hour one at the same start
+        assert slots[1]["end_time"] == "2025-06-10T10:00:00-05:00"
+        assert slots[0]["end_time"] == "2025-06-10T09:30:00-05:00"
+
+    @pytest.mark.asyncio
+    async def test_limit_keeps_calendars_of_the_last_slot(self, client):
+        slots = await client.find_free_slots("loc_123", ["cal_b", "cal_a"], date(2025, 6, 10), limit=1)
+
+        assert slots == [
+            {
+                "start_time": "2025-06-10T09:00:00-05:00",
+                "end_time": "2025-06-10T09:30:00-05:00",
+                "calendar_ids": ["cal_a", "cal_b"],
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_days_are_cached_per_calendar(self, client):
+        """Test a wider range only fetches the days not cached yet"""
+        await client.find_free_slots("loc_123", ["cal_a"], date(2025, 6, 10))
+        await client.find_free_slots("loc_123", ["cal_a"], date(2025, 6, 10), date(2025, 6, 12))
+        await client.find_free_slots("loc_123", ["cal_a"], date(2025, 6, 11))
+
+        calls = client._calendars.get_free_slot_days.call_args_list
+        assert [(c.args[2], c.args[3]) for c in calls] == [
+            (date(2025, 6, 10), date(2025, 6, 11)),
+            (date(2025, 6, 11), date(2025, 6, 13)),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_appointment_writes_drop_cached_slots(self, client):
+        await client.find_free_slots("loc_123", ["cal_a"], date(2025, 6, 10))
+        client.invalidation_bus.publish(["appointments"], "loc_123")
+        await client.find_free_slots("loc_123", ["cal_a"], date(2025, 6, 10))
+
+        assert client._calendars.get_free_slot_days.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_group_resolution(self, client):
+        calendars = await client.resolve_calendar_group("loc_123", "team")
+
+        assert [c.id for c in calendars] == ["cal_a", "cal_b"]
+        with pytest.raises(UnknownReferenceError):
+            await client.resolve_calendar_group("loc_123", "nobody")
+
+    def test_slot_length_follows_calendar(self):
+        ann, _, cat = _calendars()
+        assert ann.slot_length() == timedelta(minutes=30)
+        assert cat.slot_length() == timedelta(hours=1)
+        assert Calendar(id="x", name="X", locationId="loc_123").slot_length() == timedelta(minutes=30)
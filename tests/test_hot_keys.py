@@ -0,0 +1,142 @@
+"""Tests for hot cache key tracking and warm-start prefetching"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.cache import HotKeyTracker, ResourceCache, prewarm
+from src.services.oauth import OAuthService
+
+
+class TestHotKeyTracker:
+    """Test access counting and persistence across sessions"""
+
+    def test_ranks_by_access_frequency(self):
+        """Test the most used keys come first"""
+        tracker = HotKeyTracker()
+        for _ in range(3):
+            tracker.record("pipelines", "loc_a")
+        tracker.record("users", "loc_b")
+        for _ in range(2):
+            tracker.record("resource:get_contact_resource", {"location_id": "loc_a", "contact_id": "c1"})
+
+        assert tracker.top(2) == [
+            ("pipelines", "loc_a"),
+            ("resource:get_contact_resource", {"contact_id": "c1", "location_id": "loc_a"}),
+        ]
+
+    def test_saved_counts_decay_in_the_next_session(self, tmp_path):
+        """Test a key heavily used last session is outranked by this session's keys over time"""
+        path = tmp_path / "hot_keys.json"
+        first = HotKeyTracker(path)
+        for _ in range(4):
+            first.record("calendars", "loc_old")
+        first.save()
+
+        second = HotKeyTracker(path)
+        second.load()
+        for _ in range(3):
+            second.record("calendars", "loc_new")
+
+        assert second.top(2) == [("calendars", "loc_new"), ("calendars", "loc_old")]
+
+    def test_missing_or_corrupt_file_starts_empty(self, tmp_path):
+        """Test an unreadable hot key file is ignored"""
+        path = tmp_path / "hot_keys.json"
+        tracker = HotKeyTracker(path)
+        tracker.load()
+        path.write_text("{not json")
+        tracker.load()
+        assert tracker.top(10) == []
+
+    def test_save_keeps_only_the_hottest_keys(self, tmp_path):
+        """Test the saved list is bounded"""
+        path = tmp_path / "hot_keys.json"
+        tracker = HotKeyTracker(path, max_keys=2)
+        for i in range(5):
+            for _ in range(i + 1):
+                tracker.record("users", f"loc_{i}")
+        tracker.save()
+
+        reloaded = HotKeyTracker(path)
+        reloaded.load()
+        assert reloaded.top(10) == [("users", "loc_4"), ("users", "loc_3")]
+
+
+class TestPrewarm:
+    """Test bounded, concurrent replay of hot keys"""
+
+    @pytest.mark.asyncio
+    async def test_loads_concurrently_within_the_limit(self):
+        """Test every key is warmed with at most ``concurrency`` loads in flight"""
+        in_flight = {"now": 0, "max": 0}
+
+        async def load(key):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+
+        keys = [("pipelines", f"loc_{i}") for i in range(10)] + [("gone", "loc_1")]
+        stats = await prewarm(keys, {"pipelines": load}, concurrency=3)
+
+        assert stats == {"warmed": 10, "failed": 0, "skipped": 1, "cancelled": 0}
+        assert in_flight["max"] == 3
+
+    @pytest.mark.asyncio
+    async def test_time_budget_cancels_slow_loads(self):
+        """Test loads still running when the budget runs out are cancelled"""
+        async def load(key):
+            await asyncio.sleep(0 if key == "fast" else 10)
+
+        failing = AsyncMock(side_effect=RuntimeError("token expired"))
+        stats = await prewarm(
+            [("users", "fast"), ("users", "slow"), ("catalog", "loc_1")],
+            {"users": load, "catalog": failing},
+            time_budget=0.2,
+        )
+
+        assert stats == {"warmed": 1, "failed": 1, "skipped": 0, "cancelled": 1}
+
+
+class TestCacheIntegration:
+    """Test that caches record hot keys and can be warmed from them"""
+
+    @pytest.mark.asyncio
+    async def test_metadata_reads_are_recorded_and_warmed(self):
+        """Test client cache reads are counted and the client's warmers fill the caches"""
+        tracker = HotKeyTracker()
+        client = GoHighLevelClient(MagicMock(spec=OAuthService), hot_keys=tracker)
+        client._opportunities.get_pipelines = AsyncMock(return_value=[])
+
+        await client.get_pipelines("loc_123")
+        assert tracker.top(5) == [("pipelines", "loc_123")]
+
+        restarted = GoHighLevelClient(MagicMock(spec=OAuthService), hot_keys=HotKeyTracker())
+        restarted._opportunities.get_pipelines = AsyncMock(return_value=[])
+        await prewarm(tracker.top(5), restarted.warmers())
+
+        assert restarted.pipeline_cache.peek("loc_123") is not None
+        # Prefetching is not counted as an access
+        assert restarted.pipeline_cache.hot_keys.top(5) == []
+
+    @pytest.mark.asyncio
+    async def test_resources_are_recorded_and_warmed(self):
+        """Test resource reads are counted and replayed into the resource cache"""
+        cache = ResourceCache(soft_ttl=3600, hard_ttl=3600)
+        cache.hot_keys = HotKeyTracker()
+        render = AsyncMock(return_value="rendered")
+
+        @cache.cached()
+        async def contact_resource(location_id: str, contact_id: str) -> str:
+            return await render(location_id, contact_id)
+
+        await contact_resource("loc_123", "c1")
+        keys = cache.hot_keys.top(5)
+        cache._entries.clear()
+
+        await prewarm(keys, cache.warmers())
+        assert await contact_resource("loc_123", "c1") == "rendered"
+        assert render.await_count == 2
+        render.assert_awaited_with("loc_123", "c1")
@@ -0,0 +1,221 @@
+"""Tests for write-through cache invalidation"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.cache import InvalidationBus, ResourceCache, invalidates, invalidation
+from src.models.calendar import Calendar, CalendarList
+from src.models.location import LocationTag, LocationTagCreate
+from src.services.oauth import OAuthService
+from src.store import LocalDatabase
+from src.utils.client_helpers import get_client_with_token_override
+
+
+class _Writer:
+    """Minimal object with decorated write methods"""
+
+    def __init__(self):
+        self.invalidation_bus = InvalidationBus()
+
+    @invalidates(invalidation.TAGS)
+    async def by_argument(self, location_id, tag_id):
+        return True
+
+    @invalidates(invalidation.CALENDARS)
+    async def by_result(self, calendar_id):
+        return Calendar(id=calendar_id, name="Demo", locationId="loc_b")
+
+    @invalidates(invalidation.USERS, invalidation.CONTACTS)
+    async def unscoped(self, user_id):
+        return True
+
+    @invalidates(invalidation.TAGS)
+    async def failing(self, location_id):
+        raise RuntimeError("timed out")
+
+
+def _recorder(bus, *entities):
+    calls = []
+    for entity in entities:
+        bus.subscribe(entity, lambda location_id, entity=entity: calls.append((entity, location_id)))
+    return calls
+
+
+class TestInvalidationBus:
+    """Test publishing writes to subscribed caches"""
+
+    @pytest.mark.asyncio
+    async def test_location_from_argument_or_result(self):
+        """Test the written location is taken from location_id or a locationId attribute"""
+        writer = _Writer()
+        calls = _recorder(writer.invalidation_bus, invalidation.TAGS, invalidation.CALENDARS)
+
+        await writer.by_argument("loc_a", "tag_1")
+        await writer.by_result("cal_1")
+
+        assert calls == [(invalidation.TAGS, "loc_a"), (invalidation.CALENDARS, "loc_b")]
+
+    @pytest.mark.asyncio
+    async def test_unknown_location_drops_every_location(self):
+        """Test a write without a location publishes None for each entity"""
+        writer = _Writer()
+        calls = _recorder(writer.invalidation_bus, invalidation.USERS, invalidation.CONTACTS)
+
+        await writer.unscoped("usr_1")
+
+        assert calls == [(invalidation.USERS, None), (invalidation.CONTACTS, None)]
+
+    @pytest.mark.asyncio
+    async def test_failed_write_still_publishes(self):
+        """Test a write that raised may have been applied, so caches are dropped anyway"""
+        writer = _Writer()
+        calls = _recorder(writer.invalidation_bus, invalidation.TAGS)
+
+        with pytest.raises(RuntimeError):
+            await writer.failing("loc_a")
+        assert calls == [(invalidation.TAGS, "loc_a")]
+
+    @pytest.mark.asyncio
+    async def test_listener_errors_do_not_fail_the_write(self):
+        """Test a failing listener neither raises nor stops the others"""
+        writer = _Writer()
+        writer.invalidation_bus.subscribe(invalidation.TAGS, MagicMock(side_effect=KeyError("x")))
+        calls = _recorder(writer.invalidation_bus, invalidation.TAGS)
+
+        assert await writer.by_argument("loc_a", "tag_1") is True
+        assert calls == [(invalidation.TAGS, "loc_a")]
+
+
+class TestResourceInvalidation:
+    """Test that rendered resources subscribe by the entities they show"""
+
+    @pytest.mark.asyncio
+    async def test_only_resources_showing_the_entity_are_dropped(self):
+        """Test a tag write drops tag resources for that location only"""
+        cache = ResourceCache(soft_ttl=3600, hard_ttl=3600)
+        tag_render = AsyncMock(side_effect=["tags v1", "tags v1", "tags v2"])
+        contact_render = AsyncMock(return_value="contacts")
+
+        @cache.cached(invalidation.TAGS)
+        async def tags_resource(location_id: str) -> str:
+            return await tag_render()
+
+        @cache.cached(invalidation.CONTACTS)
+        async def contacts_resource(location_id: str) -> str:
+            return await contact_render()
+
+        bus = InvalidationBus()
+        cache.subscribe(bus)
+        await tags_resource("loc_a")
+        await tags_resource("loc_b")
+        await contacts_resource("loc_a")
+
+        bus.publish([invalidation.TAGS], "loc_a")
+
+        assert await tags_resource("loc_a") == "tags v2"
+        assert await tags_resource("loc_b") == "tags v1"
+        await contacts_resource("loc_a")
+        assert tag_render.await_count == 3
+        assert contact_render.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_location_writes_drop_everything_for_the_location(self):
+        """Test a location write drops every resource rendered for it"""
+        cache = ResourceCache(soft_ttl=3600, hard_ttl=3600)
+        render = AsyncMock(side_effect=["v1", "v2"])
+
+        @cache.cached(invalidation.CONTACTS)
+        async def contacts_resource(location_id: str) -> str:
+            return await render()
+
+        bus = InvalidationBus()
+        cache.subscribe(bus)
+        await contacts_resource("loc_a")
+        bus.publish([invalidation.LOCATIONS], "loc_a")
+        assert await contacts_resource("loc_a") == "v2"
+
+
+class TestClientWrites:
+    """Test that client write methods invalidate the caches they affect"""
+
+    @pytest.fixture
+    def client(self):
+        ghl_client = GoHighLevelClient(MagicMock(spec=OAuthService))
+        ghl_client._calendars.get_calendars = AsyncMock(
+            return_value=CalendarList(
+                calendars=[Calendar(id="cal_demo", name="Demo", locationId="loc_123")], count=1
+            )
+        )
+        ghl_client._calendar_admin.get_calendar_groups = AsyncMock(
+            return_value=MagicMock(groups=[], total=0)
+        )
+        return ghl_client
+
+    @pytest.mark.asyncio
+    async def test_create_location_tag_publishes_tags(self, client):
+        """Test creating a tag publishes a tags write for its location"""
+        client._locations_extended.create_location_tag = AsyncMock(
+            return_value=LocationTag(_id="tag_1", name="vip", locationId="loc_123")
+        )
+        calls = _recorder(client.invalidation_bus, invalidation.TAGS)
+
+        await client.create_location_tag("loc_123", LocationTagCreate(name="vip"))
+        assert calls == [(invalidation.TAGS, "loc_123")]
+
+    @pytest.mark.asyncio
+    async def test_update_calendar_drops_cached_calendars(self, client):
+        """Test a calendar update drops the metadata cache and calendar resources"""
+        client._calendar_admin.update_calendar = AsyncMock(
+            return_value=Calendar(id="cal_demo", name="Demo 2", locationId="loc_123")
+        )
+        resources = ResourceCache(soft_ttl=3600, hard_ttl=3600)
+        render = AsyncMock(side_effect=["v1", "v2"])
+
+        @resources.cached(invalidation.CALENDARS)
+        async def calendars_resource(location_id: str) -> str:
+            return await render()
+
+        resources.subscribe(client.invalidation_bus)
+        await client.get_calendars("loc_123")
+        await calendars_resource("loc_123")
+
+        await client.update_calendar("cal_demo", MagicMock())
+
+        assert client.calendar_cache.peek("loc_123") is None
+        assert await calendars_resource("loc_123") == "v2"
+
+    @pytest.mark.asyncio
+    async def test_token_override_client_shares_the_bus(self, client):
+        """Test writes through a token-override client still invalidate the main caches"""
+        await client.get_calendars("loc_123")
+
+        override = await get_client_with_token_override(
+            MagicMock(spec=OAuthService), client, access_token="other_token"
+        )
+        override._calendar_admin.create_calendar = AsyncMock(
+            return_value=Calendar(id="cal_new", name="New", locationId="loc_123")
+        )
+        await override.create_calendar(MagicMock())
+
+        assert override.invalidation_bus is client.invalidation_bus
+        assert client.calendar_cache.peek("loc_123") is None
+
+    @pytest.mark.asyncio
+    async def test_token_override_client_shares_stores_and_settings(self):
+        """Test a token-override client uses the same store instances, and so their settings"""
+        main_client = GoHighLevelClient(
+            MagicMock(spec=OAuthService), local_db=LocalDatabase(":memory:"), schedule_index=True
+        )
+        main_client.contact_mirror.sync_interval = 5.0
+        main_client.schedule_index.ttl = 42.0
+
+        override = await get_client_with_token_override(
+            MagicMock(spec=OAuthService), main_client, access_token="other_token"
+        )
+
+        assert override.local_db is main_client.local_db
+        assert all(mine is theirs for mine, theirs in zip(override.mirrors(), main_client.mirrors()))
+        assert override.duplicate_index is main_client.duplicate_index
+        assert override.contact_mirror.sync_interval == 5.0
+        assert override.schedule_index.ttl == 42.0
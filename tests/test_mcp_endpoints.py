@@ -1,7 +1,7 @@
 """Updated unit tests for MCP endpoints with FastMCP decorator support"""
 
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone
 from pydantic import BaseModel
 
@@ -278,19 +278,19 @@ class TestMCPClientHelpers:
         """Test get_client with access token"""
         from src.main import get_client
 
+        mock_global_client = MagicMock()
+        mock_client_instance = AsyncMock()
+        mock_global_client.with_oauth.return_value = mock_client_instance
+
         with patch("src.main.oauth_service", AsyncMock()):
-            with patch("src.main.ghl_client", AsyncMock()):
-                with patch(
-                    "src.utils.client_helpers.GoHighLevelClient"
-                ) as mock_client_class:
-                    mock_client_instance = AsyncMock()
-                    mock_client_class.return_value = mock_client_instance
-
-                    client = await get_client("test_token")
-
-                    # Should create new client with custom token
-                    mock_client_class.assert_called_once()
-                    assert client == mock_client_instance
+            with patch("src.main.ghl_client", mock_global_client):
+                client = await get_client("test_token")
+
+                # Should create new client with custom token, sharing the global client's stores
+                mock_global_client.with_oauth.assert_called_once()
+                temp_oauth = mock_global_client.with_oauth.call_args.args[0]
+                assert await temp_oauth.get_valid_token() == "test_token"
+                assert client == mock_client_instance
 
     @pytest.mark.asyncio
     async def test_get_client_without_token(self):
@@ -0,0 +1,134 @@
+"""Tests for negative caching of 404s and known-unsupported routes"""
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.base import BaseGoHighLevelClient, unsupported_route_reason
+from src.services.oauth import OAuthService
+from src.utils.exceptions import ResourceNotFoundError, UnsupportedRouteError
+from src.utils.negative_cache import NegativeCache, not_found_key
+
+
+@pytest.fixture
+def api_client():
+    """Base client whose HTTP transport is mocked"""
+    oauth_service = MagicMock(spec=OAuthService)
+    oauth_service.get_valid_token = AsyncMock(return_value="test_token")
+    oauth_service.get_location_token = AsyncMock(return_value="location_token")
+    client = BaseGoHighLevelClient(oauth_service)
+    client.client = MagicMock()
+    client.client.request = AsyncMock()
+    return client
+
+
+def _response(status_code, data):
+    return httpx.Response(status_code, json=data, request=httpx.Request("GET", "https://x"))
+
+
+class TestUnsupportedRoutes:
+    """Test that documented dead routes never reach the network"""
+
+    @pytest.mark.parametrize(
+        "method,endpoint",
+        [
+            ("GET", "/forms/form_123"),
+            ("GET", "/forms/form_123/submissions"),
+            ("POST", "/forms/submit"),
+            ("GET", "/opportunities/pipelines/pipe_1"),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_fails_locally(self, api_client, method, endpoint):
+        """Test unsupported routes raise a clear error without a request"""
+        with pytest.raises(UnsupportedRouteError, match="not supported|do not exist"):
+            await api_client._request(method, endpoint, location_id="loc_123")
+        api_client.client.request.assert_not_awaited()
+        api_client.oauth_service.get_location_token.assert_not_awaited()
+
+    @pytest.mark.parametrize(
+        "method,endpoint",
+        [
+            ("GET", "/forms/"),
+            ("GET", "/forms/submissions"),
+            ("POST", "/forms/upload-custom-files"),
+            ("GET", "/opportunities/pipelines"),
+        ],
+    )
+    def test_supported_routes_pass(self, method, endpoint):
+        """Test the working form and pipeline routes are not matched"""
+        assert unsupported_route_reason(method, endpoint) is None
+
+
+class TestNotFoundCache:
+    """Test short-lived caching of 404 lookups"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_lookup_is_answered_locally(self, api_client):
+        """Test a second lookup of a missing resource does not hit the API"""
+        api_client.client.request.return_value = _response(404, {"message": "Contact not found"})
+
+        for _ in range(3):
+            with pytest.raises(ResourceNotFoundError, match="Contact not found") as exc_info:
+                await api_client._request("GET", "/contacts/missing", location_id="loc_123")
+            assert exc_info.value.status_code == 404
+
+        assert api_client.client.request.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_keyed_by_resource_and_location(self, api_client):
+        """Test other resources and locations are still looked up"""
+        api_client.client.request.return_value = _response(404, {"message": "Not found"})
+
+        for endpoint, location_id in [
+            ("/contacts/missing", "loc_123"),
+            ("/contacts/other", "loc_123"),
+            ("/contacts/missing", "loc_456"),
+        ]:
+            with pytest.raises(ResourceNotFoundError):
+                await api_client._request("GET", endpoint, location_id=location_id)
+
+        assert api_client.client.request.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self, api_client):
+        """Test the lookup reaches the API again after the TTL"""
+        api_client.not_found_cache.ttl = 0.0
+        api_client.client.request.return_value = _response(404, {"message": "Not found"})
+
+        for _ in range(2):
+            with pytest.raises(ResourceNotFoundError):
+                await api_client._request("GET", "/contacts/missing", location_id="loc_123")
+        assert api_client.client.request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_write_forgets_the_endpoint(self, api_client):
+        """Test a successful write under an endpoint drops its remembered 404s"""
+        api_client.client.request.return_value = _response(404, {"message": "Not found"})
+        with pytest.raises(ResourceNotFoundError):
+            await api_client._request("GET", "/links/link_1", location_id="loc_123")
+
+        api_client.client.request.return_value = _response(200, {"link": {}})
+        await api_client._request("PUT", "/links/link_1", json={}, location_id="loc_123")
+        await api_client._request("GET", "/links/link_1", location_id="loc_123")
+
+        assert api_client.client.request.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_writes_are_not_cached(self, api_client):
+        """Test a 404 on a write is not remembered"""
+        api_client.client.request.return_value = _response(404, {"message": "Not found"})
+        for _ in range(2):
+            with pytest.raises(ResourceNotFoundError):
+                await api_client._request("DELETE", "/links/link_1", location_id="loc_123")
+        assert api_client.client.request.await_count == 2
+
+    def test_oldest_entry_is_evicted(self):
+        """Test the cache stays bounded"""
+        cache = NegativeCache(ttl=60, max_entries=2)
+        keys = [not_found_key(f"/contacts/c{i}", "loc_123") for i in range(3)]
+        for key in keys:
+            cache.record(key, "Not found", {})
+
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[2]) == ("Not found", {})
@@ -0,0 +1,213 @@
+"""Tests for the local opportunity store and its analytics"""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.api.opportunities import OpportunitiesClient
+from src.models.opportunity import Opportunity, Pipeline, PipelineStage
+from src.services.oauth import OAuthService
+from src.store import LocalDatabase, OpportunityStore
+from src.store.base import period_label
+from src.utils.exceptions import ValidationError
+
+
+def _opportunity(opportunity_id, stage, status="open", value=100.0, source="ads", **fields):
+    return {
+        "id": opportunity_id,
+        "name": f"Deal {opportunity_id}",
+        "pipelineId": "p1",
+        "pipelineStageId": stage,
+        "status": status,
+        "source": source,
+        "monetaryValue": value,
+        "contactId": "c1",
+        "locationId": "loc_123",
+        "createdAt": "2025-06-01T10:00:00.000Z",
+        "updatedAt": "2025-06-05T10:00:00.000Z",
+        "lastStageChangeAt": "2025-06-03T10:00:00.000Z",
+        **fields,
+    }
+
+
+OPPORTUNITIES = [
+    _opportunity("o1", "s1"),
+    _opportunity("o2", "s2", value=200.0, source="referral"),
+    _opportunity("o3", "s3", status="won", value=500.0, source="referral",
+                 lastStatusChangeAt="2025-06-07T10:00:00.000Z"),
+    _opportunity("o4", "s2", status="lost", value=50.0, assignedTo="u1"),
+]
+
+PIPELINE = Pipeline(
+    id="p1",
+    name="Sales",
+    stages=[
+        PipelineStage(id="s2", name="Qualified", position=1),
+        PipelineStage(id="s1", name="New", position=0),
+        PipelineStage(id="s3", name="Closed", position=2),
+    ],
+)
+
+
+def _pages(rows):
+    async def iter_pages(location_id, page_size=100, **kwargs):
+        for start in range(0, len(rows), page_size):
+            yield rows[start:start + page_size]
+
+    return MagicMock(side_effect=iter_pages)
+
+
+@pytest.fixture
+def opportunities_client():
+    client = MagicMock(spec=OpportunitiesClient)
+    client.iter_opportunity_pages = _pages(OPPORTUNITIES)
+    return client
+
+
+@pytest.fixture
+def store(opportunities_client):
+    return OpportunityStore(opportunities_client, LocalDatabase(":memory:"), page_size=2)
+
+
+class TestOpportunitySync:
+    """Test incremental syncs on updatedAt and lastStageChangeAt"""
+
+    @pytest.mark.asyncio
+    async def test_incremental_applies_changes_from_every_page(self, store, opportunities_client):
+        """Test changed opportunities are found wherever they are in the unsorted pages"""
+        await store.sync("loc_123")
+        newer = {"updatedAt": "2099-01-01T00:00:00.000Z"}
+        moved = {"lastStageChangeAt": "2099-01-02T00:00:00.000Z", "updatedAt": "2025-01-01T00:00:00.000Z"}
+        opportunities_client.iter_opportunity_pages = _pages(
+            [
+                _opportunity("o2", "s2"),
+                _opportunity("o9", "s1"),
+                _opportunity("o1", "s2", **moved),
+                _opportunity("o5", "s1", **newer),
+            ]
+        )
+
+        state = await store.sync("loc_123")
+
+        assert state.high_water_mark == "2099-01-02T00:00:00.000Z"
+        # o9 is new to the store; o3 and o4 are no longer listed
+        rows = await store.summary("loc_123", ["stage"])
+        assert {row["stage"]: row["count"] for row in rows} == {"s2": 2, "s1": 2}
+
+    @pytest.mark.asyncio
+    async def test_full_resync_drops_deleted(self, store, opportunities_client):
+        await store.sync("loc_123")
+        opportunities_client.iter_opportunity_pages = _pages(OPPORTUNITIES[:2])
+
+        await store.sync("loc_123", full=True)
+
+        assert (await store.summary("loc_123"))[0]["count"] == 2
+
+
+class TestOpportunityAnalytics:
+    """Test grouped sums, stage conversion and time in stage"""
+
+    @pytest.mark.asyncio
+    async def test_summary_by_source(self, store):
+        await store.sync("loc_123")
+
+        rows = await store.summary("loc_123", ["source"])
+
+        by_source = {row["source"]: row for row in rows}
+        assert by_source["referral"]["total_value"] == 700.0
+        assert by_source["referral"]["win_rate"] == 1.0
+        assert by_source["ads"]["win_rate"] == 0.0
+        assert by_source["ads"]["open"] == 1
+
+    @pytest.mark.asyncio
+    async def test_created_week_groups_by_iso_week(self, store, opportunities_client):
+        """Test week groups use the ISO weeks of report period labels"""
+        opportunities_client.iter_opportunity_pages = _pages(
+            [
+                _opportunity("o1", "s1", createdAt="2025-06-01T10:00:00.000Z"),  # a Sunday
+                _opportunity("o2", "s1", createdAt="2024-12-30T10:00:00.000Z"),
+            ]
+        )
+        await store.sync("loc_123")
+
+        rows = await store.summary("loc_123", ["created_week"])
+
+        assert {row["created_week"] for row in rows} == {
+            period_label(datetime(2025, 6, 1, tzinfo=timezone.utc), "week"),  # 2025-W22
+            period_label(datetime(2024, 12, 30, tzinfo=timezone.utc), "week"),  # 2025-W01
+        }
+
+    @pytest.mark.asyncio
+    async def test_filters(self, store):
+        await store.sync("loc_123")
+
+        assert (await store.summary("loc_123", status="open"))[0]["count"] == 2
+        assert (await store.summary("loc_123", assigned_to="u1"))[0]["total_value"] == 50.0
+        assert (await store.summary("loc_123", stale_days=30))[0]["count"] == 2
+        assert await store.summary("loc_123", created_after="2025-07-01") == []
+        with pytest.raises(ValidationError):
+            await store.summary("loc_123", ["colour"])
+        with pytest.raises(ValidationError, match="Invalid created_after"):
+            await store.summary("loc_123", created_after="July")
+
+    @pytest.mark.asyncio
+    async def test_stage_conversion_counts_observed_history(self, store):
+        """Test deals count as reaching every stage up to the furthest one seen"""
+        await store.sync("loc_123")
+        # o4 moves back to the first stage after having reached the second
+        await store.put("loc_123", _opportunity("o4", "s1", status="open",
+                                                lastStageChangeAt="2025-06-10T10:00:00.000Z"))
+
+        rows = await store.stage_conversion("loc_123", ["s1", "s2", "s3"])
+
+        assert [(r["reached"], r["current"]) for r in rows] == [(4, 2), (3, 1), (1, 1)]
+        assert [r["conversion_rate"] for r in rows] == [0.75, 0.3333, None]
+
+    @pytest.mark.asyncio
+    async def test_time_in_stage(self, store):
+        await store.sync("loc_123")
+        await store.put("loc_123", _opportunity("o2", "s3",
+                                                lastStageChangeAt="2025-06-05T10:00:00.000Z"))
+
+        rows = {row["stage"]: row for row in await store.time_in_stage("loc_123")}
+
+        assert rows["s2"]["visits"] == 2
+        # o2 left s2 after two days; o4 was lost four days after entering it
+        assert rows["s2"]["average_days_before_moving"] == 2.0
+        assert rows["s3"]["still_in_stage"] == 2
+
+
+class TestClientAnalytics:
+    """Test the client's write-through and labelled analytics"""
+
+    @pytest.fixture
+    def client(self, opportunities_client):
+        ghl_client = GoHighLevelClient(MagicMock(spec=OAuthService), local_db=LocalDatabase(":memory:"))
+        ghl_client.opportunity_store._client = opportunities_client
+        ghl_client._opportunities.get_pipelines = AsyncMock(return_value=[PIPELINE])
+        ghl_client._users.get_users = AsyncMock(return_value=MagicMock(users=[]))
+        return ghl_client
+
+    @pytest.mark.asyncio
+    async def test_conversion_uses_pipeline_stage_order(self, client):
+        rows = await client.analyze_opportunities("loc_123", "stage_conversion", pipeline_id="p1")
+
+        assert [row["stage_name"] for row in rows] == ["New", "Qualified", "Closed"]
+        with pytest.raises(ValidationError):
+            await client.analyze_opportunities("loc_123", "stage_conversion")
+
+    @pytest.mark.asyncio
+    async def test_writes_go_through(self, client):
+        await client.opportunity_store.sync("loc_123")
+        client._opportunities.update_opportunity_status = AsyncMock(
+            return_value=Opportunity(**_opportunity("o1", "s3", status="won", value=100.0))
+        )
+        client._opportunities.delete_opportunity = AsyncMock(return_value=True)
+
+        await client.update_opportunity_status("o1", "won", "loc_123")
+        await client.delete_opportunity("o2", "loc_123")
+
+        rows = await client.analyze_opportunities("loc_123", group_by=["status", "pipeline"])
+        assert {row["status"]: row["count"] for row in rows} == {"won": 2, "lost": 1}
+        assert rows[0]["pipeline_name"] == "Sales"
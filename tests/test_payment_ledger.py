@@ -0,0 +1,169 @@
+"""Tests for the local payment ledger and its revenue analytics"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.api.payments import PaymentsClient
+from src.services.oauth import OAuthService
+from src.store import LocalDatabase, PaymentLedger
+from src.store.payments import monthly_amount
+from src.utils.exceptions import ValidationError
+
+
+def _transaction(transaction_id, created, amount, status="succeeded", contact="c1", currency="USD", **fields):
+    return {
+        "_id": transaction_id,
+        "createdAt": created,
+        "amount": amount,
+        "status": status,
+        "currency": currency,
+        "contactId": contact,
+        **fields,
+    }
+
+
+def _subscription(subscription_id, created, amount, interval="month", status="active", **fields):
+    return {
+        "_id": subscription_id,
+        "createdAt": created,
+        "amount": amount,
+        "interval": interval,
+        "status": status,
+        "currency": "USD",
+        **fields,
+    }
+
+
+TRANSACTIONS = [
+    _transaction("t1", "2025-01-05T10:00:00Z", 100),
+    _transaction("t2", "2025-01-20T10:00:00Z", 50, contact="c2"),
+    _transaction("t3", "2025-02-03T10:00:00Z", 80, status="refunded"),
+    _transaction("t4", "2025-02-10T10:00:00Z", 60, status="partially_refunded", amountRefunded=10),
+    _transaction("t5", "2025-02-11T10:00:00Z", 999, status="failed", contact="c2"),
+    _transaction("t6", "2025-02-12T10:00:00Z", 40, contact="c3", currency="EUR"),
+]
+
+SUBSCRIPTIONS = [
+    _subscription("s1", "2024-12-01T00:00:00Z", 30),
+    _subscription("s2", "2025-01-10T00:00:00Z", 120, interval="year",
+                  status="canceled", canceledAt="2025-02-15T00:00:00Z"),
+    _subscription("s3", "2025-02-01T00:00:00Z", 10, interval="week"),
+    _subscription("s4", "2025-02-02T00:00:00Z", 500, status="incomplete_expired"),
+]
+
+
+def _pages(rows):
+    async def iter_pages(location_id, page_size=100, **kwargs):
+        for start in range(0, len(rows), page_size):
+            yield rows[start:start + page_size]
+
+    return MagicMock(side_effect=iter_pages)
+
+
+@pytest.fixture
+def payments_client():
+    client = MagicMock(spec=PaymentsClient)
+    client.iter_transaction_pages = _pages(TRANSACTIONS)
+    client.iter_subscription_pages = _pages(SUBSCRIPTIONS)
+    return client
+
+
+@pytest.fixture
+def ledger(payments_client):
+    return PaymentLedger(payments_client, LocalDatabase(":memory:"), page_size=2)
+
+
+class TestPaymentAnalytics:
+    """Test revenue and subscription metrics per period"""
+
+    @pytest.mark.asyncio
+    async def test_monthly_report(self, ledger):
+        await ledger.sync("loc_123")
+
+        report = await ledger.analyze("loc_123", "month", start="2025-01-01", end="2025-03-01")
+
+        assert (report["currency"], report["currencies"]) == ("USD", ["EUR", "USD"])
+        january, february = report["buckets"]
+        assert january["period"] == "2025-01"
+        assert (january["gross"], january["net"], january["arpu"]) == (150.0, 150.0, 75.0)
+        assert (january["mrr"], january["active_subscriptions"], january["churn_rate"]) == (40.0, 2, 0.0)
+        # t3 was refunded in full, t4 in part and t5 failed
+        assert (february["gross"], february["refunds"], february["net"]) == (140.0, 90.0, 50.0)
+        assert (february["transactions"], february["paying_contacts"]) == (2, 1)
+        assert february["mrr"] == round(30 + 10 * 30.4375 / 7, 2)
+        assert (february["new_subscriptions"], february["canceled_subscriptions"]) == (1, 1)
+        assert february["churn_rate"] == 0.5
+        assert report["totals"]["net"] == 200.0
+
+    @pytest.mark.asyncio
+    async def test_weekly_buckets_start_on_monday(self, ledger):
+        await ledger.sync("loc_123")
+
+        report = await ledger.analyze("loc_123", "week", start="2025-02-05", end="2025-02-18", currency="eur")
+
+        assert [b["period"] for b in report["buckets"]] == ["2025-W06", "2025-W07", "2025-W08"]
+        assert [b["gross"] for b in report["buckets"]] == [0.0, 40.0, 0.0]
+
+    @pytest.mark.asyncio
+    async def test_unknown_period(self, ledger):
+        with pytest.raises(ValidationError):
+            await ledger.analyze("loc_123", "quarter")
+        with pytest.raises(ValidationError, match="Invalid start"):
+            await ledger.analyze("loc_123", start="last tuesday")
+
+    def test_monthly_amount(self):
+        assert monthly_amount({"amount": 120, "interval": "year"}) == 10.0
+        assert monthly_amount({"amount": 20, "interval": "month", "intervalCount": 2}) == 10.0
+        assert monthly_amount({"amount": 20, "interval": "fortnight"}) is None
+
+
+class TestPaymentSync:
+    """Test incremental syncs through startAt and the refund lookback"""
+
+    @pytest.mark.asyncio
+    async def test_incremental_rereads_recent_transactions(self, ledger, payments_client):
+        await ledger.sync("loc_123")
+        await ledger.analyze("loc_123", start="2025-01-01", end="2025-03-01")
+        payments_client.iter_transaction_pages = _pages(
+            [
+                _transaction("t2", "2025-01-20T10:00:00Z", 50, status="refunded", contact="c2"),
+                _transaction("t7", "2099-01-01T00:00:00Z", 25),
+            ]
+        )
+
+        state = await ledger.sync("loc_123")
+
+        assert state.high_water_mark == "2099-01-01T00:00:00.000Z"
+        start_at = payments_client.iter_transaction_pages.call_args.kwargs["start_at"]
+        # The window reaches back past the last sync so refunds of older payments show up
+        assert start_at < datetime.now(timezone.utc) - timedelta(days=29)
+        report = await ledger.analyze("loc_123", start="2025-01-01", end="2025-02-01")
+        assert report["buckets"][0]["net"] == 100.0
+
+    @pytest.mark.asyncio
+    async def test_full_resync_drops_deleted(self, ledger, payments_client):
+        await ledger.sync("loc_123")
+        payments_client.iter_transaction_pages = _pages(TRANSACTIONS[:1])
+        payments_client.iter_subscription_pages = _pages([])
+
+        await ledger.sync("loc_123", full=True)
+
+        report = await ledger.analyze("loc_123", start="2025-01-01", end="2025-03-01")
+        assert report["totals"]["gross"] == 100.0
+        assert report["buckets"][-1]["mrr"] == 0.0
+
+
+class TestClientPayments:
+    """Test the client answers from the ledger"""
+
+    @pytest.mark.asyncio
+    async def test_first_query_loads_the_location(self, payments_client):
+        client = GoHighLevelClient(MagicMock(spec=OAuthService), local_db=LocalDatabase(":memory:"))
+        client.payment_ledger._client = payments_client
+
+        report = await client.analyze_payments("loc_123", "month", start="2025-01-01", end="2025-02-01")
+
+        assert client.payment_ledger in client.mirrors()
+        assert report["buckets"][0]["gross"] == 150.0
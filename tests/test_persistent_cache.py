@@ -0,0 +1,226 @@
+"""Tests for metadata snapshots persisted across restarts"""
+
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.cache import CacheStore, MetadataCache, SQLiteCacheStore
+from src.models.calendar import Calendar, CalendarGroup, CalendarGroupList, CalendarList
+from src.models.location import LocationCustomField, LocationCustomFieldList
+from src.models.opportunity import Pipeline
+from src.models.product import Product, ProductList, ProductPrice, ProductPriceList
+from src.models.user import User, UserList
+from src.services.oauth import OAuthService
+
+
+def _client(store):
+    """A fresh main client (as after a restart) with every metadata endpoint mocked"""
+    ghl_client = GoHighLevelClient(MagicMock(spec=OAuthService), cache_store=store)
+    ghl_client._opportunities.get_pipelines = AsyncMock(
+        return_value=[
+            Pipeline(
+                id="pipe_sales",
+                name="Sales",
+                stages=[{"id": "stage_won", "name": "Won", "position": 1}],
+            )
+        ]
+    )
+    ghl_client._locations_extended.get_location_custom_fields = AsyncMock(
+        return_value=LocationCustomFieldList(
+            customFields=[
+                LocationCustomField(
+                    _id="cf_tier",
+                    name="Tier",
+                    fieldKey="contact.tier",
+                    dataType="SINGLE_OPTIONS",
+                    picklistOptions=["Gold", "Silver"],
+                )
+            ],
+            count=1,
+            total=1,
+        )
+    )
+    ghl_client._calendars.get_calendars = AsyncMock(
+        return_value=CalendarList(
+            calendars=[
+                Calendar(id="cal_demo", name="Product Demo", locationId="loc_123", widgetSlug="demo", groupId="grp_sales")
+            ],
+            count=1,
+        )
+    )
+    ghl_client._calendar_admin.get_calendar_groups = AsyncMock(
+        return_value=CalendarGroupList(
+            groups=[CalendarGroup(id="grp_sales", name="Sales", locationId="loc_123")], count=1, total=1
+        )
+    )
+    ghl_client._users.get_users = AsyncMock(
+        return_value=UserList(users=[User(id="usr_ann", name="Ann Lee", email="ann@example.com")], count=1, total=1)
+    )
+    ghl_client._products.get_products = AsyncMock(
+        return_value=ProductList(products=[Product(_id="prod_mug", name="Coffee Mug")], count=1, total=1)
+    )
+    ghl_client._products.get_product_prices = AsyncMock(
+        return_value=ProductPriceList(
+            prices=[
+                ProductPrice(
+                    _id="price_mug", product="prod_mug", name="Standard", type="one_time",
+                    currency="USD", amount=1500, sku="MUG-01",
+                )
+            ],
+            count=1,
+            total=1,
+        )
+    )
+    return ghl_client
+
+
+def _api_mocks(ghl_client):
+    return [
+        ghl_client._opportunities.get_pipelines,
+        ghl_client._locations_extended.get_location_custom_fields,
+        ghl_client._calendars.get_calendars,
+        ghl_client._calendar_admin.get_calendar_groups,
+        ghl_client._users.get_users,
+        ghl_client._products.get_products,
+        ghl_client._products.get_product_prices,
+    ]
+
+
+async def _warm(ghl_client):
+    await ghl_client.resolve_pipeline_stage("loc_123", "Sales", "Won")
+    await ghl_client.resolve_custom_fields("loc_123", {"tier": "gold"})
+    await ghl_client.resolve_calendar("loc_123", "demo")
+    await ghl_client.resolve_user_id("loc_123", "ann@example.com")
+    await ghl_client.get_product_catalog("loc_123")
+
+
+@pytest.fixture
+def store(tmp_path):
+    sqlite_store = SQLiteCacheStore(tmp_path / "cache.db")
+    yield sqlite_store
+    sqlite_store.close()
+
+
+class TestSQLiteCacheStore:
+    """Test the compressed SQLite snapshot store"""
+
+    def test_round_trips_values_compressed(self, store):
+        """Test values come back intact with their write time and are stored compressed"""
+        value = {"rows": [{"id": f"row_{i}", "name": "Same name"} for i in range(200)]}
+        store.set("pipelines", "loc_123", value)
+
+        stored_at, restored = store.get("pipelines", "loc_123")
+        assert restored == value
+        assert time.time() - stored_at < 5
+        blob = store._conn.execute("SELECT value FROM cache_entries").fetchone()[0]
+        assert len(blob) < len(str(value)) / 10
+
+    def test_delete_key_or_namespace(self, store):
+        """Test deleting one key or a whole namespace"""
+        store.set("users", "loc_1", [1])
+        store.set("users", "loc_2", [2])
+        store.set("catalog", "loc_1", [3])
+
+        store.delete("users", "loc_1")
+        assert store.get("users", "loc_1") is None
+        assert store.get("users", "loc_2") is not None
+
+        store.delete("users")
+        assert store.get("users", "loc_2") is None
+        assert store.get("catalog", "loc_1") is not None
+
+    def test_corrupt_entry_is_a_miss(self, store):
+        """Test an unreadable value is dropped instead of raising"""
+        with store._conn:
+            store._conn.execute(
+                "INSERT INTO cache_entries VALUES ('users', 'loc_1', ?, ?)", (time.time(), b"junk")
+            )
+        assert store.get("users", "loc_1") is None
+        assert store._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] == 0
+
+    def test_incomplete_implementations_fail_on_creation(self):
+        """Test a store or cache missing part of its interface cannot be created"""
+
+        class NoDelete(CacheStore):
+            def get(self, namespace, key):
+                return None
+
+            def set(self, namespace, key, value):
+                pass
+
+        class NoRestore(MetadataCache[dict]):
+            async def _load(self, location_id):
+                return {}
+
+            def _dump(self, snapshot):
+                return snapshot
+
+        with pytest.raises(TypeError):
+            NoDelete()
+        with pytest.raises(TypeError):
+            NoRestore()
+
+
+class TestPersistentMetadataCaches:
+    """Test that metadata caches survive a restart through the store"""
+
+    @pytest.mark.asyncio
+    async def test_restart_serves_metadata_from_disk(self, store):
+        """Test a new client resolves every kind of metadata without calling the API"""
+        await _warm(_client(store))
+
+        restarted = _client(store)
+        assert await restarted.resolve_pipeline_stage("loc_123", "sales", "won") == ("pipe_sales", "stage_won")
+        assert await restarted.resolve_custom_fields("loc_123", {"Tier": "silver"}) == [
+            {"id": "cf_tier", "value": "Silver"}
+        ]
+        assert (await restarted.resolve_calendar("loc_123", "Product Demo")).id == "cal_demo"
+        assert await restarted.resolve_user_id("loc_123", "Ann Lee") == "usr_ann"
+        catalog = await restarted.get_product_catalog("loc_123")
+        assert catalog.by_sku["mug-01"].id == "price_mug"
+        assert catalog.find("Coffee Mug").id == "prod_mug"
+
+        for mock in _api_mocks(restarted):
+            mock.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_expired_snapshot_is_reloaded(self, store):
+        """Test a persisted snapshot older than the TTL is not served"""
+        await _warm(_client(store))
+
+        restarted = _client(store)
+        restarted.pipeline_cache.ttl = 0
+        await restarted.resolve_pipeline_stage("loc_123", "Sales", "Won")
+        restarted._opportunities.get_pipelines.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalidation_drops_persisted_snapshot(self, store):
+        """Test a write through the client also removes the copy on disk"""
+        first = _client(store)
+        await _warm(first)
+        first.invalidate_calendars("loc_123")
+        first.catalog_cache.patch("loc_123")
+
+        restarted = _client(store)
+        await _warm(restarted)
+        restarted._calendars.get_calendars.assert_awaited_once()
+        restarted._products.get_products.assert_awaited_once()
+        restarted._opportunities.get_pipelines.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_refresh_bypasses_disk(self, store):
+        """Test an explicit refresh reloads from the API and rewrites the snapshot"""
+        await _warm(_client(store))
+        stored_at = store.get("users", "loc_123")[0]
+
+        restarted = _client(store)
+        await restarted.user_cache.get("loc_123", refresh=True)
+        restarted._users.get_users.assert_awaited_once()
+        assert store.get("users", "loc_123")[0] >= stored_at
+
+    @pytest.mark.asyncio
+    async def test_without_store_nothing_is_persisted(self, store):
+        """Test clients without a store keep snapshots in memory only"""
+        await _warm(_client(None))
+        assert store._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] == 0
@@ -0,0 +1,148 @@
+"""Tests for the pipeline metadata cache"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.cache import PipelineCache
+from src.models.opportunity import Pipeline
+from src.services.oauth import OAuthService
+from src.utils.exceptions import UnknownReferenceError, ValidationError
+
+
+def _pipelines():
+    return [
+        Pipeline(
+            id="pipe_sales",
+            name="Sales",
+            stages=[
+                {"id": "stage_new", "name": "New Lead", "position": 0},
+                {"id": "stage_won", "name": "Won", "position": 1},
+            ],
+        ),
+        Pipeline(
+            id="pipe_partners",
+            name="Partners",
+            stages=[
+                {"id": "stage_intro", "name": "Intro", "position": 0},
+                {"id": "stage_p_won", "name": "Won", "position": 1},
+            ],
+        ),
+    ]
+
+
+@pytest.fixture
+def opportunities_client():
+    """Mock opportunities client returning two pipelines"""
+    client = MagicMock()
+    client.get_pipelines = AsyncMock(return_value=_pipelines())
+    return client
+
+
+class TestPipelineCache:
+    """Test pipeline indexes, name resolution and invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_indexes(self, opportunities_client):
+        """Test ID, name and stage position lookups"""
+        index = await PipelineCache(opportunities_client).get("loc_123")
+
+        assert index.find_pipeline("sales").id == "pipe_sales"
+        assert index.find_pipeline("pipe_partners").name == "Partners"
+        assert index.find_stage("new lead") == ("pipe_sales", "stage_new")
+        assert index.find_stage("Won", "pipe_partners") == ("pipe_partners", "stage_p_won")
+        assert index.stage_position("stage_won") == 1
+        assert index.stage_name("stage_intro") == "Intro"
+
+    @pytest.mark.asyncio
+    async def test_resolve_names_and_ids(self, opportunities_client):
+        """Test names and IDs resolve to IDs, and the stage implies its pipeline"""
+        cache = PipelineCache(opportunities_client)
+
+        assert await cache.resolve("loc_123", "Sales", "Won") == ("pipe_sales", "stage_won")
+        assert await cache.resolve("loc_123", stage="Intro") == ("pipe_partners", "stage_intro")
+        assert await cache.resolve("loc_123", "pipe_sales", "stage_new") == ("pipe_sales", "stage_new")
+        assert await cache.resolve("loc_123") == (None, None)
+        assert opportunities_client.get_pipelines.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_ambiguous_stage_name(self, opportunities_client):
+        """Test a stage name present in several pipelines needs the pipeline"""
+        cache = PipelineCache(opportunities_client)
+
+        with pytest.raises(ValidationError, match="several pipelines"):
+            await cache.resolve("loc_123", stage="Won")
+        assert opportunities_client.get_pipelines.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_name_reloads_once(self, opportunities_client):
+        """Test an unknown name reloads the snapshot before failing"""
+        cache = PipelineCache(opportunities_client)
+        await cache.get("loc_123")
+
+        with pytest.raises(UnknownReferenceError, match="Available pipelines: Sales, Partners"):
+            await cache.resolve("loc_123", "Renewals")
+        assert opportunities_client.get_pipelines.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_ttl_and_invalidation(self, opportunities_client):
+        """Test snapshots are reused until they expire or are invalidated"""
+        cache = PipelineCache(opportunities_client, ttl=60)
+        await cache.get("loc_123")
+        await cache.get("loc_123")
+        assert opportunities_client.get_pipelines.await_count == 1
+
+        cache.invalidate("loc_123")
+        await cache.get("loc_123")
+        assert opportunities_client.get_pipelines.await_count == 2
+
+        cache.ttl = 0
+        await cache.get("loc_123")
+        assert opportunities_client.get_pipelines.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self, opportunities_client):
+        """Test that simultaneous misses for a location make a single request"""
+
+        async def slow_get_pipelines(location_id):
+            await asyncio.sleep(0.01)
+            return _pipelines()
+
+        opportunities_client.get_pipelines.side_effect = slow_get_pipelines
+        cache = PipelineCache(opportunities_client)
+
+        await asyncio.gather(*(cache.get("loc_123") for _ in range(10)))
+        assert opportunities_client.get_pipelines.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_discards_in_flight_load(self, opportunities_client):
+        """Test a load started before an invalidation is not stored"""
+
+        async def slow_get_pipelines(location_id):
+            await asyncio.sleep(0.01)
+            return _pipelines()
+
+        opportunities_client.get_pipelines.side_effect = slow_get_pipelines
+        cache = PipelineCache(opportunities_client)
+
+        load = asyncio.create_task(cache.get("loc_123"))
+        await asyncio.sleep(0)
+        cache.invalidate("loc_123")
+        await load
+        assert cache.peek("loc_123") is None
+
+    @pytest.mark.asyncio
+    async def test_client_get_pipelines_uses_cache(self, opportunities_client):
+        """Test the main client serves pipelines from the cache"""
+        oauth_service = MagicMock(spec=OAuthService)
+        client = GoHighLevelClient(oauth_service)
+        client.pipeline_cache = PipelineCache(opportunities_client)
+
+        await client.get_pipelines("loc_123")
+        pipelines = await client.get_pipelines("loc_123")
+        assert [p.id for p in pipelines] == ["pipe_sales", "pipe_partners"]
+        assert opportunities_client.get_pipelines.await_count == 1
+
+        await client.get_pipelines("loc_123", refresh=True)
+        assert opportunities_client.get_pipelines.await_count == 2
@@ -0,0 +1,88 @@
+"""Tests for MCP progress reporting in long-running tools"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.mcp.progress import ProgressReporter
+
+
+@pytest.fixture
+def mock_ctx():
+    """Create a mock FastMCP context"""
+    ctx = MagicMock()
+    ctx.report_progress = AsyncMock()
+    return ctx
+
+
+class TestProgressReporter:
+    """Test progress notifications and cancellation handling"""
+
+    @pytest.mark.asyncio
+    async def test_reports_items_pages_and_eta(self, mock_ctx):
+        """Test that notifications carry counts and an ETA once the total is known"""
+        async with ProgressReporter(mock_ctx, total=100, min_interval=0) as progress:
+            await progress.advance(items=25, pages=1)
+
+        progress_value, total, message = mock_ctx.report_progress.call_args_list[0].args
+        assert progress_value == 25
+        assert total == 100
+        assert "25 items, 1 pages" in message
+        assert "ETA" in message
+
+    @pytest.mark.asyncio
+    async def test_throttles_notifications(self, mock_ctx):
+        """Test that rapid updates are throttled but the final state is always sent"""
+        async with ProgressReporter(mock_ctx, min_interval=60) as progress:
+            for _ in range(50):
+                await progress.advance(items=1)
+
+        # First update plus the forced final report
+        assert mock_ctx.report_progress.await_count == 2
+        assert mock_ctx.report_progress.call_args.args[0] == 50
+
+    @pytest.mark.asyncio
+    async def test_add_total_grows_expected_total(self, mock_ctx):
+        """Test totals discovered incrementally are accumulated"""
+        progress = ProgressReporter(mock_ctx)
+        progress.add_total(40)
+        progress.add_total(60)
+        assert progress.total == 100
+        assert progress.eta_seconds is None
+
+    @pytest.mark.asyncio
+    async def test_without_context_is_a_no_op(self):
+        """Test that tools called without a context still work"""
+        async with ProgressReporter(None) as progress:
+            await progress.advance(items=3, pages=1)
+        assert progress.summary()["processed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_cancellation_propagates_after_final_report(self, mock_ctx):
+        """Test that a cancelled tool sends its last progress and stays cancelled"""
+        started = asyncio.Event()
+
+        async def long_tool():
+            async with ProgressReporter(mock_ctx, min_interval=60) as progress:
+                for i in range(1000):
+                    await progress.advance(items=1)
+                    if i == 9:
+                        started.set()
+                    await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(long_tool())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert mock_ctx.report_progress.await_count == 2
+        assert mock_ctx.report_progress.await_args.args[0] >= 10
+
+    @pytest.mark.asyncio
+    async def test_report_failures_do_not_break_the_tool(self, mock_ctx):
+        """Test that a failing notification is ignored"""
+        mock_ctx.report_progress.side_effect = RuntimeError("session closed")
+        async with ProgressReporter(mock_ctx, min_interval=0) as progress:
+            await progress.advance(items=1)
+        assert progress.processed == 1
@@ -0,0 +1,126 @@
+"""Tests for stale-while-revalidate resource caching"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from src.cache import CacheSettings, ResourceCache
+
+
+def _renderer(*texts):
+    """Async render function returning the given texts in turn"""
+    return AsyncMock(side_effect=list(texts))
+
+
+def _age(cache, seconds):
+    """Pretend every cached entry was rendered ``seconds`` ago"""
+    for key, (rendered_at, text) in cache._entries.items():
+        cache._entries[key] = (rendered_at - seconds, text)
+
+
+class TestResourceCache:
+    """Test soft/hard TTL behaviour of rendered resources"""
+
+    @pytest.mark.asyncio
+    async def test_fresh_reads_are_served_from_cache(self):
+        """Test reads within the soft TTL do not render again"""
+        cache = ResourceCache(soft_ttl=30, hard_ttl=600)
+        render = _renderer("v1", "v2")
+
+        @cache.cached()
+        async def resource(location_id: str) -> str:
+            return await render()
+
+        assert await resource("loc_1") == "v1"
+        assert await resource(location_id="loc_1") == "v1"
+        assert render.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_read_refreshes_in_background(self):
+        """Test a stale read returns at once and a refresh follows"""
+        cache = ResourceCache(soft_ttl=30, hard_ttl=600)
+        render = _renderer("v1", "v2")
+
+        @cache.cached()
+        async def resource(location_id: str) -> str:
+            return await render()
+
+        await resource("loc_1")
+        _age(cache, 60)
+
+        assert await resource("loc_1") == "v1"
+        assert await resource("loc_1") == "v1"
+        await asyncio.gather(*cache._tasks)
+
+        assert render.await_count == 2
+        assert await resource("loc_1") == "v2"
+
+    @pytest.mark.asyncio
+    async def test_hard_ttl_forces_synchronous_render(self):
+        """Test reads past the hard TTL wait for a fresh render"""
+        cache = ResourceCache(soft_ttl=30, hard_ttl=600)
+        render = _renderer("v1", "v2")
+
+        @cache.cached()
+        async def resource(location_id: str) -> str:
+            return await render()
+
+        await resource("loc_1")
+        _age(cache, 601)
+        assert await resource("loc_1") == "v2"
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_text(self):
+        """Test a background refresh error leaves the stale text in place"""
+        cache = ResourceCache(soft_ttl=30, hard_ttl=600)
+        render = _renderer("v1", RuntimeError("API down"))
+
+        @cache.cached()
+        async def resource(location_id: str) -> str:
+            return await render()
+
+        await resource("loc_1")
+        _age(cache, 60)
+        assert await resource("loc_1") == "v1"
+        await asyncio.gather(*cache._tasks)
+        assert await resource("loc_1") == "v1"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_cold_reads_render_once(self):
+        """Test simultaneous first reads share one render"""
+        cache = ResourceCache()
+        calls = {"n": 0}
+
+        @cache.cached()
+        async def resource(location_id: str) -> str:
+            calls["n"] += 1
+            await asyncio.sleep(0.01)
+            return "v1"
+
+        results = await asyncio.gather(*(resource("loc_1") for _ in range(5)))
+        assert results == ["v1"] * 5
+        assert calls["n"] == 1
+
+    @pytest.mark.asyncio
+    async def test_keys_and_invalidation(self):
+        """Test arguments key the cache and invalidation is per location"""
+        cache = ResourceCache()
+        render = _renderer("a1", "b1", "a2")
+
+        @cache.cached()
+        async def resource(location_id: str) -> str:
+            return await render()
+
+        assert await resource("loc_a") == "a1"
+        assert await resource("loc_b") == "b1"
+        cache.invalidate("loc_a")
+        assert await resource("loc_a") == "a2"
+        assert await resource("loc_b") == "b1"
+
+    def test_settings_from_environment(self, monkeypatch):
+        """Test TTLs are configurable through CACHE_* variables"""
+        monkeypatch.setenv("CACHE_RESOURCE_SOFT_TTL", "5")
+        monkeypatch.setenv("CACHE_RESOURCE_HARD_TTL", "120")
+        settings = CacheSettings()
+        assert settings.resource_soft_ttl == 5
+        assert settings.resource_hard_ttl == 120
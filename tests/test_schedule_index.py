@@ -0,0 +1,170 @@
+"""Tests for local appointment conflict detection"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.calendars import CalendarsClient
+from src.api.client import GoHighLevelClient
+from src.models.calendar import Appointment, AppointmentCreate, AppointmentUpdate, Calendar
+from src.services.oauth import OAuthService
+from src.store import ScheduleIndex
+from src.utils.exceptions import ScheduleConflictError
+
+DAY = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=2)
+
+
+def _at(hour, minute=0):
+    return DAY + timedelta(hours=hour, minutes=minute)
+
+
+def _event(event_id, start, end, calendar="cal1", user=None, **fields):
+    return {
+        "id": event_id,
+        "calendarId": calendar,
+        "assignedUserId": user,
+        "startTime": start.isoformat(),
+        "endTime": end.isoformat(),
+        **fields,
+    }
+
+
+APPOINTMENTS = [
+    _event("a1", _at(9), _at(10), user="u1"),
+    _event("a2", _at(10, 30), _at(11)),
+    _event("a3", _at(11), _at(12), appointmentStatus="cancelled"),
+]
+BLOCKS = [_event("b1", _at(12), _at(13), calendar=None, user="u1")]
+
+
+@pytest.fixture
+def calendars_client():
+    client = MagicMock(spec=CalendarsClient)
+
+    async def events(location_id, start_time, end_time, calendar_id=None, user_id=None):
+        return [e for e in APPOINTMENTS if e["calendarId"] == calendar_id or e["assignedUserId"] == user_id]
+
+    async def blocks(location_id, start_time, end_time, calendar_id=None, user_id=None):
+        return [e for e in BLOCKS if e["calendarId"] == calendar_id or e["assignedUserId"] == user_id]
+
+    client.get_calendar_events = AsyncMock(side_effect=events)
+    client.get_blocked_slots = AsyncMock(side_effect=blocks)
+    return client
+
+
+class TestScheduleIndex:
+    """Test overlap checks, suggestions and write-through"""
+
+    @pytest.mark.asyncio
+    async def test_conflicts_on_calendar_and_user(self, calendars_client):
+        index = ScheduleIndex(calendars_client)
+
+        conflicts = await index.conflicts("loc_123", "cal1", _at(9, 30), _at(10, 45))
+        assert [b.id for b in conflicts] == ["a1", "a2"]
+        # a3 was cancelled; b1 only blocks user u1
+        assert await index.conflicts("loc_123", "cal1", _at(11), _at(12, 30)) == []
+        conflicts = await index.conflicts("loc_123", "cal1", _at(11), _at(12, 30), user_id="u1")
+        assert [(b.id, b.kind) for b in conflicts] == [("b1", "block")]
+        # Touching intervals do not overlap
+        assert await index.conflicts("loc_123", "cal1", _at(10), _at(10, 30)) == []
+        assert calendars_client.get_calendar_events.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_suggestions_skip_known_bookings(self, calendars_client):
+        index = ScheduleIndex(calendars_client)
+
+        slots = await index.suggest("loc_123", "cal1", _at(9), _at(10), user_id="u1", count=3)
+
+        assert slots == [(_at(11), _at(12)), (_at(13), _at(14)), (_at(14), _at(15))]
+
+    @pytest.mark.asyncio
+    async def test_writes_move_bookings(self, calendars_client):
+        index = ScheduleIndex(calendars_client)
+        await index.conflicts("loc_123", "cal1", _at(9), _at(10))
+
+        index.put("loc_123", {"id": "a2", "startTime": _at(15).isoformat(), "endTime": _at(16).isoformat()})
+        index.put("loc_123", _event("a4", _at(8), _at(9)))
+        index.remove("loc_123", "a1")
+
+        assert [b.id for b in await index.conflicts("loc_123", "cal1", _at(8), _at(16))] == ["a4", "a2"]
+        assert index.booking("loc_123", "a2").calendar_id == "cal1"
+        assert calendars_client.get_calendar_events.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_timeline_is_reloaded(self, calendars_client):
+        index = ScheduleIndex(calendars_client, ttl=0)
+        await index.conflicts("loc_123", "cal1", _at(9), _at(10))
+        await index.conflicts("loc_123", "cal1", _at(9), _at(10))
+        assert calendars_client.get_calendar_events.await_count == 2
+
+
+class TestClientBooking:
+    """Test the client rejects overlapping bookings before calling the API"""
+
+    @pytest.fixture
+    def client(self, calendars_client):
+        ghl_client = GoHighLevelClient(MagicMock(spec=OAuthService), schedule_index=True)
+        ghl_client.schedule_index._client = calendars_client
+        ghl_client.get_calendar = AsyncMock(
+            return_value=Calendar(id="cal1", name="Consults", locationId="loc_123", calendarType="event")
+        )
+        ghl_client._calendars.create_appointment = AsyncMock(
+            side_effect=lambda a: Appointment(**{**a.model_dump(exclude_none=True), "id": "a9"})
+        )
+        return ghl_client
+
+    def _create(self, start, end):
+        return AppointmentCreate(
+            calendarId="cal1", locationId="loc_123", contactId="c1", startTime=start, endTime=end
+        )
+
+    @pytest.mark.asyncio
+    async def test_overlap_is_rejected_with_alternatives(self, client):
+        with pytest.raises(ScheduleConflictError) as caught:
+            await client.create_appointment(self._create(_at(9, 30), _at(10)))
+
+        client._calendars.create_appointment.assert_not_awaited()
+        assert [c["id"] for c in caught.value.response_data["conflicts"]] == ["a1"]
+        assert caught.value.response_data["suggestions"][0]["start_time"] == _at(10).isoformat()
+
+    @pytest.mark.asyncio
+    async def test_created_appointment_blocks_the_next_booking(self, client):
+        await client.create_appointment(self._create(_at(14), _at(15)))
+
+        with pytest.raises(ScheduleConflictError):
+            await client.create_appointment(self._create(_at(14, 30), _at(15, 30)))
+        await client.create_appointment(self._create(_at(14, 30), _at(15, 30)), allow_overlap=True)
+        assert client._calendars.create_appointment.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_moving_an_appointment_ignores_itself(self, client):
+        client._calendars.update_appointment = AsyncMock(
+            return_value=Appointment(**_event("a2", _at(10, 45), _at(11, 15)), locationId="loc_123",
+                                     contactId="c1", appointmentStatus="confirmed")
+        )
+        await client.check_schedule("loc_123", "cal1", _at(7), _at(8))
+
+        await client.update_appointment("a2", AppointmentUpdate(startTime=_at(10, 45)), "loc_123")
+        with pytest.raises(ScheduleConflictError):
+            await client.update_appointment("a2", AppointmentUpdate(startTime=_at(9, 45)), "loc_123")
+
+        assert client.schedule_index.booking("loc_123", "a2").start == _at(10, 45).timestamp()
+
+    @pytest.mark.asyncio
+    async def test_shared_slot_calendars_are_not_checked(self, client):
+        client.get_calendar.return_value = Calendar(
+            id="cal1", name="Classes", locationId="loc_123", appoinmentPerSlot=3
+        )
+
+        await client.create_appointment(self._create(_at(9, 30), _at(10)))
+
+        client._calendars.create_appointment.assert_awaited_once()
+        assert client.schedule_index._client.get_calendar_events.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_timeline_load_does_not_block_booking(self, client):
+        client.schedule_index._client.get_calendar_events.side_effect = RuntimeError("upstream down")
+
+        created = await client.create_appointment(self._create(_at(9, 30), _at(10)))
+
+        assert created.id == "a9"
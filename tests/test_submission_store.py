@@ -0,0 +1,184 @@
+"""Tests for the local submission store and its columnar answer analytics"""
+
+import pytest
+from datetime import date
+from unittest.mock import MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.api.forms import FormsClient
+from src.api.surveys import SurveysClient
+from src.services.oauth import OAuthService
+from src.store import LocalDatabase, SubmissionStore
+from src.store.submissions import flatten_answers
+from src.utils.exceptions import ValidationError
+
+
+def _form(submission_id, submitted, form="f1", **answers):
+    return {"id": submission_id, "formId": form, "contactId": "c1", "submittedAt": submitted, "data": answers}
+
+
+def _survey(submission_id, submitted, **answers):
+    return {"id": submission_id, "surveyId": "s1", "createdAt": submitted, "responses": answers}
+
+
+FORMS = [
+    _form("f-1", "2025-01-05T10:00:00Z", plan="Pro", source="Ads", topics=["billing", "api"]),
+    _form("f-2", "2025-01-20T10:00:00Z", plan="Basic", source="Ads", topics=["api"]),
+    _form("f-3", "2025-02-03T10:00:00Z", plan="Pro", source="Referral"),
+    _form("f-4", "2025-02-10T10:00:00Z", plan="Pro", source="Ads", address={"city": "Austin"}),
+    _form("f-5", "2025-02-11T10:00:00Z", form="f2", plan="Enterprise"),
+]
+SURVEYS = [
+    _survey("s-1", "2025-02-12T10:00:00Z", score=9, recommend=True),
+]
+
+
+def _pages(rows):
+    async def iter_pages(location_id, start_date=None, page_size=100):
+        for start in range(0, len(rows), page_size):
+            yield rows[start:start + page_size]
+
+    return MagicMock(side_effect=iter_pages)
+
+
+@pytest.fixture
+def clients():
+    forms = MagicMock(spec=FormsClient)
+    forms.iter_submission_pages = _pages(FORMS)
+    surveys = MagicMock(spec=SurveysClient)
+    surveys.iter_submission_pages = _pages(SURVEYS)
+    return forms, surveys
+
+
+@pytest.fixture
+def store(clients):
+    return SubmissionStore(*clients, LocalDatabase(":memory:"), page_size=2)
+
+
+class TestSubmissionAnalytics:
+    """Test fields, distributions, cross-tabs and histograms"""
+
+    @pytest.mark.asyncio
+    async def test_fields_of_one_form(self, store):
+        await store.sync("loc_123")
+
+        report = await store.analyze("loc_123", "fields", source_id="f1")
+
+        assert report["submissions"] == 4
+        assert report["fields"][:3] == [
+            {"field": "plan", "answered": 4, "distinct": 2},
+            {"field": "source", "answered": 4, "distinct": 2},
+            {"field": "topics", "answered": 2, "distinct": 2},
+        ]
+        assert {"field": "address.city", "answered": 1, "distinct": 1} in report["fields"]
+
+    @pytest.mark.asyncio
+    async def test_distribution_counts_every_list_item(self, store):
+        await store.sync("loc_123")
+
+        plans = await store.analyze("loc_123", "distribution", field="plan")
+        topics = await store.analyze("loc_123", "distribution", field="topics")
+
+        assert [(v["value"], v["count"]) for v in plans["values"]] == [("Pro", 3), ("Basic", 1), ("Enterprise", 1)]
+        assert plans["values"][0]["share"] == 0.6
+        assert (topics["answered"], [(v["value"], v["count"]) for v in topics["values"]]) == (
+            2, [("api", 2), ("billing", 1)]
+        )
+
+    @pytest.mark.asyncio
+    async def test_crosstab_within_a_date_range(self, store):
+        await store.sync("loc_123")
+
+        report = await store.analyze(
+            "loc_123", "crosstab", field="plan", by="source", start="2025-01-01", end="2025-02-05"
+        )
+
+        assert report["submissions"] == 3
+        assert report["columns"] == ["Ads", "Referral"]
+        assert report["rows"] == [
+            {"value": "Pro", "total": 2, "counts": {"Ads": 1, "Referral": 1}},
+            {"value": "Basic", "total": 1, "counts": {"Ads": 1, "Referral": 0}},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_histogram_by_top_answers(self, store):
+        await store.sync("loc_123")
+
+        report = await store.analyze(
+            "loc_123", "histogram", field="plan", period="month", start="2025-01-01", end="2025-03-01", top=2
+        )
+
+        assert [(b["period"], b["submissions"]) for b in report["buckets"]] == [("2025-01", 2), ("2025-02", 4)]
+        assert report["buckets"][1]["values"] == {"Pro": 2, "Basic": 0}
+
+    @pytest.mark.asyncio
+    async def test_survey_answers_are_flattened(self, store):
+        await store.sync("loc_123")
+
+        report = await store.analyze("loc_123", "distribution", source_id="s1", field="recommend")
+
+        assert report["values"] == [{"value": "true", "count": 1, "share": 1.0}]
+
+    @pytest.mark.asyncio
+    async def test_bad_requests(self, store):
+        await store.sync("loc_123")
+
+        with pytest.raises(ValidationError):
+            await store.analyze("loc_123", "distribution")
+        with pytest.raises(ValidationError):
+            await store.analyze("loc_123", "distribution", field="missing")
+        with pytest.raises(ValidationError):
+            await store.analyze("loc_123", "histogram", period="quarter")
+        with pytest.raises(ValidationError, match="Invalid end"):
+            await store.analyze("loc_123", "fields", end="02/30/2025")
+
+    def test_flatten_answers(self):
+        flat = flatten_answers(
+            {"others": {"a": 1.0, "b": "", "c": [{"url": "x"}, "y"], "d": {"e": False}, "f": None}}
+        )
+        assert flat == {"a": ["1"], "c": ["y"], "d.e": ["false"]}
+
+
+class TestSubmissionSync:
+    """Test incremental syncs from the day before the mark"""
+
+    @pytest.mark.asyncio
+    async def test_incremental_adds_new_submissions(self, store, clients):
+        forms, surveys = clients
+        await store.sync("loc_123")
+        await store.analyze("loc_123", "fields")
+        forms.iter_submission_pages = _pages([_form("f-6", "2099-01-01T00:00:00Z", plan="Basic")])
+        surveys.iter_submission_pages = _pages([])
+
+        state = await store.sync("loc_123")
+
+        assert state.high_water_mark == "2099-01-01T00:00:00.000Z"
+        # The mark from the full load is about a minute before it started
+        assert forms.iter_submission_pages.call_args.args[1] < date.today()
+        plans = await store.analyze("loc_123", "distribution", field="plan")
+        assert ("Basic", 2) in [(v["value"], v["count"]) for v in plans["values"]]
+
+    @pytest.mark.asyncio
+    async def test_full_resync_drops_deleted(self, store, clients):
+        forms, surveys = clients
+        await store.sync("loc_123")
+        forms.iter_submission_pages = _pages(FORMS[:1])
+        surveys.iter_submission_pages = _pages([])
+
+        await store.sync("loc_123", full=True)
+
+        assert (await store.analyze("loc_123", "fields"))["submissions"] == 1
+
+
+class TestClientSubmissions:
+    """Test the client answers from the submission store"""
+
+    @pytest.mark.asyncio
+    async def test_first_query_loads_the_location(self, clients):
+        client = GoHighLevelClient(MagicMock(spec=OAuthService), local_db=LocalDatabase(":memory:"))
+        client.submission_store._forms, client.submission_store._surveys = clients
+
+        report = await client.analyze_submissions("loc_123", "distribution", source_id="f2", field="plan")
+
+        assert client.submission_store in client.mirrors()
+        assert report["values"][0]["value"] == "Enterprise"
@@ -0,0 +1,177 @@
+"""Tests for the local task index and its due-date and assignee queries"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.api.locations_extended import LocationsExtendedClient
+from src.models.task import Task, TaskCreate
+from src.services.oauth import OAuthService
+from src.store import LocalDatabase, TaskIndex
+from src.utils.exceptions import ValidationError
+
+NOW = datetime.now(timezone.utc)
+
+
+def _due(days):
+    return (NOW + timedelta(days=days)).isoformat()
+
+
+def _task(task_id, due_days, assigned="u1", contact="c1", completed=False, **fields):
+    return {
+        "id": task_id,
+        "locationId": "loc_123",
+        "title": f"Task {task_id}",
+        "assignedTo": assigned,
+        "contactId": contact,
+        "dueDate": _due(due_days) if due_days is not None else None,
+        "completed": completed,
+        "dateUpdated": "2025-01-01T00:00:00Z",
+        **fields,
+    }
+
+
+TASKS = [
+    _task("t1", -3),
+    _task("t2", 2, assigned="u2"),
+    _task("t3", -1, assigned="u2", contact="c2"),
+    _task("t4", 10),
+    _task("t5", -5, completed=True),
+    _task("t6", None, assigned=None),
+]
+
+
+def _pages(rows):
+    async def iter_pages(location_id, completed=None, page_size=100):
+        matching = [r for r in rows if completed is None or r["completed"] == completed]
+        for start in range(0, len(matching), page_size):
+            yield matching[start:start + page_size]
+
+    return MagicMock(side_effect=iter_pages)
+
+
+@pytest.fixture
+def tasks_client():
+    client = MagicMock(spec=LocationsExtendedClient)
+    client.iter_task_pages = _pages(TASKS)
+    return client
+
+
+@pytest.fixture
+def index(tasks_client):
+    return TaskIndex(tasks_client, LocalDatabase(":memory:"), page_size=2)
+
+
+class TestTaskQueries:
+    """Test due-date ordering, overdue and assignee filters and workload counts"""
+
+    @pytest.mark.asyncio
+    async def test_open_tasks_soonest_due_first(self, index):
+        await index.sync("loc_123")
+
+        tasks, total = await index.search("loc_123")
+
+        assert [t["id"] for t in tasks] == ["t1", "t3", "t2", "t4", "t6"]
+        assert total == 5
+
+    @pytest.mark.asyncio
+    async def test_overdue_for_an_assignee(self, index):
+        await index.sync("loc_123")
+
+        tasks, _ = await index.search("loc_123", assigned_to="u1", overdue=True)
+        assert [t["id"] for t in tasks] == ["t1"]
+        tasks, _ = await index.search("loc_123", overdue=True)
+        assert [t["id"] for t in tasks] == ["t1", "t3"]
+
+    @pytest.mark.asyncio
+    async def test_due_window_and_completed(self, index):
+        await index.sync("loc_123")
+
+        tasks, _ = await index.search("loc_123", due_after=_due(0), due_before=_due(7))
+        assert [t["id"] for t in tasks] == ["t2"]
+        tasks, total = await index.search("loc_123", completed=None, limit=2, skip=1)
+        assert ([t["id"] for t in tasks], total) == (["t1", "t3"], 6)
+        with pytest.raises(ValidationError):
+            await index.search("loc_123", due_after="next tuesday")
+
+    @pytest.mark.asyncio
+    async def test_workload_per_assignee(self, index):
+        await index.sync("loc_123")
+
+        rows = await index.workload("loc_123", due_within_days=7)
+
+        by_user = {row["assigned_to"]: row for row in rows}
+        assert (by_user["u1"]["open"], by_user["u1"]["overdue"], by_user["u1"]["due_soon"]) == (2, 1, 0)
+        assert (by_user["u2"]["open"], by_user["u2"]["overdue"], by_user["u2"]["due_soon"]) == (2, 1, 1)
+        assert by_user[None]["overdue"] == 0
+
+
+class TestTaskSync:
+    """Test incremental syncs over open tasks and full reloads"""
+
+    @pytest.mark.asyncio
+    async def test_incremental_closes_tasks_no_longer_open(self, index, tasks_client):
+        await index.sync("loc_123")
+        tasks_client.iter_task_pages = _pages(
+            [t for t in TASKS if t["id"] != "t1"] + [_task("t7", 1, dateUpdated="2099-01-01T00:00:00Z")]
+        )
+
+        state = await index.sync("loc_123")
+
+        assert tasks_client.iter_task_pages.call_args.kwargs["completed"] is False
+        assert state.high_water_mark == "2099-01-01T00:00:00.000Z"
+        tasks, _ = await index.search("loc_123", assigned_to="u1")
+        assert [t["id"] for t in tasks] == ["t7", "t4"]
+        tasks, _ = await index.search("loc_123", completed=True)
+        assert [t["id"] for t in tasks] == ["t5", "t1"]
+        assert all(t["completed"] is True for t in tasks)
+
+    @pytest.mark.asyncio
+    async def test_full_resync_drops_deleted(self, index, tasks_client):
+        await index.sync("loc_123")
+        tasks_client.iter_task_pages = _pages(TASKS[:2])
+
+        await index.sync("loc_123", full=True)
+
+        _, total = await index.search("loc_123", completed=None)
+        assert total == 2
+
+
+class TestClientTasks:
+    """Test the client answers from the index and writes tasks through to it"""
+
+    @pytest.fixture
+    def client(self, tasks_client):
+        ghl_client = GoHighLevelClient(MagicMock(spec=OAuthService), local_db=LocalDatabase(":memory:"))
+        ghl_client.task_index._client = tasks_client
+        return ghl_client
+
+    @pytest.mark.asyncio
+    async def test_first_query_loads_the_location(self, client):
+        tasks, total = await client.search_tasks_local("loc_123", overdue=True)
+
+        assert client.task_index in client.mirrors()
+        assert [t.id for t in tasks] == ["t1", "t3"]
+        assert total == 2
+
+    @pytest.mark.asyncio
+    async def test_writes_update_the_index(self, client):
+        await client.search_tasks_local("loc_123")
+        client._contacts.create_contact_task = AsyncMock(
+            return_value=Task(id="t8", title="Call back", dueDate=NOW - timedelta(hours=1), assignedTo="u1")
+        )
+        # The completion endpoint returns the task without its due date
+        client._contacts.complete_contact_task = AsyncMock(
+            return_value=Task(id="t1", title="Task t1", completed=True)
+        )
+        client._contacts.delete_contact_task = AsyncMock(return_value=True)
+
+        await client.create_contact_task("c9", TaskCreate(title="Call back"), "loc_123")
+        await client.complete_contact_task("c1", "t1", True, "loc_123")
+        await client.delete_contact_task("c2", "t3", "loc_123")
+
+        tasks, _ = await client.search_tasks_local("loc_123", overdue=True)
+        assert [(t.id, t.contactId) for t in tasks] == [("t8", "c9")]
+        done, _ = await client.search_tasks_local("loc_123", completed=True)
+        assert [(t.id, t.dueDate is not None) for t in done] == [("t5", True), ("t1", True)]
@@ -0,0 +1,132 @@
+"""Tests for the incremental payment transaction export"""
+
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+from src.models.payment import PaymentTransaction, PaymentTransactionList
+from src.services.exports import TransactionExportService
+
+
+def _transactions(count, start=datetime(2025, 6, 1, tzinfo=timezone.utc)):
+    """Build transactions one hour apart, returned newest first like the API"""
+    rows = [
+        PaymentTransaction(
+            _id=f"txn_{i}",
+            amount=10.0,
+            fee=0.5,
+            netAmount=9.5,
+            currency="USD",
+            status="succeeded",
+            createdAt=start + timedelta(hours=i),
+        )
+        for i in range(count)
+    ]
+    return list(reversed(rows))
+
+
+def _mock_client(rows, fail_on_call=None):
+    """Mock client paging over rows by skip, optionally failing on one call"""
+    calls = {"n": 0}
+
+    async def get_payment_transactions(location_id, limit=100, skip=0, start_at=None):
+        calls["n"] += 1
+        if fail_on_call is not None and calls["n"] == fail_on_call:
+            raise RuntimeError("connection dropped")
+        page = rows[skip:skip + limit]
+        return PaymentTransactionList(transactions=page, count=len(page), total=len(rows))
+
+    client = AsyncMock()
+    client.get_payment_transactions = AsyncMock(side_effect=get_payment_transactions)
+    return client
+
+
+def _exported_ids(path):
+    with open(path) as f:
+        return [json.loads(line)["id"] for line in f if line.strip()]
+
+
+class TestTransactionExport:
+    """Test checkpointed transaction exports"""
+
+    @pytest.mark.asyncio
+    async def test_full_export_writes_rows_and_summary(self, tmp_path):
+        """Test the first run exports everything and writes a daily summary"""
+        rows = _transactions(30)
+        service = TransactionExportService(_mock_client(rows), export_dir=tmp_path, page_size=10)
+
+        result = await service.export("loc_123")
+
+        assert result.rows_exported == 30
+        assert result.high_water_mark == rows[0].createdAt
+        assert sorted(_exported_ids(result.output_file)) == sorted(r.id for r in rows)
+
+        with open(result.summary_file) as f:
+            summary = json.load(f)
+        assert summary["rows"] == 30
+        assert summary["days"]["2025-06-01"]["count"] == 24
+        assert summary["days"]["2025-06-02"]["amount"]["USD"] == 60.0
+
+    @pytest.mark.asyncio
+    async def test_incremental_run_fetches_only_new_rows(self, tmp_path):
+        """Test a second run only exports transactions newer than the mark"""
+        rows = _transactions(30)
+        service = TransactionExportService(_mock_client(rows), export_dir=tmp_path, page_size=10)
+        await service.export("loc_123")
+
+        newer = _transactions(35)
+        client = _mock_client(newer)
+        service = TransactionExportService(client, export_dir=tmp_path, page_size=10)
+        result = await service.export("loc_123")
+
+        assert result.rows_exported == 5
+        assert sorted(_exported_ids(result.output_file)) == sorted(r.id for r in newer[:5])
+        # Paging stops at the first page holding nothing newer than the mark
+        assert client.get_payment_transactions.await_count == 2
+        assert client.get_payment_transactions.call_args.kwargs["start_at"] == rows[0].createdAt
+
+    @pytest.mark.asyncio
+    async def test_interrupted_run_resumes_without_duplicates(self, tmp_path):
+        """Test an interrupted run resumes from its last page"""
+        rows = _transactions(30)
+        service = TransactionExportService(
+            _mock_client(rows, fail_on_call=3), export_dir=tmp_path, page_size=10
+        )
+        with pytest.raises(RuntimeError):
+            await service.export("loc_123")
+
+        state = await service.load_state("loc_123")
+        assert state.next_skip == 20
+        assert state.high_water_mark is None
+
+        # Simulate a crash in the middle of writing a row
+        with open(state.run_file, "a") as f:
+            f.write('{"id": "txn_partial", "amo')
+
+        client = _mock_client(rows)
+        service = TransactionExportService(client, export_dir=tmp_path, page_size=10)
+        result = await service.export("loc_123")
+
+        assert result.resumed is True
+        assert client.get_payment_transactions.call_args_list[0].kwargs["skip"] == 20
+        ids = _exported_ids(result.output_file)
+        assert len(ids) == 30
+        assert len(set(ids)) == 30
+        assert (await service.load_state("loc_123")).run_file is None
+
+    @pytest.mark.asyncio
+    async def test_rows_sharing_the_mark_are_not_lost(self, tmp_path):
+        """Test a later run keeps new transactions with the same time as the mark"""
+        rows = _transactions(5)
+        service = TransactionExportService(_mock_client(rows), export_dir=tmp_path, page_size=10)
+        await service.export("loc_123")
+
+        tied = PaymentTransaction(_id="txn_tied", amount=10.0, currency="USD", createdAt=rows[0].createdAt)
+        result = await TransactionExportService(
+            _mock_client([tied] + rows), export_dir=tmp_path, page_size=10
+        ).export("loc_123")
+
+        assert _exported_ids(result.output_file) == ["txn_tied"]
+        state = await service.load_state("loc_123")
+        assert state.high_water_ids == ["txn_4", "txn_tied"]
@@ -0,0 +1,97 @@
+"""Tests for the user directory cache"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.client import GoHighLevelClient
+from src.models.user import User, UserList
+from src.services.oauth import OAuthService
+from src.utils.exceptions import UnknownReferenceError, ValidationError
+
+
+def _users():
+    return [
+        User(id="usr_ann", name="Ann Lee", firstName="Ann", lastName="Lee", email="ann@example.com"),
+        User(id="usr_bob", name="Bob Stone", email="Bob@Example.com"),
+        User(id="usr_sam1", name="Sam Park", email="sam.park@example.com"),
+        User(id="usr_sam2", name="Sam Park", email="sam.p@example.com"),
+    ]
+
+
+@pytest.fixture
+def client():
+    """Main client whose users endpoint is mocked"""
+    ghl_client = GoHighLevelClient(MagicMock(spec=OAuthService))
+    ghl_client._users.get_users = AsyncMock(
+        return_value=UserList(users=_users(), count=4, total=4)
+    )
+    return ghl_client
+
+
+class TestUserDirectoryCache:
+    """Test assignee resolution, enrichment and invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_resolves_ids_emails_and_names(self, client):
+        """Test the same user is found by ID, email and name with one load"""
+        assert await client.resolve_user_id("loc_123", "usr_ann") == "usr_ann"
+        assert await client.resolve_user_id("loc_123", "BOB@example.com") == "usr_bob"
+        assert await client.resolve_user_id("loc_123", "ann  lee") == "usr_ann"
+        assert await client.resolve_user_id("loc_123", None) is None
+        assert client._users.get_users.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_ambiguous_name(self, client):
+        """Test a shared name asks for an email or ID"""
+        with pytest.raises(ValidationError, match="Several users are named"):
+            await client.resolve_user_id("loc_123", "Sam Park")
+
+    @pytest.mark.asyncio
+    async def test_unknown_user(self, client):
+        """Test unknown names fail after one reload and unknown IDs pass through"""
+        with pytest.raises(UnknownReferenceError):
+            await client.resolve_user_id("loc_123", "Carol King")
+        assert client._users.get_users.await_count == 2
+
+        assert await client.resolve_user_id("loc_123", "a1B2c3D4e5F6g7H8i9J0") == "a1B2c3D4e5F6g7H8i9J0"
+        assert client._users.get_users.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_ids_resolve_without_the_directory(self, client):
+        """Test ID-shaped references pass through even when /users fails"""
+        client._users.get_users.side_effect = RuntimeError("missing scope")
+
+        assert await client.resolve_user_id("loc_123", "a1B2c3D4e5F6g7H8i9J0") == "a1B2c3D4e5F6g7H8i9J0"
+        client._users.get_users.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_enrich_adds_display_names(self, client):
+        """Test assigned user IDs gain display names without extra calls"""
+        rows = [
+            {"id": "opp_1", "assignedTo": "usr_ann"},
+            {"id": "appt_1", "assignedUserId": "usr_bob"},
+            {"id": "opp_2", "assignedTo": "usr_gone"},
+        ]
+        await client.enrich_user_names("loc_123", rows)
+
+        assert rows[0]["assignedToName"] == "Ann Lee"
+        assert rows[1]["assignedUserIdName"] == "Bob Stone"
+        assert rows[2]["assignedToName"] is None
+        assert client._users.get_users.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_enrich_skips_load_without_assignees(self, client):
+        """Test rows with no assigned users do not load the directory"""
+        await client.enrich_user_names("loc_123", [{"id": "opp_1", "assignedTo": None}])
+        client._users.get_users.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_user_writes_invalidate(self, client):
+        """Test user writes drop every cached directory"""
+        client._users.delete_user = AsyncMock(return_value=True)
+        await client.resolve_user_id("loc_123", "usr_ann")
+        await client.resolve_user_id("loc_456", "usr_ann")
+
+        await client.delete_user("usr_bob")
+        assert client.user_cache.peek("loc_123") is None
+        assert client.user_cache.peek("loc_456") is None